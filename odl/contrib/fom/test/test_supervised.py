@@ -17,6 +17,7 @@ import scipy.signal
 
 import odl
 from odl.contrib import fom
+from odl.trafos.backends import SCIPY_FFT_AVAILABLE
 from odl.util.testutils import noise_element, simple_fixture, skip_if_no_pyfftw
 
 
@@ -25,7 +26,10 @@ from odl.util.testutils import noise_element, simple_fixture, skip_if_no_pyfftw
 
 fft_impl = simple_fixture(
     'fft_impl',
-    [pytest.param('numpy'), pytest.param('pyfftw', marks=skip_if_no_pyfftw)]
+    [pytest.param('numpy'),
+     pytest.param('scipy', marks=pytest.mark.skipif(
+         not SCIPY_FFT_AVAILABLE, reason='scipy.fft not available')),
+     pytest.param('pyfftw', marks=skip_if_no_pyfftw)]
 )
 
 space = simple_fixture(
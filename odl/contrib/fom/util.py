@@ -11,7 +11,7 @@
 import numpy as np
 
 from odl.discr import uniform_discr
-from odl.trafos.backends import PYFFTW_AVAILABLE
+from odl.trafos.backends import FFT_IMPLS, PYFFTW_AVAILABLE, fft_call
 
 __all__ = ()
 
@@ -26,10 +26,11 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
     fh, fv : 1D array-like
         Horizontal (axis 0) and vertical (axis 1) filters. Their sizes
         can be at most the image sizes in the respective axes.
-    impl : {'numpy', 'pyfftw'}, optional
+    impl : {'numpy', 'scipy', 'pyfftw'}, optional
         FFT backend to use. The ``pyfftw`` backend requires the
         ``pyfftw`` package to be installed. It is usually significantly
-        faster than the NumPy backend.
+        faster than the NumPy backend. The ``scipy`` backend uses
+        ``scipy.fft`` with multiple threads.
     padding : positive int, optional
         Amount of zeros added to the left and right of the image in all
         axes before FFT. This helps avoiding wraparound artifacts due to
@@ -51,9 +52,13 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
     """
     # TODO: generalize for nD
     impl, impl_in = str(impl).lower(), impl
-    if impl not in ('numpy', 'pyfftw'):
+    if impl not in ('numpy', 'scipy', 'pyfftw'):
         raise ValueError('`impl` {!r} not understood'
                          ''.format(impl_in))
+    if impl not in FFT_IMPLS:
+        raise ValueError(
+            '`{}` package is not available; you need to install it '
+            'to use the {} backend'.format(impl, impl))
 
     image = np.asarray(image)
     if image.ndim != 2:
@@ -89,7 +94,7 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
     if padding != 0:
         image_padded = np.pad(image, padding, mode='constant')
     else:
-        image_padded = image.copy() if impl == 'pyfftw' else image
+        image_padded = image
 
     # Prepare filters for the convolution
     def prepare_for_fft(filt, n_new):
@@ -108,79 +113,23 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
     fh = prepare_for_fft(fh, image_padded.shape[0])
     fv = prepare_for_fft(fv, image_padded.shape[1])
 
-    # Perform the multiplication in Fourier space and apply inverse FFT
-    if impl == 'numpy':
-        image_ft = np.fft.rfftn(image_padded)
-        fh_ft = np.fft.fft(fh)
-        fv_ft = np.fft.rfft(fv)
-
-        image_ft *= fh_ft[:, None]
-        image_ft *= fv_ft[None, :]
-        # Important to specify the shape since `irfftn` cannot know the
-        # original shape
-        conv = np.fft.irfftn(image_ft, s=image_padded.shape)
-        if conv.dtype != image.dtype:
-            conv = conv.astype(image.dtype)
-
-    elif impl == 'pyfftw':
-        if not PYFFTW_AVAILABLE:
-            raise ValueError(
-                '`pyfftw` package is not available; you need to install it '
-                'to use the pyfftw backend')
-
-        import pyfftw
-        import multiprocessing
-
-        # Generate output arrays, for half-complex transform of image and
-        # vertical filter, and full FT of the horizontal filter
-        out_img_shape = (image_padded.shape[0], image_padded.shape[1] // 2 + 1)
-        out_img_dtype = np.result_type(image_padded, 1j)
-        out_img = np.empty(out_img_shape, out_img_dtype)
-
-        out_fh_shape = out_img_shape[0]
-        out_fh_dtype = np.result_type(fh, 1j)
-        fh_c = fh.astype(out_fh_dtype)  # need to make this a C2C trafo
-        out_fh = np.empty(out_fh_shape, out_fh_dtype)
-
-        out_fv_shape = out_img_shape[1]
-        out_fv_dtype = np.result_type(fv, 1j)
-        out_fv = np.empty(out_fv_shape, out_fv_dtype)
-
-        # Perform the forward transforms of image and filters. We use
-        # the `FFTW_ESTIMATE` flag to not allow the planner to destroy
-        # the input.
-        plan = pyfftw.FFTW(image_padded, out_img, axes=(0, 1),
-                           direction='FFTW_FORWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(image_padded, out_img)
-
-        plan = pyfftw.FFTW(fh_c, out_fh, axes=(0,),
-                           direction='FFTW_FORWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(fh_c, out_fh)
-
-        plan = pyfftw.FFTW(fv, out_fv, axes=(0,),
-                           direction='FFTW_FORWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(fv, out_fv)
-
-        # Fourier space multiplication
-        out_img *= out_fh[:, None]
-        out_img *= out_fv[None, :]
-
-        # Inverse trafo
-        conv = image_padded  # Overwrite
-        plan = pyfftw.FFTW(out_img.copy(), conv, axes=(0, 1),
-                           direction='FFTW_BACKWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(out_img, conv)
-
-    else:
-        raise ValueError('unsupported `impl` {!r}'.format(impl_in))
+    # Perform the multiplication in Fourier space and apply inverse FFT.
+    # The horizontal filter needs a full (C2C) transform.
+    image_ft = fft_call(image_padded, axes=(0, 1), halfcomplex=True,
+                        impl=impl)
+    fh_ft = fft_call(fh.astype(np.result_type(fh, 1j)), axes=(0,),
+                     impl=impl, preserve_input=False)
+    fv_ft = fft_call(fv, axes=(0,), halfcomplex=True, impl=impl)
+
+    image_ft *= fh_ft[:, None]
+    image_ft *= fv_ft[None, :]
+    # Important to specify the shape since the inverse half-complex
+    # transform cannot know the original shape
+    conv = fft_call(image_ft, direction='backward', axes=(0, 1),
+                    halfcomplex=True, normalise_idft=True, impl=impl,
+                    s=image_padded.shape, preserve_input=False)
+    if conv.dtype != image.dtype:
+        conv = conv.astype(image.dtype)
 
     if padding:
         return conv[padding:-padding, padding:-padding]
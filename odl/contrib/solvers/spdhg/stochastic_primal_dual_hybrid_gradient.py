@@ -110,11 +110,12 @@ def spdhg(x, f, g, A, tau, sigma, niter, **kwargs):
         Operators A[i] : X -> Y[i] that possess adjoints: A[i].adjoint
     tau : scalar / vector / matrix
         Step size for primal variable. Note that the proximal operator of g
-        has to be well-defined for this input.
+        has to be well-defined for this input. If None, it is computed
+        from the norms of A[i], see Notes.
     sigma : scalar
         Scalar / vector / matrix used as step size for dual variable. Note that
         the proximal operator related to f (see above) has to be well-defined
-        for this input.
+        for this input. If None, it is computed from the norms of A[i].
     niter : int
         Number of iterations
 
@@ -132,10 +133,22 @@ def spdhg(x, f, g, A, tau, sigma, niter, **kwargs):
     fun_select : function
         Function that selects blocks at every iteration IN -> {1,...,n}. By
         default this is serial sampling, fun_select(k) selects an index
-        i \in {1,...,n} with probability p_i.
+        i \in {1,...,n} with probability p_i. If A is a
+        `odl.operator.SubsetOperator` with deterministic sampling and
+        ``prob`` is uniform, the default is A.sample.
     callback : callable
         Function called with the current iterate after each iteration.
 
+    Notes
+    -----
+    If tau or sigma is None, the step sizes are chosen as in [CERS2017],
+
+        sigma_i = rho / ||A_i||,   tau = rho * min_i p_i / ||A_i||
+
+    with rho = 0.99. For a `odl.operator.SubsetOperator`, the cached norms
+    `SubsetOperator.subset_norms` are used, otherwise the norms are
+    estimated with a power iteration.
+
     References
     ----------
     [CERS2017] A. Chambolle, M. J. Ehrhardt, P. Richtarik and C.-B. Schoenlieb,
@@ -153,11 +166,13 @@ def spdhg(x, f, g, A, tau, sigma, niter, **kwargs):
     if prob is None:
         prob = [1 / len(A)] * len(A)
 
+    # Step sizes
+    tau, sigma = _default_step_sizes(A, prob, tau, sigma)
+
     # Selection function
     fun_select = kwargs.pop('fun_select', None)
     if fun_select is None:
-        def fun_select(x):
-            return [int(np.random.choice(len(A), 1, p=prob))]
+        fun_select = _default_fun_select(A, prob)
 
     # Dual variable
     y = kwargs.pop('y', None)
@@ -188,9 +203,11 @@ def pa_spdhg(x, f, g, A, tau, sigma, niter, mu_g, **kwargs):
     A : functions
         Operators A[i] : X -> Y[i] that possess adjoints: A[i].adjoint
     tau : scalar
-        Step size for primal variable.
+        Step size for primal variable. If None, it is computed from the
+        norms of A[i], see `spdhg`.
     sigma : scalar
-        Step size for dual variable.
+        Step size for dual variable. If None, it is computed from the
+        norms of A[i].
     niter : int
         Number of iterations
     mu_g : scalar
@@ -208,7 +225,9 @@ def pa_spdhg(x, f, g, A, tau, sigma, niter, mu_g, **kwargs):
     fun_select : function
         Function that selects blocks at every iteration IN -> {1,...,n}. By
         default this is serial sampling, fun_select(k) selects an index
-        i \in {1,...,n} with probability p_i.
+        i \in {1,...,n} with probability p_i. If A is a
+        `odl.operator.SubsetOperator` with deterministic sampling and
+        ``prob`` is uniform, the default is A.sample.
     callback : callable, optional
         Function called with the current iterate after each iteration.
 
@@ -223,11 +242,13 @@ def pa_spdhg(x, f, g, A, tau, sigma, niter, mu_g, **kwargs):
     if prob is None:
         prob = [1 / len(A)] * len(A)
 
+    # Step sizes
+    tau, sigma = _default_step_sizes(A, prob, tau, sigma)
+
     # Selection function
     fun_select = kwargs.pop('fun_select', None)
     if fun_select is None:
-        def fun_select(x):
-            return [int(np.random.choice(len(A), 1, p=prob))]
+        fun_select = _default_fun_select(A, prob)
 
     # Dual variable
     y = kwargs.pop('y', None)
@@ -238,6 +259,39 @@ def pa_spdhg(x, f, g, A, tau, sigma, niter, mu_g, **kwargs):
                   extra=extra, mu_g=mu_g, y=y, **kwargs)
 
 
+def _default_step_sizes(A, prob, tau, sigma, rho=0.99):
+    """Return ``(tau, sigma)``, filling in `None` from the norms of A[i]."""
+    if tau is not None and sigma is not None:
+        return tau, sigma
+
+    if isinstance(A, odl.operator.SubsetOperator):
+        norms = A.subset_norms
+    else:
+        norms = [odl.power_method_opnorm(Ai) for Ai in A]
+
+    if sigma is None:
+        sigma = [rho / norm for norm in norms]
+    if tau is None:
+        tau = rho * min(p / norm for p, norm in zip(prob, norms))
+    return tau, sigma
+
+
+def _default_fun_select(A, prob):
+    """Return the default block selection function for A.
+
+    The deterministic orders of a `SubsetOperator` visit all subsets
+    equally often, hence they are only used for uniform ``prob``.
+    """
+    if (isinstance(A, odl.operator.SubsetOperator) and
+            A.sampling != 'random' and np.allclose(prob, 1 / len(A))):
+        return A.sample
+
+    def fun_select(x):
+        return [int(np.random.choice(len(A), 1, p=prob))]
+
+    return fun_select
+
+
 def spdhg_generic(x, f, g, A, tau, sigma, niter, **kwargs):
     r"""Computes a saddle point with a stochastic PDHG.
 
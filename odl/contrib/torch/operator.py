@@ -27,7 +27,11 @@ if parse_version(torch.__version__) < parse_version('0.4'):
     warnings.warn("This interface is designed to work with Pytorch >= 0.4",
                   RuntimeWarning, stacklevel=2)
 
-__all__ = ('OperatorFunction', 'OperatorModule')
+__all__ = ('OperatorFunction', 'OperatorModule', 'tensor_as_array')
+
+_ZERO_STRIDES_BUG = parse_version(np.__version__) < parse_version('1.16')
+_DLPACK_AVAILABLE = (hasattr(np, 'from_dlpack') and
+                     hasattr(torch.Tensor, '__dlpack__'))
 
 
 class OperatorFunction(torch.autograd.Function):
@@ -200,12 +204,10 @@ class OperatorFunction(torch.autograd.Function):
             ctx.save_for_backward(input)
 
         # TODO(kohr-h): use GPU memory directly when possible
-        # TODO(kohr-h): remove `copy_if_zero_strides` when NumPy 1.16.0
-        # is required
-        input_arr = copy_if_zero_strides(input.cpu().detach().numpy())
+        # CPU tensors are wrapped without copying
+        input_arr = tensor_as_array(input)
 
-        # Determine how to loop over extra shape "left" of the operator
-        # domain shape
+        # Determine the extra shape "left" of the operator domain shape
         in_shape = input_arr.shape
         op_in_shape = operator.domain.shape
         if operator.is_functional:
@@ -230,27 +232,13 @@ class OperatorFunction(torch.autograd.Function):
         ctx.op_in_dtype = operator.domain.dtype
         ctx.op_out_dtype = op_out_dtype
 
-        # Evaluate the operator on all inputs in a loop
-        if extra_shape:
-            # Multiple inputs: flatten extra axes, then do one entry at a time
-            input_arr_flat_extra = input_arr.reshape((-1,) + op_in_shape)
-            results = []
-            for inp in input_arr_flat_extra:
-                results.append(operator(inp))
-
-            # Stack results, reshape to the expected output shape and enforce
-            # correct dtype
-            result_arr = np.stack(results).astype(op_out_dtype, copy=False)
-            result_arr = result_arr.reshape(extra_shape + op_out_shape)
-        else:
-            # Single input: evaluate directly
-            result_arr = np.asarray(
-                operator(input_arr)
-            ).astype(op_out_dtype, copy=False)
-
-        # Convert back to tensor
-        tensor = torch.from_numpy(result_arr).to(input.device)
-        return tensor
+        # Evaluate the operator on all inputs at once, using a vectorized
+        # implementation if the operator provides one. The result is
+        # written directly into the memory of the output tensor.
+        tensor, result_arr = _empty_tensor(extra_shape + op_out_shape,
+                                           op_out_dtype)
+        operator.apply_batch(input_arr, out=result_arr)
+        return tensor.to(input.device)
 
     @staticmethod
     def backward(ctx, grad_output):
@@ -310,11 +298,7 @@ class OperatorFunction(torch.autograd.Function):
         # is only needed for nonlinear operators)
         if not operator.is_linear:
             # TODO: implement directly for GPU data
-            # TODO(kohr-h): remove `copy_if_zero_strides` when NumPy 1.16.0
-            # is required
-            input_arr = copy_if_zero_strides(
-                ctx.saved_tensors[0].detach().cpu().numpy()
-            )
+            input_arr = tensor_as_array(ctx.saved_tensors[0])
 
         # ODL weights spaces, pytorch doesn't, so we need to handle this
         try:
@@ -328,9 +312,7 @@ class OperatorFunction(torch.autograd.Function):
         scaling = dom_weight / ran_weight
 
         # Convert `grad_output` to NumPy array
-        grad_output_arr = copy_if_zero_strides(
-            grad_output.detach().cpu().numpy()
-        )
+        grad_output_arr = tensor_as_array(grad_output)
 
         # Get shape information from the context object
         op_in_shape = ctx.op_in_shape
@@ -346,47 +328,30 @@ class OperatorFunction(torch.autograd.Function):
                 ''.format(extra_shape + op_out_shape, grad_output_arr.shape)
             )
 
-        # Evaluate the (derivative) adjoint on all inputs in a loop
-        if extra_shape:
-            # Multiple gradients: flatten extra axes, then do one entry
-            # at a time
+        # Evaluate the (derivative) adjoint on all inputs, writing into
+        # the memory of the gradient tensor
+        grad_input, result_arr = _empty_tensor(extra_shape + op_in_shape,
+                                               op_in_dtype)
+        if operator.is_linear:
+            operator.adjoint.apply_batch(grad_output_arr, out=result_arr)
+        else:
+            # The derivative depends on the input, hence we need a loop.
+            # Flatten extra axes, then do one entry at a time.
             grad_output_arr_flat_extra = grad_output_arr.reshape(
                 (-1,) + op_out_shape
             )
-
-            results = []
-            if operator.is_linear:
-                for ograd in grad_output_arr_flat_extra:
-                    results.append(np.asarray(operator.adjoint(ograd)))
-            else:
-                # Need inputs, flattened in the same way as the gradients
-                input_arr_flat_extra = input_arr.reshape((-1,) + op_in_shape)
-                for ograd, inp in zip(
-                    grad_output_arr_flat_extra, input_arr_flat_extra
-                ):
-                    results.append(
-                        np.asarray(operator.derivative(inp).adjoint(ograd))
-                    )
-
-            # Stack results, reshape to the expected output shape and enforce
-            # correct dtype
-            result_arr = np.stack(results).astype(op_in_dtype, copy=False)
-            result_arr = result_arr.reshape(extra_shape + op_in_shape)
-        else:
-            # Single gradient: evaluate directly
-            if operator.is_linear:
-                result_arr = np.asarray(
-                    operator.adjoint(grad_output_arr)
-                ).astype(op_in_dtype, copy=False)
-            else:
-                result_arr = np.asarray(
-                    operator.derivative(input_arr).adjoint(grad_output_arr)
-                ).astype(op_in_dtype, copy=False)
-
-        # Apply scaling, convert to tensor and return
+            input_arr_flat_extra = input_arr.reshape((-1,) + op_in_shape)
+            result_arr_flat_extra = result_arr.reshape((-1,) + op_in_shape)
+            for ograd, inp, res in zip(
+                grad_output_arr_flat_extra, input_arr_flat_extra,
+                result_arr_flat_extra
+            ):
+                res[:] = np.asarray(operator.derivative(inp).adjoint(ograd))
+
+        # Apply scaling and move to the device of the gradient
         if scaling != 1.0:
             result_arr *= scaling
-        grad_input = torch.from_numpy(result_arr).to(grad_output.device)
+        grad_input = grad_input.to(grad_output.device)
         return None, grad_input  # return `None` for the `operator` part
 
 
@@ -510,10 +475,70 @@ class OperatorModule(torch.nn.Module):
         )
 
 
+def tensor_as_array(tensor):
+    """Return a NumPy array holding the data of a PyTorch tensor.
+
+    Tensors in CPU memory are wrapped without copying, using the DLPack
+    protocol if supported by both PyTorch and NumPy. Tensors on other
+    devices are copied to the CPU first.
+
+    Parameters
+    ----------
+    tensor : `torch.Tensor`
+        The tensor to be converted. It may require gradient.
+
+    Returns
+    -------
+    array : `numpy.ndarray`
+        Array with the data of ``tensor``. For CPU tensors, it shares
+        memory with ``tensor``; it may then be read-only.
+
+    Examples
+    --------
+    >>> x = torch.tensor([1.0, 2.0, 3.0])
+    >>> arr = tensor_as_array(x)
+    >>> arr
+    array([ 1.,  2.,  3.], dtype=float32)
+    >>> x[0] = 5
+    >>> arr
+    array([ 5.,  2.,  3.], dtype=float32)
+
+    NumPy arrays obtained this way can be used as `NumpyTensor` data
+    without copying:
+
+    >>> space = odl.rn(3, dtype='float32')
+    >>> elem = space.element(arr)
+    >>> elem.data is arr
+    True
+    """
+    tensor = tensor.detach()
+    if tensor.device.type != 'cpu':
+        tensor = tensor.cpu()
+
+    if _DLPACK_AVAILABLE:
+        arr = np.from_dlpack(tensor)
+    else:
+        arr = tensor.numpy()
+    return copy_if_zero_strides(arr)
+
+
+def _empty_tensor(shape, dtype):
+    """Return a new CPU tensor and a NumPy array sharing its memory."""
+    arr = np.empty(shape, dtype=dtype)
+    return torch.from_numpy(arr), arr
+
+
 def copy_if_zero_strides(arr):
-    """Workaround for NumPy issue #9165 with 0 in arr.strides."""
+    """Workaround for NumPy issue #9165 with 0 in arr.strides.
+
+    The issue is fixed in NumPy 1.16.0, hence no copy is made for newer
+    versions.
+    """
     assert isinstance(arr, np.ndarray)
-    return arr.copy() if 0 in arr.strides else arr
+    if _ZERO_STRIDES_BUG and 0 in arr.strides:
+        return arr.copy()
+    else:
+        return arr
 
 
 if __name__ == '__main__':
@@ -187,5 +187,34 @@ def test_module_backward(device):
     assert x.device.type == loss.device.type == device
 
 
+def test_tensor_as_array(dtype, device):
+    """Test conversion of tensors to arrays without copying."""
+    x = torch.arange(6, dtype=getattr(torch, dtype)).reshape(2, 3)
+    x = x.to(device).requires_grad_(True)
+    arr = odl_torch.tensor_as_array(x)
+    assert arr.dtype == dtype
+    assert all_almost_equal(arr, [[0, 1, 2], [3, 4, 5]])
+
+    if device == 'cpu':
+        # Shared memory also for tensors with zero strides
+        assert arr.ctypes.data == x.data_ptr()
+        y = torch.ones(1, dtype=getattr(torch, dtype)).expand(4)
+        assert odl_torch.tensor_as_array(y).ctypes.data == y.data_ptr()
+
+
+def test_autograd_function_nonlinear(device):
+    """Test forward and backward pass with a nonlinear functional."""
+    odl_func = odl.solvers.L2NormSquared(odl.rn(3, dtype='float32'))
+    x_arr = np.random.rand(2, 3).astype('float32')
+    x = torch.from_numpy(x_arr).to(device).requires_grad_(True)
+
+    res = odl_torch.OperatorFunction.apply(odl_func, x)
+    assert all_almost_equal(res.detach().cpu().numpy(),
+                            np.sum(x_arr ** 2, axis=1))
+    res.sum().backward()
+    assert all_almost_equal(x.grad.detach().cpu().numpy(), 2 * x_arr)
+    assert x.grad.device.type == device
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -14,7 +14,8 @@ import numpy as np
 
 from odl.discr import DiscretizedSpace, Divergence, Gradient
 from odl.discr.discr_space import DiscretizedSpaceElement
-from odl.discr.discr_utils import _normalize_interp, per_axis_interpolator
+from odl.discr.discr_utils import (
+    InterpolationPlan, _normalize_interp, per_axis_interpolator)
 from odl.operator import Operator, PointwiseInner
 from odl.space import ProductSpace
 from odl.space.pspace import ProductSpaceElement
@@ -87,6 +88,21 @@ def linear_deform(template, displacement, interp='linear', out=None):
     return values.reshape(template.space.shape)
 
 
+def _linear_deform_plan(space, displacement, interp):
+    """Return an `InterpolationPlan` for sampling at ``x + v(x)``.
+
+    The deformed points are generated one axis at a time from the
+    (sparse) grid coordinates instead of the full ``space.points()``.
+    Building the plan only pays off if it is reused for several
+    evaluations with the same displacement, as in `LinDeformFixedDisp`;
+    single evaluations should use `linear_deform` instead.
+    """
+    points = (xi + vi.asarray()
+              for xi, vi in zip(space.grid.meshgrid, displacement))
+    return InterpolationPlan(space.grid.coord_vectors, points, interp=interp,
+                             dtype=space.real_dtype)
+
+
 class LinDeformFixedTempl(Operator):
 
     r"""Deformation operator with fixed template acting on displacement fields.
@@ -317,7 +333,8 @@ class LinDeformFixedDisp(Operator):
     i.e., :math:`W_v^*(I)(x) \approx \exp(-\mathrm{div}\,v(x))\, I(x - v(x))`.
     """
 
-    def __init__(self, displacement, templ_space=None, interp='linear'):
+    def __init__(self, displacement, templ_space=None, interp='linear',
+                 adjoint_method='approximate'):
         """Initialize a new instance.
 
         Parameters
@@ -341,6 +358,13 @@ class LinDeformFixedDisp(Operator):
 
             Supported values: ``'nearest'``, ``'linear'``
 
+        adjoint_method : {'approximate', 'transpose'}, optional
+            Method used for the `adjoint`. ``'approximate'`` uses the
+            approximation of the continuous adjoint for small
+            displacements, see Notes. ``'transpose'`` uses the transposed
+            interpolation matrix of `plan`, which is the exact adjoint of
+            the discretized operator.
+
         Examples
         --------
         Create a simple 1D template to initialize the operator and
@@ -403,6 +427,17 @@ class LinDeformFixedDisp(Operator):
 
         self.__interp_byaxis = _normalize_interp(interp, templ_space.ndim)
 
+        method, method_in = str(adjoint_method).lower(), adjoint_method
+        if method not in ('approximate', 'transpose'):
+            raise ValueError('`adjoint_method` {!r} not understood'
+                             ''.format(method_in))
+        self.__adjoint_method = method
+
+        # Created on first use
+        self.__plan = None
+        self.__inverse = None
+        self.__adjoint = None
+
     @property
     def interp_byaxis(self):
         """Tuple of per-axis interpolation schemes."""
@@ -419,14 +454,32 @@ class LinDeformFixedDisp(Operator):
         else:
             return self.interp_byaxis
 
+    @property
+    def adjoint_method(self):
+        """Method used for the `adjoint`."""
+        return self.__adjoint_method
+
     @property
     def displacement(self):
         """Fixed displacement field of this deformation operator."""
         return self.__displacement
 
+    @property
+    def plan(self):
+        """`InterpolationPlan` of the deformation, created on first use.
+
+        It stores the interpolation indices and weights for the fixed
+        displacement, such that repeated evaluations only need a sparse
+        matrix-vector product.
+        """
+        if self.__plan is None:
+            self.__plan = _linear_deform_plan(
+                self.domain, self.displacement, self.interp)
+        return self.__plan
+
     def _call(self, template, out=None):
         """Implementation of ``self(template[, out])``."""
-        return linear_deform(template, self.displacement, self.interp, out)
+        return self.plan(template, out=out)
 
     @property
     def inverse(self):
@@ -435,23 +488,36 @@ class LinDeformFixedDisp(Operator):
         Note that this implementation uses an approximation that is only
         valid for small displacements.
         """
-        return LinDeformFixedDisp(
-            -self.displacement, templ_space=self.domain, interp=self.interp
-        )
+        if self.__inverse is None:
+            self.__inverse = LinDeformFixedDisp(
+                -self.displacement, templ_space=self.domain,
+                interp=self.interp, adjoint_method=self.adjoint_method
+            )
+        return self.__inverse
 
     @property
     def adjoint(self):
         """Adjoint of the linear operator.
 
-        Note that this implementation uses an approximation that is only
-        valid for small displacements.
+        With ``adjoint_method='approximate'``, this implementation uses an
+        approximation that is only valid for small displacements. With
+        ``adjoint_method='transpose'``, the transposed interpolation matrix
+        is applied.
         """
-        # TODO allow users to select what method to use here.
-        div_op = Divergence(domain=self.displacement.space, method='forward',
-                            pad_mode='symmetric')
-        jacobian_det = self.domain.element(np.exp(-div_op(self.displacement)))
+        if self.__adjoint is not None:
+            return self.__adjoint
 
-        return jacobian_det * self.inverse
+        if self.adjoint_method == 'transpose':
+            self.__adjoint = _LinDeformFixedDispTranspose(self)
+        else:
+            # TODO allow users to select the divergence method here.
+            div_op = Divergence(domain=self.displacement.space,
+                                method='forward', pad_mode='symmetric')
+            jacobian_det = self.domain.element(
+                np.exp(-div_op(self.displacement)))
+            self.__adjoint = jacobian_det * self.inverse
+
+        return self.__adjoint
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -459,11 +525,49 @@ class LinDeformFixedDisp(Operator):
         optargs = [
             ('templ_space', self.domain, self.displacement.space[0]),
             ('interp', self.interp, 'linear'),
+            ('adjoint_method', self.adjoint_method, 'approximate'),
         ]
         inner_str = signature_string(posargs, optargs, mod='!r', sep=',\n')
         return '{}(\n{}\n)'.format(self.__class__.__name__, indent(inner_str))
 
 
+class _LinDeformFixedDispTranspose(Operator):
+
+    """Exact adjoint of `LinDeformFixedDisp` from its interpolation plan."""
+
+    def __init__(self, deform_op):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        deform_op : `LinDeformFixedDisp`
+            Operator whose adjoint should be represented.
+        """
+        super(_LinDeformFixedDispTranspose, self).__init__(
+            domain=deform_op.range, range=deform_op.domain, linear=True)
+        self.__deform_op = deform_op
+
+    def _call(self, x, out=None):
+        """Implementation of ``self(x[, out])``."""
+        # With weights w, the adjoint of M is w^-1 M^T w
+        weights = getattr(self.domain.weighting, 'array', None)
+        if weights is not None:
+            x = x * weights
+        out = self.__deform_op.plan.adjoint(x, out=out)
+        if weights is not None:
+            out /= weights
+        return out
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, the original deformation."""
+        return self.__deform_op
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{!r}.adjoint'.format(self.__deform_op)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -16,6 +16,8 @@ from odl.discr.discr_space import DiscretizedSpace
 from odl.operator.tensor_ops import PointwiseTensorFieldOperator
 from odl.space import ProductSpace
 from odl.util import indent, signature_string, writable_array
+from odl.util.parallel import chunk_slices, parallel_map
+from odl.util.utility import _writable_arrays
 
 __all__ = ('PartialDerivative', 'Gradient', 'Divergence', 'Laplacian')
 
@@ -202,6 +204,10 @@ class Gradient(PointwiseTensorFieldOperator):
     resulting product space element. For the adjoint of the `Gradient`
     operator, zero padding is assumed to match the negative `Divergence`
     operator
+
+    All components are computed in a single pass over the input, which is
+    processed in cache-sized blocks along the first axis. The blocks are
+    distributed over `odl.util.parallel.get_num_threads` threads.
     """
 
     def __init__(self, domain=None, range=None, method='forward',
@@ -347,18 +353,20 @@ class Gradient(PointwiseTensorFieldOperator):
         if out is None:
             out = self.range.element()
 
-        x_arr = x.asarray()
-        ndim = self.domain.ndim
-        dx = self.domain.cell_sides
-
-        for axis in range(ndim):
-            with writable_array(out[axis]) as out_arr:
-                finite_diff(x_arr, axis=axis, dx=dx[axis], method=self.method,
-                            pad_mode=self.pad_mode,
-                            pad_const=self.pad_const,
-                            out=out_arr)
+        with _writable_arrays(list(out)) as out_arrs:
+            _gradient_pass(x.asarray(), out_arrs, self.domain.cell_sides,
+                           method=self.method, pad_mode=self.pad_mode,
+                           pad_const=self.pad_const)
         return out
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        dx = self.domain.cell_sides
+        for axis in range(self.domain.ndim):
+            finite_diff(x_batch, axis=axis + 1, dx=dx[axis],
+                        method=self.method, pad_mode=self.pad_mode,
+                        pad_const=self.pad_const, out=out[:, axis])
+
     def derivative(self, point=None):
         """Return the derivative operator.
 
@@ -425,6 +433,8 @@ class Divergence(PointwiseTensorFieldOperator):
     Calls helper function `finite_diff` for each component of the input
     product space vector. For the adjoint of the `Divergence` operator to
     match the negative `Gradient` operator implicit zero is assumed.
+
+    Like for `Gradient`, the result is computed in a single blocked pass.
     """
 
     def __init__(self, domain=None, range=None, method='forward',
@@ -557,23 +567,25 @@ class Divergence(PointwiseTensorFieldOperator):
         if out is None:
             out = self.range.element()
 
-        ndim = self.range.ndim
-        dx = self.range.cell_sides
-
-        tmp = np.empty(out.shape, out.dtype, order=out.space.default_order)
         with writable_array(out) as out_arr:
-            for axis in range(ndim):
-                finite_diff(x[axis], axis=axis, dx=dx[axis],
-                            method=self.method, pad_mode=self.pad_mode,
-                            pad_const=self.pad_const,
-                            out=tmp)
-                if axis == 0:
-                    out_arr[:] = tmp
-                else:
-                    out_arr += tmp
-
+            _divergence_pass([xi.asarray() for xi in x], out_arr,
+                             self.range.cell_sides, method=self.method,
+                             pad_mode=self.pad_mode, pad_const=self.pad_const)
         return out
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        dx = self.range.cell_sides
+        tmp = np.empty_like(out)
+        for axis in range(self.range.ndim):
+            finite_diff(x_batch[:, axis], axis=axis + 1, dx=dx[axis],
+                        method=self.method, pad_mode=self.pad_mode,
+                        pad_const=self.pad_const, out=tmp)
+            if axis == 0:
+                out[:] = tmp
+            else:
+                out += tmp
+
     def derivative(self, point=None):
         """Return the derivative operator.
 
@@ -635,6 +647,8 @@ class Laplacian(PointwiseTensorFieldOperator):
     resulting product space vector.
 
     Outside the domain zero padding is assumed.
+
+    Like for `Gradient`, the result is computed in a single blocked pass.
     """
 
     def __init__(self, domain, range=None, pad_mode='constant', pad_const=0):
@@ -710,36 +724,28 @@ class Laplacian(PointwiseTensorFieldOperator):
     def _call(self, x, out=None):
         """Calculate the spatial Laplacian of ``x``."""
         if out is None:
-            out = self.range.zero()
-        else:
-            out.set_zero()
-
-        x_arr = x.asarray()
-        out_arr = out.asarray()
-        tmp = np.empty(out.shape, out.dtype, order=out.space.default_order)
-
-        ndim = self.domain.ndim
-        dx = self.domain.cell_sides
+            out = self.range.element()
 
         with writable_array(out) as out_arr:
-            for axis in range(ndim):
-                # TODO: this can be optimized
-                finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
-                            method='forward',
-                            pad_mode=self.pad_mode,
-                            pad_const=self.pad_const, out=tmp)
-
-                out_arr += tmp
-
-                finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
-                            method='backward',
-                            pad_mode=self.pad_mode,
-                            pad_const=self.pad_const, out=tmp)
-
-                out_arr -= tmp
-
+            _laplacian_pass(x.asarray(), out_arr, self.domain.cell_sides,
+                            pad_mode=self.pad_mode, pad_const=self.pad_const)
         return out
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        dx = self.domain.cell_sides
+        tmp = np.empty_like(out)
+        out[:] = 0
+        for axis in range(self.domain.ndim):
+            finite_diff(x_batch, axis=axis + 1, dx=dx[axis] ** 2,
+                        method='forward', pad_mode=self.pad_mode,
+                        pad_const=self.pad_const, out=tmp)
+            out += tmp
+            finite_diff(x_batch, axis=axis + 1, dx=dx[axis] ** 2,
+                        method='backward', pad_mode=self.pad_mode,
+                        pad_const=self.pad_const, out=tmp)
+            out -= tmp
+
     def derivative(self, point=None):
         """Return the derivative operator.
 
@@ -1130,6 +1136,127 @@ def finite_diff(f, axis, dx=1.0, method='forward', out=None,
     return out_in
 
 
+# --- Cache-blocked stencil engine --- #
+
+
+# Approximate size in bytes of the input blocks processed in one go. All
+# axes of a stencil are applied to a block while it is in cache.
+_STENCIL_BLOCK_BYTES = 2 ** 18
+
+# Number of extra rows needed to reproduce the boundary treatment of
+# `finite_diff` in a block, see `_diff_block`
+_STENCIL_HALO = 3
+
+
+def _stencil_blocks(shape, itemsize):
+    """Return slices along axis 0 that split an array into blocks."""
+    row_bytes = itemsize * int(np.prod(shape[1:]))
+    rows = max(1, _STENCIL_BLOCK_BYTES // max(row_bytes, 1))
+    return chunk_slices(shape[0], rows)
+
+
+def _diff_block(f, axis, blk, out, **kwargs):
+    """Write ``finite_diff(f, axis, **kwargs)[blk]`` to ``out``.
+
+    Parameters
+    ----------
+    f : `numpy.ndarray`
+        Full input array.
+    axis : int
+        Axis along which to differentiate.
+    blk : slice
+        Slice along axis 0 with explicit ``start`` and ``stop``.
+    out : `numpy.ndarray`
+        Array of the same shape as ``f[blk]`` to which the result is
+        written.
+    kwargs :
+        Further arguments to `finite_diff`.
+    """
+    if axis != 0:
+        # Axis is contained in the block as a whole
+        finite_diff(f[blk], axis=axis, out=out, **kwargs)
+        return
+
+    n = f.shape[0]
+    start, stop = blk.start, blk.stop
+    if start == 0 and stop == n:
+        finite_diff(f, axis=0, out=out, **kwargs)
+        return
+
+    if start >= _STENCIL_HALO and stop <= n - _STENCIL_HALO:
+        # Block is not affected by boundary treatment, use the interior
+        # formulas of `finite_diff` directly
+        method = kwargs.get('method', 'forward')
+        if method == 'central':
+            np.subtract(f[start + 1:stop + 1], f[start - 1:stop - 1], out=out)
+            out /= 2.0
+        elif method == 'forward':
+            np.subtract(f[start + 1:stop + 1], f[start:stop], out=out)
+        else:
+            np.subtract(f[start:stop], f[start - 1:stop - 1], out=out)
+        out /= float(kwargs.get('dx', 1.0))
+        return
+
+    # Differentiate a slab that includes neighboring rows. Boundary
+    # corrections of `finite_diff` at the slab ends affect at most
+    # `_STENCIL_HALO` rows, which are discarded afterwards. Periodic
+    # boundaries are no boundaries of the slab, hence we wrap around.
+    if kwargs.get('pad_mode') == 'periodic':
+        slab = f.take(np.arange(start - 1, stop + 1) % n, axis=0)
+        offset = 1
+    else:
+        slab_start = max(start - _STENCIL_HALO, 0)
+        slab = f[slab_start:min(stop + _STENCIL_HALO, n)]
+        offset = start - slab_start
+
+    tmp = np.empty(slab.shape, dtype=out.dtype)
+    finite_diff(slab, axis=0, out=tmp, **kwargs)
+    out[:] = tmp[offset:offset + stop - start]
+
+
+def _gradient_pass(f, outs, dx, **kwargs):
+    """Write the partial derivatives of ``f`` to ``outs`` in one pass.
+
+    The array is processed in blocks along axis 0, and the blocks are
+    distributed over `odl.util.parallel.get_num_threads` threads.
+    """
+    def run(blk):
+        for axis, out in enumerate(outs):
+            _diff_block(f, axis, blk, out[blk], dx=dx[axis], **kwargs)
+
+    parallel_map(run, _stencil_blocks(f.shape, f.itemsize))
+
+
+def _divergence_pass(fs, out, dx, **kwargs):
+    """Write ``sum_i d fs[i] / dx_i`` to ``out`` in one pass."""
+    def run(blk):
+        out_blk = out[blk]
+        tmp = np.empty_like(out_blk)
+        _diff_block(fs[0], 0, blk, out_blk, dx=dx[0], **kwargs)
+        for axis in range(1, len(fs)):
+            _diff_block(fs[axis], axis, blk, tmp, dx=dx[axis], **kwargs)
+            out_blk += tmp
+
+    parallel_map(run, _stencil_blocks(out.shape, out.itemsize))
+
+
+def _laplacian_pass(f, out, dx, **kwargs):
+    """Write the finite difference Laplacian of ``f`` to ``out``."""
+    def run(blk):
+        out_blk = out[blk]
+        out_blk[:] = 0
+        tmp = np.empty_like(out_blk)
+        for axis in range(f.ndim):
+            _diff_block(f, axis, blk, tmp, dx=dx[axis] ** 2,
+                        method='forward', **kwargs)
+            out_blk += tmp
+            _diff_block(f, axis, blk, tmp, dx=dx[axis] ** 2,
+                        method='backward', **kwargs)
+            out_blk -= tmp
+
+    parallel_map(run, _stencil_blocks(f.shape, f.itemsize))
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
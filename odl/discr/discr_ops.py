@@ -14,13 +14,15 @@ import numpy as np
 
 from odl.discr.discr_space import DiscretizedSpace
 from odl.discr.discr_utils import (
-    _normalize_interp, per_axis_interpolator, point_collocation)
+    _find_axis_indices, _normalize_interp, per_axis_interpolator,
+    point_collocation)
 from odl.discr.partition import uniform_partition
 from odl.operator import Operator
 from odl.space import tensor_space
 from odl.util import (
     normalized_scalar_param_list, resize_array, safe_int_conv, writable_array)
 from odl.util.numerics import _SUPPORTED_RESIZE_PAD_MODES
+from odl.util.parallel import chunk_slices, parallel_map
 from odl.util.utility import nullcontext
 
 __all__ = ('Resampling', 'ResizingOperator')
@@ -30,7 +32,8 @@ class Resampling(Operator):
 
     """An operator that resamples on a different grid in the same set."""
 
-    def __init__(self, domain, range, interp):
+    def __init__(self, domain, range, interp, block_size=None,
+                 num_threads=None):
         """Initialize a new instance.
 
         Parameters
@@ -47,6 +50,17 @@ class Resampling(Operator):
 
             Supported values: ``'nearest'``, ``'linear'``
 
+        block_size : positive int, optional
+            If given, the output is computed in slabs of ``block_size``
+            entries along axis 0, each from the slab of the input that it
+            depends on. This bounds the working memory, and with
+            ``np.memmap``-backed input and output, only the slabs being
+            processed are loaded into memory.
+            For ``None``, the whole output is computed at once.
+        num_threads : positive int, optional
+            Number of threads used to process slabs. For ``None``, the
+            global setting of `odl.util.parallel.num_threads` is used.
+
         Examples
         --------
         Create two spaces with different number of points and a resampling
@@ -83,6 +97,8 @@ class Resampling(Operator):
             domain=domain, range=range, linear=True)
 
         self.__interp_byaxis = _normalize_interp(interp, domain.ndim)
+        self.__block_size = _normalize_block_size(block_size)
+        self.__num_threads = num_threads
 
     @property
     def interp_byaxis(self):
@@ -100,21 +116,62 @@ class Resampling(Operator):
         else:
             return self.interp_byaxis
 
+    @property
+    def block_size(self):
+        """Number of entries along axis 0 computed at once, or ``None``."""
+        return self.__block_size
+
+    @property
+    def num_threads(self):
+        """Number of threads used to process slabs, or ``None``."""
+        return self.__num_threads
+
     def _call(self, x, out=None):
         """Apply resampling operator.
 
         The element ``x`` is resampled using the sampling and interpolation
         operators of the underlying spaces.
         """
-        interpolator = per_axis_interpolator(
-            x, self.domain.grid.coord_vectors, self.interp
-        )
-
         out_ctx = nullcontext() if out is None else writable_array(out)
         with out_ctx as out_arr:
-            return point_collocation(
-                interpolator, self.range.meshgrid, out=out_arr
-            )
+            if self.block_size is None:
+                interpolator = per_axis_interpolator(
+                    x, self.domain.grid.coord_vectors, self.interp
+                )
+                out_arr = point_collocation(
+                    interpolator, self.range.meshgrid, out=out_arr
+                )
+            else:
+                x_arr = x.asarray()
+                if out_arr is None:
+                    out_arr = np.empty(self.range.shape, dtype=x_arr.dtype)
+
+                def resample_slab(rows):
+                    self._resample_slab(x_arr, out_arr, rows)
+
+                parallel_map(
+                    resample_slab,
+                    chunk_slices(self.range.shape[0], self.block_size),
+                    num_threads=self.num_threads)
+
+        return out_arr if out is None else out
+
+    def _resample_slab(self, x_arr, out_arr, rows):
+        """Resample to ``out_arr[rows]`` from the needed slab of ``x_arr``."""
+        coord_vecs = list(self.domain.grid.coord_vectors)
+        mesh = list(self.range.meshgrid)
+        mesh[0] = mesh[0][rows]
+
+        # Input entries along axis 0 that the output slab depends on, i.e.,
+        # both neighbors of each output coordinate
+        idcs, _ = _find_axis_indices(mesh[0].ravel(), coord_vecs[0])
+        in_rows = slice(idcs.min(), idcs.max() + 2)
+        coord_vecs[0] = coord_vecs[0][in_rows]
+
+        interpolator = per_axis_interpolator(
+            x_arr[in_rows], coord_vecs, self.interp
+        )
+        point_collocation(interpolator, tuple(mesh), out=out_arr[rows])
 
     @property
     def inverse(self):
@@ -127,7 +184,9 @@ class Resampling(Operator):
         --------
         adjoint : resampling is unitary, so the adjoint is the inverse.
         """
-        return Resampling(self.range, self.domain, self.interp)
+        return Resampling(self.range, self.domain, self.interp,
+                          block_size=self.block_size,
+                          num_threads=self.num_threads)
 
     @property
     def adjoint(self):
@@ -235,6 +294,17 @@ class ResizingOperator(Operator):
         discr_kwargs: dict, optional
             Keyword arguments passed to the `uniform_discr` constructor.
 
+        block_size : positive int, optional
+            If given, the output is computed in slabs of ``block_size``
+            entries along axis 0, each from the input entries that it
+            depends on. This bounds the working memory, and with
+            ``np.memmap``-backed input and output, only the slabs being
+            processed are loaded into memory.
+            For ``None``, the whole output is computed at once.
+        num_threads : positive int, optional
+            Number of threads used to process slabs. For ``None``, the
+            global setting of `odl.util.parallel.num_threads` is used.
+
         Examples
         --------
         The simplest way of initializing a resizing operator is by
@@ -302,6 +372,9 @@ class ResizingOperator(Operator):
 
         offset = kwargs.pop('offset', None)
         discr_kwargs = kwargs.pop('discr_kwargs', {})
+        self.__block_size = _normalize_block_size(
+            kwargs.pop('block_size', None))
+        self.__num_threads = kwargs.pop('num_threads', None)
 
         if ran is None:
             if ran_shp is None:
@@ -372,12 +445,26 @@ class ResizingOperator(Operator):
         return tuple(i for i in range(self.domain.ndim)
                      if self.domain.shape[i] != self.range.shape[i])
 
+    @property
+    def block_size(self):
+        """Number of entries along axis 0 computed at once, or ``None``."""
+        return self.__block_size
+
+    @property
+    def num_threads(self):
+        """Number of threads used to process slabs, or ``None``."""
+        return self.__num_threads
+
     def _call(self, x, out):
         """Implement ``self(x, out)``."""
         with writable_array(out) as out_arr:
-            resize_array(x.asarray(), self.range.shape, offset=self.offset,
-                         pad_mode=self.pad_mode, pad_const=self.pad_const,
-                         direction='forward', out=out_arr)
+            if self.block_size is None:
+                resize_array(x.asarray(), self.range.shape,
+                             offset=self.offset, pad_mode=self.pad_mode,
+                             pad_const=self.pad_const, direction='forward',
+                             out=out_arr)
+            else:
+                _resize_slabs(x.asarray(), out_arr, self, 'forward')
 
     def derivative(self, point):
         """Derivative of this operator at ``point``.
@@ -390,7 +477,8 @@ class ResizingOperator(Operator):
         if self.pad_mode == 'constant' and self.pad_const != 0:
             return ResizingOperator(
                 domain=self.domain, range=self.range, pad_mode='constant',
-                pad_const=0.0)
+                pad_const=0.0, block_size=self.block_size,
+                num_threads=self.num_threads)
         else:  # operator is linear
             return self
 
@@ -415,10 +503,13 @@ class ResizingOperator(Operator):
             def _call(self, x, out):
                 """Implement ``self(x, out)``."""
                 with writable_array(out) as out_arr:
-                    resize_array(x.asarray(), op.domain.shape,
-                                 offset=op.offset, pad_mode=op.pad_mode,
-                                 pad_const=0, direction='adjoint',
-                                 out=out_arr)
+                    if op.block_size is None:
+                        resize_array(x.asarray(), op.domain.shape,
+                                     offset=op.offset, pad_mode=op.pad_mode,
+                                     pad_const=0, direction='adjoint',
+                                     out=out_arr)
+                    else:
+                        _resize_slabs(x.asarray(), out_arr, op, 'adjoint')
 
             @property
             def adjoint(self):
@@ -449,7 +540,94 @@ class ResizingOperator(Operator):
         """
         return ResizingOperator(self.range, self.domain,
                                 pad_mode=self.pad_mode,
-                                pad_const=self.pad_const)
+                                pad_const=self.pad_const,
+                                block_size=self.block_size,
+                                num_threads=self.num_threads)
+
+
+def _normalize_block_size(block_size):
+    """Return ``block_size`` as positive int or ``None``."""
+    if block_size is None:
+        return None
+    block_size_in, block_size = block_size, safe_int_conv(block_size)
+    if block_size <= 0:
+        raise ValueError('`block_size` must be positive, got {}'
+                         ''.format(block_size_in))
+    return block_size
+
+
+def _resize_axis_matrix(n, m, offset, pad_mode):
+    """Return the resizing of one axis as sparse matrix of shape ``(m, n)``.
+
+    Constant padding is represented by empty rows, i.e., with constant 0.
+    """
+    import scipy.sparse
+
+    # Resizing the labels 1, ..., n yields the source entry of each output
+    # entry, or 0 for constant padding. Invalid padding sizes raise here.
+    labels = resize_array(np.arange(1, n + 1, dtype=float), (m,),
+                          offset=[offset], pad_mode=pad_mode, pad_const=0)
+
+    if pad_mode == 'order1' and m > n:
+        # Extrapolation x_b + k * (x_b - x_c) with boundary entry x_b and
+        # its inner neighbor x_c, at distance k from the boundary
+        k_l = np.arange(offset, 0, -1)
+        k_r = np.arange(1, m - n - offset + 1)
+        rows_inner = np.arange(offset, offset + n)
+        rows = np.concatenate([rows_inner, np.repeat(np.arange(offset), 2),
+                               np.repeat(np.arange(offset + n, m), 2)])
+        cols = np.concatenate([rows_inner - offset,
+                               np.tile([0, 1], offset),
+                               np.tile([n - 1, n - 2], m - n - offset)])
+        data = np.concatenate([np.ones(n),
+                               np.stack([1 + k_l, -k_l], axis=1).ravel(),
+                               np.stack([1 + k_r, -k_r], axis=1).ravel()])
+    else:
+        rows = np.flatnonzero(labels)
+        cols = labels[rows].astype(int) - 1
+        data = np.ones(rows.size)
+
+    return scipy.sparse.csr_matrix((data, (rows, cols)), shape=(m, n))
+
+
+def _resize_slabs(arr, out, op, direction):
+    """Apply the resizing ``op`` slab by slab along axis 0.
+
+    Resizing is separable, i.e., it is the resizing along axis 0,
+    given by a sparse matrix, applied to the resizing along the other
+    axes. Hence each output slab only needs the input entries along axis 0
+    that it depends on, and they are resized in the other axes first.
+    """
+    axis_matrix = _resize_axis_matrix(op.domain.shape[0], op.range.shape[0],
+                                      op.offset[0], op.pad_mode)
+    if direction == 'forward':
+        pad_const = op.pad_const
+        slab_shape = op.range.shape[1:]
+    else:
+        axis_matrix = axis_matrix.T.tocsr()
+        pad_const = 0
+        slab_shape = op.domain.shape[1:]
+    offset = (0,) + tuple(op.offset[1:])
+
+    def resize_slab(rows):
+        matrix = axis_matrix[rows]
+        in_rows = np.unique(matrix.indices)
+        if in_rows.size == 0:
+            out[rows] = pad_const
+            return
+
+        # Resize the needed entries in the other axes, then along axis 0
+        tmp = resize_array(arr[in_rows], (in_rows.size,) + slab_shape,
+                           offset=offset, pad_mode=op.pad_mode,
+                           pad_const=pad_const, direction=direction)
+        result = matrix[:, in_rows].dot(tmp.reshape(in_rows.size, -1))
+        if pad_const != 0:
+            # Rows without source entries are constant padding
+            result[np.diff(matrix.indptr) == 0] = pad_const
+        out[rows] = result.reshape(out[rows].shape)
+
+    parallel_map(resize_slab, chunk_slices(out.shape[0], op.block_size),
+                 num_threads=op.num_threads)
 
 
 def _offset_from_spaces(dom, ran):
@@ -512,6 +512,11 @@ class DiscretizedSpace(TensorSpace):
         """Raw linear combination."""
         self.tspace._lincomb(a, x1.tensor, b, x2.tensor, out.tensor)
 
+    def _lincomb_n(self, coeffs, vectors, out):
+        """Raw linear combination of arbitrarily many elements."""
+        self.tspace._lincomb_n(coeffs, [x.tensor for x in vectors],
+                               out.tensor)
+
     def _multiply(self, x1, x2, out):
         """Raw pointwise multiplication of two elements."""
         self.tspace._multiply(x1.tensor, x2.tensor, out.tensor)
@@ -618,6 +623,13 @@ class DiscretizedSpace(TensorSpace):
                 ):
                     optargs.append(('weighting', self.weighting.const, None))
 
+            optargs.extend([
+                ('storage', getattr(self.tspace, 'storage', 'memory'),
+                 'memory'),
+                ('storage_dir', getattr(self.tspace, 'storage_dir', None),
+                 None)
+            ])
+
             optmod = [''] * len(optargs)
             if self.dtype in (float, complex, int, bool):
                 optmod[2] = '!s'
@@ -1575,8 +1587,12 @@ def uniform_discr_frompartition(partition, dtype=None, impl='numpy', **kwargs):
         else:
             weighting = partition.cell_volume
 
+    # Only pass storage options if given, since they are specific to
+    # `NumpyTensorSpace`
+    tspace_kwargs = {key: kwargs.pop(key) for key in ('storage', 'storage_dir')
+                     if key in kwargs}
     tspace = tspace_type(partition.shape, dtype, exponent=exponent,
-                         weighting=weighting)
+                         weighting=weighting, **tspace_kwargs)
     return DiscretizedSpace(partition, tspace, **kwargs)
 
 
@@ -1665,6 +1681,13 @@ def uniform_discr(min_pt, max_pt, shape, dtype=None, impl='numpy', **kwargs):
         - array-like: Point-wise weighting by an array.
         - `Weighting`: Use weighting class as-is. Compatibility
           with this space's elements is not checked during init.
+    storage : {'memory', 'memmap'}, optional
+        Storage of the element data for ``impl='numpy'``. With
+        ``'memmap'``, elements are backed by temporary files in
+        ``storage_dir``, see `NumpyTensorSpace` for details.
+        Default: ``'memory'``.
+    storage_dir : str, optional
+        Directory for the temporary files of memory-mapped storage.
 
     Returns
     -------
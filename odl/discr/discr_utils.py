@@ -27,17 +27,22 @@ from odl.util import (
     dtype_repr, is_real_dtype, is_string, is_valid_input_array,
     is_valid_input_meshgrid, out_shape_from_array, out_shape_from_meshgrid,
     writable_array)
+from odl.util.parallel import chunk_slices, parallel_map
 
 __all__ = (
     'point_collocation',
     'nearest_interpolator',
     'linear_interpolator',
     'per_axis_interpolator',
+    'InterpolationPlan',
     'sampling_function',
 )
 
 SUPPORTED_INTERP = ['nearest', 'linear']
 
+# Number of points per chunk when interpolating at large point arrays
+_INTERP_CHUNK_SIZE = 2 ** 16
+
 
 def point_collocation(func, points, out=None, **kwargs):
     """Sample a function on a grid of points.
@@ -568,7 +573,9 @@ class _Interpolator(object):
         """
         if self.input_type == 'meshgrid':
             # Given a meshgrid, the evaluation will be on a ragged array.
-            x = np.asarray(x, dtype=object)
+            # A tuple avoids broadcasting of arrays with size 1 in the first
+            # axis when creating an object array.
+            x = tuple(np.asarray(xi) for xi in x)
         else:
             x = np.asarray(x)
 
@@ -602,8 +609,23 @@ class _Interpolator(object):
                                  'dtype {}'
                                  ''.format(out.dtype, self.values.dtype))
 
-        indices, norm_distances = self._find_indices(x)
-        values = self._evaluate(indices, norm_distances, out)
+        if self.input_type == 'array' and x.shape[1] > _INTERP_CHUNK_SIZE:
+            # Evaluate chunks of points in parallel, keeping the
+            # temporary index and weight arrays small
+            if out is None:
+                out = np.empty(out_shape, dtype=self.values.dtype)
+
+            def eval_chunk(chunk):
+                indices, norm_distances = self._find_indices(x[:, chunk])
+                self._evaluate(indices, norm_distances, out[chunk])
+
+            parallel_map(eval_chunk,
+                         chunk_slices(x.shape[1], _INTERP_CHUNK_SIZE))
+            values = out
+        else:
+            indices, norm_distances = self._find_indices(x)
+            values = self._evaluate(indices, norm_distances, out)
+
         if scalar_out:
             return values.item()
         else:
@@ -621,14 +643,9 @@ class _Interpolator(object):
 
         # iterate through dimensions
         for xi, cvec in zip(x, self.coord_vecs):
-            idcs = np.searchsorted(cvec, xi) - 1
-
-            idcs[idcs < 0] = 0
-            idcs[idcs > cvec.size - 2] = cvec.size - 2
+            idcs, ndist = _find_axis_indices(xi, cvec)
             index_vecs.append(idcs)
-
-            norm_distances.append((xi - cvec[idcs]) /
-                                  (cvec[idcs + 1] - cvec[idcs]))
+            norm_distances.append(ndist)
 
         return index_vecs, norm_distances
 
@@ -637,6 +654,62 @@ class _Interpolator(object):
         raise NotImplementedError('abstract method')
 
 
+def _find_axis_indices(xi, cvec):
+    """Return lower neighbor indices and normalized distances along an axis.
+
+    Parameters
+    ----------
+    xi : `numpy.ndarray`
+        Coordinates of the points along the axis.
+    cvec : `numpy.ndarray`
+        Sorted coordinate vector of the grid along the axis.
+
+    Returns
+    -------
+    idcs : `numpy.ndarray`
+        Indices ``i`` of the lower neighbors, clipped to the range
+        ``[0, cvec.size - 2]``.
+    norm_distances : `numpy.ndarray`
+        Distances ``(xi - cvec[i]) / (cvec[i + 1] - cvec[i])``. Values
+        outside of ``[0, 1]`` indicate out-of-bounds points.
+    """
+    if _is_uniform(cvec):
+        # Affine index computation instead of a binary search, followed
+        # by a correction of round-off such that the result is the same
+        t = np.asarray(xi, dtype=float) - cvec[0]
+        t *= (cvec.size - 1) / (cvec[-1] - cvec[0])
+        idcs = np.floor(t).astype(int)
+        np.clip(idcs, 0, cvec.size - 2, out=idcs)
+        idcs -= (xi <= cvec[idcs]) & (idcs > 0)
+        idcs += (xi > cvec[idcs + 1]) & (idcs < cvec.size - 2)
+    else:
+        idcs = np.searchsorted(cvec, xi) - 1
+        idcs[idcs < 0] = 0
+        idcs[idcs > cvec.size - 2] = cvec.size - 2
+
+    norm_distances = (xi - cvec[idcs]) / (cvec[idcs + 1] - cvec[idcs])
+    return idcs, norm_distances
+
+
+def _is_sparse_meshgrid(arrs):
+    """Return ``True`` if each array only varies along its own axis."""
+    return all(np.ndim(a) == len(arrs) and np.size(a) == np.shape(a)[i]
+               for i, a in enumerate(arrs))
+
+
+def _is_uniform(cvec):
+    """Return ``True`` if ``cvec`` has (at least 2) equidistant entries.
+
+    The tolerance is much stricter than for `RectGrid.is_uniform` such
+    that an affine index estimate is off by at most one.
+    """
+    if cvec.size < 2:
+        return False
+    diffs = np.diff(cvec)
+    return bool(diffs[0] > 0 and
+                np.allclose(diffs, diffs[0], rtol=1e-10, atol=0))
+
+
 class _NearestInterpolator(_Interpolator):
 
     """Nearest neighbor interpolator.
@@ -781,6 +854,9 @@ class _PerAxisInterpolator(_Interpolator):
         Modified for in-place evaluation and treatment of out-of-bounds
         points by implicitly assuming 0 at the next node.
         """
+        if self.input_type == 'meshgrid' and _is_sparse_meshgrid(indices):
+            return self._evaluate_separable(indices, norm_distances, out)
+
         # slice for broadcasting over trailing dimensions in self.values
         vslice = (slice(None),) + (None,) * (self.values.ndim - len(indices))
 
@@ -815,6 +891,34 @@ class _PerAxisInterpolator(_Interpolator):
             out += np.asarray(self.values[edge]) * weight[vslice]
         return np.array(out, copy=False, ndmin=1)
 
+    def _evaluate_separable(self, indices, norm_distances, out=None):
+        """Evaluate per-axis interpolation on a sparse meshgrid.
+
+        Since weights and indices only vary along one axis each, the
+        interpolation is applied as a sequence of 1D interpolations along
+        the axes. This needs ``2 * ndim`` instead of ``2 ** ndim``
+        gathers, and the weights are computed per axis, not per point.
+        """
+        low_weights, high_weights, edge_indices = _create_weight_edge_lists(
+            indices, norm_distances, self.interp)
+
+        result = self.values
+        for axis, (w_lo, w_hi, edge) in enumerate(
+                zip(low_weights, high_weights, edge_indices)):
+            # Shape for broadcasting the weights along `axis`
+            wshape = [1] * self.values.ndim
+            wshape[axis] = -1
+            result = (np.take(result, edge[0].ravel(), axis=axis) *
+                      w_lo.reshape(wshape) +
+                      np.take(result, edge[1].ravel(), axis=axis) *
+                      w_hi.reshape(wshape))
+
+        if out is None:
+            out = result.astype(self.values.dtype, copy=False)
+        else:
+            out[:] = result
+        return np.array(out, copy=False, ndmin=1)
+
 
 class _LinearInterpolator(_PerAxisInterpolator):
     """Linear (i.e. bi-/tri-/multi-linear) interpolator.
@@ -840,6 +944,245 @@ class _LinearInterpolator(_PerAxisInterpolator):
         )
 
 
+class InterpolationPlan(object):
+
+    """Precomputed interpolation of grid values at fixed points.
+
+    The plan stores, for each point, the flat indices of the neighboring
+    grid nodes and the corresponding interpolation weights as a sparse
+    matrix. Evaluating the plan for new grid values is then a single
+    sparse matrix-vector product, and the transpose of that matrix gives
+    the exact adjoint of the interpolation.
+
+    Out-of-bounds points are treated as in `per_axis_interpolator`.
+    """
+
+    def __init__(self, coord_vecs, points, interp='linear', dtype=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        coord_vecs : sequence of `numpy.ndarray`
+            Coordinate vectors of the rectangular grid on which
+            interpolation should be based. They must be sorted in
+            ascending order.
+        points : sequence of `array-like`
+            Coordinates of the evaluation points, one array per axis.
+            All arrays must have the same shape, which is the shape of
+            the result of `__call__`. Since the arrays are processed one
+            after the other, ``points`` can also be a generator that
+            creates them lazily.
+        interp : str or sequence of str, optional
+            Interpolation scheme to use. A single value applies to all
+            axes, and a sequence gives the interpolation scheme per axis.
+
+            Supported values: ``'nearest'``, ``'linear'``
+
+        dtype : optional
+            Real floating point data type of the interpolation weights.
+            Default: ``float``
+
+        Examples
+        --------
+        Plan linear interpolation at three points and apply it to
+        different grid values:
+
+        >>> coord_vecs = [np.array([0.0, 1.0, 2.0])]
+        >>> plan = InterpolationPlan(coord_vecs, [[0.5, 1.0, 1.75]])
+        >>> plan([0.0, 2.0, 4.0])
+        array([ 1. ,  2. ,  3.5])
+        >>> plan([1.0, 1.0, 0.0])
+        array([ 1.  ,  1.  ,  0.25])
+
+        The adjoint distributes values back to the grid nodes:
+
+        >>> plan.adjoint([1.0, 1.0, 1.0])
+        array([ 0.5 ,  1.75,  0.75])
+        """
+        import scipy.sparse
+
+        self.__coord_vecs = tuple(np.asarray(c) for c in coord_vecs)
+        ndim = len(self.coord_vecs)
+        self.__interp_byaxis = _normalize_interp(interp, ndim)
+        self.__grid_shape = tuple(c.size for c in self.coord_vecs)
+        dtype = np.dtype(float if dtype is None else dtype)
+        if not is_real_dtype(dtype):
+            raise ValueError('`dtype` {} is not a real data type'
+                             ''.format(dtype_repr(dtype)))
+
+        grid_size = int(np.prod(self.grid_shape, dtype='int64'))
+        if grid_size < np.iinfo('int32').max:
+            idx_dtype = np.dtype('int32')
+        else:
+            idx_dtype = np.dtype('int64')
+        strides = np.cumprod((1,) + self.grid_shape[:0:-1])[::-1]
+
+        # Build flat indices and weights of shape (npoints, nneighbors)
+        # one axis at a time, such that only a single coordinate array is
+        # needed at once
+        shape = None
+        flat_idcs = weights = None
+        num_axes = 0
+        for xi, cvec, stride, s in zip(points, self.coord_vecs, strides,
+                                       self.interp_byaxis):
+            num_axes += 1
+            xi = np.asarray(xi, dtype=float)
+            if shape is None:
+                shape = xi.shape
+            elif xi.shape != shape:
+                raise ValueError(
+                    'points in axis {} have shape {}, expected {}'
+                    ''.format(num_axes - 1, xi.shape, shape))
+
+            idcs, ndist = _find_axis_indices(xi.ravel(), cvec)
+            if s == 'nearest':
+                w_lo, _, edge = _compute_nearest_weights_edge(idcs, ndist)
+                # Exactly one neighbor gets weight 1
+                ax_idcs = np.where(w_lo > 0, edge[0], edge[1])[:, None]
+                ax_weights = None
+            else:
+                w_lo, w_hi, edge = _compute_linear_weights_edge(idcs, ndist)
+                ax_idcs = np.stack(edge, axis=1)
+                ax_weights = np.stack([w_lo, w_hi], axis=1).astype(
+                    dtype, copy=False)
+
+            # Resolve "last node" indices -1 used for out-of-bounds points
+            ax_idcs[ax_idcs < 0] += cvec.size
+            ax_idcs = (ax_idcs * stride).astype(idx_dtype)
+
+            if flat_idcs is None:
+                flat_idcs, weights = ax_idcs, ax_weights
+                continue
+
+            npts = flat_idcs.shape[0]
+            flat_idcs = (flat_idcs[:, :, None] +
+                         ax_idcs[:, None, :]).reshape(npts, -1)
+            if ax_weights is None:
+                if weights is not None:
+                    weights = np.repeat(weights, ax_idcs.shape[1], axis=1)
+            elif weights is None:
+                weights = np.tile(ax_weights, (1, flat_idcs.shape[1] //
+                                               ax_weights.shape[1]))
+            else:
+                weights = (weights[:, :, None] *
+                           ax_weights[:, None, :]).reshape(npts, -1)
+
+        if num_axes != ndim:
+            raise ValueError('got coordinates for {} axes, expected {}'
+                             ''.format(num_axes, ndim))
+
+        npts, nnbrs = flat_idcs.shape
+        if npts * nnbrs >= np.iinfo('int32').max:
+            idx_dtype = np.dtype('int64')
+            flat_idcs = flat_idcs.astype(idx_dtype)
+        if weights is None:
+            weights = np.ones(flat_idcs.shape, dtype=dtype)
+        indptr = np.arange(0, npts * nnbrs + 1, nnbrs, dtype=idx_dtype)
+        self.__shape = shape
+        self.__matrix = scipy.sparse.csr_matrix(
+            (weights.ravel(), flat_idcs.ravel(), indptr),
+            shape=(npts, grid_size), copy=False)
+
+    @property
+    def coord_vecs(self):
+        """Coordinate vectors of the interpolation grid."""
+        return self.__coord_vecs
+
+    @property
+    def grid_shape(self):
+        """Shape of the interpolation grid."""
+        return self.__grid_shape
+
+    @property
+    def interp_byaxis(self):
+        """Tuple of per-axis interpolation schemes."""
+        return self.__interp_byaxis
+
+    @property
+    def shape(self):
+        """Shape of the array of evaluation points."""
+        return self.__shape
+
+    @property
+    def matrix(self):
+        """Interpolation matrix as `scipy.sparse.csr_matrix`.
+
+        It maps the flattened grid values to the flattened values at
+        the evaluation points.
+        """
+        return self.__matrix
+
+    @property
+    def nbytes(self):
+        """Total number of bytes used by the plan."""
+        return (self.matrix.data.nbytes + self.matrix.indices.nbytes +
+                self.matrix.indptr.nbytes)
+
+    def __call__(self, values, out=None):
+        """Interpolate grid values at the points of the plan.
+
+        Parameters
+        ----------
+        values : `array-like`
+            Values on the grid, of shape `grid_shape`.
+        out : `numpy.ndarray`, optional
+            Array of shape `shape` to which the result should be written.
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            Interpolated values. If ``out`` was given, the returned
+            object is a reference to it.
+        """
+        return self._apply(self.matrix, values, self.grid_shape,
+                           self.shape, out)
+
+    def adjoint(self, values, out=None):
+        """Apply the adjoint (transpose) of the interpolation.
+
+        Parameters
+        ----------
+        values : `array-like`
+            Values at the points, of shape `shape`.
+        out : `numpy.ndarray`, optional
+            Array of shape `grid_shape` to which the result should be
+            written.
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            Result on the grid. If ``out`` was given, the returned object
+            is a reference to it.
+        """
+        return self._apply(self.matrix.T, values, self.shape,
+                           self.grid_shape, out)
+
+    @staticmethod
+    def _apply(matrix, values, in_shape, out_shape, out):
+        """Multiply ``values`` with ``matrix``, checking shapes."""
+        values = np.asarray(values)
+        if values.shape != in_shape:
+            raise ValueError('`values` has shape {}, expected {}'
+                             ''.format(values.shape, in_shape))
+
+        result = matrix.dot(values.ravel()).reshape(out_shape)
+        if out is None:
+            return result.astype(
+                np.result_type(values.dtype, matrix.dtype), copy=False)
+
+        if out.shape != out_shape:
+            raise ValueError('`out` has shape {}, expected {}'
+                             ''.format(out.shape, out_shape))
+        out[:] = result
+        return out
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}(<{} points on a {} grid, {} bytes>)'.format(
+            self.__class__.__name__, int(np.prod(self.shape)),
+            'x'.join(str(n) for n in self.grid_shape), self.nbytes)
+
+
 def _check_func_out_arg(func):
     """Check if ``func`` has an (optional) ``out`` argument.
 
@@ -10,6 +10,7 @@
 
 from __future__ import absolute_import
 
+from .compiled import *
 from .default_ops import *
 from .operator import *
 from .oputils import *
@@ -17,6 +18,9 @@ from .pspace_ops import *
 from .tensor_ops import *
 
 __all__ = ()
+# `compile` is not re-exported to avoid shadowing the builtin in star
+# imports, use it as `odl.operator.compile`
+__all__ += tuple(name for name in compiled.__all__ if name != 'compile')
 __all__ += default_ops.__all__
 __all__ += operator.__all__
 __all__ += oputils.__all__
@@ -0,0 +1,576 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Compilation of operator expressions into execution plans.
+
+Operator arithmetic like ``a * A.adjoint * A + b * B`` builds a tree of
+`OperatorSum`, `OperatorComp`, `OperatorLeftScalarMult` etc., whose
+nodes are evaluated one after the other, each with its own temporaries.
+`compile` flattens such a tree into an expression graph, simplifies it
+and turns it into a sequence of steps on preallocated buffers.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+from collections import OrderedDict
+
+from odl.operator.default_ops import (
+    MultiplyOperator, ScalingOperator, ZeroOperator)
+from odl.operator.operator import (
+    Operator, OperatorComp, OperatorLeftScalarMult, OperatorLeftVectorMult,
+    OperatorPointwiseProduct, OperatorRightScalarMult,
+    OperatorRightVectorMult, OperatorSum, OperatorVectorSum)
+from odl.set.sets import ComplexNumbers
+from odl.set.space import LinearSpace, LinearSpaceElement
+from odl.util.scratch import scratch_elements
+
+__all__ = ('CompiledOperator', 'compile')
+
+
+class _Node(object):
+
+    """Node of an expression graph, see `_GraphBuilder`.
+
+    The ``kind`` of a node determines the meaning of ``data``:
+
+    - ``'input'``: the operator argument, no data
+    - ``'const'``: a fixed element ``data``
+    - ``'apply'``: ``data(args[0])`` with an `Operator` ``data``
+    - ``'lincomb'``: ``sum(c * arg for c, arg in zip(data, args))``
+    - ``'pointwise'``: pointwise functions applied to ``args[0]`` in
+      order, given in ``data`` as ``('mul', elements, scalar)`` for the
+      multiplication with fixed elements and a scalar, or as
+      ``('ufunc', name)``
+    - ``'product'``: ``args[0] * args[1]``, no data
+    """
+
+    def __init__(self, uid, kind, space, args=(), data=None):
+        self.uid = uid
+        self.kind = kind
+        self.space = space
+        self.args = tuple(args)
+        self.data = data
+
+
+def _ufunc_name(op):
+    """Return the ufunc name of a pointwise ufunc operator, else ``None``.
+
+    Only operators from `odl.ufunc_ops` with one input and one output
+    in the same space qualify.
+    """
+    from odl.ufunc_ops import ufunc_ops
+
+    cls_name = type(op).__name__
+    if (cls_name.endswith('_op') and
+            getattr(ufunc_ops, cls_name, None) is type(op) and
+            op.domain == op.range):
+        return cls_name[:-len('_op')]
+    else:
+        return None
+
+
+class _GraphBuilder(object):
+
+    """Builder of an expression graph from an operator tree.
+
+    Nodes are hash-consed, i.e., structurally identical subexpressions
+    are represented by the same node and are thus evaluated only once.
+    Scalar factors are collected in ``'lincomb'`` nodes and moved out of
+    linear operators where they commute, such that they end up in a
+    single linear combination wherever possible.
+    """
+
+    def __init__(self, space):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space of the input node.
+        """
+        self.__nodes = {}
+        self.input = self._node(('input',), 'input', space)
+
+    def _node(self, key, kind, space, args=(), data=None):
+        """Return the node for ``key``, creating it if necessary."""
+        node = self.__nodes.get(key, None)
+        if node is None:
+            node = _Node(len(self.__nodes), kind, space, args, data)
+            self.__nodes[key] = node
+        return node
+
+    @staticmethod
+    def _split_scalar(node):
+        """Return ``(c, arg)`` with ``node == c * arg``."""
+        if node.kind == 'lincomb' and len(node.args) == 1:
+            return node.data[0], node.args[0]
+        else:
+            return 1, node
+
+    @staticmethod
+    def _commutes(op, scalar):
+        """Return ``True`` if ``op(scalar * x) == scalar * op(x)``.
+
+        Complex scalars can only be moved out of complex-linear operators,
+        not out of real-linear ones like `RealPart`.
+        """
+        if not op.is_linear:
+            return False
+        elif complex(scalar).imag == 0:
+            return True
+        else:
+            return (op.domain.field == ComplexNumbers() and
+                    op.range.field == ComplexNumbers())
+
+    @staticmethod
+    def _is_zero(node):
+        """Return ``True`` if ``node`` is an empty linear combination."""
+        return node.kind == 'lincomb' and not node.args
+
+    def lincomb(self, terms, space):
+        """Return the node of ``sum(c * node for c, node in terms)``."""
+        merged = OrderedDict()
+        for coeff, node in terms:
+            if node.kind == 'lincomb':
+                sub_terms = zip(node.data, node.args)
+            else:
+                sub_terms = [(1, node)]
+            for sub_coeff, sub_node in sub_terms:
+                merged[sub_node] = (merged.get(sub_node, 0) +
+                                    coeff * sub_coeff)
+
+        terms = sorted(((coeff, node) for node, coeff in merged.items()
+                        if coeff != 0),
+                       key=lambda term: term[1].uid)
+        if len(terms) == 1 and terms[0][0] == 1:
+            return terms[0][1]
+
+        coeffs = tuple(coeff for coeff, _ in terms)
+        args = tuple(node for _, node in terms)
+        return self._node(('lincomb', id(space), coeffs, args), 'lincomb',
+                          space, args, coeffs)
+
+    def scale(self, node, scalar):
+        """Return the node of ``scalar * node``."""
+        return self.lincomb([(scalar, node)], node.space)
+
+    def const(self, vector):
+        """Return the node of the fixed element ``vector``."""
+        return self._node(('const', id(vector)), 'const', vector.space,
+                          data=vector)
+
+    def apply(self, op, arg):
+        """Return the node of ``op(arg)``, treating ``op`` as opaque."""
+        coeff = 1
+        if op.is_linear:
+            if self._is_zero(arg):
+                return self.lincomb([], op.range)
+            scalar, inner = self._split_scalar(arg)
+            if self._commutes(op, scalar):
+                coeff, arg = scalar, inner
+
+        try:
+            hash(op)
+        except TypeError:
+            op_key = id(op)
+        else:
+            op_key = op
+        node = self._node(('apply', op_key, arg), 'apply', op.range, (arg,),
+                          op)
+        return self.scale(node, coeff)
+
+    def multiply(self, arg, vector):
+        """Return the node of ``vector * arg``."""
+        if self._is_zero(arg):
+            return arg
+        coeff, arg = self._split_scalar(arg)
+        node = self._node(('pointwise', arg, 'mul', id(vector)), 'pointwise',
+                          arg.space, (arg,), [('mul', (vector,), 1)])
+        return self.scale(node, coeff)
+
+    def ufunc(self, arg, name):
+        """Return the node of the ufunc ``name`` applied to ``arg``."""
+        return self._node(('pointwise', arg, 'ufunc', name), 'pointwise',
+                          arg.space, (arg,), [('ufunc', name)])
+
+    def product(self, left, right, space):
+        """Return the node of ``left * right``."""
+        if self._is_zero(left) or self._is_zero(right):
+            return self.lincomb([], space)
+        coeff_left, left = self._split_scalar(left)
+        coeff_right, right = self._split_scalar(right)
+        args = tuple(sorted([left, right], key=lambda node: node.uid))
+        node = self._node(('product', id(space), args), 'product', space,
+                          args)
+        return self.scale(node, coeff_left * coeff_right)
+
+    def lower(self, op, arg):
+        """Return the node of ``op(arg)``, descending into ``op``."""
+        if not (isinstance(op.domain, LinearSpace) and
+                isinstance(op.range, LinearSpace)):
+            return self.apply(op, arg)
+
+        if isinstance(op, CompiledOperator):
+            return self.lower(op.operator, arg)
+        elif isinstance(op, OperatorSum):
+            return self.lincomb([(1, self.lower(op.left, arg)),
+                                 (1, self.lower(op.right, arg))],
+                                op.range)
+        elif isinstance(op, OperatorVectorSum):
+            return self.lincomb([(1, self.lower(op.operator, arg)),
+                                 (1, self.const(op.vector))],
+                                op.range)
+        elif isinstance(op, OperatorComp):
+            return self.lower(op.left, self.lower(op.right, arg))
+        elif isinstance(op, OperatorLeftScalarMult):
+            return self.scale(self.lower(op.operator, arg), op.scalar)
+        elif isinstance(op, OperatorRightScalarMult):
+            return self.lower(op.operator, self.scale(arg, op.scalar))
+        elif isinstance(op, ScalingOperator):
+            return self.lincomb([(op.scalar, arg)], op.range)
+        elif isinstance(op, ZeroOperator):
+            return self.lincomb([], op.range)
+        elif isinstance(op, MultiplyOperator) and op.domain == op.range:
+            if isinstance(op.multiplicand, LinearSpaceElement):
+                return self.multiply(arg, op.multiplicand)
+            else:
+                return self.lincomb([(op.multiplicand, arg)], op.range)
+        elif isinstance(op, OperatorLeftVectorMult):
+            return self.multiply(self.lower(op.operator, arg), op.vector)
+        elif isinstance(op, OperatorRightVectorMult):
+            return self.lower(op.operator, self.multiply(arg, op.vector))
+        elif isinstance(op, OperatorPointwiseProduct):
+            return self.product(self.lower(op.left, arg),
+                                self.lower(op.right, arg), op.range)
+
+        name = _ufunc_name(op)
+        if name is not None:
+            return self.ufunc(arg, name)
+        else:
+            return self.apply(op, arg)
+
+
+def _dependencies(root):
+    """Return the nodes needed for ``root`` and their numbers of uses.
+
+    The nodes are sorted topologically, ending with ``root``.
+    """
+    uses = {}
+    seen = set([root])
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for arg in node.args:
+            uses[arg] = uses.get(arg, 0) + 1
+            if arg not in seen:
+                seen.add(arg)
+                stack.append(arg)
+    return sorted(seen, key=lambda node: node.uid), uses
+
+
+def _fuse(nodes, uses):
+    """Fuse chains of pointwise nodes and fold scalars into them.
+
+    Pointwise nodes whose result is only used by another pointwise node
+    are merged into that node, and consecutive multiplications by fixed
+    elements are merged into one function with the product of their
+    scalars. A scalar multiple of a single-use pointwise node ending
+    with a multiplication is folded into that scalar. The elements
+    themselves are kept, such that in-place changes to them take effect.
+    """
+    for node in nodes:
+        if node.kind == 'pointwise':
+            arg = node.args[0]
+            if arg.kind == 'pointwise' and uses[arg] == 1:
+                node.data = arg.data + node.data
+                node.args = arg.args
+        elif node.kind == 'lincomb' and len(node.args) == 1:
+            arg = node.args[0]
+            if (arg.kind == 'pointwise' and uses[arg] == 1 and
+                    arg.data[-1][0] == 'mul'):
+                _, elements, scalar = arg.data[-1]
+                node.kind = 'pointwise'
+                node.data = arg.data[:-1] + [
+                    ('mul', elements, node.data[0] * scalar)]
+                node.args = arg.args
+
+        if node.kind == 'pointwise':
+            funcs = []
+            for func in node.data:
+                if func[0] == 'mul' and funcs and funcs[-1][0] == 'mul':
+                    funcs[-1] = ('mul', funcs[-1][1] + func[1],
+                                 funcs[-1][2] * func[2])
+                else:
+                    funcs.append(func)
+            node.data = funcs
+
+
+def _schedule(root):
+    """Return an execution plan for the expression graph of ``root``.
+
+    Returns
+    -------
+    plan : list
+        Steps ``(kind, dest, srcs, data)``, where ``kind`` and ``data``
+        are as in `_Node` (plus ``'assign'`` for a root that needs no
+        computation), and ``dest`` and ``srcs`` are indices in the list
+        of registers ``[x, out] + consts + buffers``.
+    consts : list
+        Fixed elements used in the plan.
+    buffer_spaces : list
+        Spaces of the buffers for intermediate results. A buffer is
+        reused once its content is not needed anymore, but never as
+        output of a step reading from it.
+    """
+    nodes, _ = _dependencies(root)
+    last_use = {}
+    for i, node in enumerate(nodes):
+        for arg in node.args:
+            last_use[arg] = i
+
+    consts = [node.data for node in nodes if node.kind == 'const']
+    registers = {}
+    buffer_spaces = []
+    idle_buffers = {}
+    plan = []
+    for i, node in enumerate(nodes):
+        if node.kind == 'input':
+            registers[node] = 0
+            continue
+        elif node.kind == 'const':
+            registers[node] = 2 + consts.index(node.data)
+            continue
+
+        if node is root:
+            dest = 1
+        else:
+            idle = idle_buffers.get(id(node.space), [])
+            if idle:
+                dest = idle.pop()
+            else:
+                dest = 2 + len(consts) + len(buffer_spaces)
+                buffer_spaces.append(node.space)
+        plan.append((node.kind, dest, [registers[arg] for arg in node.args],
+                     node.data))
+        registers[node] = dest
+
+        for arg in set(node.args):
+            if last_use[arg] == i and arg.kind not in ('input', 'const'):
+                idle_buffers.setdefault(id(arg.space), []).append(
+                    registers[arg])
+
+    if root.kind in ('input', 'const'):
+        plan.append(('assign', 1, [registers[root]], None))
+
+    return plan, consts, buffer_spaces
+
+
+class CompiledOperator(Operator):
+
+    """Operator evaluating an operator expression with a fixed plan.
+
+    See Also
+    --------
+    compile : Create a compiled operator
+    """
+
+    def __init__(self, operator):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        operator : `Operator`
+            Operator expression to be compiled. Its `Operator.domain` and
+            `Operator.range` must be `LinearSpace` instances.
+        """
+        if not isinstance(operator, Operator):
+            raise TypeError('`operator` {!r} is not an `Operator` instance'
+                            ''.format(operator))
+        if not (isinstance(operator.domain, LinearSpace) and
+                isinstance(operator.range, LinearSpace)):
+            raise TypeError('`operator` {!r} does not map between '
+                            '`LinearSpace` instances'.format(operator))
+
+        super(CompiledOperator, self).__init__(
+            operator.domain, operator.range, linear=operator.is_linear)
+        self.__operator = operator
+
+        builder = _GraphBuilder(operator.domain)
+        root = builder.lower(operator, builder.input)
+        _fuse(*_dependencies(root))
+        self.__plan, self.__consts, self.__buffer_spaces = _schedule(root)
+        self.__buffers = [space.element() for space in self.__buffer_spaces]
+        self.__buffers_lock = threading.Lock()
+        self.__adjoint = None
+        self.__inverse = None
+
+    @property
+    def operator(self):
+        """The compiled operator expression."""
+        return self.__operator
+
+    @property
+    def num_steps(self):
+        """Number of steps of the execution plan."""
+        return len(self.__plan)
+
+    @property
+    def num_buffers(self):
+        """Number of buffers for intermediate results."""
+        return len(self.__buffer_spaces)
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        # The preallocated buffers are used by one call at a time,
+        # concurrent calls borrow their buffers from the scratch pool
+        if self.__buffers_lock.acquire(False):
+            try:
+                self._execute(x, out, self.__buffers)
+            finally:
+                self.__buffers_lock.release()
+        else:
+            with scratch_elements(*self.__buffer_spaces) as buffers:
+                self._execute(x, out, buffers)
+
+    def _execute(self, x, out, buffers):
+        """Run the execution plan with the given buffers."""
+        registers = [x, out] + self.__consts + list(buffers)
+        for kind, dest, srcs, data in self.__plan:
+            result = registers[dest]
+            if kind == 'apply':
+                data.call_unchecked(registers[srcs[0]], out=result)
+            elif kind == 'lincomb':
+                if srcs:
+                    result.space._lincomb_n(
+                        list(data), [registers[i] for i in srcs], result)
+                else:
+                    result.set_zero()
+            elif kind == 'pointwise':
+                src = registers[srcs[0]]
+                for func in data:
+                    if func[0] == 'mul':
+                        _, elements, scalar = func
+                        for element in elements:
+                            result.space._multiply(element, src, result)
+                            src = result
+                        if scalar != 1:
+                            result.space._lincomb(scalar, src, 0, src,
+                                                  result)
+                    else:
+                        getattr(src.ufuncs, func[1])(out=result)
+                    src = result
+            elif kind == 'product':
+                result.space._multiply(registers[srcs[0]],
+                                       registers[srcs[1]], result)
+            elif registers[srcs[0]] is not result:
+                result.assign(registers[srcs[0]])
+
+    @property
+    def adjoint(self):
+        """Compiled adjoint of the operator expression."""
+        if self.__adjoint is None:
+            self.__adjoint = compile(self.operator.adjoint)
+        return self.__adjoint
+
+    @property
+    def inverse(self):
+        """Compiled inverse of the operator expression."""
+        if self.__inverse is None:
+            self.__inverse = compile(self.operator.inverse)
+        return self.__inverse
+
+    def derivative(self, point):
+        """Return the derivative of the operator expression in ``point``.
+
+        For linear expressions, this is the compiled operator itself.
+        """
+        if self.is_linear:
+            return self
+        else:
+            return self.operator.derivative(point)
+
+    def norm(self, estimate=False, **kwargs):
+        """Return the operator norm of the operator expression."""
+        return self.operator.norm(estimate, **kwargs)
+
+    def norm_bound(self):
+        """Return an upper bound for the norm of the operator expression."""
+        return self.operator.norm_bound()
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r})'.format(self.__class__.__name__, self.operator)
+
+    def __str__(self):
+        """Return ``str(self)``."""
+        return 'compile({})'.format(self.operator)
+
+
+def compile(op):
+    """Return a compiled version of an operator expression.
+
+    The operator tree of ``op`` is flattened into an expression graph
+    and evaluated with a fixed plan:
+
+    - Sums and scalar multiples are collected in linear combinations,
+      which are evaluated in a single pass per result; scalars are moved
+      out of linear operators into these combinations.
+    - Identical subexpressions, i.e., the same operator applied to the
+      same intermediate result, are evaluated only once.
+    - Consecutive pointwise operations (`MultiplyOperator`,
+      `ScalingOperator`, vector multiplications and unary operators
+      from `odl.ufunc_ops`) work on a single buffer, with their scalar
+      factors combined up front.
+    - All intermediate buffers are allocated once and reused between
+      steps and calls.
+
+    Operators without known structure are applied as they are, without
+    input checks. The compiled operator refers to the same operators,
+    elements and multiplicands as ``op``, hence in-place changes to them
+    are reflected in its results.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Operator expression to compile. Its `Operator.domain` and
+        `Operator.range` must be `LinearSpace` instances.
+
+    Returns
+    -------
+    compiled : `CompiledOperator`
+        Operator with the same domain, range and linearity as ``op``.
+        Its `Operator.adjoint` and `Operator.inverse` are compiled from
+        the respective operators of ``op``.
+
+    Examples
+    --------
+    >>> A = odl.MatrixOperator(np.diag([1.0, 2.0, 3.0]))
+    >>> op = 2 * (A.adjoint * A) + A
+    >>> compiled = odl.operator.compile(op)
+    >>> x = A.domain.element([1, 1, 1])
+    >>> compiled(x)
+    rn(3).element([  3.,  10.,  21.])
+    >>> compiled.adjoint(x) == op.adjoint(x)
+    True
+
+    The term ``A(x)`` is computed only once, and the scalar factor is
+    merged into the final linear combination:
+
+    >>> compiled.num_steps
+    3
+    """
+    if isinstance(op, CompiledOperator):
+        return op
+    else:
+        return CompiledOperator(op)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
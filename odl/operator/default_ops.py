@@ -330,6 +330,17 @@ class MultiplyOperator(Operator):
         else:
             raise ValueError('can only use `out` with `LinearSpace` range')
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        if self.__range_is_field:
+            super(MultiplyOperator, self)._apply_batch(x_batch, out)
+        elif self.__domain_is_field:
+            mult = np.asarray(self.multiplicand)
+            np.multiply(x_batch.reshape((-1,) + (1,) * mult.ndim), mult,
+                        out=out)
+        else:
+            np.multiply(x_batch, np.asarray(self.multiplicand), out=out)
+
     @property
     def adjoint(self):
         """Adjoint of this operator.
@@ -12,11 +12,16 @@ from __future__ import absolute_import, division, print_function
 
 import inspect
 import sys
+import threading
 from builtins import object
+from contextlib import contextmanager
 from numbers import Integral, Number
 
-from odl.set import Field, LinearSpace, Set
+import numpy as np
+
+from odl.set import ComplexNumbers, Field, LinearSpace, Set
 from odl.set.space import LinearSpaceElement
+from odl.util.scratch import scratch_element
 
 __all__ = (
     'Operator',
@@ -33,9 +38,56 @@ __all__ = (
     'OpDomainError',
     'OpRangeError',
     'OpNotImplementedError',
+    'input_checks',
 )
 
 
+class _InputChecks(threading.local):
+
+    """Per-thread switch for the input checks in `Operator.__call__`."""
+
+    enabled = True
+
+
+_INPUT_CHECKS = _InputChecks()
+
+
+@contextmanager
+def input_checks(enabled):
+    """Context manager to switch input checks of operator calls.
+
+    With ``enabled=False``, all operator calls ``op(x[, out])`` in the
+    current thread behave like `Operator.call_unchecked`, i.e., they skip
+    the membership checks of ``x`` and ``out``. This removes the
+    overhead of these checks for small operators in tight loops, which
+    can dominate the actual computation, in particular when spaces are
+    equal but not identical objects. The solvers in `odl.solvers` use
+    this after checking their inputs once, and enable the checks again
+    for user-provided functions like ``callback``.
+
+    Parameters
+    ----------
+    enabled : bool
+        If ``False``, skip input checks within the context. Nested
+        contexts can enable the checks again.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> op = odl.ScalingOperator(space, 2.0)
+    >>> with input_checks(False):
+    ...     result = op(space.element([1, 2, 3]))
+    >>> result
+    rn(3).element([ 2.,  4.,  6.])
+    """
+    enabled_before = _INPUT_CHECKS.enabled
+    _INPUT_CHECKS.enabled = bool(enabled)
+    try:
+        yield
+    finally:
+        _INPUT_CHECKS.enabled = enabled_before
+
+
 def _default_call_out_of_place(op, x, **kwargs):
     """Default out-of-place evaluation.
 
@@ -82,6 +134,15 @@ def _default_call_in_place(op, x, out, **kwargs):
     out.assign(op.range.element(op._call_out_of_place(x, **kwargs)))
 
 
+def _batch_shape_dtype(space):
+    """Return shape and data type of ``space`` elements as arrays."""
+    if isinstance(space, Field):
+        return (), np.dtype(complex if isinstance(space, ComplexNumbers)
+                            else float)
+    else:
+        return tuple(space.shape), space.dtype
+
+
 def _function_signature(func):
     """Return the signature of a callable as a string.
 
@@ -664,7 +725,11 @@ class Operator(object):
         See Also
         --------
         _call : Implementation of the method
+        call_unchecked : Variant without input checks
         """
+        if not _INPUT_CHECKS.enabled:
+            return self.call_unchecked(x, out, **kwargs)
+
         if x not in self.domain:
             try:
                 x = self.domain.element(x)
@@ -702,6 +767,166 @@ class Operator(object):
                         'the range {!r}'.format(out, self.range))
         return out
 
+    def call_unchecked(self, x, out=None, **kwargs):
+        """Return ``self(x[, out, **kwargs])`` without input checks.
+
+        This is a fast path for evaluations in tight loops, e.g., in
+        iterative solvers. Unlike `__call__`, it does not check whether
+        ``x`` is an element of `domain` and ``out`` an element of
+        `range`, which requires a comparison of spaces. Objects that are
+        not space elements at all, like arrays or lists, are still
+        converted with ``domain.element``, and results of out-of-place
+        evaluation with ``range.element``.
+
+        Parameters
+        ----------
+        x : `domain` element
+            Point in which the operator is evaluated. It must be an
+            element of `domain` or of an equal space, otherwise the
+            behavior is undefined.
+        out : `range` element, optional
+            Element to which the result is written. The same requirements
+            as for ``x`` apply.
+        kwargs :
+            Passed on to the underlying implementation in `_call`.
+
+        Returns
+        -------
+        out : `range` element
+            Result of the operator evaluation. If ``out`` was provided,
+            the returned object is a reference to it.
+
+        See Also
+        --------
+        input_checks : context manager to skip checks in all calls
+
+        Examples
+        --------
+        >>> rn = odl.rn(3)
+        >>> op = odl.ScalingOperator(rn, 2.0)
+        >>> op.call_unchecked(rn.element([1, 2, 3]))
+        rn(3).element([ 2.,  4.,  6.])
+        >>> y = rn.element()
+        >>> result = op.call_unchecked([1, 2, 3], out=y)
+        >>> y
+        rn(3).element([ 2.,  4.,  6.])
+        >>> result is y
+        True
+        """
+        if (not isinstance(x, LinearSpaceElement) and
+                isinstance(self.domain, LinearSpace)):
+            x = self.domain.element(x)
+
+        if out is not None:
+            self._call_in_place(x, out=out, **kwargs)
+            return out
+
+        out = self._call_out_of_place(x, **kwargs)
+        if (isinstance(self.range, LinearSpace) and
+                getattr(out, 'space', None) is not self.range):
+            out = self.range.element(out)
+        return out
+
+    def apply_batch(self, x_batch, out=None):
+        """Apply this operator to a batch of inputs.
+
+        The entries of the batch are stacked along leading axes, i.e.,
+        ``x_batch`` has shape ``batch_shape + domain.shape``, and the
+        result has shape ``batch_shape + range.shape``. For functionals,
+        the result has shape ``batch_shape``. This requires that elements
+        of `domain` and `range` are representable as arrays, e.g., for
+        tensor spaces and power spaces of those.
+
+        Subclasses can provide a vectorized implementation by overriding
+        `Operator._apply_batch`.
+
+        Parameters
+        ----------
+        x_batch : `array-like`
+            Stacked inputs to which the operator is applied.
+        out : `numpy.ndarray`, optional
+            Array to which the result is written.
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            Stacked results of the operator evaluations. If ``out`` was
+            provided, the returned object is a reference to it.
+
+        Examples
+        --------
+        >>> op = odl.ScalingOperator(odl.rn(3), 2.0)
+        >>> op.apply_batch([[1, 2, 3],
+        ...                 [4, 5, 6]])
+        array([[  2.,   4.,   6.],
+               [  8.,  10.,  12.]])
+
+        Functionals map each input to a number:
+
+        >>> func = odl.solvers.L2NormSquared(odl.rn(3))
+        >>> func.apply_batch([[1, 2, 3],
+        ...                   [4, 5, 6]])
+        array([ 14.,  77.])
+        """
+        in_shape, in_dtype = _batch_shape_dtype(self.domain)
+        if self.is_functional:
+            out_shape, out_dtype = (), in_dtype
+        else:
+            out_shape, out_dtype = _batch_shape_dtype(self.range)
+
+        x_batch = np.asarray(x_batch, dtype=in_dtype)
+        batch_ndim = x_batch.ndim - len(in_shape)
+        if batch_ndim < 0 or x_batch.shape[batch_ndim:] != in_shape:
+            raise ValueError('`x_batch` must have shape (*, {}), got {}'
+                             ''.format(str(in_shape).strip('(,)'),
+                                       x_batch.shape))
+        batch_shape = x_batch.shape[:batch_ndim]
+
+        if out is None:
+            out = np.empty(batch_shape + out_shape, dtype=out_dtype)
+        elif out.shape != batch_shape + out_shape:
+            raise ValueError('`out` must have shape {}, got {}'
+                             ''.format(batch_shape + out_shape, out.shape))
+
+        # Implementations work on contiguous arrays with a single batch axis
+        x_flat = np.ascontiguousarray(x_batch).reshape((-1,) + in_shape)
+        if out.dtype == out_dtype and out.flags.c_contiguous:
+            out_flat = out.reshape((-1,) + out_shape)
+        else:
+            out_flat = np.empty((x_flat.shape[0],) + out_shape, out_dtype)
+
+        self._apply_batch(x_flat, out_flat)
+
+        if not np.may_share_memory(out_flat, out):
+            out[:] = out_flat.reshape(out.shape)
+        return out
+
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``.
+
+        The default implementation evaluates the operator in a loop over
+        the batch. The inputs are wrapped as domain elements, without
+        copying if the domain supports it, and one range element is reused
+        as buffer for the results.
+
+        Parameters
+        ----------
+        x_batch : `numpy.ndarray`
+            C-contiguous array of shape ``(N,) + domain.shape`` and
+            data type ``domain.dtype``.
+        out : `numpy.ndarray`
+            C-contiguous array of shape ``(N,) + range.shape`` (or
+            ``(N,)`` for functionals) to which the result is written.
+        """
+        if self.is_functional:
+            for i in range(x_batch.shape[0]):
+                out[i] = self(self.domain.element(x_batch[i]))
+        else:
+            out_tmp = self.range.element()
+            for i in range(x_batch.shape[0]):
+                self(self.domain.element(x_batch[i]), out=out_tmp)
+                out_tmp.asarray(out=out[i])
+
     def norm(self, estimate=False, **kwargs):
         """Return the operator norm of this operator.
 
@@ -726,6 +951,17 @@ class Operator(object):
         -------
         norm : float
 
+        Notes
+        -----
+        The estimate is cached on the operator, and subsequent calls
+        without ``kwargs`` return the cached value. Calls with ``kwargs``
+        always compute a new estimate and replace the cached one.
+
+        The cached value is never refreshed automatically. If the operator
+        is changed in place, e.g., by modifying the ``multiplicand`` of a
+        `MultiplyOperator`, call `clear_norm_cache` to discard the outdated
+        estimate.
+
         Examples
         --------
         Some operators know their own operator norm and do not need an estimate
@@ -741,19 +977,70 @@ class Operator(object):
         >>> spc = odl.uniform_discr(0, 1, 3)
         >>> grad = odl.Gradient(spc)
         >>> opnorm = grad.norm(estimate=True)
+        >>> grad.norm(estimate=True) == opnorm
+        True
         """
         if not estimate:
             raise NotImplementedError('`Operator.norm()` not implemented, use '
                                       '`Operator.norm(estimate=True)` to '
                                       'obtain an estimate.')
-        else:
-            norm = getattr(self, '__norm', None)
-            if norm is not None:
-                return norm
-            else:
-                from odl.operator.oputils import power_method_opnorm
-                self.__norm = power_method_opnorm(self, **kwargs)
-                return self.__norm
+
+        if kwargs or getattr(self, '_Operator__norm', None) is None:
+            from odl.operator.oputils import power_method_opnorm
+            self.__norm = power_method_opnorm(self, **kwargs)
+        return self.__norm
+
+    def clear_norm_cache(self):
+        """Discard the norm estimate cached by `norm`.
+
+        The next call to ``norm(estimate=True)`` computes a new estimate.
+        Cached estimates of other operators, e.g., the parts of a
+        composite operator used by `norm_bound`, are not affected.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr(0, 1, 3)
+        >>> op = odl.MultiplyOperator(space.one())
+        >>> round(op.norm(estimate=True), 3)
+        1.0
+        >>> op.multiplicand[:] = 2
+        >>> round(op.norm(estimate=True), 3)
+        1.0
+        >>> op.clear_norm_cache()
+        >>> round(op.norm(estimate=True), 3)
+        2.0
+        """
+        self.__norm = None
+
+    def norm_bound(self):
+        """Return an upper bound for the operator norm.
+
+        Composite operators like `OperatorComp` or `OperatorSum` combine
+        the bounds of their parts, e.g., ``||A B|| <= ||A|| ||B||``. Exact
+        norms and cached estimates of the parts are thus reused instead of
+        estimating the norm of the composite from scratch.
+
+        For operators without composite structure, this is the exact
+        norm if available, and the (cached) estimate from
+        ``norm(estimate=True)`` otherwise. Since estimates can be slightly
+        too small, the result is only an upper bound up to the accuracy
+        of these estimates.
+
+        Returns
+        -------
+        norm_bound : float
+
+        Examples
+        --------
+        >>> spc = odl.rn(3)
+        >>> op = 2 * odl.IdentityOperator(spc) + odl.ScalingOperator(spc, -3)
+        >>> op.norm_bound()
+        5.0
+        """
+        try:
+            return float(self.norm(estimate=False))
+        except NotImplementedError:
+            return float(self.norm(estimate=True))
 
     def __add__(self, other):
         """Return ``self + other``.
@@ -1159,13 +1446,12 @@ class OperatorSum(Operator):
         if out is None:
             return self.left(x) + self.right(x)
         else:
-            tmp = (self.__tmp_ran if self.__tmp_ran is not None
-                   else self.range.element())
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out += tmp
+            with scratch_element(self.range, self.__tmp_ran) as tmp:
+                # Write to `tmp` first, otherwise aliased `x` and `out` lead
+                # to wrong result
+                self.left(x, out=tmp)
+                self.right(x, out=out)
+                out += tmp
 
     def derivative(self, x):
         """Return the operator derivative at ``x``.
@@ -1210,6 +1496,10 @@ class OperatorSum(Operator):
         return OperatorSum(self.left.adjoint, self.right.adjoint,
                            self.__tmp_dom, self.__tmp_ran)
 
+    def norm_bound(self):
+        """Return ``left.norm_bound() + right.norm_bound()``."""
+        return self.left.norm_bound() + self.right.norm_bound()
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return '{}({!r}, {!r})'.format(self.__class__.__name__,
@@ -1371,10 +1661,13 @@ class OperatorComp(Operator):
         if out is None:
             return self.left(self.right(x))
         else:
-            tmp = (self.__tmp if self.__tmp is not None
-                   else self.right.range.element())
-            self.right(x, out=tmp)
-            return self.left(tmp, out=out)
+            with scratch_element(self.right.range, self.__tmp) as tmp:
+                self.right(x, out=tmp)
+                return self.left(tmp, out=out)
+
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        self.left.apply_batch(self.right.apply_batch(x_batch), out=out)
 
     @property
     def inverse(self):
@@ -1442,6 +1735,10 @@ class OperatorComp(Operator):
         return OperatorComp(self.right.adjoint, self.left.adjoint,
                             self.__tmp)
 
+    def norm_bound(self):
+        """Return ``left.norm_bound() * right.norm_bound()``."""
+        return self.left.norm_bound() * self.right.norm_bound()
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return '{}({!r}, {!r})'.format(self.__class__.__name__,
@@ -1500,12 +1797,12 @@ class OperatorPointwiseProduct(Operator):
         if out is None:
             return self.left(x) * self.right(x)
         else:
-            tmp = self.right.range.element()
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out *= tmp
+            with scratch_element(self.right.range) as tmp:
+                # Write to `tmp` first, otherwise aliased `x` and `out` lead
+                # to wrong result
+                self.left(x, out=tmp)
+                self.right(x, out=out)
+                out *= tmp
 
     def derivative(self, x):
         """Return the derivative at ``x``."""
@@ -1595,6 +1892,11 @@ class OperatorLeftScalarMult(Operator):
             self.operator(x, out=out)
             out *= self.scalar
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        self.operator.apply_batch(x_batch, out=out)
+        out *= self.scalar
+
     @property
     def inverse(self):
         """Inverse of this operator.
@@ -1679,6 +1981,10 @@ class OperatorLeftScalarMult(Operator):
 
         return self.scalar.conjugate() * self.operator.adjoint
 
+    def norm_bound(self):
+        """Return ``abs(scalar) * operator.norm_bound()``."""
+        return abs(self.scalar) * self.operator.norm_bound()
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return '{}({!r}, {!r})'.format(self.__class__.__name__,
@@ -1763,12 +2069,9 @@ class OperatorRightScalarMult(Operator):
         if out is None:
             return self.operator(self.scalar * x)
         else:
-            if self.__tmp is not None:
-                tmp = self.__tmp
-            else:
-                tmp = self.domain.element()
-            tmp.lincomb(self.scalar, x)
-            self.operator(tmp, out=out)
+            with scratch_element(self.domain, self.__tmp) as tmp:
+                tmp.lincomb(self.scalar, x)
+                self.operator(tmp, out=out)
 
     def __mul__(self, other):
         """Implement ``self * other``.
@@ -1860,6 +2163,10 @@ class OperatorRightScalarMult(Operator):
 
         return self.operator.adjoint * self.scalar.conjugate()
 
+    def norm_bound(self):
+        """Return ``abs(scalar) * operator.norm_bound()``."""
+        return abs(self.scalar) * self.operator.norm_bound()
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return '{}({!r}, {!r})'.format(self.__class__.__name__,
@@ -2147,9 +2454,9 @@ class OperatorRightVectorMult(Operator):
         if out is None:
             return self.operator(x * self.vector)
         else:
-            tmp = self.domain.element()
-            x.multiply(self.vector, out=tmp)
-            self.operator(tmp, out=out)
+            with scratch_element(self.domain) as tmp:
+                x.multiply(self.vector, out=tmp)
+                self.operator(tmp, out=out)
 
     @property
     def inverse(self):
@@ -10,6 +10,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import warnings
+
 import numpy as np
 from future.utils import native
 from odl.space import ProductSpace
@@ -20,6 +22,7 @@ from odl.util.testutils import noise_element
 __all__ = (
     'matrix_representation',
     'power_method_opnorm',
+    'lanczos_opnorm',
     'as_scipy_operator',
     'as_scipy_functional',
 )
@@ -263,6 +266,180 @@ def power_method_opnorm(op, xstart=None, maxiter=100, rtol=1e-05, atol=1e-08,
     return opnorm
 
 
+def lanczos_opnorm(op, xstart=None, maxiter=20, rtol=1e-05, atol=1e-08,
+                   num_threads=None, callback=None):
+    r"""Estimate the operator norm with the Lanczos method.
+
+    Compared to `power_method_opnorm`, this method typically needs far
+    fewer operator evaluations for the same accuracy, in particular when
+    the largest singular values are clustered. In exchange, it stores
+    one `Operator.domain` element per iteration.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Linear operator whose norm is to be estimated. If its
+        `Operator.range` does not coincide with its `Operator.domain`,
+        an `Operator.adjoint` must be defined.
+    xstart : ``op.domain`` `element-like`, optional
+        Starting point of the iteration. By default an `Operator.domain`
+        element containing noise is used.
+    maxiter : positive int, optional
+        Maximum number of Lanczos iterations. Each iteration evaluates
+        ``op`` once, and ``op.adjoint`` once if ``op`` is not self-adjoint.
+        A ``RuntimeWarning`` is issued if the tolerance is not reached
+        within ``maxiter`` iterations.
+    rtol : float, optional
+        Relative tolerance parameter, see `power_method_opnorm`.
+    atol : float, optional
+        Absolute tolerance parameter, see `power_method_opnorm`.
+    num_threads : positive int, optional
+        Number of threads used to evaluate the components of a
+        `BroadcastOperator` or `ProductSpaceOperator` in parallel.
+        For ``None``, `odl.util.parallel.get_num_threads` is used.
+    callback : callable, optional
+        Function called with the current Lanczos vector in each iteration.
+
+    Returns
+    -------
+    est_opnorm : float
+        The estimated operator norm of ``op``.
+
+    Examples
+    --------
+    >>> op = odl.MatrixOperator([[3.0, 1.0],
+    ...                          [0.0, 2.0],
+    ...                          [1.0, 0.0]])
+    >>> est = lanczos_opnorm(op)
+    >>> abs(est - np.linalg.norm(op.matrix, 2)) < 1e-6
+    True
+
+    Notes
+    -----
+    The method builds an orthonormal basis :math:`v_1, \dots, v_k` of the
+    Krylov space of :math:`N = A^* A` (or of :math:`A` itself if
+    :math:`A` is self-adjoint) and computes the eigenvalues of the
+    tridiagonal matrix :math:`T_k = V_k^* N V_k`. The largest of them
+    converges to :math:`\|A\|^2` from below, usually much faster than the
+    power iteration. The basis is fully re-orthogonalized in each step
+    for numerical stability.
+    """
+    from odl.util.parallel import parallel_map
+
+    maxiter, maxiter_in = int(maxiter), maxiter
+    if maxiter <= 0:
+        raise ValueError('`maxiter` must be positive, got {}'
+                         ''.format(maxiter_in))
+
+    use_normal = op.adjoint is not op
+
+    if xstart is None:
+        x = noise_element(op.domain)
+    else:
+        x = op.domain.element(xstart).copy()
+
+    x_norm = x.norm()
+    if x_norm == 0:
+        raise ValueError('``xstart`` must be nonzero')
+    x /= x_norm
+
+    def apply_normal(x, out):
+        """Evaluate ``A^* A`` with parallel evaluation of components."""
+        from odl.operator.pspace_ops import (
+            BroadcastOperator, ProductSpaceOperator)
+
+        if isinstance(op, BroadcastOperator):
+            parts = parallel_map(lambda opi: opi.adjoint(opi(x)),
+                                 op.operators, num_threads)
+            out.assign(parts[0])
+            for part in parts[1:]:
+                out += part
+        elif isinstance(op, ProductSpaceOperator):
+            mat = op.ops
+            entries = list(zip(mat.row, mat.col, mat.data))
+
+            def apply_row(i):
+                result = op.range[i].zero()
+                for row, col, opi in entries:
+                    if row == i:
+                        result += opi(x[col])
+                return result
+
+            def apply_adjoint_col(j):
+                result = op.domain[j].zero()
+                for row, col, opi in entries:
+                    if col == j:
+                        result += opi.adjoint(y[row])
+                return result
+
+            y = op.range.element(parallel_map(apply_row, range(mat.shape[0]),
+                                              num_threads))
+            out.assign(op.domain.element(parallel_map(
+                apply_adjoint_col, range(mat.shape[1]), num_threads)))
+        else:
+            op.adjoint(op(x), out=out)
+
+    def calc_opnorm(eigvals):
+        if use_normal:
+            return np.sqrt(max(np.max(eigvals), 0))
+        else:
+            return np.max(np.abs(eigvals))
+
+    basis = [x]
+    alphas = []
+    betas = []
+    opnorm = 0.0
+    w = op.domain.element()
+    for i in range(maxiter):
+        if use_normal:
+            apply_normal(basis[-1], out=w)
+        else:
+            op(basis[-1], out=w)
+
+        if not np.isfinite(w.norm()):
+            raise ValueError('reached nonfinite ``x={}`` after {} iterations'
+                             ''.format(w, i))
+
+        alphas.append(w.inner(basis[-1]).real)
+
+        # Full reorthogonalization, done twice for numerical stability
+        for _ in range(2):
+            for v in basis:
+                w.lincomb(1, w, -w.inner(v), v)
+
+        # Largest eigenvalue of the tridiagonal matrix
+        tridiag = np.diag(alphas)
+        if betas:
+            tridiag += np.diag(betas, 1) + np.diag(betas, -1)
+        opnorm, opnorm_old = calc_opnorm(np.linalg.eigvalsh(tridiag)), opnorm
+
+        if i > 0 and np.isclose(opnorm, opnorm_old, rtol, atol):
+            break
+
+        beta = w.norm()
+        if beta <= np.finfo(float).eps * max(opnorm, 1) ** (1 + use_normal):
+            # Krylov space is invariant, the estimate is exact
+            break
+
+        betas.append(beta)
+        w /= beta
+        basis.append(w)
+        w = op.domain.element()
+
+        if callback is not None:
+            callback(basis[-1])
+    else:
+        warnings.warn('`lanczos_opnorm` did not converge in {} iterations, '
+                      'the estimate {} may be too small; increase `maxiter` '
+                      'for a more accurate result'.format(maxiter, opnorm),
+                      RuntimeWarning)
+
+    if opnorm == 0:
+        raise ValueError('reached ``x=0`` after {} iterations'.format(i))
+
+    return float(opnorm)
+
+
 def as_scipy_operator(op):
     """Wrap ``op`` as a ``scipy.sparse.linalg.LinearOperator``.
 
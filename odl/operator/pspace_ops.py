@@ -16,11 +16,14 @@ from odl.operator.operator import Operator
 from odl.operator.default_ops import ZeroOperator
 from odl.space import ProductSpace
 from odl.util import COOMatrix
+from odl.util.parallel import parallel_map
+from odl.util.scratch import scratch_elements
 
 
 __all__ = ('ProductSpaceOperator',
            'ComponentProjection', 'ComponentProjectionAdjoint',
-           'BroadcastOperator', 'ReductionOperator', 'DiagonalOperator')
+           'BroadcastOperator', 'SubsetOperator', 'ReductionOperator',
+           'DiagonalOperator')
 
 
 class ProductSpaceOperator(Operator):
@@ -82,6 +85,16 @@ class ProductSpaceOperator(Operator):
     .. math::
         [\mathcal{A}(x)]_i = \sum_{j=1}^m \mathcal{A}_{ij}(x_j).
 
+    The component operators are independent of each other and can
+    optionally be evaluated concurrently, see the ``num_threads`` and
+    ``executor`` parameters. Each component then runs in a pool worker,
+    where its own parallelism (e.g., of ray transforms, large linear
+    combinations or stencil operators) is switched off. This is useful
+    for many small components, but not for components that already use
+    all cores themselves. Results in the same row are summed up in the
+    order of the components, hence the result does not depend on the
+    order in which the evaluations finish.
+
     See Also
     --------
     BroadcastOperator : Case when a single argument is used by several ops.
@@ -89,7 +102,8 @@ class ProductSpaceOperator(Operator):
     DiagonalOperator : Case where the 'matrix' is diagonal.
     """
 
-    def __init__(self, operators, domain=None, range=None):
+    def __init__(self, operators, domain=None, range=None, num_threads=None,
+                 executor=None):
         """Initialize a new instance.
 
         Parameters
@@ -104,6 +118,15 @@ class ProductSpaceOperator(Operator):
             Range of the operator. If not provided, it is tried to be
             inferred from the operators. This requires each **row**
             to contain at least one operator.
+        num_threads : positive int, optional
+            Maximum number of component operators evaluated concurrently
+            in ODL's thread pool. For ``None`` or 1, they are evaluated
+            one after the other in the calling thread.
+        executor : `concurrent.futures.Executor`, optional
+            If given, the component operators are evaluated out-of-place
+            in this executor instead of ODL's thread pool. With a
+            ``ProcessPoolExecutor``, the operators and the parts of the
+            input must be picklable.
 
         Examples
         --------
@@ -154,6 +177,18 @@ class ProductSpaceOperator(Operator):
         import scipy.sparse
 
         # Validate input data
+        if num_threads is not None:
+            num_threads, num_threads_in = int(num_threads), num_threads
+            if num_threads != num_threads_in or num_threads < 1:
+                raise ValueError('`num_threads` must be a positive integer '
+                                 'or None, got {!r}'.format(num_threads_in))
+        if executor is not None and not callable(getattr(executor, 'map',
+                                                         None)):
+            raise TypeError('`executor` {!r} is not an `Executor`'
+                            ''.format(executor))
+        self.__num_threads = num_threads
+        self.__executor = executor
+
         if domain is not None:
             if not isinstance(domain, ProductSpace):
                 raise TypeError('`domain` {!r} not a ProductSpace instance'
@@ -298,8 +333,33 @@ class ProductSpaceOperator(Operator):
         """The sparse operator matrix representing this operator."""
         return self.__ops
 
+    @property
+    def num_threads(self):
+        """Maximum number of concurrently evaluated components.
+
+        ``None`` means sequential evaluation unless `executor` is given.
+        """
+        return self.__num_threads
+
+    @property
+    def executor(self):
+        """Executor for the component operators, ``None`` for default."""
+        return self.__executor
+
+    @property
+    def _parallel_kwargs(self):
+        """Keyword arguments for derived operators with the same mode."""
+        return {'num_threads': self.num_threads, 'executor': self.executor}
+
     def _call(self, x, out=None):
         """Call the operators on the parts of ``x``."""
+        num_threads = self.num_threads or 1
+        # Aliased input and output is left to the sequential evaluation
+        # since components could be overwritten before they are read
+        if (len(self.ops.data) > 1 and out is not x and
+                (num_threads > 1 or self.executor is not None)):
+            return self._call_parallel(x, out, num_threads)
+
         # TODO: add optimization in case an operator appears repeatedly in a
         # row
         if out is None:
@@ -323,6 +383,54 @@ class ProductSpaceOperator(Operator):
 
         return out
 
+    def _call_parallel(self, x, out, num_threads):
+        """Evaluate the operators on the parts of ``x`` concurrently."""
+        if out is None:
+            out = self.range.element()
+
+        # The first component of each row is written to `out`, the others
+        # to temporaries that are summed up in a fixed order afterwards
+        blocks = list(zip(self.ops.row, self.ops.col, self.ops.data))
+        row_blocks = {}
+        for k, (i, _, _) in enumerate(blocks):
+            row_blocks.setdefault(i, []).append(k)
+
+        if self.executor is None:
+            extra = [k for ks in row_blocks.values() for k in ks[1:]]
+            with scratch_elements(*[self.range[blocks[k][0]]
+                                    for k in extra]) as tmps:
+                results = dict(zip(extra, tmps))
+                for i, ks in row_blocks.items():
+                    results[ks[0]] = out[i]
+
+                def evaluate(k):
+                    _, j, op = blocks[k]
+                    op(x[j], out=results[k])
+
+                parallel_map(evaluate, range(len(blocks)), num_threads)
+                self._sum_rows(row_blocks, results, out)
+        else:
+            results = list(self.executor.map(
+                _evaluate_component, [op for _, _, op in blocks],
+                [x[j] for _, j, _ in blocks]))
+            self._sum_rows(row_blocks, dict(enumerate(results)), out)
+
+        for i in range(len(self.range)):
+            if i not in row_blocks:
+                out[i].set_zero()
+
+        return out
+
+    def _sum_rows(self, row_blocks, results, out):
+        """Write the row sums of ``results`` to ``out``."""
+        for i, ks in row_blocks.items():
+            if len(ks) == 1:
+                if results[ks[0]] is not out[i]:
+                    out[i].assign(results[ks[0]])
+            else:
+                self.range[i].lincomb_n([1] * len(ks),
+                                        [results[k] for k in ks], out=out[i])
+
     def derivative(self, x):
         """Derivative of the product space operator.
 
@@ -394,7 +502,8 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.row, self.ops.col]
         shape = self.ops.shape
         deriv_matrix = COOMatrix(data, indices, shape)
-        return ProductSpaceOperator(deriv_matrix, self.domain, self.range)
+        return ProductSpaceOperator(deriv_matrix, self.domain, self.range,
+                                    **self._parallel_kwargs)
 
     @property
     def adjoint(self):
@@ -443,7 +552,27 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.col, self.ops.row]  # Swap col/row -> transpose
         shape = (self.ops.shape[1], self.ops.shape[0])
         adj_matrix = COOMatrix(data, indices, shape)
-        return ProductSpaceOperator(adj_matrix, self.range, self.domain)
+        return ProductSpaceOperator(adj_matrix, self.range, self.domain,
+                                    **self._parallel_kwargs)
+
+    def norm_bound(self):
+        """Return an upper bound for the operator norm.
+
+        The bound is the spectral norm of the matrix of the component
+        bounds ``self[i, j].norm_bound()``.
+
+        Examples
+        --------
+        >>> r3 = odl.rn(3)
+        >>> I = odl.IdentityOperator(r3)
+        >>> prod_op = ProductSpaceOperator([[I, 0], [0, 3 * I]])
+        >>> prod_op.norm_bound()
+        3.0
+        """
+        norms = np.zeros(self.ops.shape)
+        for row, col, op in zip(self.ops.row, self.ops.col, self.ops.data):
+            norms[row, col] = op.norm_bound()
+        return float(np.linalg.norm(norms, 2))
 
     def __getitem__(self, index):
         """Get sub-operator by index.
@@ -506,7 +635,7 @@ class ProductSpaceOperator(Operator):
                 if ops[i] is None:
                     ops[i] = ZeroOperator(self.domain[i])
 
-            return ReductionOperator(*ops)
+            return ReductionOperator(*ops, **self._parallel_kwargs)
 
     @property
     def shape(self):
@@ -530,6 +659,11 @@ class ProductSpaceOperator(Operator):
         return '{}({!r})'.format(self.__class__.__name__, aslist)
 
 
+def _evaluate_component(op, x):
+    """Return ``op(x)``, for evaluation in an executor."""
+    return op(x)
+
+
 class ComponentProjection(Operator):
 
     r"""Projection onto the subspace identified by an index.
@@ -743,7 +877,7 @@ class BroadcastOperator(Operator):
     DiagonalOperator : Case where each operator should have its own argument.
     """
 
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance
 
         Parameters
@@ -753,6 +887,15 @@ class BroadcastOperator(Operator):
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
 
+        Other Parameters
+        ----------------
+        num_threads : positive int, optional
+            Maximum number of operators evaluated concurrently, see
+            `ProductSpaceOperator`.
+        executor : `concurrent.futures.Executor`, optional
+            Executor for the evaluation of the operators, see
+            `ProductSpaceOperator`.
+
         Examples
         --------
         Initialize an operator:
@@ -786,7 +929,8 @@ class BroadcastOperator(Operator):
             operators = (operators[0],) * operators[1]
 
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([[op] for op in operators])
+        self.__prod_op = ProductSpaceOperator([[op] for op in operators],
+                                              **kwargs)
         super(BroadcastOperator, self).__init__(
             self.prod_op.domain[0], self.prod_op.range,
             linear=self.prod_op.is_linear)
@@ -858,7 +1002,8 @@ class BroadcastOperator(Operator):
         ])
         """
         return BroadcastOperator(*[op.derivative(x) for op in
-                                   self.operators])
+                                   self.operators],
+                                 **self.prod_op._parallel_kwargs)
 
     @property
     def adjoint(self):
@@ -875,7 +1020,22 @@ class BroadcastOperator(Operator):
         >>> op.adjoint([[1, 2, 3], [2, 3, 4]])
         rn(3).element([  5.,   8.,  11.])
         """
-        return ReductionOperator(*[op.adjoint for op in self.operators])
+        return ReductionOperator(*[op.adjoint for op in self.operators],
+                                 **self.prod_op._parallel_kwargs)
+
+    def norm_bound(self):
+        """Return an upper bound for the operator norm.
+
+        The bound is ``sqrt(sum(op.norm_bound() ** 2 for op in self))``.
+
+        Examples
+        --------
+        >>> I = odl.IdentityOperator(odl.rn(3))
+        >>> BroadcastOperator(3 * I, 4 * I).norm_bound()
+        5.0
+        """
+        return float(np.hypot.reduce([op.norm_bound()
+                                      for op in self.operators]))
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -898,6 +1058,287 @@ class BroadcastOperator(Operator):
             return '{}({})'.format(self.__class__.__name__, op_repr)
 
 
+class SubsetOperator(BroadcastOperator):
+
+    """Broadcast operator made of subsets of a larger operator.
+
+    The sub-operators are meant to be the blocks of one operator, e.g., a
+    `RayTransform` restricted to subsets of the angles. In addition to the
+    functionality of `BroadcastOperator`, this class caches quantities
+    that subset-based solvers need in every run, and defines the order in
+    which the subsets are visited.
+
+    See Also
+    --------
+    odl.solvers.iterative.statistical.osmlem
+    odl.solvers.iterative.iterative.kaczmarz
+    """
+
+    def __init__(self, *operators, **kwargs):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        operator1,...,operatorN : `Operator`
+            The subset operators.
+
+        Other Parameters
+        ----------------
+        sampling : str or callable, optional
+            Order in which the subsets are visited in each epoch:
+
+            - ``'sequential'``: ``0, 1, ..., N - 1``
+            - ``'random'``: New random permutation in each epoch.
+            - ``'herman_meyer'``: Mixed-radix digit reversal of the
+              indices, see [HM1993]. For ``N`` a power of 2, this is the
+              bit-reversal permutation.
+            - ``'golden_angle'``: Subset ``k`` in the order is the free
+              index closest to ``N`` times the fractional part of
+              ``k`` times the golden ratio.
+
+            A callable is called as ``sampling(epoch)`` and must return
+            a permutation of ``range(N)``.
+            Default: ``'sequential'``
+        seed : int, optional
+            Seed for the random number generator used for
+            ``sampling='random'``.
+        indices : sequence of index expressions, optional
+            For each subset, the indices of the range of the full operator
+            that it covers. This is required for `split_data`.
+
+        Examples
+        --------
+        >>> I = odl.IdentityOperator(odl.rn(3))
+        >>> op = SubsetOperator(I, 2 * I, 3 * I, 4 * I,
+        ...                     sampling='herman_meyer')
+        >>> op.epoch_order()
+        [0, 2, 1, 3]
+        >>> [op.sample(k) for k in range(6)]
+        [[0], [2], [1], [3], [0], [2]]
+
+        References
+        ----------
+        [HM1993] Herman, G T, and Meyer, L B. *Algebraic reconstruction
+        techniques can be made computationally efficient*. IEEE
+        Transactions on Medical Imaging, 12 (1993), pp 600--609.
+        """
+        sampling = kwargs.pop('sampling', 'sequential')
+        seed = kwargs.pop('seed', None)
+        indices = kwargs.pop('indices', None)
+        super(SubsetOperator, self).__init__(*operators, **kwargs)
+
+        if callable(sampling):
+            self.__sampling = sampling
+        else:
+            self.__sampling, sampling_in = str(sampling).lower(), sampling
+            if self.__sampling not in _SUBSET_SAMPLINGS:
+                raise ValueError('`sampling` {!r} not understood'
+                                 ''.format(sampling_in))
+
+        if indices is not None and len(indices) != len(self):
+            raise ValueError('need {} `indices`, got {}'
+                             ''.format(len(self), len(indices)))
+        self.__indices = indices
+
+        self.__rng = np.random.RandomState(seed)
+        self.__epoch = None
+        self.__order = None
+        self.__sensitivities = None
+        self.__norms = None
+
+    @classmethod
+    def from_ray_transform(cls, ray_trafo, num_subsets, **kwargs):
+        """Split a ray transform into subsets of interleaved angles.
+
+        Subset ``i`` uses the angles with indices ``i, i + n, ...``, where
+        ``n = num_subsets``. This distributes the angles evenly over the
+        subsets.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform`
+            Operator to be split. The subsets are created with
+            `RayTransform.angle_subset`, i.e., they use the same volume
+            space, range weighting and back-end. With ``'numpy_sparse'``,
+            they project with the rows of the system matrix of
+            ``ray_trafo`` instead of computing matrices of their own.
+        num_subsets : positive int
+            Number of subsets. It must not exceed the number of angles.
+        kwargs :
+            Further keyword arguments passed to the constructor, e.g.
+            ``sampling``.
+
+        Returns
+        -------
+        subset_op : `SubsetOperator`
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry,
+        ...                                   impl='numpy_cpu')
+        >>> subsets = SubsetOperator.from_ray_transform(ray_trafo, 3)
+        >>> [op.range.shape for op in subsets]
+        [(2, 17), (2, 17), (2, 17)]
+        """
+        num_subsets, num_subsets_in = int(num_subsets), num_subsets
+        num_angles = len(ray_trafo.geometry.angles)
+        if num_subsets != num_subsets_in or not 0 < num_subsets <= num_angles:
+            raise ValueError('`num_subsets` must be an integer between 1 '
+                             'and {}, got {}'.format(num_angles,
+                                                     num_subsets_in))
+
+        indices = [slice(i, None, num_subsets) for i in range(num_subsets)]
+        operators = [ray_trafo.angle_subset(idx) for idx in indices]
+        kwargs.setdefault('indices', indices)
+        return cls(*operators, **kwargs)
+
+    @property
+    def sampling(self):
+        """Sampling strategy of the subsets."""
+        return self.__sampling
+
+    @property
+    def indices(self):
+        """Indices of the full range covered by each subset, or ``None``."""
+        return self.__indices
+
+    def epoch_order(self, epoch=0):
+        """Return the order in which the subsets are visited in an epoch.
+
+        Parameters
+        ----------
+        epoch : int, optional
+            Index of the epoch, used for callable `sampling`.
+
+        Returns
+        -------
+        order : list of int
+            Permutation of ``range(len(self))``.
+        """
+        n = len(self)
+        if callable(self.sampling):
+            order = [int(i) for i in self.sampling(epoch)]
+            if sorted(order) != list(range(n)):
+                raise ValueError('`sampling({})` returned {}, which is not a '
+                                 'permutation of range({})'
+                                 ''.format(epoch, order, n))
+            return order
+        elif self.sampling == 'sequential':
+            return list(range(n))
+        elif self.sampling == 'random':
+            return [int(i) for i in self.__rng.permutation(n)]
+        elif self.sampling == 'herman_meyer':
+            return _herman_meyer_order(n)
+        else:
+            return _golden_angle_order(n)
+
+    def sample(self, k):
+        """Return the subset to be used in iteration ``k``.
+
+        This method can be used as ``fun_select`` argument of the
+        stochastic PDHG solvers in ``odl.contrib.solvers.spdhg``.
+
+        Parameters
+        ----------
+        k : nonnegative int
+            Iteration index. A new `epoch_order` is generated whenever
+            ``k`` enters a new epoch.
+
+        Returns
+        -------
+        selected : list of int
+            Single-element list with the index of the subset.
+        """
+        epoch, i = divmod(int(k), len(self))
+        if epoch != self.__epoch:
+            self.__order = self.epoch_order(epoch)
+            self.__epoch = epoch
+        return [self.__order[i]]
+
+    @property
+    def sensitivities(self):
+        """Images ``op.adjoint(op.range.one())`` of all subsets.
+
+        They are computed on first access and cached.
+        """
+        if self.__sensitivities is None:
+            self.__sensitivities = [op.adjoint(op.range.one())
+                                    for op in self.operators]
+        return self.__sensitivities
+
+    @property
+    def subset_norms(self):
+        """Estimated operator norms of all subsets.
+
+        They are computed with ``op.norm(estimate=True)`` on first access
+        and cached.
+        """
+        if self.__norms is None:
+            self.__norms = [op.norm(estimate=True) for op in self.operators]
+        return self.__norms
+
+    def split_data(self, data):
+        """Split data of the full operator into data of the subsets.
+
+        Parameters
+        ----------
+        data : `array-like`
+            Data in the range of the full operator, e.g., a sinogram for
+            the full set of angles.
+
+        Returns
+        -------
+        split_data : `range` element
+            Product space element whose components are the parts of
+            ``data`` covered by the subsets.
+        """
+        if self.indices is None:
+            raise ValueError('`indices` are required for splitting data')
+        data = np.asarray(data)
+        return self.range.element([data[idx] for idx in self.indices])
+
+
+_SUBSET_SAMPLINGS = ('sequential', 'random', 'herman_meyer', 'golden_angle')
+
+
+def _herman_meyer_order(n):
+    """Return the Herman-Meyer permutation of ``range(n)``."""
+    # Prime factors of n in increasing order
+    factors = []
+    rem, p = n, 2
+    while rem > 1:
+        while rem % p == 0:
+            factors.append(p)
+            rem //= p
+        p += 1
+
+    # Mixed-radix digit reversal with respect to the factors
+    order = []
+    for i in range(n):
+        value, q, mult = 0, i, n
+        for p in factors:
+            mult //= p
+            value += (q % p) * mult
+            q //= p
+        order.append(value)
+    return order
+
+
+def _golden_angle_order(n):
+    """Return a golden-ratio based permutation of ``range(n)``."""
+    golden = (np.sqrt(5) - 1) / 2
+    free = list(range(n))
+    order = []
+    for k in range(n):
+        target = (k * golden) % 1 * n
+        # Closest free index in cyclic distance
+        dists = [min(abs(i - target), n - abs(i - target)) for i in free]
+        order.append(free.pop(int(np.argmin(dists))))
+    return order
+
+
 class ReductionOperator(Operator):
     """Reduce argument over set of operators.
 
@@ -914,7 +1355,7 @@ class ReductionOperator(Operator):
     SeparableSum : Corresponding construction for functionals.
     """
 
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance.
 
         Parameters
@@ -924,6 +1365,15 @@ class ReductionOperator(Operator):
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
 
+        Other Parameters
+        ----------------
+        num_threads : positive int, optional
+            Maximum number of operators evaluated concurrently, see
+            `ProductSpaceOperator`.
+        executor : `concurrent.futures.Executor`, optional
+            Executor for the evaluation of the operators, see
+            `ProductSpaceOperator`.
+
         Examples
         --------
         >>> I = odl.IdentityOperator(odl.rn(3))
@@ -963,7 +1413,7 @@ class ReductionOperator(Operator):
             operators = (operators[0],) * operators[1]
 
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([operators])
+        self.__prod_op = ProductSpaceOperator([operators], **kwargs)
 
         super(ReductionOperator, self).__init__(
             self.prod_op.domain, self.prod_op.range[0],
@@ -1044,7 +1494,8 @@ class ReductionOperator(Operator):
         rn(3).element([  9.,  14.,  19.])
         """
         return ReductionOperator(*[op.derivative(xi)
-                                   for op, xi in zip(self.operators, x)])
+                                   for op, xi in zip(self.operators, x)],
+                                 **self.prod_op._parallel_kwargs)
 
     @property
     def adjoint(self):
@@ -1064,7 +1515,22 @@ class ReductionOperator(Operator):
             [ 2.,  4.,  6.]
         ])
         """
-        return BroadcastOperator(*[op.adjoint for op in self.operators])
+        return BroadcastOperator(*[op.adjoint for op in self.operators],
+                                 **self.prod_op._parallel_kwargs)
+
+    def norm_bound(self):
+        """Return an upper bound for the operator norm.
+
+        The bound is ``sqrt(sum(op.norm_bound() ** 2 for op in self))``.
+
+        Examples
+        --------
+        >>> I = odl.IdentityOperator(odl.rn(3))
+        >>> ReductionOperator(3 * I, 4 * I).norm_bound()
+        5.0
+        """
+        return float(np.hypot.reduce([op.norm_bound()
+                                      for op in self.operators]))
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -1214,7 +1680,8 @@ class DiagonalOperator(ProductSpaceOperator):
 
         derivs = [op.derivative(p) for op, p in zip(self.operators, point)]
         return DiagonalOperator(*derivs,
-                                domain=self.domain, range=self.range)
+                                domain=self.domain, range=self.range,
+                                **self._parallel_kwargs)
 
     @property
     def adjoint(self):
@@ -1243,7 +1710,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         adjoints = [op.adjoint for op in self.operators]
         return DiagonalOperator(*adjoints,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                **self._parallel_kwargs)
 
     @property
     def inverse(self):
@@ -1272,7 +1740,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         inverses = [op.inverse for op in self.operators]
         return DiagonalOperator(*inverses,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                **self._parallel_kwargs)
 
     def __repr__(self):
         """Return ``repr(self)``.
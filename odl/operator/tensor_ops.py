@@ -20,6 +20,8 @@ from odl.space import ProductSpace, tensor_space
 from odl.space.base_tensors import TensorSpace
 from odl.space.weighting import ArrayWeighting
 from odl.util import dtype_repr, indent, signature_string, writable_array
+from odl.util.parallel import chunk_slices
+from odl.util.scratch import scratch_element
 
 __all__ = ('PointwiseNorm', 'PointwiseInner', 'PointwiseSum', 'MatrixOperator',
            'SamplingOperator', 'WeightedSumSamplingOperator',
@@ -231,6 +233,26 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
         else:
             self._call_vecfield_p(f, out)
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        # Weights broadcast along the component axis 1
+        weights = self.weights.reshape((-1,) + (1,) * self.domain[0].ndim)
+        abs_batch = np.abs(x_batch)
+        if self.exponent == float('inf'):
+            if self.is_weighted:
+                abs_batch *= weights
+            np.max(abs_batch, axis=1, out=out)
+        elif self.exponent == 1.0:
+            if self.is_weighted:
+                abs_batch *= weights
+            np.sum(abs_batch, axis=1, out=out)
+        else:
+            abs_batch **= self.exponent
+            if self.is_weighted:
+                abs_batch *= weights
+            np.sum(abs_batch, axis=1, out=out)
+            out **= 1 / self.exponent
+
     def _call_vecfield_1(self, vf, out):
         """Implement ``self(vf, out)`` for exponent 1."""
         vf[0].ufuncs.absolute(out=out)
@@ -240,12 +262,12 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
         if len(self.domain) == 1:
             return
 
-        tmp = self.range.element()
-        for fi, wi in zip(vf[1:], self.weights[1:]):
-            fi.ufuncs.absolute(out=tmp)
-            if self.is_weighted:
-                tmp *= wi
-            out += tmp
+        with scratch_element(self.range) as tmp:
+            for fi, wi in zip(vf[1:], self.weights[1:]):
+                fi.ufuncs.absolute(out=tmp)
+                if self.is_weighted:
+                    tmp *= wi
+                out += tmp
 
     def _call_vecfield_inf(self, vf, out):
         """Implement ``self(vf, out)`` for exponent ``inf``."""
@@ -256,12 +278,12 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
         if len(self.domain) == 1:
             return
 
-        tmp = self.range.element()
-        for vfi, wi in zip(vf[1:], self.weights[1:]):
-            vfi.ufuncs.absolute(out=tmp)
-            if self.is_weighted:
-                tmp *= wi
-            out.ufuncs.maximum(tmp, out=out)
+        with scratch_element(self.range) as tmp:
+            for vfi, wi in zip(vf[1:], self.weights[1:]):
+                vfi.ufuncs.absolute(out=tmp)
+                if self.is_weighted:
+                    tmp *= wi
+                out.ufuncs.maximum(tmp, out=out)
 
     def _call_vecfield_p(self, vf, out):
         """Implement ``self(vf, out)`` for exponent 1 < p < ``inf``."""
@@ -272,31 +294,40 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
                 out *= self.weights[0] ** (1 / self.exponent)
             return
 
-        # Initialize out, avoiding one copy
-        self._abs_pow_ufunc(vf[0], out=out, p=self.exponent)
-        if self.is_weighted:
-            out *= self.weights[0]
-
-        tmp = self.range.element()
-        for fi, wi in zip(vf[1:], self.weights[1:]):
-            self._abs_pow_ufunc(fi, out=tmp, p=self.exponent)
-            if self.is_weighted:
-                tmp *= wi
-            out += tmp
-
-        self._abs_pow_ufunc(out, out=out, p=(1 / self.exponent))
+        # Accumulate block by block such that the scratch array stays small
+        # and in cache
+        vf_arrs = [fi.asarray() for fi in vf]
+        with writable_array(out) as out_arr:
+            blocks = _pointwise_blocks(out_arr.shape, out_arr.itemsize)
+            tmp = np.empty_like(out_arr[blocks[0]])
+            for blk in blocks:
+                out_blk = out_arr[blk]
+                tmp_blk = tmp[:len(out_blk)] if out_blk.ndim else tmp
+                self._abs_pow_ufunc(vf_arrs[0][blk], out=out_blk,
+                                    p=self.exponent)
+                if self.is_weighted:
+                    out_blk *= self.weights[0]
+
+                for fi, wi in zip(vf_arrs[1:], self.weights[1:]):
+                    self._abs_pow_ufunc(fi[blk], out=tmp_blk, p=self.exponent)
+                    if self.is_weighted:
+                        tmp_blk *= wi
+                    out_blk += tmp_blk
+
+                self._abs_pow_ufunc(out_blk, out=out_blk,
+                                    p=(1 / self.exponent))
 
     def _abs_pow_ufunc(self, fi, out, p):
         """Compute |F_i(x)|^p point-wise and write to ``out``."""
         # Optimization for very common cases
         if p == 0.5:
-            fi.ufuncs.absolute(out=out)
-            out.ufuncs.sqrt(out=out)
+            np.absolute(fi, out=out)
+            np.sqrt(out, out=out)
         elif p == 2.0 and self.base_space.field == RealNumbers():
-            fi.multiply(fi, out=out)
+            np.multiply(fi, fi, out=out)
         else:
-            fi.ufuncs.absolute(out=out)
-            out.ufuncs.power(p, out=out)
+            np.absolute(fi, out=out)
+            np.power(out, p, out=out)
 
     def derivative(self, vf):
         """Derivative of the point-wise norm operator at ``vf``.
@@ -530,18 +561,18 @@ class PointwiseInner(PointwiseInnerBase):
         if len(self.domain) == 1:
             return
 
-        tmp = self.range.element()
-        for vfi, gi, wi in zip(vf[1:], self.vecfield[1:],
-                               self.weights[1:]):
+        with scratch_element(self.range) as tmp:
+            for vfi, gi, wi in zip(vf[1:], self.vecfield[1:],
+                                   self.weights[1:]):
 
-            if self.domain.field == ComplexNumbers():
-                vfi.multiply(gi.conj(), out=tmp)
-            else:
-                vfi.multiply(gi, out=tmp)
+                if self.domain.field == ComplexNumbers():
+                    vfi.multiply(gi.conj(), out=tmp)
+                else:
+                    vfi.multiply(gi, out=tmp)
 
-            if self.is_weighted:
-                tmp *= wi
-            out += tmp
+                if self.is_weighted:
+                    tmp *= wi
+                out += tmp
 
     @property
     def adjoint(self):
@@ -1629,6 +1660,25 @@ def is_compatible_space(space, base_space):
         return comp_space == base_space
 
 
+# Approximate number of bytes per component that blocked pointwise kernels
+# process at once
+_POINTWISE_BLOCK_BYTES = 2 ** 16
+
+
+def _pointwise_blocks(shape, itemsize):
+    """Return indices along axis 0 that split an array into blocks.
+
+    Pointwise kernels over several components of a vector field can process
+    one block of all components while it is in cache, with block-sized
+    instead of full-size temporaries.
+    """
+    if not shape:
+        return [Ellipsis]
+    row_bytes = itemsize * int(np.prod(shape[1:]))
+    rows = max(1, _POINTWISE_BLOCK_BYTES // max(row_bytes, 1))
+    return chunk_slices(shape[0], rows) or [slice(0, 0)]
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
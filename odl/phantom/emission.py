@@ -10,7 +10,7 @@
 
 from __future__ import absolute_import, division, print_function
 
-from odl.phantom.geometric import ellipsoid_phantom
+from odl.phantom.geometric import _cached_ellipsoid_phantom
 from odl.phantom.phantom_utils import cylinders_from_ellipses
 
 __all__ = ('derenzo_sources',)
@@ -138,9 +138,10 @@ def derenzo_sources(space, min_pt=None, max_pt=None):
         The Derenzo source phantom in the given space.
     """
     if space.ndim == 2:
-        return ellipsoid_phantom(space, _derenzo_sources_2d(), min_pt, max_pt)
+        return _cached_ellipsoid_phantom(
+            space, _derenzo_sources_2d(), min_pt, max_pt)
     if space.ndim == 3:
-        return ellipsoid_phantom(
+        return _cached_ellipsoid_phantom(
             space, cylinders_from_ellipses(_derenzo_sources_2d()),
             min_pt, max_pt)
     else:
@@ -9,10 +9,30 @@
 """Utilities for creating phantoms."""
 
 from __future__ import print_function, division, absolute_import
+
+import threading
+from collections import OrderedDict
+from itertools import product
+
 import numpy as np
 
+from odl.util.parallel import chunk_slices, parallel_map
+
+__all__ = ('cylinders_from_ellipses', 'rasterize_ellipsoids',
+           'ellipsoid_line_integrals', 'cached_phantom',
+           'clear_phantom_cache', 'set_phantom_cache_size')
+
 
-__all__ = ('cylinders_from_ellipses',)
+# Number of grid points per slab in `rasterize_ellipsoids`, bounds the size
+# of temporary arrays
+_RASTER_SLAB_SIZE = 2 ** 20
+
+# Relative enlargement of bounding boxes as safeguard against rounding
+_BBOX_RTOL = 1e-9
+
+_PHANTOM_CACHE = OrderedDict()
+_PHANTOM_CACHE_MAX_BYTES = 2 ** 28
+_PHANTOM_CACHE_LOCK = threading.Lock()
 
 
 def cylinders_from_ellipses(ellipses):
@@ -25,6 +45,424 @@ def cylinders_from_ellipses(ellipses):
     return ellipsoids
 
 
+def _rotation_matrix(angles):
+    """Return the rotation matrix of an ellipse or ellipsoid.
+
+    For a single angle ``theta``, the 2D matrix is returned, for three
+    Euler angles ``(phi, theta, psi)`` the 3D matrix. Rows of the matrix
+    are the principal axes of the ellipsoid.
+    """
+    if len(angles) == 1:
+        theta = angles[0]
+        ctheta = np.cos(theta)
+        stheta = np.sin(theta)
+        return np.array([[ctheta, stheta],
+                         [-stheta, ctheta]])
+
+    phi, theta, psi = angles
+    cphi = np.cos(phi)
+    sphi = np.sin(phi)
+    ctheta = np.cos(theta)
+    stheta = np.sin(theta)
+    cpsi = np.cos(psi)
+    spsi = np.sin(psi)
+    return np.array([[cpsi * cphi - ctheta * sphi * spsi,
+                      cpsi * sphi + ctheta * cphi * spsi,
+                      spsi * stheta],
+                     [-spsi * cphi - ctheta * sphi * cpsi,
+                      -spsi * sphi + ctheta * cphi * cpsi,
+                      cpsi * stheta],
+                     [stheta * sphi,
+                      -stheta * cphi,
+                      ctheta]])
+
+
+class _RasterEllipsoid(object):
+
+    """Precomputed parameters of one ellipsoid for rasterization."""
+
+    def __init__(self, row, ndim, clip_planes=()):
+        """Initialize a new instance from a row of ellipsoid parameters."""
+        row = [float(v) for v in row]
+        if len(row) != {2: 6, 3: 10}[ndim]:
+            raise ValueError('ellipsoid parameters {} have wrong length for '
+                             '{} dimensions'.format(row, ndim))
+        self.value = row[0]
+        half_axes = np.array(row[1:1 + ndim])
+        self.center = np.array(row[1 + ndim:1 + 2 * ndim])
+        angles = row[1 + 2 * ndim:]
+        self.scales = 1 / half_axes ** 2
+        if any(angles):
+            self.mat = _rotation_matrix(angles)
+            # The extent along axis i is the maximum of e_i^T R^T p
+            # over the points p of the axis-aligned ellipsoid
+            self.extent = np.sqrt((self.mat ** 2).T.dot(half_axes ** 2))
+        else:
+            self.mat = None
+            self.extent = half_axes
+        self.clip_planes = [(np.asarray(normal, dtype=float), float(offset))
+                            for normal, offset in clip_planes]
+
+    def index_box(self, coord_vecs, margins):
+        """Return index slices of the grid points in the bounding box."""
+        box = []
+        for vec, c, r, m in zip(coord_vecs, self.center, self.extent,
+                                margins):
+            r = r * (1 + _BBOX_RTOL) + m
+            box.append(slice(np.searchsorted(vec, c - r, 'left'),
+                             np.searchsorted(vec, c + r, 'right')))
+        return box
+
+    def inside(self, coord_vecs):
+        """Return a boolean array that is ``True`` inside the ellipsoid."""
+        ndim = len(coord_vecs)
+        diffs = []
+        for i, (vec, c) in enumerate(zip(coord_vecs, self.center)):
+            shape = [1] * ndim
+            shape[i] = -1
+            diffs.append((vec - c).reshape(shape))
+
+        if self.mat is None:
+            sq_dists = [scale * diff ** 2
+                        for scale, diff in zip(self.scales, diffs)]
+            # Parentheses to get best order for broadcasting
+            if ndim == 2:
+                radius = sq_dists[0] + sq_dists[1]
+            else:
+                radius = sq_dists[0] + (sq_dists[1] + sq_dists[2])
+        else:
+            radius = 0
+            for scale, row in zip(self.scales, self.mat):
+                rotated = row[0] * diffs[0]
+                for r, diff in zip(row[1:], diffs[1:]):
+                    rotated = rotated + r * diff
+                radius = radius + scale * rotated ** 2
+
+        inside = radius <= 1
+        for normal, offset in self.clip_planes:
+            proj = normal[0] * diffs[0]
+            for n, diff in zip(normal[1:], diffs[1:]):
+                proj = proj + n * diff
+            inside &= proj < offset
+        return inside
+
+    def chord(self, origins, directions):
+        """Return the parameter interval of lines inside the ellipsoid.
+
+        The lines are ``origins + t * directions``, given as sequences of
+        coordinate arrays. Lines missing the ellipsoid get an empty
+        interval ``t_min > t_max``.
+        """
+        diffs = [orig - c for orig, c in zip(origins, self.center)]
+        if self.mat is not None:
+            diffs = [sum(r * diff for r, diff in zip(row, diffs))
+                     for row in self.mat]
+            directions = [sum(r * d for r, d in zip(row, directions))
+                          for row in self.mat]
+        # Coefficients of a * t^2 + 2 * b * t + c <= 0
+        a = sum(scale * d ** 2 for scale, d in zip(self.scales, directions))
+        b = sum(scale * d * diff
+                for scale, d, diff in zip(self.scales, directions, diffs))
+        c = sum(scale * diff ** 2
+                for scale, diff in zip(self.scales, diffs)) - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            half_width = np.sqrt(b ** 2 - a * c) / a
+            mid = -b / a
+        # NaN from lines missing the ellipsoid or zero directions
+        half_width, mid = np.broadcast_arrays(half_width, mid)
+        missed = ~(half_width >= 0)
+        half_width = np.where(missed, -np.inf, half_width)
+        mid = np.where(missed, 0, mid)
+        return mid - half_width, mid + half_width
+
+
+def rasterize_ellipsoids(coord_vecs, ellipsoids, clip_planes=None,
+                         supersampling=1, cell_sides=None, out=None,
+                         dtype=float, num_threads=None):
+    """Add up indicator functions of ellipsoids on a rectilinear grid.
+
+    Each ellipsoid is only evaluated in its exact bounding box, computed
+    from the principal axes in rotated coordinates. The grid is processed
+    in slabs along the first axis, which are distributed over the ODL
+    thread pool. Since every slab is written by one thread, the result
+    does not depend on the number of threads.
+
+    Parameters
+    ----------
+    coord_vecs : sequence of `array-like`
+        Increasing coordinate vectors of the grid, 2 or 3 of them.
+    ellipsoids : sequence of sequences
+        Ellipsoid parameters as in `odl.phantom.ellipsoid_phantom`, in
+        the same coordinates as ``coord_vecs``.
+    clip_planes : sequence of sequences, optional
+        For each ellipsoid, a sequence of ``(normal, offset)`` pairs. Only
+        points ``x`` with ``dot(normal, x - center) < offset`` are
+        considered part of the ellipsoid.
+    supersampling : positive int, optional
+        Number of sub-samples per axis and grid cell. For values larger
+        than 1, each cell gets the value times the fraction of its
+        sub-samples inside the ellipsoid, which gives anti-aliased edges.
+    cell_sides : `array-like`, optional
+        Cell sides of the grid, required for ``supersampling > 1``.
+    out : `numpy.ndarray`, optional
+        Array to which the values are added. If not given, a new array
+        filled with zeros is used.
+    dtype : optional
+        Data type of the new array if ``out`` is not given.
+    num_threads : positive int, optional
+        Number of threads to use. For ``None``, the value of
+        `odl.util.parallel.get_num_threads` is used.
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        The rasterized ellipsoids. If ``out`` was given, the returned
+        object is a reference to it.
+
+    Examples
+    --------
+    >>> vec = np.linspace(-1, 1, 5)
+    >>> rasterize_ellipsoids([vec, vec], [[1.0, 0.8, 0.8, 0.0, 0.0, 0.0]])
+    array([[ 0.,  0.,  0.,  0.,  0.],
+           [ 0.,  1.,  1.,  1.,  0.],
+           [ 0.,  1.,  1.,  1.,  0.],
+           [ 0.,  1.,  1.,  1.,  0.],
+           [ 0.,  0.,  0.,  0.,  0.]])
+
+    With supersampling, boundary cells get fractional values:
+
+    >>> rasterize_ellipsoids([vec, vec], [[1.0, 0.8, 0.8, 0.0, 0.0, 0.0]],
+    ...                      supersampling=4, cell_sides=[0.5, 0.5])
+    array([[ 0.    ,  0.    ,  0.    ,  0.    ,  0.    ],
+           [ 0.    ,  0.6875,  1.    ,  0.6875,  0.    ],
+           [ 0.    ,  1.    ,  1.    ,  1.    ,  0.    ],
+           [ 0.    ,  0.6875,  1.    ,  0.6875,  0.    ],
+           [ 0.    ,  0.    ,  0.    ,  0.    ,  0.    ]])
+    """
+    coord_vecs = [np.asarray(vec, dtype=float).ravel() for vec in coord_vecs]
+    ndim = len(coord_vecs)
+    if ndim not in (2, 3):
+        raise ValueError('dimension not 2 or 3, got {}'.format(ndim))
+    shape = tuple(vec.size for vec in coord_vecs)
+
+    supersampling, ss_in = int(supersampling), supersampling
+    if supersampling != ss_in or supersampling < 1:
+        raise ValueError('`supersampling` must be a positive integer, got {}'
+                         ''.format(ss_in))
+    if supersampling > 1:
+        if cell_sides is None:
+            raise ValueError('`cell_sides` required for supersampling')
+        cell_sides = np.broadcast_to(np.asarray(cell_sides, dtype=float),
+                                     (ndim,))
+        # Cells reach half a cell side beyond their grid points
+        margins = cell_sides / 2
+        sub_offsets = ((np.arange(supersampling) + 0.5) / supersampling -
+                       0.5)
+    else:
+        margins = np.zeros(ndim)
+
+    if clip_planes is None:
+        clip_planes = [()] * len(ellipsoids)
+    elif len(clip_planes) != len(ellipsoids):
+        raise ValueError('need one entry of `clip_planes` per ellipsoid, got '
+                         '{} for {} ellipsoids'
+                         ''.format(len(clip_planes), len(ellipsoids)))
+    objects = []
+    for row, clips in zip(ellipsoids, clip_planes):
+        obj = _RasterEllipsoid(row, ndim, clips)
+        box = obj.index_box(coord_vecs, margins)
+        if all(slc.stop > slc.start for slc in box):
+            objects.append((obj, box))
+
+    if out is None:
+        out = np.zeros(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError('`out` must have shape {}, got {}'
+                         ''.format(shape, out.shape))
+
+    def rasterize_slab(slab):
+        """Add all ellipsoids in ``slab`` of the first axis to ``out``."""
+        for obj, box in objects:
+            start = max(box[0].start, slab.start)
+            stop = min(box[0].stop, slab.stop)
+            if start >= stop:
+                continue
+            idx = (slice(start, stop),) + tuple(box[1:])
+            vecs = [vec[slc] for vec, slc in zip(coord_vecs, idx)]
+            out_box = out[idx]
+            if supersampling == 1:
+                np.add(out_box, obj.value, out=out_box,
+                       where=obj.inside(vecs))
+            else:
+                count = np.zeros(out_box.shape, dtype=int)
+                for offsets in product(sub_offsets, repeat=ndim):
+                    count += obj.inside(
+                        [vec + off * side for vec, off, side in
+                         zip(vecs, offsets, cell_sides)])
+                out_box += obj.value * count / supersampling ** ndim
+
+    rows_per_slab = max(1, _RASTER_SLAB_SIZE // max(1, np.prod(shape[1:])))
+    parallel_map(rasterize_slab, chunk_slices(shape[0], rows_per_slab),
+                 num_threads=num_threads)
+    return out
+
+
+def ellipsoid_line_integrals(origins, directions, ellipsoids, t_min=None,
+                             t_max=None, out=None):
+    """Integrate the sum of ellipsoid indicators along lines.
+
+    The lines are parametrized as ``origins + t * directions``, and the
+    integrals are computed with respect to ``t``, i.e., for each line the
+    sum of ``value`` times the length of the parameter interval inside
+    the ellipsoid is returned. The intervals are computed in closed form,
+    such that the cost is proportional to the number of lines times the
+    number of ellipsoids.
+
+    Parameters
+    ----------
+    origins, directions : `array-like`
+        Points on the lines and line directions, with 2 or 3 coordinates
+        in the last axis. The other axes are broadcast against each
+        other.
+    ellipsoids : sequence of sequences
+        Ellipsoid parameters as in `odl.phantom.ellipsoid_phantom`, in
+        the same coordinates as ``origins``.
+    t_min, t_max : `array-like`, optional
+        Bounds for the line parameter, broadcast against the lines.
+        Default: no bounds.
+    out : `numpy.ndarray`, optional
+        Array to which the integrals are added. If not given, a new array
+        filled with zeros is used.
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        The line integrals. If ``out`` was given, the returned object is
+        a reference to it.
+
+    Examples
+    --------
+    Horizontal lines through the unit disk:
+
+    >>> origins = [[-2, 0], [-2, 0.6], [-2, 1.5]]
+    >>> ellipsoid_line_integrals(origins, [1, 0],
+    ...                          [[1.0, 1.0, 1.0, 0.0, 0.0, 0.0]])
+    array([ 2. ,  1.6,  0. ])
+
+    Only count the part with ``t <= 2``:
+
+    >>> ellipsoid_line_integrals(origins, [1, 0],
+    ...                          [[1.0, 1.0, 1.0, 0.0, 0.0, 0.0]],
+    ...                          t_max=2)
+    array([ 1. ,  0.8,  0. ])
+    """
+    origins = np.asarray(origins, dtype=float)
+    directions = np.asarray(directions, dtype=float)
+    ndim = origins.shape[-1]
+    if ndim not in (2, 3) or directions.shape[-1] != ndim:
+        raise ValueError('`origins` and `directions` must have 2 or 3 '
+                         'coordinates in the last axis, got shapes {} and '
+                         '{}'.format(origins.shape, directions.shape))
+    shape = np.broadcast(origins[..., 0], directions[..., 0]).shape
+    t_min = -np.inf if t_min is None else np.asarray(t_min, dtype=float)
+    t_max = np.inf if t_max is None else np.asarray(t_max, dtype=float)
+
+    if out is None:
+        out = np.zeros(shape)
+    elif out.shape != shape:
+        raise ValueError('`out` must have shape {}, got {}'
+                         ''.format(shape, out.shape))
+
+    origins = [origins[..., i] for i in range(ndim)]
+    directions = [directions[..., i] for i in range(ndim)]
+    for row in ellipsoids:
+        obj = _RasterEllipsoid(row, ndim)
+        t_lower, t_upper = obj.chord(origins, directions)
+        length = np.minimum(t_upper, t_max) - np.maximum(t_lower, t_min)
+        out += obj.value * np.maximum(length, 0)
+    return out
+
+
+def cached_phantom(key, create):
+    """Return a phantom array from the cache, creating it if necessary.
+
+    Phantoms are kept in a least-recently-used cache of limited total
+    size, see `set_phantom_cache_size`. Since every result is stored and
+    copied on each hit, this should only be used for fixed phantoms that
+    are likely to be requested again, not for, e.g., random ones.
+
+    Parameters
+    ----------
+    key : hashable
+        Key identifying the phantom, e.g., a tuple of the space and the
+        phantom parameters.
+    create : callable
+        Function without arguments that returns the phantom as
+        `numpy.ndarray`.
+
+    Returns
+    -------
+    phantom : `numpy.ndarray`
+        A new array with the phantom values, which can be modified without
+        affecting the cache.
+
+    Examples
+    --------
+    >>> calls = []
+    >>> def create():
+    ...     calls.append(1)
+    ...     return np.ones(3)
+    >>> cached_phantom(('ones', 3), create)
+    array([ 1.,  1.,  1.])
+    >>> cached_phantom(('ones', 3), create)
+    array([ 1.,  1.,  1.])
+    >>> len(calls)
+    1
+    """
+    with _PHANTOM_CACHE_LOCK:
+        arr = _PHANTOM_CACHE.get(key)
+        if arr is not None:
+            _PHANTOM_CACHE[key] = _PHANTOM_CACHE.pop(key)
+            return arr.copy()
+
+    arr = create()
+    if arr.nbytes <= _PHANTOM_CACHE_MAX_BYTES:
+        with _PHANTOM_CACHE_LOCK:
+            _PHANTOM_CACHE.pop(key, None)
+            _PHANTOM_CACHE[key] = arr
+            _shrink_phantom_cache(_PHANTOM_CACHE_MAX_BYTES)
+        arr = arr.copy()
+    return arr
+
+
+def _shrink_phantom_cache(max_bytes):
+    """Evict least recently used phantoms down to ``max_bytes``."""
+    while sum(arr.nbytes for arr in _PHANTOM_CACHE.values()) > max_bytes:
+        _PHANTOM_CACHE.popitem(last=False)
+
+
+def clear_phantom_cache():
+    """Remove all phantoms from the cache."""
+    with _PHANTOM_CACHE_LOCK:
+        _PHANTOM_CACHE.clear()
+
+
+def set_phantom_cache_size(max_bytes):
+    """Set the maximum total size in bytes of cached phantoms.
+
+    Phantoms larger than this are never cached. A size of 0 disables
+    caching.
+    """
+    global _PHANTOM_CACHE_MAX_BYTES
+    max_bytes, max_bytes_in = int(max_bytes), max_bytes
+    if max_bytes != max_bytes_in or max_bytes < 0:
+        raise ValueError('`max_bytes` must be a nonnegative integer, got {}'
+                         ''.format(max_bytes_in))
+    with _PHANTOM_CACHE_LOCK:
+        _PHANTOM_CACHE_MAX_BYTES = max_bytes
+        _shrink_phantom_cache(max_bytes)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -13,9 +13,12 @@ from __future__ import absolute_import, division, print_function
 import numpy as np
 
 from odl.discr import DiscretizedSpace
-from odl.phantom.geometric import ellipsoid_phantom
+from odl.phantom.geometric import (
+    _cached_ellipsoid_phantom, ellipsoid_projection)
+from odl.phantom.phantom_utils import cached_phantom, rasterize_ellipsoids
 
-__all__ = ('shepp_logan_ellipsoids', 'shepp_logan', 'forbild')
+__all__ = ('shepp_logan_ellipsoids', 'shepp_logan', 'shepp_logan_projection',
+           'forbild')
 
 
 def _shepp_logan_ellipse_2d():
@@ -151,7 +154,51 @@ def shepp_logan(space, modified=False, min_pt=None, max_pt=None):
     .. _Shepp-Logan phantom: https://en.wikipedia.org/wiki/Shepp-Logan_phantom
     """
     ellipsoids = shepp_logan_ellipsoids(space.ndim, modified)
-    return ellipsoid_phantom(space, ellipsoids, min_pt, max_pt)
+    return _cached_ellipsoid_phantom(space, ellipsoids, min_pt, max_pt)
+
+
+def shepp_logan_projection(space, geometry, modified=False,
+                           proj_space=None):
+    """Exact projections of the Shepp-Logan phantom.
+
+    The line integrals are computed analytically for all rays of
+    ``geometry``, see `odl.phantom.geometric.ellipsoid_projection`.
+
+    Parameters
+    ----------
+    space : `DiscretizedSpace`
+        Reconstruction space, must be 2- or 3-dimensional. The phantom is
+        placed in it as in `shepp_logan`.
+    geometry : `Geometry`
+        Parallel beam or divergent beam geometry of the same dimension
+        as ``space``.
+    modified : `bool`, optional
+        True if the modified Shepp-Logan phantom should be used.
+    proj_space : `DiscretizedSpace`, optional
+        Space of the projection data, e.g., ``RayTransform.range``.
+        Default: ``uniform_discr_frompartition(geometry.partition)``.
+
+    Returns
+    -------
+    proj : ``proj_space`` element
+        Line integrals of the phantom.
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr([-20, -20], [20, 20], [128, 128])
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=90)
+    >>> sinogram = shepp_logan_projection(space, geometry, modified=True)
+    >>> sinogram.shape
+    (90, 183)
+
+    See Also
+    --------
+    shepp_logan : Discretized phantom
+    odl.phantom.geometric.ellipsoid_projection :
+        Projections of arbitrary ellipsoid phantoms
+    """
+    ellipsoids = shepp_logan_ellipsoids(space.ndim, modified)
+    return ellipsoid_projection(space, geometry, ellipsoids, proj_space)
 
 
 def _analytical_forbild_phantom(resolution, ear):
@@ -315,10 +362,6 @@ def forbild(space, resolution=False, ear=True, value_type='density',
     .. _FORBILD phantom: www.imp.uni-erlangen.de/phantoms/head/head.html
     .. _algorithm: https://www.ncbi.nlm.nih.gov/pmc/articles/PMC3426508/
     """
-    def transposeravel(arr):
-        """Implement MATLAB's ``transpose(arr(:))``."""
-        return arr.T.ravel()
-
     if not isinstance(space, DiscretizedSpace):
         raise TypeError('`space` must be a `DiscretizedSpace`')
     if space.ndim != 2:
@@ -326,13 +369,26 @@ def forbild(space, resolution=False, ear=True, value_type='density',
 
     scale, scale_in = str(scale).lower(), scale
     value_type, value_type_in = str(value_type).lower(), value_type
+    if scale not in ('auto', 'cm', 'm', 'mm'):
+        raise ValueError('unknown `scale` {}'.format(scale_in))
+    if value_type not in ('density', 'materials'):
+        raise ValueError('unknown `value_type` {}'.format(value_type_in))
 
+    key = ('forbild', space, bool(resolution), bool(ear), value_type, scale)
+    phantom = cached_phantom(
+        key, lambda: _forbild_array(space, resolution, ear, value_type,
+                                    scale))
+    return space.element(phantom)
+
+
+def _forbild_array(space, resolution, ear, value_type, scale):
+    """Return the values of `forbild` as array."""
     # Create analytic description of phantom
     phantomE, phantomC = _analytical_forbild_phantom(resolution, ear)
 
     # Rescale points to the default grid.
     # The forbild phantom is defined on [-12.8, 12.8] x [-12.8, 12.8]
-    xcoord, ycoord = space.points().T
+    xcoord, ycoord = space.grid.coord_vectors
     if scale == 'auto':
         xcoord = ((xcoord - space.min_pt[0]) /
                   (space.max_pt[0] - space.min_pt[0]))
@@ -343,40 +399,30 @@ def forbild(space, resolution=False, ear=True, value_type='density',
     elif scale == 'cm':
         pass  # dimensions already correct.
     elif scale == 'm':
-        xcoord *= 100.0
-        ycoord *= 100.0
+        xcoord = xcoord * 100.0
+        ycoord = ycoord * 100.0
     elif scale == 'mm':
-        xcoord /= 10.0
-        ycoord /= 10.0
-    else:
-        raise ValueError('unknown `scale` {}'.format(scale_in))
+        xcoord = xcoord / 10.0
+        ycoord = ycoord / 10.0
 
-    # Compute the phantom values in each voxel
-    image = np.zeros(space.size)
+    # Convert to the parametrization of `ellipsoid_phantom`, with the
+    # clipping surfaces as half-planes relative to the ellipse centers
+    ellipses = []
+    clip_planes = []
     nclipinfo = 0
-    for k in range(phantomE.shape[0]):
-        # Handle elliptic bounds
-        Vx0 = np.array([transposeravel(xcoord) - phantomE[k, 0],
-                        transposeravel(ycoord) - phantomE[k, 1]])
-        D = np.array([[1 / phantomE[k, 2], 0],
-                      [0, 1 / phantomE[k, 3]]])
-        phi = np.deg2rad(phantomE[k, 4])
-        Q = np.array([[np.cos(phi), np.sin(phi)],
-                      [-np.sin(phi), np.cos(phi)]])
-        f = phantomE[k, 5]
-        nclip = int(phantomE[k, 6])
-        equation1 = np.sum(D.dot(Q).dot(Vx0) ** 2, axis=0)
-        i = (equation1 <= 1.0)
-
-        # Handle clipping surfaces
-        for _ in range(nclip):  # note: nclib can be 0
+    for x0, y0, a, b, phi, f, nclip in phantomE:
+        ellipses.append([f, a, b, x0, y0, np.deg2rad(phi)])
+        clips = []
+        for _ in range(int(nclip)):  # note: nclip can be 0
             d = phantomC[0, nclipinfo]
             psi = np.deg2rad(phantomC[1, nclipinfo])
-            equation2 = np.array([np.cos(psi), np.sin(psi)]).dot(Vx0)
-            i &= (equation2 < d)
+            clips.append(([np.cos(psi), np.sin(psi)], d))
             nclipinfo += 1
+        clip_planes.append(clips)
 
-        image[i] += f
+    # Compute the phantom values in each voxel
+    image = rasterize_ellipsoids([xcoord, ycoord], ellipses,
+                                 clip_planes=clip_planes).ravel()
 
     if value_type == 'materials':
         materials = np.zeros(space.size, dtype=space.dtype)
@@ -395,11 +441,9 @@ def forbild(space, resolution=False, ear=True, value_type='density',
         # Bone
         materials[image > 1.75] = 7
 
-        return space.element(materials.reshape(space.shape))
-    elif value_type == 'density':
-        return space.element(image.reshape(space.shape))
+        return materials.reshape(space.shape)
     else:
-        raise ValueError('unknown `value_type` {}'.format(value_type_in))
+        return image.reshape(space.shape)
 
 
 if __name__ == '__main__':
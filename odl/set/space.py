@@ -89,6 +89,33 @@ class LinearSpace(Set):
         """
         raise NotImplementedError('abstract method')
 
+    def _lincomb_n(self, coeffs, vectors, out):
+        """Implement ``out[:] = sum(a * x for a, x in zip(coeffs, vectors))``.
+
+        The default implementation reduces the linear combination to
+        successive calls of `_lincomb`. Subclasses can override this
+        method to evaluate all terms in a single pass.
+
+        This method is intended to be private. Public callers should
+        resort to `lincomb_n` which is type-checked.
+        """
+        coeffs, vectors = _merge_lincomb_terms(coeffs, vectors)
+        # A term that is aliased with `out` must be consumed first since
+        # `out` is overwritten afterwards
+        for i, x in enumerate(vectors):
+            if x is out:
+                coeffs.insert(0, coeffs.pop(i))
+                vectors.insert(0, vectors.pop(i))
+                break
+
+        if len(vectors) == 1:
+            self._lincomb(coeffs[0], vectors[0], 0, vectors[0], out)
+            return
+
+        self._lincomb(coeffs[0], vectors[0], coeffs[1], vectors[1], out)
+        for a, x in zip(coeffs[2:], vectors[2:]):
+            self._lincomb(1, out, a, x, out)
+
     def _dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -225,6 +252,77 @@ class LinearSpace(Set):
 
         return out
 
+    def lincomb_n(self, coeffs, vectors, out=None):
+        """Implement ``out[:] = sum(a * x for a, x in zip(coeffs, vectors))``.
+
+        In contrast to chained calls of `lincomb`, spaces can implement
+        this method such that all terms are combined in a single pass
+        over the data and without temporary elements.
+
+        Parameters
+        ----------
+        coeffs : sequence of `field` elements
+            Scalars to multiply the ``vectors`` with.
+        vectors : sequence of `LinearSpaceElement`
+            Space elements in the linear combination. It must be
+            nonempty and have the same length as ``coeffs``.
+        out : `LinearSpaceElement`, optional
+            Element to which the result is written.
+
+        Returns
+        -------
+        out : `LinearSpaceElement`
+            Result of the linear combination. If ``out`` was provided,
+            the returned object is a reference to it.
+
+        Notes
+        -----
+        The element ``out`` may be aligned with any of the ``vectors``,
+        and the same element may appear several times in ``vectors``.
+        Thus, a call
+
+            ``space.lincomb_n([1, theta, -theta], [x, x, x_old], out=x)``
+
+        is (mathematically) equivalent to
+
+            ``x = x + theta * (x - x_old)``.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([1, 2, 3])
+        >>> y = space.element([0, 1, 0])
+        >>> z = space.element([1, 1, 1])
+        >>> space.lincomb_n([1, 2, -1], [x, y, z])
+        rn(3).element([ 0.,  3.,  2.])
+        """
+        coeffs = list(coeffs)
+        vectors = list(vectors)
+        if len(coeffs) != len(vectors):
+            raise ValueError('`coeffs` and `vectors` must have the same '
+                             'length, got {} != {}'
+                             ''.format(len(coeffs), len(vectors)))
+        if not vectors:
+            raise ValueError('`vectors` cannot be empty')
+
+        if out is None:
+            out = self.element()
+        elif out not in self:
+            raise LinearSpaceTypeError('`out` {!r} is not an element of {!r}'
+                                       ''.format(out, self))
+        for i, (a, x) in enumerate(zip(coeffs, vectors)):
+            if self.field is not None and a not in self.field:
+                raise LinearSpaceTypeError('`coeffs[{}]` {!r} not an element '
+                                           'of the field {!r} of {!r}'
+                                           ''.format(i, a, self.field, self))
+            if x not in self:
+                raise LinearSpaceTypeError('`vectors[{}]` {!r} is not an '
+                                           'element of {!r}'
+                                           ''.format(i, x, self))
+
+        self._lincomb_n(coeffs, vectors, out)
+        return out
+
     def dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -1051,6 +1149,33 @@ class UniversalSpace(LinearSpace):
         return isinstance(other, LinearSpaceElement)
 
 
+def _merge_lincomb_terms(coeffs, vectors):
+    """Return coefficients and vectors with identical vectors merged.
+
+    Vectors are compared by identity, and the order of first occurrence
+    is preserved.
+
+    Examples
+    --------
+    >>> x, y = object(), object()
+    >>> coeffs, vectors = _merge_lincomb_terms([1, 2, 3], [x, y, x])
+    >>> coeffs
+    [4, 2]
+    >>> vectors[0] is x and vectors[1] is y
+    True
+    """
+    merged_coeffs, merged_vectors = [], []
+    for a, x in zip(coeffs, vectors):
+        for i, y in enumerate(merged_vectors):
+            if y is x:
+                merged_coeffs[i] += a
+                break
+        else:
+            merged_coeffs.append(a)
+            merged_vectors.append(x)
+    return merged_coeffs, merged_vectors
+
+
 class LinearSpaceTypeError(TypeError):
     """Exception for type errors in `LinearSpace`'s.
 
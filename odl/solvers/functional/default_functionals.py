@@ -26,6 +26,7 @@ from odl.solvers.nonsmooth.proximal_operators import (
     proximal_convex_conj_l1_l2, proximal_convex_conj_l2,
     proximal_convex_conj_linfty, proximal_huber, proximal_l1, proximal_l1_l2,
     proximal_l2, proximal_l2_squared, proximal_linfty)
+from odl.set import RealNumbers
 from odl.space import ProductSpace
 from odl.util import conj_exponent
 
@@ -339,12 +340,21 @@ class IndicatorGroupL1UnitBall(Functional):
 
     """The convex conjugate to the mixed L1--Lp norm on `ProductSpace`.
 
+    This is the indicator function of the set of vector fields whose
+    pointwise norm is bounded by ``radius``, by default 1.
+
+    Scaling the functional or its argument by a positive scalar gives again
+    an indicator of this type, hence ``(lam * GroupL1Norm(vfspace))
+    .convex_conj`` is an `IndicatorGroupL1UnitBall` with ``radius=lam``.
+    Its proximal is a single fused projection, see
+    `proximal_convex_conj_l1_l2`.
+
     See Also
     --------
     GroupL1Norm
     """
 
-    def __init__(self, vfspace, exponent=None):
+    def __init__(self, vfspace, exponent=None, radius=1):
         """Initialize a new instance.
 
         Parameters
@@ -358,6 +368,8 @@ class IndicatorGroupL1UnitBall(Functional):
             0 and 1 are currently not supported due to numerical
             instability. Infinity gives the supremum norm.
             Default: ``vfspace.exponent``, usually 2.
+        radius : positive float, optional
+            Bound for the pointwise norm.
 
         Examples
         --------
@@ -372,6 +384,12 @@ class IndicatorGroupL1UnitBall(Functional):
         Set exponent of inner (p) norm:
 
         >>> op2 = IndicatorGroupL1UnitBall(pspace, exponent=1)
+
+        Scaling the argument changes the radius:
+
+        >>> op * 0.2
+        IndicatorGroupL1UnitBall(ProductSpace(rn(2), 2), exponent=2.0, \
+radius=5.0)
         """
         if not isinstance(vfspace, ProductSpace):
             raise TypeError('`space` must be a `ProductSpace`')
@@ -381,16 +399,44 @@ class IndicatorGroupL1UnitBall(Functional):
         super(IndicatorGroupL1UnitBall, self).__init__(
             space=vfspace, linear=False, grad_lipschitz=np.nan)
         self.pointwise_norm = PointwiseNorm(vfspace, exponent)
+        self.radius = float(radius)
+        if not self.radius > 0:
+            raise ValueError('`radius` must be positive, got {}'
+                             ''.format(radius))
 
     def _call(self, x):
         """Return ``self(x)``."""
         x_norm = self.pointwise_norm(x).ufuncs.max()
 
-        if x_norm > 1:
+        if x_norm > self.radius:
             return np.inf
         else:
             return 0
 
+    def __mul__(self, other):
+        """Return ``self * other``.
+
+        For a nonzero real scalar, this is the indicator of the ball with
+        radius ``self.radius / abs(other)``.
+        """
+        if other in RealNumbers() and other != 0:
+            return IndicatorGroupL1UnitBall(
+                self.domain, self.pointwise_norm.exponent,
+                radius=self.radius / abs(other))
+        else:
+            return super(IndicatorGroupL1UnitBall, self).__mul__(other)
+
+    def __rmul__(self, other):
+        """Return ``other * self``.
+
+        For a positive scalar, this is ``self`` since the functional only
+        takes the values 0 and infinity.
+        """
+        if other in RealNumbers() and other > 0:
+            return self
+        else:
+            return super(IndicatorGroupL1UnitBall, self).__rmul__(other)
+
     @property
     def proximal(self):
         """Return the `proximal factory` of the functional.
@@ -401,9 +447,10 @@ class IndicatorGroupL1UnitBall(Functional):
             `proximal factory` for the L1-norms convex conjugate.
         """
         if self.pointwise_norm.exponent == np.inf:
-            return proximal_convex_conj_l1(space=self.domain)
+            return proximal_convex_conj_l1(space=self.domain, lam=self.radius)
         elif self.pointwise_norm.exponent == 2:
-            return proximal_convex_conj_l1_l2(space=self.domain)
+            return proximal_convex_conj_l1_l2(space=self.domain,
+                                              lam=self.radius)
         else:
             raise NotImplementedError('`proximal` only implemented for p = 1 '
                                       'or 2')
@@ -415,16 +462,26 @@ class IndicatorGroupL1UnitBall(Functional):
         Returns
         -------
         convex_conj : GroupL1Norm
-            The convex conjugate is the the group L1-norm.
+            The convex conjugate is the the group L1-norm, scaled by
+            `radius`.
         """
         conj_exp = conj_exponent(self.pointwise_norm.exponent)
-        return GroupL1Norm(self.domain, exponent=conj_exp)
+        conj = GroupL1Norm(self.domain, exponent=conj_exp)
+        if self.radius == 1:
+            return conj
+        else:
+            return self.radius * conj
 
     def __repr__(self):
         """Return ``repr(self)``."""
-        return '{}({!r}, exponent={})'.format(self.__class__.__name__,
-                                              self.domain,
-                                              self.pointwise_norm.exponent)
+        if self.radius == 1:
+            return '{}({!r}, exponent={})'.format(
+                self.__class__.__name__, self.domain,
+                self.pointwise_norm.exponent)
+        else:
+            return '{}({!r}, exponent={}, radius={})'.format(
+                self.__class__.__name__, self.domain,
+                self.pointwise_norm.exponent, self.radius)
 
 
 class IndicatorLpUnitBall(Functional):
@@ -9,6 +9,11 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import print_function, division, absolute_import
+
+import threading
+from collections import OrderedDict
+from numbers import Real
+
 import numpy as np
 
 from odl.operator.operator import (
@@ -26,7 +31,96 @@ __all__ = ('Functional', 'FunctionalLeftScalarMult',
            'FunctionalRightVectorMult', 'FunctionalSum', 'FunctionalScalarSum',
            'FunctionalTranslation', 'InfimalConvolution',
            'FunctionalQuadraticPerturb', 'FunctionalProduct',
-           'FunctionalQuotient', 'BregmanDistance', 'simple_functional')
+           'FunctionalQuotient', 'BregmanDistance', 'simple_functional',
+           'set_proximal_cache_size')
+
+
+# Maximum number of proximal operators cached per functional, see
+# `set_proximal_cache_size`
+_PROXIMAL_CACHE_SIZE = 8
+_PROXIMAL_CACHE_LOCK = threading.Lock()
+
+
+def set_proximal_cache_size(size):
+    """Set the number of proximal operators cached per functional.
+
+    The `proximal factory` of a functional stores the operators it
+    creates for scalar step sizes, such that solvers calling it with the
+    same step size in every iteration construct each proximal operator
+    only once. Setting an attribute of a functional invalidates its
+    cache.
+
+    Parameters
+    ----------
+    size : nonnegative int
+        Maximum number of step sizes per functional whose proximal
+        operators are kept. The least recently used operator is dropped
+        first. With ``size=0``, proximal operators are not cached.
+
+    Examples
+    --------
+    >>> l1 = odl.solvers.L1Norm(odl.rn(3))
+    >>> l1.proximal(0.5) is l1.proximal(0.5)
+    True
+    >>> set_proximal_cache_size(0)
+    >>> l1.proximal(0.5) is l1.proximal(0.5)
+    False
+    >>> set_proximal_cache_size(8)
+    """
+    global _PROXIMAL_CACHE_SIZE
+    size, size_in = int(size), size
+    if size != size_in or size < 0:
+        raise ValueError('`size` must be a nonnegative integer, got {!r}'
+                         ''.format(size_in))
+    _PROXIMAL_CACHE_SIZE = size
+
+
+def _cached_proximal_property(prox_prop):
+    """Return a property caching the operators of a proximal factory.
+
+    Parameters
+    ----------
+    prox_prop : property
+        Original ``proximal`` property of a `Functional` subclass.
+
+    Returns
+    -------
+    cached_prop : property
+        Property returning a `proximal factory` that looks up operators
+        for scalar step sizes in the ``_proximal_cache`` of the instance
+        before calling the factory of ``prox_prop``.
+    """
+    def proximal(self):
+        # Evaluate the original property right away such that functionals
+        # without proximal still raise on attribute access
+        factory = prox_prop.__get__(self, type(self))
+
+        def cached_factory(*args, **kwargs):
+            """Return the proximal operator for the given step size."""
+            if (len(args) != 1 or kwargs or not isinstance(args[0], Real) or
+                    _PROXIMAL_CACHE_SIZE == 0):
+                return factory(*args, **kwargs)
+
+            key = (prox_prop, float(args[0]))
+            with _PROXIMAL_CACHE_LOCK:
+                # Bypass `__setattr__` since it clears the cache
+                cache = self.__dict__.setdefault('_proximal_cache',
+                                                 OrderedDict())
+                prox_op = cache.get(key, None)
+                if prox_op is not None:
+                    cache[key] = cache.pop(key)
+                    return prox_op
+
+            prox_op = factory(*args)
+            with _PROXIMAL_CACHE_LOCK:
+                cache[key] = prox_op
+                while len(cache) > _PROXIMAL_CACHE_SIZE:
+                    cache.popitem(last=False)
+            return prox_op
+
+        return cached_factory
+
+    return property(proximal, doc=prox_prop.__doc__)
 
 
 class Functional(Operator):
@@ -48,6 +142,22 @@ class Functional(Operator):
     <http://odlgroup.github.io/odl/guide/in_depth/functional_guide.html>`_.
     """
 
+    def __new__(cls, *args, **kwargs):
+        """Create a new instance."""
+        if '_proximal_cached' not in cls.__dict__:
+            # Wrap the `proximal` properties of this class and its parents
+            # once, see `set_proximal_cache_size`
+            for base in cls.__mro__:
+                if (not issubclass(base, Functional) or
+                        '_proximal_cached' in base.__dict__):
+                    continue
+                prox_prop = base.__dict__.get('proximal', None)
+                if isinstance(prox_prop, property):
+                    base.proximal = _cached_proximal_property(prox_prop)
+                base._proximal_cached = True
+
+        return super(Functional, cls).__new__(cls, *args, **kwargs)
+
     def __init__(self, space, linear=False, grad_lipschitz=np.nan):
         """Initialize a new instance.
 
@@ -77,6 +187,15 @@ class Functional(Operator):
         """Setter for the Lipschitz constant for the gradient."""
         self.__grad_lipschitz = float(value)
 
+    def __setattr__(self, name, value):
+        """Implement ``self.name = value``.
+
+        Since the new value may change the proximal, this also clears the
+        cached proximal operators.
+        """
+        super(Functional, self).__setattr__(name, value)
+        self.__dict__.pop('_proximal_cache', None)
+
     @property
     def gradient(self):
         r"""Gradient operator of the functional.
@@ -12,8 +12,11 @@ from __future__ import print_function, division, absolute_import
 from builtins import next
 import numpy as np
 
-from odl.operator import IdentityOperator, OperatorComp, OperatorSum
+from odl.operator import (
+    IdentityOperator, OperatorComp, OperatorSum, SubsetOperator,
+    input_checks)
 from odl.util import normalized_scalar_param_list
+from odl.util.scratch import scratch_element, scratch_elements
 
 
 __all__ = ('landweber', 'conjugate_gradient', 'conjugate_gradient_normal',
@@ -104,20 +107,21 @@ def landweber(op, x, rhs, niter, omega=None, projection=None, callback=None):
         omega = 1 / op.norm(estimate=True) ** 2
 
     # Reusable temporaries
-    tmp_ran = op.range.element()
-    tmp_dom = op.domain.element()
+    with input_checks(False), scratch_elements(
+            op.range, op.domain) as (tmp_ran, tmp_dom):
+        for _ in range(niter):
+            op(x, out=tmp_ran)
+            tmp_ran -= rhs
+            op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
+            x.lincomb(1, x, -omega, tmp_dom)
 
-    for _ in range(niter):
-        op(x, out=tmp_ran)
-        tmp_ran -= rhs
-        op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
-        x.lincomb(1, x, -omega, tmp_dom)
-
-        if projection is not None:
-            projection(x)
+            if projection is not None:
+                with input_checks(True):
+                    projection(x)
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def conjugate_gradient(op, x, rhs, niter, callback=None):
@@ -167,38 +171,41 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
                         ''.format(x, op.domain))
 
-    r = op(x)
-    r.lincomb(1, rhs, -1, r)       # r = rhs - A x
-    p = r.copy()
-    d = op.domain.element()  # Extra storage for storing A x
+    # Residual r, search direction p and extra storage d for A p
+    with input_checks(False), scratch_elements(
+            op.domain, op.domain, op.domain) as (r, p, d):
+        op(x, out=r)
+        r.lincomb(1, rhs, -1, r)       # r = rhs - A x
+        p.assign(r)
 
-    sqnorm_r_old = r.norm() ** 2  # Only recalculate norm after update
+        sqnorm_r_old = r.norm() ** 2  # Only recalculate norm after update
 
-    if sqnorm_r_old == 0:  # Return if no step forward
-        return
+        if sqnorm_r_old == 0:  # Return if no step forward
+            return
 
-    for _ in range(niter):
-        op(p, out=d)  # d = A p
+        for _ in range(niter):
+            op(p, out=d)  # d = A p
 
-        inner_p_d = p.inner(d)
+            inner_p_d = p.inner(d)
 
-        if inner_p_d == 0.0:  # Return if step is 0
-            return
+            if inner_p_d == 0.0:  # Return if step is 0
+                return
 
-        alpha = sqnorm_r_old / inner_p_d
+            alpha = sqnorm_r_old / inner_p_d
 
-        x.lincomb(1, x, alpha, p)            # x = x + alpha*p
-        r.lincomb(1, r, -alpha, d)           # r = r - alpha*d
+            x.lincomb(1, x, alpha, p)            # x = x + alpha*p
+            r.lincomb(1, r, -alpha, d)           # r = r - alpha*d
 
-        sqnorm_r_new = r.norm() ** 2
+            sqnorm_r_new = r.norm() ** 2
 
-        beta = sqnorm_r_new / sqnorm_r_old
-        sqnorm_r_old = sqnorm_r_new
+            beta = sqnorm_r_new / sqnorm_r_old
+            sqnorm_r_old = sqnorm_r_new
 
-        p.lincomb(1, r, beta, p)                       # p = s + b * p
+            p.lincomb(1, r, beta, p)                       # p = s + b * p
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None):
@@ -251,32 +258,34 @@ Conjugate_gradient_on_the_normal_equations>`_.
         raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
                         ''.format(x, op.domain))
 
-    d = op(x)
-    d.lincomb(1, rhs, -1, d)               # d = rhs - A x
-    p = op.derivative(x).adjoint(d)
-    s = p.copy()
-    q = op.range.element()
-    sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
-
-    for _ in range(niter):
-        op(p, out=q)                       # q = A p
-        sqnorm_q = q.norm() ** 2
-        if sqnorm_q == 0.0:  # Return if residual is 0
-            return
+    with input_checks(False), scratch_elements(
+            op.range, op.range, op.domain, op.domain) as (d, q, p, s):
+        op(x, out=d)
+        d.lincomb(1, rhs, -1, d)               # d = rhs - A x
+        op.derivative(x).adjoint(d, out=p)
+        s.assign(p)
+        sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
 
-        a = sqnorm_s_old / sqnorm_q
-        x.lincomb(1, x, a, p)               # x = x + a*p
-        d.lincomb(1, d, -a, q)              # d = d - a*Ap
-        op.derivative(p).adjoint(d, out=s)  # s = A^T d
+        for _ in range(niter):
+            op(p, out=q)                       # q = A p
+            sqnorm_q = q.norm() ** 2
+            if sqnorm_q == 0.0:  # Return if residual is 0
+                return
 
-        sqnorm_s_new = s.norm() ** 2
-        b = sqnorm_s_new / sqnorm_s_old
-        sqnorm_s_old = sqnorm_s_new
+            a = sqnorm_s_old / sqnorm_q
+            x.lincomb(1, x, a, p)               # x = x + a*p
+            d.lincomb(1, d, -a, q)              # d = d - a*Ap
+            op.derivative(p).adjoint(d, out=s)  # s = A^T d
 
-        p.lincomb(1, s, b, p)               # p = s + b * p
+            sqnorm_s_new = s.norm() ** 2
+            b = sqnorm_s_new / sqnorm_s_old
+            sqnorm_s_old = sqnorm_s_new
 
-        if callback is not None:
-            callback(x)
+            p.lincomb(1, s, b, p)               # p = s + b * p
+
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def exp_zero_seq(base):
@@ -355,38 +364,37 @@ def gauss_newton(op, x, rhs, niter, zero_seq=exp_zero_seq(2.0),
     id_op = IdentityOperator(op.domain)
     dx = op.domain.zero()
 
-    tmp_dom = op.domain.element()
-    u = op.domain.element()
-    tmp_ran = op.range.element()
-    v = op.range.element()
-
-    for _ in range(niter):
-        tm = next(zero_seq)
-        deriv = op.derivative(x)
-        deriv_adjoint = deriv.adjoint
-
-        # v = rhs - op(x) - deriv(x0-x)
-        # u = deriv.T(v)
-        op(x, out=tmp_ran)              # eval  op(x)
-        v.lincomb(1, rhs, -1, tmp_ran)  # assign  v = rhs - op(x)
-        tmp_dom.lincomb(1, x0, -1, x)   # assign temp  tmp_dom = x0 - x
-        deriv(tmp_dom, out=tmp_ran)     # eval  deriv(x0-x)
-        v -= tmp_ran                    # assign  v = rhs-op(x)-deriv(x0-x)
-        deriv_adjoint(v, out=u)         # eval/assign  u = deriv.T(v)
-
-        # Solve equation Tikhonov regularized system
-        # (deriv.T o deriv + tm * id_op)^-1 u = dx
-        tikh_op = OperatorSum(OperatorComp(deriv.adjoint, deriv),
-                              tm * id_op, tmp_dom)
-
-        # TODO: allow user to select other method
-        conjugate_gradient(tikh_op, dx, u, 3)
+    with input_checks(False), scratch_elements(
+            op.domain, op.domain, op.range,
+            op.range) as (tmp_dom, u, tmp_ran, v):
+        for _ in range(niter):
+            tm = next(zero_seq)
+            deriv = op.derivative(x)
+            deriv_adjoint = deriv.adjoint
+
+            # v = rhs - op(x) - deriv(x0-x)
+            # u = deriv.T(v)
+            op(x, out=tmp_ran)              # eval  op(x)
+            v.lincomb(1, rhs, -1, tmp_ran)  # assign  v = rhs - op(x)
+            tmp_dom.lincomb(1, x0, -1, x)   # assign temp  tmp_dom = x0 - x
+            deriv(tmp_dom, out=tmp_ran)     # eval  deriv(x0-x)
+            v -= tmp_ran                    # assign  v = rhs-op(x)-deriv(x0-x)
+            deriv_adjoint(v, out=u)         # eval/assign  u = deriv.T(v)
+
+            # Solve equation Tikhonov regularized system
+            # (deriv.T o deriv + tm * id_op)^-1 u = dx
+            tikh_op = OperatorSum(OperatorComp(deriv.adjoint, deriv),
+                                  tm * id_op, tmp_dom)
+
+            # TODO: allow user to select other method
+            conjugate_gradient(tikh_op, dx, u, 3)
 
-        # Update x
-        x.lincomb(1, x0, 1, dx)  # x = x0 + dx
+            # Update x
+            x.lincomb(1, x0, 1, dx)  # x = x0 + dx
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
@@ -405,6 +413,8 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     ops : sequence of `Operator`'s
         Operators in the inverse problem. ``op[i].derivative(x).adjoint`` must
         be well-defined for ``x`` in the operator domain and for all ``i``.
+        If a `SubsetOperator` is given and ``random`` is `False`, the
+        operators are visited in its `SubsetOperator.epoch_order`.
     x : ``op.domain`` element
         Element to which the result is written. Its initial value is
         used as starting point of the iteration, and its values are
@@ -416,6 +426,8 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     omega : positive float or sequence of positive floats, optional
         Relaxation parameter in the iteration. If a single float is given the
         same step is used for all operators, otherwise separate steps are used.
+        For a `SubsetOperator` of linear operators, ``None`` means
+        ``1 / ops.subset_norms[i] ** 2``.
     projection : callable, optional
         Function that can be used to modify the iterates in each iteration,
         for example enforcing positivity. The function should take one
@@ -486,40 +498,51 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
         raise ValueError('`number of `ops` {} does not match number of '
                          '`rhs` {}'.format(len(ops), len(rhs)))
 
+    is_subset_op = isinstance(ops, SubsetOperator)
+    if omega is None:
+        if not is_subset_op:
+            raise ValueError('`omega=None` requires a `SubsetOperator`')
+        omega = [1 / norm ** 2 for norm in ops.subset_norms]
     omega = normalized_scalar_param_list(omega, len(ops), param_conv=float)
 
-    # Reusable elements in the range, one per type of space
+    # Reusable elements in the range, one per type of space, and a single
+    # reusable element in the domain
     ranges = [opi.range for opi in ops]
-    unique_ranges = set(ranges)
-    tmp_rans = {ran: ran.element() for ran in unique_ranges}
-
-    # Single reusable element in the domain
-    tmp_dom = domain.element()
-
-    # Iteratively find solution
-    for _ in range(niter):
-        if random:
-            rng = np.random.permutation(range(len(ops)))
-        else:
-            rng = range(len(ops))
-
-        for i in rng:
-            # Find residual
-            tmp_ran = tmp_rans[ops[i].range]
-            ops[i](x, out=tmp_ran)
-            tmp_ran -= rhs[i]
-
-            # Update x
-            ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
-            x.lincomb(1, x, -omega[i], tmp_dom)
-
-            if projection is not None:
-                projection(x)
-
-            if callback is not None and callback_loop == 'inner':
-                callback(x)
-        if callback is not None and callback_loop == 'outer':
-            callback(x)
+    unique_ranges = list(set(ranges))
+    with input_checks(False), scratch_elements(
+            domain, *unique_ranges) as tmps:
+        tmp_dom = tmps[0]
+        tmp_rans = dict(zip(unique_ranges, tmps[1:]))
+
+        # Iteratively find solution
+        for epoch in range(niter):
+            if random:
+                rng = np.random.permutation(range(len(ops)))
+            elif is_subset_op:
+                rng = ops.epoch_order(epoch)
+            else:
+                rng = range(len(ops))
+
+            for i in rng:
+                # Find residual
+                tmp_ran = tmp_rans[ops[i].range]
+                ops[i](x, out=tmp_ran)
+                tmp_ran -= rhs[i]
+
+                # Update x
+                ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
+                x.lincomb(1, x, -omega[i], tmp_dom)
+
+                if projection is not None:
+                    with input_checks(True):
+                        projection(x)
+
+                if callback is not None and callback_loop == 'inner':
+                    with input_checks(True):
+                        callback(x)
+            if callback is not None and callback_loop == 'outer':
+                with input_checks(True):
+                    callback(x)
 
 
 if __name__ == '__main__':
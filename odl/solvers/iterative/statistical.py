@@ -91,14 +91,18 @@ def osmlem(op, x, data, niter, callback=None, **kwargs):
     Parameters
     ----------
     op : sequence of `Operator`
-        Forward operators in the inverse problem.
+        Forward operators in the inverse problem. If a `SubsetOperator` is
+        given, its cached sensitivities are used and the subsets are
+        visited in its `SubsetOperator.epoch_order`.
     x : ``op.domain`` element
         Vector to which the result is written. Its initial value is
         used as starting point of the iteration, and its values are
         updated in each iteration step.
         The initial value of ``x`` should be non-negative.
-      data : sequence of ``op.range`` `element-like`
+    data : sequence of ``op.range`` `element-like`
         Right-hand sides of the equation defining the inverse problem.
+        For a `SubsetOperator` with ``indices``, this can also be the
+        data of the full operator, which is then split into subsets.
     niter : int
         Number of iterations.
     callback : callable, optional
@@ -109,7 +113,8 @@ def osmlem(op, x, data, niter, callback=None, **kwargs):
     sensitivities : float or ``op.domain`` `element-like`, optional
         The algorithm contains an ``A^T 1``
         term, if this parameter is given, it is replaced by it.
-        Default: ``op[i].adjoint(op[i].range.one())``
+        Default: ``op[i].adjoint(op[i].range.one())``, or
+        ``op.sensitivities`` for a `SubsetOperator`
 
     Notes
     -----
@@ -142,7 +147,12 @@ def osmlem(op, x, data, niter, callback=None, **kwargs):
     mlem : Ordinary MLEM algorithm without subsets.
     loglikelihood : Function for calculating the logarithm of the likelihood
     """
+    from odl.operator.pspace_ops import SubsetOperator
+    is_subset_op = isinstance(op, SubsetOperator)
     n_ops = len(op)
+    if (is_subset_op and op.indices is not None and
+            data not in op.range and not isinstance(data, (list, tuple))):
+        data = op.split_data(data)
     if len(data) != n_ops:
         raise ValueError('number of data ({}) does not match number of '
                          'operators ({})'.format(len(data), n_ops))
@@ -161,7 +171,9 @@ def osmlem(op, x, data, niter, callback=None, **kwargs):
 
     # Extract the sensitivites parameter
     sensitivities = kwargs.pop('sensitivities', None)
-    if sensitivities is None:
+    if sensitivities is None and is_subset_op:
+        sensitivities = [np.maximum(sens, eps) for sens in op.sensitivities]
+    elif sensitivities is None:
         sensitivities = [np.maximum(opi.adjoint(opi.range.one()), eps)
                          for opi in op]
     else:
@@ -174,8 +186,13 @@ def osmlem(op, x, data, niter, callback=None, **kwargs):
     tmp_dom = op[0].domain.element()
     tmp_ran = [opi.range.element() for opi in op]
 
-    for _ in range(niter):
-        for i in range(n_ops):
+    for epoch in range(niter):
+        if is_subset_op:
+            order = op.epoch_order(epoch)
+        else:
+            order = range(n_ops)
+
+        for i in order:
             op[i](x, out=tmp_ran[i])
             tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
             data[i].divide(tmp_ran[i], out=tmp_ran[i])
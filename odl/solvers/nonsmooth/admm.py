@@ -11,7 +11,7 @@
 from __future__ import division
 from builtins import range
 
-from odl.operator import Operator, OpDomainError
+from odl.operator import Operator, OpDomainError, input_checks
 
 
 __all__ = ('admm_linearized',)
@@ -129,29 +129,29 @@ def admm_linearized(x, f, g, L, tau, sigma, niter, **kwargs):
     prox_tau_f = f.proximal(tau)
     prox_sigma_g = g.proximal(sigma)
 
-    for _ in range(niter):
-        # tmp_ran has value Lx^k here
-        # tmp_dom <- L^*(Lx^k + u^k - z^k)
-        tmp_ran += u
-        tmp_ran -= z
-        L.adjoint(tmp_ran, out=tmp_dom)
-
-        # x <- x^k - (tau/sigma) L^*(Lx^k + u^k - z^k)
-        x.lincomb(1, x, -tau / sigma, tmp_dom)
-        # x^(k+1) <- prox[tau*f](x)
-        prox_tau_f(x, out=x)
-
-        # tmp_ran <- Lx^(k+1)
-        L(x, out=tmp_ran)
-        # z^(k+1) <- prox[sigma*g](Lx^(k+1) + u^k)
-        prox_sigma_g(tmp_ran + u, out=z)  # 1 copy here
-
-        # u^(k+1) = u^k + Lx^(k+1) - z^(k+1)
-        u += tmp_ran
-        u -= z
-
-        if callback is not None:
-            callback(x)
+    with input_checks(False):
+        for _ in range(niter):
+            # tmp_ran has value Lx^k here
+            # tmp_dom <- L^*(Lx^k + u^k - z^k)
+            L.range.lincomb_n([1, 1, -1], [tmp_ran, u, z], out=tmp_ran)
+            L.adjoint(tmp_ran, out=tmp_dom)
+
+            # x <- x^k - (tau/sigma) L^*(Lx^k + u^k - z^k)
+            x.lincomb(1, x, -tau / sigma, tmp_dom)
+            # x^(k+1) <- prox[tau*f](x)
+            prox_tau_f(x, out=x)
+
+            # tmp_ran <- Lx^(k+1)
+            L(x, out=tmp_ran)
+            # z^(k+1) <- prox[sigma*g](Lx^(k+1) + u^k)
+            prox_sigma_g(tmp_ran + u, out=z)  # 1 copy here
+
+            # u^(k+1) = u^k + Lx^(k+1) - z^(k+1)
+            L.range.lincomb_n([1, 1, -1], [u, tmp_ran, z], out=u)
+
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def admm_linearized_simple(x, f, g, L, tau, sigma, niter, **kwargs):
@@ -10,7 +10,7 @@
 
 from __future__ import print_function, division, absolute_import
 
-from odl.operator import Operator
+from odl.operator import Operator, input_checks
 
 
 __all__ = ('forward_backward_pd',)
@@ -168,23 +168,32 @@ def forward_backward_pd(x, f, g, L, h, tau, sigma, niter,
     v = [Li.range.zero() for Li in L]
     y = x.space.zero()
 
-    for k in range(niter):
-        x_old = x
-
-        tmp_1 = grad_h(x) + sum(Li.adjoint(vi) for Li, vi in zip(L, v))
-        prox_f(tau)(x - tau * tmp_1, out=x)
-        y.lincomb(2.0, x, -1, x_old)
-
-        for i in range(m):
-            if l is not None:
-                # In this case gradients were given.
-                tmp_2 = sigma[i] * (L[i](y) - grad_cc_l[i](v[i]))
-            else:
-                # In this case gradients were not given. Therefore the gradient
-                # step is omitted. For more details, see the documentation.
-                tmp_2 = sigma[i] * L[i](y)
-
-            prox_cc_g[i](sigma[i])(v[i] + tmp_2, out=v[i])
-
-        if callback is not None:
-            callback(x)
+    with input_checks(False):
+        for k in range(niter):
+            x_old = x
+
+            # tmp_1 = x - tau * (grad_h(x) + sum(Li.adjoint(vi)))
+            terms = [x, grad_h(x)] + [Li.adjoint(vi) for Li, vi in zip(L, v)]
+            tmp_1 = x.space.lincomb_n([1] + [-tau] * (len(terms) - 1), terms)
+            prox_f(tau)(tmp_1, out=x)
+            y.lincomb(2.0, x, -1, x_old)
+
+            for i in range(m):
+                if l is not None:
+                    # In this case gradients were given.
+                    # tmp_2 = v[i] + sigma[i] * (L[i](y) - grad_cc_l[i](v[i]))
+                    tmp_2 = v[i].space.lincomb_n(
+                        [1, sigma[i], -sigma[i]],
+                        [v[i], L[i](y), grad_cc_l[i](v[i])])
+                else:
+                    # In this case gradients were not given. Therefore the
+                    # gradient step is omitted. For more details, see the
+                    # documentation.
+                    tmp_2 = L[i](y)
+                    tmp_2.lincomb(1, v[i], sigma[i], tmp_2)
+
+                prox_cc_g[i](sigma[i])(tmp_2, out=v[i])
+
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
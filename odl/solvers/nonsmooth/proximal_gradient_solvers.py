@@ -11,6 +11,8 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
+from odl.operator import input_checks
+
 
 __all__ = ('proximal_gradient', 'accelerated_proximal_gradient')
 
@@ -104,17 +106,19 @@ def proximal_gradient(x, f, g, gamma, niter, callback=None, **kwargs):
     # Create temporary
     tmp = x.space.element()
 
-    for k in range(niter):
-        lam_k = lam(k)
+    with input_checks(False):
+        for k in range(niter):
+            lam_k = lam(k)
 
-        # x - gamma grad_g (x)
-        tmp.lincomb(1, x, -gamma, g_grad(x))
+            # x - gamma grad_g (x)
+            tmp.lincomb(1, x, -gamma, g_grad(x))
 
-        # Update x
-        x.lincomb(1 - lam_k, x, lam_k, f_prox(tmp))
+            # Update x
+            x.lincomb(1 - lam_k, x, lam_k, f_prox(tmp))
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
@@ -192,25 +196,27 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
     y = x.copy()
     t = 1
 
-    for k in range(niter):
-        # Update t
-        t, t_old = (1 + np.sqrt(1 + 4 * t ** 2)) / 2, t
-        alpha = (t_old - 1) / t
+    with input_checks(False):
+        for k in range(niter):
+            # Update t
+            t, t_old = (1 + np.sqrt(1 + 4 * t ** 2)) / 2, t
+            alpha = (t_old - 1) / t
 
-        # x - gamma grad_g (y)
-        tmp.lincomb(1, y, -gamma, g_grad(y))
+            # x - gamma grad_g (y)
+            tmp.lincomb(1, y, -gamma, g_grad(y))
 
-        # Store old x value in y
-        y.assign(x)
+            # Store old x value in y
+            y.assign(x)
 
-        # Update x
-        f_prox(tmp, out=x)
+            # Update x
+            f_prox(tmp, out=x)
 
-        # Update y
-        y.lincomb(1 + alpha, x, -alpha, y)
+            # Update y
+            y.lincomb(1 + alpha, x, -alpha, y)
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 if __name__ == '__main__':
@@ -27,8 +27,10 @@ import numpy as np
 from odl.operator import (
     Operator, IdentityOperator, ConstantOperator, DiagonalOperator,
     PointwiseNorm, MultiplyOperator)
+from odl.operator.tensor_ops import _pointwise_blocks
 from odl.space import ProductSpace
 from odl.set.space import LinearSpaceElement
+from odl.util.utility import _writable_arrays
 
 
 __all__ = ('combine_proximals', 'proximal_convex_conj', 'proximal_translation',
@@ -1216,24 +1218,10 @@ def proximal_convex_conj_l1_l2(space, lam=1, g=None):
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            # lam * (x - sig * g) / max(lam, |x - sig * g|)
-
-            # diff = x - sig * g
-            if g is not None:
-                diff = self.domain.element()
-                diff.lincomb(1, x, -self.sigma, g)
-            else:
-                diff = x
-
-            # denom = max( |x-sig*g|_2, lam ) / lam  (|.|_2 pointwise)
-            pwnorm = PointwiseNorm(self.domain, exponent=2)
-            denom = pwnorm(diff)
-            denom.ufuncs.maximum(lam, out=denom)
-            denom /= lam
-
-            # Pointwise division
-            for out_i, diff_i in zip(out, diff):
-                diff_i.divide(denom, out=out_i)
+            # lam * (x - sig * g) / max(lam, |x - sig * g|), where |.|_2
+            # is taken pointwise, computed in one fused pass
+            _pointwise_l2_scaling(x, out, radius=lam, g=g,
+                                  g_coeff=self.sigma)
 
     return ProximalConvexConjL1L2
 
@@ -1421,31 +1409,80 @@ def proximal_l1_l2(space, lam=1, g=None):
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            # diff = x - g
-            if g is not None:
-                diff = x - g
-            else:
-                if x is out:
-                    # Handle aliased `x` and `out` (original `x` needed later)
-                    diff = x.copy()
-                else:
-                    diff = x
-
             # We write the operator as
             # x - (x - g) / max(|x - g|_2 / sig*lam, 1)
-            pwnorm = PointwiseNorm(self.domain, exponent=2)
-            denom = pwnorm(diff)
-            denom /= self.sigma * lam
-            denom.ufuncs.maximum(1, out=denom)
+            # and compute it in one fused pass
+            _pointwise_l2_scaling(x, out, radius=self.sigma * lam, g=g,
+                                  shrink=True)
 
-            # out = (x - g) / denom
-            for out_i, diff_i in zip(out, diff):
-                diff_i.divide(denom, out=out_i)
+    return ProximalL1L2
 
-            # out = x - ...
-            out.lincomb(1, x, -1, out)
 
-    return ProximalL1L2
+def _pointwise_l2_scaling(x, out, radius, g=None, g_coeff=1.0,
+                          shrink=False):
+    """Fused pointwise projection or shrinkage of a vector field.
+
+    With ``d = x - g_coeff * g`` and its pointwise Euclidean norm ``r``,
+    this function writes ::
+
+        d / max(r / radius, 1)        if ``shrink`` is False,
+        x - d / max(r / radius, 1)    if ``shrink`` is True
+
+    to ``out``. The first variant is the projection onto the ball with
+    given radius, the second one the group shrinkage. All components are
+    processed block by block, such that norms, factors and results are
+    computed in one pass with small scratch arrays. ``out`` may be
+    ``x``.
+    """
+    x_arrs = [np.asarray(xi) for xi in x]
+    g_arrs = None if g is None else [np.asarray(gi) for gi in g]
+    is_complex = np.iscomplexobj(x_arrs[0])
+
+    with _writable_arrays(out) as out_arrs:
+        blocks = _pointwise_blocks(x_arrs[0].shape, x_arrs[0].itemsize)
+        blk_shape = x_arrs[0][blocks[0]].shape
+        real_dtype = np.empty(0, dtype=x_arrs[0].dtype).real.dtype
+        denom = np.empty(blk_shape, dtype=real_dtype)
+        tmp = np.empty(blk_shape, dtype=real_dtype)
+        if g_arrs is not None:
+            diffs = [np.empty(blk_shape, dtype=xi.dtype) for xi in x_arrs]
+        res = np.empty(blk_shape, dtype=x_arrs[0].dtype)
+
+        for blk in blocks:
+            # The last block can be shorter than the scratch arrays
+            part = slice(0, len(x_arrs[0][blk])) if blk_shape else Ellipsis
+            denom_b, tmp_b, res_b = denom[part], tmp[part], res[part]
+
+            # d = x - g_coeff * g
+            if g_arrs is None:
+                d_blks = [xi[blk] for xi in x_arrs]
+            else:
+                d_blks = [di[part] for di in diffs]
+                for xi, gi, di in zip(x_arrs, g_arrs, d_blks):
+                    np.multiply(gi[blk], g_coeff, out=di)
+                    np.subtract(xi[blk], di, out=di)
+
+            # denom = max(|d|_2, radius) / radius
+            denom_b[:] = 0
+            for di in d_blks:
+                if is_complex:
+                    np.absolute(di, out=tmp_b)
+                    tmp_b *= tmp_b
+                else:
+                    np.multiply(di, di, out=tmp_b)
+                denom_b += tmp_b
+            np.sqrt(denom_b, out=denom_b)
+            np.maximum(denom_b, radius, out=denom_b)
+            denom_b /= radius
+
+            for xi, di, out_i in zip(x_arrs, d_blks, out_arrs):
+                if shrink:
+                    np.divide(di, denom_b, out=res_b)
+                    np.subtract(xi[blk], res_b, out=out_i[blk])
+                else:
+                    np.divide(di, denom_b, out=out_i[blk])
+
+    return out
 
 
 def proximal_linfty(space):
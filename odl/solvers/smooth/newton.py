@@ -11,6 +11,7 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
+from odl.operator import input_checks
 from odl.solvers.util import ConstantLineSearch
 from odl.solvers.iterative.iterative import conjugate_gradient
 
@@ -210,37 +211,39 @@ def newtons_method(f, x, line_search=1.0, maxiter=1000, tol=1e-16,
         cg_iter = grad.domain.size
 
     # TODO: optimize by using lincomb and avoiding to create copies
-    for _ in range(maxiter):
-
-        # Initialize the search direction to 0
-        search_direction = x.space.zero()
-
-        # Compute hessian (as operator) and gradient in the current point
-        hessian = grad.derivative(x)
-        deriv_in_point = grad(x)
-
-        # Solving A*x = b for x, in this case f''(x)*p = -f'(x)
-        # TODO: Let the user provide/choose method for how to solve this?
-        try:
-            hessian_inverse = hessian.inverse
-        except NotImplementedError:
-            conjugate_gradient(hessian, search_direction,
-                               -deriv_in_point, cg_iter)
-        else:
-            hessian_inverse(-deriv_in_point, out=search_direction)
+    with input_checks(False):
+        for _ in range(maxiter):
+
+            # Initialize the search direction to 0
+            search_direction = x.space.zero()
+
+            # Compute hessian (as operator) and gradient in the current point
+            hessian = grad.derivative(x)
+            deriv_in_point = grad(x)
+
+            # Solving A*x = b for x, in this case f''(x)*p = -f'(x)
+            # TODO: Let the user provide/choose method for how to solve this?
+            try:
+                hessian_inverse = hessian.inverse
+            except NotImplementedError:
+                conjugate_gradient(hessian, search_direction,
+                                   -deriv_in_point, cg_iter)
+            else:
+                hessian_inverse(-deriv_in_point, out=search_direction)
 
-        # Computing step length
-        dir_deriv = search_direction.inner(deriv_in_point)
-        if np.abs(dir_deriv) <= tol:
-            return
+            # Computing step length
+            dir_deriv = search_direction.inner(deriv_in_point)
+            if np.abs(dir_deriv) <= tol:
+                return
 
-        step_length = line_search(x, search_direction, dir_deriv)
+            step_length = line_search(x, search_direction, dir_deriv)
 
-        # Updating
-        x += step_length * search_direction
+            # Updating
+            x += step_length * search_direction
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def bfgs_method(f, x, line_search=1.0, maxiter=1000, tol=1e-15, num_store=None,
@@ -316,45 +319,48 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
     ss = []
 
     grad_x = grad(x)
-    for i in range(maxiter):
-        # Determine a stepsize using line search
-        search_dir = -_bfgs_direction(ss, ys, grad_x, hessinv_estimate)
-        dir_deriv = search_dir.inner(grad_x)
-        if np.abs(dir_deriv) == 0:
-            return  # we found an optimum
-        step = line_search(x, direction=search_dir, dir_derivative=dir_deriv)
-
-        # Update x
-        x_update = search_dir
-        x_update *= step
-        x += x_update
-
-        grad_x, grad_diff = grad(x), grad_x
-        # grad_diff = grad(x) - grad(x_old)
-        grad_diff.lincomb(-1, grad_diff, 1, grad_x)
-
-        y_inner_s = grad_diff.inner(x_update)
-
-        # Test for convergence
-        if np.abs(y_inner_s) < tol:
-            if grad_x.norm() < tol:
-                return
-            else:
-                # Reset if needed
-                ys = []
-                ss = []
-                continue
+    with input_checks(False):
+        for i in range(maxiter):
+            # Determine a stepsize using line search
+            search_dir = -_bfgs_direction(ss, ys, grad_x, hessinv_estimate)
+            dir_deriv = search_dir.inner(grad_x)
+            if np.abs(dir_deriv) == 0:
+                return  # we found an optimum
+            step = line_search(x, direction=search_dir,
+                               dir_derivative=dir_deriv)
+
+            # Update x
+            x_update = search_dir
+            x_update *= step
+            x += x_update
+
+            grad_x, grad_diff = grad(x), grad_x
+            # grad_diff = grad(x) - grad(x_old)
+            grad_diff.lincomb(-1, grad_diff, 1, grad_x)
+
+            y_inner_s = grad_diff.inner(x_update)
+
+            # Test for convergence
+            if np.abs(y_inner_s) < tol:
+                if grad_x.norm() < tol:
+                    return
+                else:
+                    # Reset if needed
+                    ys = []
+                    ss = []
+                    continue
 
-        # Update Hessian
-        ys.append(grad_diff)
-        ss.append(x_update)
-        if num_store is not None:
-            # Throw away factors if they are too many.
-            ss = ss[-num_store:]
-            ys = ys[-num_store:]
+            # Update Hessian
+            ys.append(grad_diff)
+            ss.append(x_update)
+            if num_store is not None:
+                # Throw away factors if they are too many.
+                ss = ss[-num_store:]
+                ys = ys[-num_store:]
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 def broydens_method(f, x, line_search=1.0, impl='first', maxiter=1000,
@@ -434,61 +440,63 @@ def broydens_method(f, x, line_search=1.0, impl='first', maxiter=1000,
     ys = []
 
     grad_x = grad(x)
-    for i in range(maxiter):
-        # find step size
-        search_dir = -_broydens_direction(ss, ys, grad_x,
-                                          hessinv_estimate, impl)
-        dir_deriv = search_dir.inner(grad_x)
-        if np.abs(dir_deriv) == 0:
-            return  # we found an optimum
-
-        step = line_search(x, search_dir, dir_deriv)
-
-        # update x
-        x_update = step * search_dir
-        x += x_update
-
-        # compute new gradient
-        grad_x, grad_x_old = grad(x), grad_x
-        delta_grad = grad_x - grad_x_old
-
-        # update hessian.
-        # TODO: reuse from above
-        v = _broydens_direction(ss, ys, delta_grad, hessinv_estimate,
-                                impl)
-        if impl == 'first':
-            divisor = x_update.inner(v)
-
-            # Test for convergence
-            if np.abs(divisor) < tol:
-                if grad_x.norm() < tol:
-                    return
-                else:
-                    # Reset if needed
-                    ys = []
-                    ss = []
-                    continue
-            u = (x_update - v) / divisor
-            ss.append(u)
-            ys.append(x_update)
-        elif impl == 'second':
-            divisor = delta_grad.inner(delta_grad)
-
-            # Test for convergence
-            if np.abs(divisor) < tol:
-                if grad_x.norm() < tol:
-                    return
-                else:
-                    # Reset if needed
-                    ys = []
-                    ss = []
-                    continue
-            u = (x_update - v) / divisor
-            ss.append(u)
-            ys.append(delta_grad)
-
-        if callback is not None:
-            callback(x)
+    with input_checks(False):
+        for i in range(maxiter):
+            # find step size
+            search_dir = -_broydens_direction(ss, ys, grad_x,
+                                              hessinv_estimate, impl)
+            dir_deriv = search_dir.inner(grad_x)
+            if np.abs(dir_deriv) == 0:
+                return  # we found an optimum
+
+            step = line_search(x, search_dir, dir_deriv)
+
+            # update x
+            x_update = step * search_dir
+            x += x_update
+
+            # compute new gradient
+            grad_x, grad_x_old = grad(x), grad_x
+            delta_grad = grad_x - grad_x_old
+
+            # update hessian.
+            # TODO: reuse from above
+            v = _broydens_direction(ss, ys, delta_grad, hessinv_estimate,
+                                    impl)
+            if impl == 'first':
+                divisor = x_update.inner(v)
+
+                # Test for convergence
+                if np.abs(divisor) < tol:
+                    if grad_x.norm() < tol:
+                        return
+                    else:
+                        # Reset if needed
+                        ys = []
+                        ss = []
+                        continue
+                u = (x_update - v) / divisor
+                ss.append(u)
+                ys.append(x_update)
+            elif impl == 'second':
+                divisor = delta_grad.inner(delta_grad)
+
+                # Test for convergence
+                if np.abs(divisor) < tol:
+                    if grad_x.norm() < tol:
+                        return
+                    else:
+                        # Reset if needed
+                        ys = []
+                        ss = []
+                        continue
+                u = (x_update - v) / divisor
+                ss.append(u)
+                ys.append(delta_grad)
+
+            if callback is not None:
+                with input_checks(True):
+                    callback(x)
 
 
 if __name__ == '__main__':
@@ -10,6 +10,7 @@
 
 from __future__ import print_function, division, absolute_import
 
+from odl.operator import input_checks
 from odl.solvers.util import ConstantLineSearch
 
 
@@ -88,48 +89,50 @@ def conjugate_gradient_nonlinear(f, x, line_search=1.0, maxiter=1000, nreset=0,
     if beta_method not in ['FR', 'PR', 'HS', 'DY']:
         raise ValueError('unknown ``beta_method``')
 
-    for _ in range(nreset + 1):
-        # First iteration is done without beta
-        dx = -f.gradient(x)
-        dir_derivative = -dx.inner(dx)
-        if abs(dir_derivative) < tol:
-            return
-        a = line_search(x, dx, dir_derivative)
-        x.lincomb(1, x, a, dx)  # x = x + a * dx
-
-        s = dx  # for 'HS' and 'DY' beta methods
-
-        for _ in range(maxiter // (nreset + 1)):
-            # Compute dx as -grad f
-            dx, dx_old = -f.gradient(x), dx
-
-            # Calculate "beta"
-            if beta_method == 'FR':
-                beta = dx.inner(dx) / dx_old.inner(dx_old)
-            elif beta_method == 'PR':
-                beta = dx.inner(dx - dx_old) / dx_old.inner(dx_old)
-            elif beta_method == 'HS':
-                beta = - dx.inner(dx - dx_old) / s.inner(dx - dx_old)
-            elif beta_method == 'DY':
-                beta = - dx.inner(dx) / s.inner(dx - dx_old)
-            else:
-                raise RuntimeError('unknown ``beta_method``')
-
-            # Reset beta if negative.
-            beta = max(0, beta)
-
-            # Update search direction
-            s.lincomb(1, dx, beta, s)  # s = dx + beta * s
-
-            # Find optimal step along s
-            dir_derivative = -dx.inner(s)
-
-            if abs(dir_derivative) <= tol:
+    with input_checks(False):
+        for _ in range(nreset + 1):
+            # First iteration is done without beta
+            dx = -f.gradient(x)
+            dir_derivative = -dx.inner(dx)
+            if abs(dir_derivative) < tol:
                 return
-            a = line_search(x, s, dir_derivative)
-
-            # Update position
-            x.lincomb(1, x, a, s)  # x = x + a * s
-
-            if callback is not None:
-                callback(x)
+            a = line_search(x, dx, dir_derivative)
+            x.lincomb(1, x, a, dx)  # x = x + a * dx
+
+            s = dx  # for 'HS' and 'DY' beta methods
+
+            for _ in range(maxiter // (nreset + 1)):
+                # Compute dx as -grad f
+                dx, dx_old = -f.gradient(x), dx
+
+                # Calculate "beta"
+                if beta_method == 'FR':
+                    beta = dx.inner(dx) / dx_old.inner(dx_old)
+                elif beta_method == 'PR':
+                    beta = dx.inner(dx - dx_old) / dx_old.inner(dx_old)
+                elif beta_method == 'HS':
+                    beta = - dx.inner(dx - dx_old) / s.inner(dx - dx_old)
+                elif beta_method == 'DY':
+                    beta = - dx.inner(dx) / s.inner(dx - dx_old)
+                else:
+                    raise RuntimeError('unknown ``beta_method``')
+
+                # Reset beta if negative.
+                beta = max(0, beta)
+
+                # Update search direction
+                s.lincomb(1, dx, beta, s)  # s = dx + beta * s
+
+                # Find optimal step along s
+                dir_derivative = -dx.inner(s)
+
+                if abs(dir_derivative) <= tol:
+                    return
+                a = line_search(x, s, dir_derivative)
+
+                # Update position
+                x.lincomb(1, x, a, s)  # x = x + a * s
+
+                if callback is not None:
+                    with input_checks(True):
+                        callback(x)
@@ -12,13 +12,14 @@ from __future__ import absolute_import, division, print_function
 from future.utils import native
 
 import ctypes
+import tempfile
 from builtins import object
 from functools import partial
 
 import numpy as np
 
 from odl.set.sets import ComplexNumbers, RealNumbers
-from odl.set.space import LinearSpaceTypeError
+from odl.set.space import LinearSpaceTypeError, _merge_lincomb_terms
 from odl.space.base_tensors import Tensor, TensorSpace
 from odl.space.weighting import (
     ArrayWeighting, ConstWeighting, CustomDist, CustomInner, CustomNorm,
@@ -26,6 +27,7 @@ from odl.space.weighting import (
 from odl.util import (
     dtype_str, is_floating_dtype, is_numeric_dtype, is_real_dtype, nullcontext,
     signature_string, writable_array)
+from odl.util.parallel import chunk_slices, parallel_map
 
 __all__ = ('NumpyTensorSpace',)
 
@@ -36,6 +38,10 @@ _BLAS_DTYPES = (np.dtype('float32'), np.dtype('float64'),
 # Define size thresholds to switch implementations
 THRESHOLD_SMALL = 100
 THRESHOLD_MEDIUM = 50000
+# Arrays above this size are split into chunks of `CHUNK_SIZE` entries that
+# are processed in parallel; chunks should fit into the L2 cache
+THRESHOLD_LARGE = 2 ** 21
+CHUNK_SIZE = 2 ** 17
 
 
 class NumpyTensorSpace(TensorSpace):
@@ -148,6 +154,22 @@ class NumpyTensorSpace(TensorSpace):
             ``dist`` or ``norm``. It also cannot be used in case of
             non-numeric ``dtype``.
 
+        storage : {'memory', 'memmap'}, optional
+            Storage of the data of new elements. With ``'memmap'``,
+            `element`, `zero` and `NumpyTensor.copy` create arrays backed
+            by anonymous temporary files (`numpy.memmap`), such that
+            elements larger than the main memory can be used. Arithmetic
+            and reductions are then carried out in chunks of bounded
+            size. The storage is not taken into account for comparison
+            of spaces.
+
+            Default: ``'memory'``
+
+        storage_dir : str, optional
+            Directory in which the temporary files for ``storage='memmap'``
+            are created. For ``None``, the default directory of the
+            `tempfile` module is used.
+
         kwargs :
             Further keyword arguments are passed to the weighting
             classes.
@@ -217,6 +239,14 @@ class NumpyTensorSpace(TensorSpace):
         >>> space = odl.tensor_space((2, 3), dtype=int)
         >>> space
         tensor_space((2, 3), dtype=int)
+
+        Elements can be stored in temporary files instead of main memory:
+
+        >>> space = odl.rn((2, 3), storage='memmap')
+        >>> space
+        rn((2, 3), storage='memmap')
+        >>> isinstance(space.zero().data, np.memmap)
+        True
         """
         super(NumpyTensorSpace, self).__init__(shape, dtype)
         if self.dtype.char not in self.available_dtypes():
@@ -228,6 +258,17 @@ class NumpyTensorSpace(TensorSpace):
         inner = kwargs.pop('inner', None)
         weighting = kwargs.pop('weighting', None)
         exponent = kwargs.pop('exponent', getattr(weighting, 'exponent', 2.0))
+        storage = str(kwargs.pop('storage', 'memory')).lower()
+        storage_dir = kwargs.pop('storage_dir', None)
+
+        if storage not in ('memory', 'memmap'):
+            raise ValueError("`storage` must be 'memory' or 'memmap', got "
+                             '{!r}'.format(storage))
+        if storage_dir is not None and storage != 'memmap':
+            raise ValueError("`storage_dir` can only be used with "
+                             "`storage='memmap'`")
+        self.__storage = storage
+        self.__storage_dir = storage_dir
 
         if (not is_numeric_dtype(self.dtype) and
                 any(x is not None for x in (dist, norm, inner, weighting))):
@@ -316,6 +357,37 @@ class NumpyTensorSpace(TensorSpace):
         """Exponent of the norm and the distance."""
         return self.weighting.exponent
 
+    @property
+    def storage(self):
+        """Storage of new elements, ``'memory'`` or ``'memmap'``."""
+        return self.__storage
+
+    @property
+    def storage_dir(self):
+        """Directory of the temporary files for memory-mapped storage."""
+        return self.__storage_dir
+
+    @property
+    def _storage_kwargs(self):
+        """Keyword arguments propagating the storage to new spaces."""
+        if self.storage == 'memory':
+            return {}
+        else:
+            return {'storage': self.storage, 'storage_dir': self.storage_dir}
+
+    def _new_array(self, order=None):
+        """Return a new uninitialized array according to `storage`."""
+        if order is None:
+            order = self.default_order
+        if self.storage == 'memmap' and self.nbytes > 0:
+            # The file is unlinked right away on POSIX systems, and its
+            # space is freed as soon as the array is garbage collected
+            with tempfile.TemporaryFile(dir=self.storage_dir) as fid:
+                return np.memmap(fid, dtype=self.dtype, mode='w+',
+                                 shape=self.shape, order=order)
+        else:
+            return np.empty(self.shape, dtype=self.dtype, order=order)
+
     def element(self, inp=None, data_ptr=None, order=None):
         """Create a new element.
 
@@ -332,7 +404,10 @@ class NumpyTensorSpace(TensorSpace):
             Otherwise, a copy is avoided whenever possible. This requires
             correct `shape` and `dtype`, and if ``order`` is provided,
             also contiguousness in that ordering. If any of these
-            conditions is not met, a copy is made.
+            conditions is not met, a copy is made. For
+            ``storage='memmap'``, the input must in addition be a
+            writeable `numpy.memmap`, otherwise it is copied to a new
+            memory-mapped array.
 
         data_ptr : int, optional
             Pointer to the start memory address of a contiguous Numpy array
@@ -399,13 +474,7 @@ class NumpyTensorSpace(TensorSpace):
             raise ValueError("`order` {!r} not understood".format(order))
 
         if inp is None and data_ptr is None:
-            if order is None:
-                arr = np.empty(self.shape, dtype=self.dtype,
-                               order=self.default_order)
-            else:
-                arr = np.empty(self.shape, dtype=self.dtype, order=order)
-
-            return self.element_type(self, arr)
+            return self.element_type(self, self._new_array(order))
 
         elif inp is None and data_ptr is not None:
             if order is None:
@@ -426,15 +495,22 @@ class NumpyTensorSpace(TensorSpace):
 
             # Try to not copy but require dtype and order if given
             # (`order=None` is ok as np.array argument)
+            memmap = self.storage == 'memmap' and self.nbytes > 0
             arr = np.array(inp, copy=False, dtype=self.dtype, ndmin=self.ndim,
-                           order=order)
-            # Make sure the result is writeable, if not make copy.
-            # This happens for e.g. results of `np.broadcast_to()`.
-            if not arr.flags.writeable:
-                arr = arr.copy()
+                           order=order, subok=memmap)
             if arr.shape != self.shape:
                 raise ValueError('shape of `inp` not equal to space shape: '
                                  '{} != {}'.format(arr.shape, self.shape))
+            if memmap and not (isinstance(arr, np.memmap) and
+                               arr.flags.writeable):
+                # Copy the data to a file-backed array in chunks
+                new_arr = self._new_array(order)
+                _chunked(_copy_arrays, arr, new_arr)
+                arr = new_arr
+            elif not arr.flags.writeable:
+                # Make sure the result is writeable, if not make copy.
+                # This happens for e.g. results of `np.broadcast_to()`.
+                arr = arr.copy()
             return self.element_type(self, arr)
 
         else:
@@ -450,6 +526,9 @@ class NumpyTensorSpace(TensorSpace):
         >>> x
         rn(3).element([ 0.,  0.,  0.])
         """
+        if self.storage == 'memmap' and self.nbytes > 0:
+            # New files are filled with zeros
+            return self.element()
         return self.element(np.zeros(self.shape, dtype=self.dtype,
                                      order=self.default_order))
 
@@ -463,6 +542,10 @@ class NumpyTensorSpace(TensorSpace):
         >>> x
         rn(3).element([ 1.,  1.,  1.])
         """
+        if self.storage == 'memmap' and self.nbytes > 0:
+            one = self.element()
+            _chunked(lambda arr: arr.fill(1), one.data)
+            return one
         return self.element(np.ones(self.shape, dtype=self.dtype,
                                     order=self.default_order))
 
@@ -547,6 +630,47 @@ class NumpyTensorSpace(TensorSpace):
         """
         _lincomb_impl(a, x1, b, x2, out)
 
+    def _lincomb_n(self, coeffs, vectors, out):
+        """Implement a linear combination of arbitrarily many tensors.
+
+        Compute ``out = sum(a * x for a, x in zip(coeffs, vectors))``
+        in a single pass over the data. With more than two terms, the
+        computation is done on cache-sized chunks, each of which is
+        combined in a temporary buffer and then written to ``out``.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Parameters
+        ----------
+        coeffs : sequence of `TensorSpace.field` elements
+            Scalars to multiply ``vectors`` with.
+        vectors : sequence of `NumpyTensor`
+            Summands in the linear combination.
+        out : `NumpyTensor`
+            Tensor to which the result is written.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([0, 1, 1])
+        >>> y = space.element([0, 0, 1])
+        >>> z = space.element([1, 1, 1])
+        >>> result = space.lincomb_n([1, 2, -1], [x, y, z], out=x)
+        >>> result
+        rn(3).element([-1.,  0.,  2.])
+        >>> result is x
+        True
+        """
+        coeffs, vectors = _merge_lincomb_terms(coeffs, vectors)
+        if len(vectors) == 1:
+            _lincomb_impl(coeffs[0], vectors[0], 0, vectors[0], out)
+        elif len(vectors) == 2:
+            _lincomb_impl(coeffs[0], vectors[0], coeffs[1], vectors[1], out)
+        else:
+            arrays = [x.data for x in vectors] + [out.data]
+            _chunked(partial(_lincomb_n_arrays, coeffs), *arrays)
+
     def _dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -688,7 +812,11 @@ class NumpyTensorSpace(TensorSpace):
         >>> result is out
         True
         """
-        np.multiply(x1.data, x2.data, out=out.data)
+        if _is_chunked(x1, x2, out):
+            _chunked(lambda x1, x2, out: np.multiply(x1, x2, out=out),
+                     x1.data, x2.data, out.data)
+        else:
+            np.multiply(x1.data, x2.data, out=out.data)
 
     def _divide(self, x1, x2, out):
         """Compute the entry-wise quotient ``x1 / x2``.
@@ -717,7 +845,11 @@ class NumpyTensorSpace(TensorSpace):
         >>> result is out
         True
         """
-        np.divide(x1.data, x2.data, out=out.data)
+        if _is_chunked(x1, x2, out):
+            _chunked(lambda x1, x2, out: np.divide(x1, x2, out=out),
+                     x1.data, x2.data, out.data)
+        else:
+            np.divide(x1.data, x2.data, out=out.data)
 
     def __eq__(self, other):
         """Return ``self == other``.
@@ -803,7 +935,8 @@ class NumpyTensorSpace(TensorSpace):
                 else:
                     weighting = space.weighting
 
-                return type(space)(newshape, space.dtype, weighting=weighting)
+                return type(space)(newshape, space.dtype, weighting=weighting,
+                                   **space._storage_kwargs)
 
             def __repr__(self):
                 """Return ``repr(self)``."""
@@ -841,9 +974,24 @@ class NumpyTensorSpace(TensorSpace):
         weight_str = self.weighting.repr_part
         if weight_str:
             inner_str += ', ' + weight_str
+        storage_str = signature_string(
+            [], [('storage', self.storage, 'memory'),
+                 ('storage_dir', self.storage_dir, None)])
+        if storage_str:
+            inner_str += ', ' + storage_str
 
         return '{}({})'.format(ctor_name, inner_str)
 
+    def _astype(self, dtype):
+        """Internal helper for `astype`."""
+        kwargs = dict(self._storage_kwargs)
+        if is_floating_dtype(dtype):
+            # Use weighting only for floating-point types, otherwise, e.g.,
+            # `space.astype(bool)` would fail
+            kwargs['weighting'] = self.weighting
+
+        return type(self)(self.shape, dtype=dtype, **kwargs)
+
     @property
     def element_type(self):
         """Type of elements in this space: `NumpyTensor`."""
@@ -924,6 +1072,10 @@ class NumpyTensor(Tensor):
         newelem : `NumpyTensor`
             Version of this element with given data type.
         """
+        if self.space.storage == 'memmap':
+            out = self.space.astype(dtype).element()
+            _chunked(_copy_arrays, self.data, out.data)
+            return out
         return self.space.astype(dtype).element(self.data.astype(dtype))
 
     @property
@@ -1008,6 +1160,10 @@ class NumpyTensor(Tensor):
         >>> y is x
         False
         """
+        if self.space.storage == 'memmap':
+            out = self.space.element()
+            _chunked(_copy_arrays, self.data, out.data)
+            return out
         return self.space.element(self.data.copy())
 
     def __copy__(self):
@@ -1110,7 +1266,7 @@ class NumpyTensor(Tensor):
                 weighting = None
             space = type(self.space)(
                 arr.shape, dtype=self.dtype, exponent=self.space.exponent,
-                weighting=weighting)
+                weighting=weighting, **self.space._storage_kwargs)
             return space.element(arr)
 
     def __setitem__(self, indices, values):
@@ -1652,11 +1808,36 @@ numpy.ufunc.reduceat.html
 
         exponent = self.space.exponent
         weighting = self.space.weighting
+        storage_kwargs = self.space._storage_kwargs
 
         # --- Evaluate ufunc --- #
 
         if method == '__call__':
             if ufunc.nout == 1:
+                # Memory-mapped data is processed in chunks, with the
+                # result allocated in the same storage
+                chunked = (
+                    self.space.storage == 'memmap' and
+                    isinstance(self.data, np.memmap) and
+                    set(kwargs) <= {'dtype'} and
+                    all(isinstance(inp, np.ndarray) and
+                        inp.shape == self.shape or np.isscalar(inp)
+                        for inp in inputs))
+                if chunked and out is None:
+                    # Determine the result data type from a single entry
+                    one_entry = (slice(0, 1),) * self.ndim
+                    res_dtype = ufunc(*[
+                        inp[one_entry] if isinstance(inp, np.ndarray) else inp
+                        for inp in inputs], **kwargs).dtype
+                    if is_floating_dtype(res_dtype):
+                        spc_kwargs = {'weighting': weighting}
+                    else:
+                        spc_kwargs = {}
+                    out_space = type(self.space)(
+                        self.shape, res_dtype, **dict(spc_kwargs,
+                                                      **storage_kwargs))
+                    out = out_space.element()
+
                 # Make context for output (trivial one returns `None`)
                 if out is None:
                     out_ctx = nullcontext()
@@ -1665,8 +1846,12 @@ numpy.ufunc.reduceat.html
 
                 # Evaluate ufunc
                 with out_ctx as out_arr:
-                    kwargs['out'] = out_arr
-                    res = ufunc(*inputs, **kwargs)
+                    if chunked and out_arr.shape == self.shape:
+                        _chunked_ufunc(ufunc, inputs, out_arr, **kwargs)
+                        res = out_arr
+                    else:
+                        kwargs['out'] = out_arr
+                        res = ufunc(*inputs, **kwargs)
 
                 # Wrap result if necessary (lazily)
                 if out is None:
@@ -1676,6 +1861,7 @@ numpy.ufunc.reduceat.html
                     else:
                         # No `exponent` or `weighting` applicable
                         spc_kwargs = {}
+                    spc_kwargs.update(storage_kwargs)
                     out_space = type(self.space)(self.shape, res.dtype,
                                                  **spc_kwargs)
                     out = out_space.element(res)
@@ -1702,10 +1888,12 @@ numpy.ufunc.reduceat.html
                 # We don't use exponents or weightings since we don't know
                 # how to map them to the spaces
                 if out1 is None:
-                    out1_space = type(self.space)(self.shape, res1.dtype)
+                    out1_space = type(self.space)(self.shape, res1.dtype,
+                                                  **storage_kwargs)
                     out1 = out1_space.element(res1)
                 if out2 is None:
-                    out2_space = type(self.space)(self.shape, res2.dtype)
+                    out2_space = type(self.space)(self.shape, res2.dtype,
+                                                  **storage_kwargs)
                     out2 = out2_space.element(res2)
 
                 return out1, out2
@@ -1744,6 +1932,7 @@ numpy.ufunc.reduceat.html
                     spc_kwargs = {'weighting': weighting}
                 else:
                     spc_kwargs = {}
+                spc_kwargs.update(storage_kwargs)
 
                 out_space = type(self.space)(res.shape, res.dtype,
                                              **spc_kwargs)
@@ -1759,6 +1948,8 @@ def _blas_is_applicable(*args):
     float or complex data only. If the arrays are non-contiguous,
     BLAS methods are usually slower, and array-writing routines do
     not work at all. Hence, only contiguous arrays are allowed.
+    Since BLAS uses 32 bit integers for sizes, arrays with more entries
+    have to be processed in chunks, see `_chunked`.
 
     Parameters
     ----------
@@ -1778,27 +1969,134 @@ def _blas_is_applicable(*args):
               all(x.flags.c_contiguous for x in args)):
         return False
     elif any(x.size > np.iinfo('int32').max for x in args):
-        # Temporary fix for 32 bit int overflow in BLAS
-        # TODO: use chunking instead
         return False
     else:
         return True
 
 
+def _chunked(func, *arrays):
+    """Apply ``func`` to corresponding chunks of ``arrays`` in parallel.
+
+    If all arrays are contiguous in the same memory order, they are
+    split into flat chunks of ``CHUNK_SIZE`` entries. Otherwise, they
+    are split into blocks along the axis with the largest stride in the
+    last array, such that each block has at most ``CHUNK_SIZE`` entries
+    unless a single slice along that axis is larger.
+
+    Parameters
+    ----------
+    func : callable
+        Function called as ``func(chunk_1, ..., chunk_N)``. Chunks are
+        views into the original arrays, hence ``func`` can write into
+        them.
+    array_1, ..., array_N : `numpy.ndarray`
+        Arrays of the same shape that should be processed.
+
+    Returns
+    -------
+    results : list
+        Return values of ``func`` for all chunks, in ascending order of
+        the chunk position.
+    """
+    if all(arr.flags.c_contiguous for arr in arrays):
+        order = 'C'
+    elif all(arr.flags.f_contiguous for arr in arrays):
+        order = 'F'
+    else:
+        order = None
+
+    if order is not None:
+        flat = [arr.ravel(order) for arr in arrays]
+        slices = chunk_slices(flat[0].size, CHUNK_SIZE)
+        chunks = [[arr[slc] for arr in flat] for slc in slices]
+    else:
+        shape = arrays[-1].shape
+        axis = int(np.argmax(np.abs(arrays[-1].strides)))
+        slice_size = arrays[-1].size // shape[axis]
+        slices = chunk_slices(shape[axis], max(1, CHUNK_SIZE // slice_size))
+        idx = [slice(None)] * arrays[-1].ndim
+        chunks = []
+        for slc in slices:
+            idx[axis] = slc
+            chunks.append([arr[tuple(idx)] for arr in arrays])
+
+    return parallel_map(lambda chunk: func(*chunk), chunks)
+
+
+def _is_chunked(*tensors):
+    """Whether operations on ``tensors`` should be run with `_chunked`.
+
+    This is the case for large arrays, and for memory-mapped arrays
+    to avoid full-size temporaries in main memory.
+    """
+    return any(x.size > THRESHOLD_LARGE or isinstance(x.data, np.memmap)
+               for x in tensors)
+
+
+def _copy_arrays(src, dst):
+    """Copy ``src`` to ``dst``, casting as necessary."""
+    np.copyto(dst, src, casting='unsafe')
+
+
+def _chunked_ufunc(ufunc, inputs, out, **kwargs):
+    """Evaluate ``ufunc(*inputs, out=out, **kwargs)`` with `_chunked`.
+
+    All array inputs must have the same shape as ``out``, other inputs
+    are passed on as-is.
+    """
+    array_idcs = [i for i, inp in enumerate(inputs)
+                  if isinstance(inp, np.ndarray)]
+
+    def ufunc_chunk(*chunks):
+        args = list(inputs)
+        for i, chunk in zip(array_idcs, chunks[:-1]):
+            args[i] = chunk
+        ufunc(*args, out=chunks[-1], **kwargs)
+
+    _chunked(ufunc_chunk, *([inputs[i] for i in array_idcs] + [out]))
+
+
 def _lincomb_impl(a, x1, b, x2, out):
     """Optimized implementation of ``out[:] = a * x1 + b * x2``."""
-    # Lazy import to improve `import odl` time
-    import scipy.linalg
-
     size = native(x1.size)
 
     if size < THRESHOLD_SMALL:
         # Faster for small arrays
         out.data[:] = a * x1.data + b * x2.data
-        return
 
-    elif (size < THRESHOLD_MEDIUM or
-          not _blas_is_applicable(x1.data, x2.data, out.data)):
+    elif x1 is x2 and b != 0:
+        # x1 is aligned with x2 -> out = (a+b)*x1
+        _lincomb_impl(a + b, x1, 0, x1, out)
+
+    elif _is_chunked(x1, x2, out):
+        # Run the single-pass implementation on chunks in parallel, which
+        # also circumvents the 32 bit size limit of BLAS and avoids
+        # full-size temporaries for memory-mapped arrays
+        _chunked(
+            partial(_lincomb_arrays, a, b,
+                    x1_is_out=x1 is out, x2_is_out=x2 is out),
+            x1.data, x2.data, out.data)
+
+    else:
+        _lincomb_arrays(a, b, x1.data, x2.data, out.data,
+                        x1_is_out=x1 is out, x2_is_out=x2 is out)
+
+
+def _lincomb_arrays(a, b, x1_arr, x2_arr, out_arr, x1_is_out, x2_is_out):
+    """Compute ``out_arr[:] = a * x1_arr + b * x2_arr``.
+
+    The cases ``x1_arr is x2_arr`` with ``b != 0`` and very small
+    arrays are handled by `_lincomb_impl`. The aliasing flags are
+    passed explicitly since chunks of the same array are different
+    view objects.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.linalg
+
+    size = native(out_arr.size)
+
+    if (size < THRESHOLD_MEDIUM or
+            not _blas_is_applicable(x1_arr, x2_arr, out_arr)):
 
         def fallback_axpy(x1, x2, n, a):
             """Fallback axpy implementation avoiding copy."""
@@ -1819,42 +2117,36 @@ def _lincomb_impl(a, x1, b, x2, out):
             return x2
 
         axpy, scal, copy = (fallback_axpy, fallback_scal, fallback_copy)
-        x1_arr = x1.data
-        x2_arr = x2.data
-        out_arr = out.data
 
     else:
         # Need flat data for BLAS, otherwise in-place does not work.
         # Raveling must happen in fixed order for non-contiguous out,
         # otherwise 'A' is applied to arrays, which makes the outcome
         # dependent on their respective contiguousness.
-        if out.data.flags.f_contiguous:
+        if out_arr.flags.f_contiguous:
             ravel_order = 'F'
         else:
             ravel_order = 'C'
 
-        x1_arr = x1.data.ravel(order=ravel_order)
-        x2_arr = x2.data.ravel(order=ravel_order)
-        out_arr = out.data.ravel(order=ravel_order)
+        x1_arr = x1_arr.ravel(order=ravel_order)
+        x2_arr = x2_arr.ravel(order=ravel_order)
+        out_arr = out_arr.ravel(order=ravel_order)
         axpy, scal, copy = scipy.linalg.blas.get_blas_funcs(
             ['axpy', 'scal', 'copy'], arrays=(x1_arr, x2_arr, out_arr))
 
-    if x1 is x2 and b != 0:
-        # x1 is aligned with x2 -> out = (a+b)*x1
-        _lincomb_impl(a + b, x1, 0, x1, out)
-    elif out is x1 and out is x2:
+    if x1_is_out and x2_is_out:
         # All the vectors are aligned -> out = (a+b)*out
         if (a + b) != 0:
             scal(a + b, out_arr, size)
         else:
             out_arr[:] = 0
-    elif out is x1:
+    elif x1_is_out:
         # out is aligned with x1 -> out = a*out + b*x2
         if a != 1:
             scal(a, out_arr, size)
         if b != 0:
             axpy(x2_arr, out_arr, size, b)
-    elif out is x2:
+    elif x2_is_out:
         # out is aligned with x2 -> out = a*x1 + b*out
         if b != 1:
             scal(b, out_arr, size)
@@ -1887,6 +2179,24 @@ def _lincomb_impl(a, x1, b, x2, out):
                 axpy(x1_arr, out_arr, size, a)
 
 
+def _lincomb_n_arrays(coeffs, *arrays):
+    """Compute ``arrays[-1][:] = sum(a * x for a, x in zip(coeffs, ...))``.
+
+    The result is accumulated in a temporary array, hence the output
+    may be aligned with any of the input arrays.
+    """
+    out_arr = arrays[-1]
+    result = coeffs[0] * arrays[0]
+    for a, x_arr in zip(coeffs[1:], arrays[1:-1]):
+        if a == 1:
+            result += x_arr
+        elif a == -1:
+            result -= x_arr
+        elif a != 0:
+            result += a * x_arr
+    out_arr[...] = result
+
+
 def _weighting(weights, exponent):
     """Return a weighting whose type is inferred from the arguments."""
     if np.isscalar(weights):
@@ -1980,7 +2290,13 @@ def _norm_default(x):
     # Lazy import to improve `import odl` time
     import scipy.linalg
 
-    if _blas_is_applicable(x.data):
+    if _is_chunked(x):
+        # Combine the norms of the chunks as in `numpy.linalg.norm`, i.e.,
+        # without squaring to avoid overflow
+        partial_norms = _chunked(
+            lambda x: np.linalg.norm(x.ravel()), x.data)
+        return np.linalg.norm(partial_norms)
+    elif _blas_is_applicable(x.data):
         nrm2 = scipy.linalg.blas.get_blas_funcs('nrm2', dtype=x.dtype)
         norm = partial(nrm2, n=native(x.size))
     else:
@@ -1990,11 +2306,25 @@ def _norm_default(x):
 
 def _pnorm_default(x, p):
     """Default p-norm implementation."""
+    if _is_chunked(x):
+        if p == float('inf'):
+            return max(_chunked(lambda x: np.max(np.abs(x)), x.data))
+        else:
+            return sum(_chunked(lambda x: np.sum(np.abs(x) ** p),
+                                x.data)) ** (1 / p)
     return np.linalg.norm(x.data.ravel(), ord=p)
 
 
 def _pnorm_diagweight(x, p, w):
     """Diagonally weighted p-norm implementation."""
+    if _is_chunked(x) and w.shape == x.shape:
+        if p == float('inf'):
+            return max(_chunked(lambda x, w: np.max(np.abs(x) * w),
+                                x.data, w))
+        else:
+            return sum(_chunked(lambda x, w: np.sum(np.abs(x) ** p * w),
+                                x.data, w)) ** (1 / p)
+
     # Ravel both in the same order (w is a numpy array)
     order = 'F' if all(a.flags.f_contiguous for a in (x.data, w)) else 'C'
 
@@ -2010,8 +2340,35 @@ def _pnorm_diagweight(x, p, w):
         return np.sum(xp) ** (1 / p)
 
 
+def _dist_default(x1, x2):
+    """Default Euclidean distance implementation."""
+    if _is_chunked(x1, x2):
+        # Avoid a full-size temporary for the difference
+        partial_dists = _chunked(
+            lambda x1, x2: np.linalg.norm((x1 - x2).ravel()),
+            x1.data, x2.data)
+        return np.linalg.norm(partial_dists)
+    else:
+        return _norm_default(x1 - x2)
+
+
+def _inner_arrays(x1, x2):
+    """Euclidean inner product of two arrays of the same shape."""
+    # Ravel both in the same order
+    order = 'F' if all(a.flags.f_contiguous for a in (x1, x2)) else 'C'
+    if is_real_dtype(x1.dtype):
+        return np.dot(x1.ravel(order), x2.ravel(order))
+    else:
+        # x2 as first argument because we want linearity in x1
+        return np.vdot(x2.ravel(order), x1.ravel(order))
+
+
 def _inner_default(x1, x2):
     """Default Euclidean inner product implementation."""
+    if _is_chunked(x1, x2):
+        # Partial sums are added in fixed order for reproducibility
+        return sum(_chunked(_inner_arrays, x1.data, x2.data))
+
     # Ravel both in the same order
     order = 'F' if all(a.data.flags.f_contiguous for a in (x1, x2)) else 'C'
 
@@ -2129,7 +2486,13 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
         else:
-            inner = _inner_default(x1 * self.array, x2)
+            if _is_chunked(x1, x2) and self.array.shape == x1.shape:
+                # Avoid a full-size temporary for the weighted array
+                inner = sum(_chunked(
+                    lambda x1, x2, w: _inner_arrays(x1 * w, x2),
+                    x1.data, x2.data, self.array))
+            else:
+                inner = _inner_default(x1 * self.array, x2)
             if is_real_dtype(x1.dtype):
                 return float(inner)
             else:
@@ -2276,7 +2639,7 @@ class NumpyTensorSpaceConstWeighting(ConstWeighting):
             The distance between the tensors.
         """
         if self.exponent == 2.0:
-            return float(np.sqrt(self.const) * _norm_default(x1 - x2))
+            return float(np.sqrt(self.const) * _dist_default(x1, x2))
         elif self.exponent == float('inf'):
             return float(self.const * _pnorm_default(x1 - x2, self.exponent))
         else:
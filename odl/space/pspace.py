@@ -577,6 +577,11 @@ class ProductSpace(LinearSpace):
                                        out.parts):
             space._lincomb(a, xp, b, yp, outp)
 
+    def _lincomb_n(self, coeffs, vectors, out):
+        """Linear combination ``out = sum(a * x for a, x in ...)``."""
+        for i, (space, outp) in enumerate(zip(self.spaces, out.parts)):
+            space._lincomb_n(coeffs, [x.parts[i] for x in vectors], outp)
+
     def _dist(self, x1, x2):
         """Distance between two elements."""
         return self.weighting.dist(x1, x2)
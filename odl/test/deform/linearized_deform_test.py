@@ -14,9 +14,9 @@ import numpy as np
 import pytest
 
 import odl
-from odl.deform import LinDeformFixedDisp, LinDeformFixedTempl
+from odl.deform import LinDeformFixedDisp, LinDeformFixedTempl, linear_deform
 from odl.space.entry_points import tensor_space_impl
-from odl.util.testutils import simple_fixture
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
 
 # --- pytest fixtures --- #
 
@@ -317,5 +317,30 @@ def test_fixed_disp_adj(space, interp):
     assert inner1 == pytest.approx(inner2, abs=.1)
 
 
+def test_fixed_disp_plan(space, interp):
+    """Test the cached plan and the transposed adjoint."""
+    template = space.element(template_function)
+    disp_field = space.real_space.tangent_bundle.element(
+        disp_field_factory(space.ndim))
+
+    deform_op = LinDeformFixedDisp(
+        disp_field, templ_space=space, interp=interp,
+        adjoint_method='transpose'
+    )
+    # The plan is created once and reused
+    assert deform_op.plan is deform_op.plan
+    assert deform_op.adjoint is deform_op.adjoint
+    assert deform_op.inverse is deform_op.inverse
+    assert all_almost_equal(deform_op(template),
+                            linear_deform(template, disp_field, interp))
+
+    # The transposed plan is the exact adjoint
+    x = noise_element(space)
+    y = noise_element(space)
+    assert deform_op(x).inner(y) == pytest.approx(
+        x.inner(deform_op.adjoint(y)))
+    assert deform_op.adjoint.adjoint is deform_op
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
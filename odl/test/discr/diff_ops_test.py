@@ -494,5 +494,59 @@ def test_laplacian(space, padding):
     assert lhs == pytest.approx(rhs, rel=dtype_tol(space.dtype))
 
 
+def test_diff_ops_apply_batch(space, method):
+    """Check vectorized batch evaluation against a loop."""
+    grad = Gradient(space, method=method, pad_mode='symmetric')
+    ops = [grad, grad.adjoint, Laplacian(space, pad_mode='periodic')]
+    for op in ops:
+        x_batch = np.stack([noise_element(op.domain).asarray()
+                            for _ in range(3)])
+        expected = np.stack([op(x).asarray() for x in x_batch])
+        assert all_almost_equal(op.apply_batch(x_batch), expected)
+
+
+all_pad_modes = simple_fixture(
+    'pad_mode', ['constant', 'symmetric', 'symmetric_adjoint', 'periodic',
+                 'order0', 'order0_adjoint', 'order1', 'order1_adjoint',
+                 'order2', 'order2_adjoint'])
+
+
+def test_diff_ops_blocked(method, all_pad_modes, monkeypatch):
+    """Check cache-blocked evaluation against `finite_diff` per axis."""
+    pad_mode = all_pad_modes
+    # Blocks of a few rows, such that blocks in the interior, at the
+    # boundaries and shorter than the halo occur
+    monkeypatch.setattr(odl.discr.diff_ops, '_STENCIL_BLOCK_BYTES', 8 * 8)
+    space = odl.uniform_discr([0, 0], [1, 1], (13, 8))
+    dx = space.cell_sides
+    x = noise_element(space)
+    y = noise_element(space ** 2)
+
+    expected = [finite_diff(x.asarray(), axis=axis, dx=dx[axis],
+                            method=method, pad_mode=pad_mode)
+                for axis in range(2)]
+    with odl.util.parallel.num_threads(2):
+        grad = Gradient(space, method=method, pad_mode=pad_mode)
+        assert all_almost_equal(grad(x), expected)
+
+        expected = sum(finite_diff(y[axis].asarray(), axis=axis, dx=dx[axis],
+                                   method=method, pad_mode=pad_mode)
+                       for axis in range(2))
+        div = Divergence(range=space, method=method, pad_mode=pad_mode)
+        assert all_almost_equal(div(y), expected)
+
+        if method == 'forward' and pad_mode in ('constant', 'symmetric',
+                                                'periodic', 'order0'):
+            expected = sum(finite_diff(x.asarray(), axis=axis,
+                                       dx=dx[axis] ** 2, method='forward',
+                                       pad_mode=pad_mode) -
+                           finite_diff(x.asarray(), axis=axis,
+                                       dx=dx[axis] ** 2, method='backward',
+                                       pad_mode=pad_mode)
+                           for axis in range(2))
+            lap = Laplacian(space, pad_mode=pad_mode)
+            assert all_almost_equal(lap(x), expected)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
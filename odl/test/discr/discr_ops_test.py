@@ -289,5 +289,61 @@ def test_resizing_op_mixed_uni_nonuni():
     assert inner1 == pytest.approx(inner2)
 
 
+def test_resizing_op_block_size(padding):
+    """Check that slab-wise resizing matches resizing in one pass."""
+    pad_mode, pad_const = padding
+    space = odl.uniform_discr([0, -1, 0], [1, 1, 1], (5, 6, 4))
+    x = noise_element(space)
+
+    for ran_shp in [(8, 7, 4), (3, 9, 2)]:
+        res_op = odl.ResizingOperator(space, ran_shp=ran_shp,
+                                      pad_mode=pad_mode, pad_const=pad_const)
+        for block_size in [1, 2, 5]:
+            blk_op = odl.ResizingOperator(
+                space, ran_shp=ran_shp, pad_mode=pad_mode,
+                pad_const=pad_const, block_size=block_size, num_threads=2)
+            assert blk_op.block_size == block_size
+            assert np.allclose(blk_op(x), res_op(x))
+
+            if pad_const == 0:
+                y = noise_element(res_op.range)
+                assert np.allclose(blk_op.adjoint(y), res_op.adjoint(y))
+
+
+def test_resizing_op_block_size_memmap(tmpdir):
+    """Check slab-wise resizing with memory-mapped input and output."""
+    space = odl.uniform_discr([0, -1], [1, 1], (6, 5))
+    res_op = odl.ResizingOperator(space, ran_shp=(9, 8), pad_mode='order1',
+                                  block_size=2)
+    x = noise_element(space)
+
+    x_mmap = np.memmap(str(tmpdir.join('x.dat')), dtype=space.dtype,
+                       mode='w+', shape=space.shape)
+    x_mmap[:] = x
+    out_mmap = np.memmap(str(tmpdir.join('out.dat')), dtype=space.dtype,
+                         mode='w+', shape=res_op.range.shape)
+    res_op(space.element(x_mmap), out=res_op.range.element(out_mmap))
+    assert np.allclose(out_mmap, res_op(x))
+
+
+def test_resampling_block_size():
+    """Check that slab-wise resampling matches resampling in one pass."""
+    coarse = odl.uniform_discr([0, 0, 0], [1, 1, 1], (5, 4, 3))
+    fine = odl.uniform_discr([0, 0, 0], [1, 1, 1], (11, 6, 5))
+
+    for interp in ['linear', 'nearest', ['nearest', 'linear', 'linear']]:
+        for domain, range in [(coarse, fine), (fine, coarse)]:
+            resampling = odl.Resampling(domain, range, interp)
+            x = noise_element(domain)
+            for block_size in [1, 3]:
+                blk_resampling = odl.Resampling(
+                    domain, range, interp, block_size=block_size,
+                    num_threads=2)
+                assert np.allclose(blk_resampling(x), resampling(x))
+                out = range.element()
+                blk_resampling(x, out=out)
+                assert np.allclose(out, resampling(x))
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
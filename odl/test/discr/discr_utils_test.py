@@ -17,8 +17,8 @@ import pytest
 
 import odl
 from odl.discr.discr_utils import (
-    linear_interpolator, nearest_interpolator, per_axis_interpolator,
-    point_collocation, sampling_function)
+    InterpolationPlan, linear_interpolator, nearest_interpolator,
+    per_axis_interpolator, point_collocation, sampling_function)
 from odl.discr.grid import sparse_meshgrid
 from odl.util.testutils import all_almost_equal, all_equal, simple_fixture
 
@@ -794,10 +794,10 @@ def test_linear_interpolation_2d():
     true_val_22 = (1 - lx2) * f[3, 1]  # ly2 = 0, no upper for 1.0
     true_mg = [[true_val_11, true_val_12],
                [true_val_21, true_val_22]]
-    assert all_equal(interpolator(mg), true_mg)
+    assert all_almost_equal(interpolator(mg), true_mg)
     out = np.empty((2, 2), dtype='float64')
     interpolator(mg, out=out)
-    assert all_equal(out, true_mg)
+    assert all_almost_equal(out, true_mg)
 
 
 def test_per_axis_interpolation():
@@ -851,6 +851,73 @@ def test_per_axis_interpolation():
     assert all_equal(out, true_mg)
 
 
+def test_interpolation_uniform_fast_paths(monkeypatch):
+    """Check uniform-grid, meshgrid and chunked paths against references."""
+    import odl.discr.discr_utils as discr_utils
+    monkeypatch.setattr(discr_utils, '_INTERP_CHUNK_SIZE', 7)
+
+    coord_vecs = [np.linspace(0, 1, 5), np.linspace(-1, 2, 4)]
+    rng = np.random.RandomState(0)
+    f = rng.rand(5, 4)
+    # Random points and points on grid nodes, inside and outside
+    pts = np.concatenate([rng.uniform(-0.5, 2.5, size=(2, 30)),
+                          [coord_vecs[0][[0, 1, 4, 3]],
+                           coord_vecs[1][[0, 3, 2, 1]]]], axis=1)
+    mg = sparse_meshgrid([-0.1, 0.25, 0.6, 1.2], [-1.5, 0.0, 0.5, 2.0])
+
+    for cvec in coord_vecs:
+        xi = np.concatenate([pts[0], cvec])
+        idcs, ndist = discr_utils._find_axis_indices(xi, cvec)
+        true_idcs = np.clip(np.searchsorted(cvec, xi) - 1, 0, cvec.size - 2)
+        assert all_equal(idcs, true_idcs)
+
+    for interp in ['linear', 'nearest', ['nearest', 'linear']]:
+        interpolator = per_axis_interpolator(f, coord_vecs, interp)
+        # Reference: evaluate point by point, without chunking
+        true_arr = [interpolator(p) for p in pts.T]
+        assert all_almost_equal(interpolator(pts), true_arr)
+
+        mg_pts = np.broadcast_arrays(*mg)
+        true_mg = interpolator(np.stack([a.ravel() for a in mg_pts]))
+        assert all_almost_equal(interpolator(mg), true_mg.reshape(4, 4))
+
+
+def test_interpolation_plan():
+    """Check that interpolation plans match the interpolators."""
+    coord_vecs = [[0.125, 0.375, 0.625, 0.875], [0.25, 0.75], [0.0, 1.0]]
+    rng = np.random.RandomState(0)
+    f = rng.rand(4, 2, 2)
+    g = rng.rand(4, 2, 2)
+    # Points inside and outside of the grid
+    pts = rng.uniform(-0.2, 1.2, size=(3, 5, 6))
+
+    for interp in ['linear', 'nearest', ['nearest', 'linear', 'nearest']]:
+        plan = InterpolationPlan(coord_vecs, pts, interp=interp)
+        assert plan.shape == (5, 6)
+        assert plan.grid_shape == (4, 2, 2)
+
+        interpolator = per_axis_interpolator(f, coord_vecs, interp)
+        true_val = interpolator(pts.reshape(3, -1)).reshape(5, 6)
+        assert all_almost_equal(plan(f), true_val)
+        out = np.empty((5, 6))
+        plan(f, out=out)
+        assert all_almost_equal(out, true_val)
+
+        # Adjoint by definition
+        h = rng.rand(5, 6)
+        assert np.vdot(plan(g), h) == pytest.approx(
+            np.vdot(g, plan.adjoint(h)))
+
+    # Points generated lazily
+    plan = InterpolationPlan(coord_vecs, iter(pts))
+    assert all_almost_equal(plan(f), InterpolationPlan(coord_vecs, pts)(f))
+
+    with pytest.raises(ValueError):
+        InterpolationPlan(coord_vecs, pts[:2])
+    with pytest.raises(ValueError):
+        plan(f[:2])
+
+
 def test_collocation_interpolation_identity():
     """Check if collocation is left-inverse to interpolation."""
     # Interpolation followed by collocation on the same grid should be
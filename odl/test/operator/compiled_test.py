@@ -0,0 +1,196 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the compilation of operator expressions."""
+
+from __future__ import division
+
+import pytest
+
+import odl
+from odl.operator import (
+    CompiledOperator, OperatorPointwiseProduct, OperatorVectorSum)
+from odl.util.parallel import num_threads, parallel_map
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+# --- pytest fixtures --- #
+
+
+SPACE = odl.uniform_discr([0, 0], [1, 1], (8, 8))
+GRAD = odl.Gradient(SPACE)
+LAPLACE = GRAD.adjoint * GRAD
+MULT = odl.MultiplyOperator(noise_element(SPACE))
+VEC = noise_element(SPACE)
+
+EXPRESSIONS = {
+    'normal_eq': 2 * (MULT.adjoint * MULT) + 0.5 * LAPLACE,
+    'scalar_mult': (MULT * 3) * MULT - MULT,
+    'ufunc': odl.ufunc_ops.exp(SPACE) * MULT * 2 + odl.IdentityOperator(SPACE),
+    'vector_mult': VEC * odl.ufunc_ops.sin(SPACE) * (MULT * VEC) * LAPLACE,
+    'product': OperatorPointwiseProduct(MULT, LAPLACE) - 3 * LAPLACE,
+    'vector_sum': OperatorVectorSum(2 * LAPLACE, VEC),
+    'zero': odl.ZeroOperator(SPACE) + 0 * LAPLACE,
+    'identity': odl.IdentityOperator(SPACE),
+    'gradient': GRAD * (MULT + odl.ScalingOperator(SPACE, -1)),
+}
+expr_name = simple_fixture('expr_name', sorted(EXPRESSIONS))
+
+
+class CountingOperator(odl.Operator):
+
+    """Linear operator ``2 * x`` counting its evaluations."""
+
+    def __init__(self, space):
+        super(CountingOperator, self).__init__(space, space, linear=True)
+        self.ncalls = 0
+
+    def _call(self, x, out):
+        self.ncalls += 1
+        out.lincomb(2, x)
+
+    @property
+    def adjoint(self):
+        return self
+
+
+# --- Tests --- #
+
+
+def test_compile_evaluation(expr_name):
+    """Compiled expressions should give the same results."""
+    expression = EXPRESSIONS[expr_name]
+    compiled = odl.operator.compile(expression)
+    assert isinstance(compiled, CompiledOperator)
+    assert compiled.domain == expression.domain
+    assert compiled.range == expression.range
+    assert compiled.is_linear == expression.is_linear
+
+    x = noise_element(expression.domain)
+    expected = expression(x)
+    assert all_almost_equal(compiled(x), expected)
+    out = compiled.range.element()
+    for _ in range(2):
+        assert compiled(x, out=out) is out
+        assert all_almost_equal(out, expected)
+
+    # Aliased input and output
+    if compiled.domain == compiled.range:
+        compiled(x, out=x)
+        assert all_almost_equal(x, expected)
+
+
+def test_compile_adjoint(expr_name):
+    """Adjoints should be compiled and match the expression."""
+    expression = EXPRESSIONS[expr_name]
+    if not expression.is_linear:
+        return
+    compiled = odl.operator.compile(expression)
+    adjoint = compiled.adjoint
+    assert isinstance(adjoint, CompiledOperator)
+    assert adjoint is compiled.adjoint
+
+    x = noise_element(compiled.domain)
+    y = noise_element(compiled.range)
+    assert all_almost_equal(adjoint(y), expression.adjoint(y))
+    assert compiled(x).inner(y) == pytest.approx(x.inner(adjoint(y)),
+                                                 rel=1e-5)
+
+
+def test_compile_common_subexpressions():
+    """Identical subexpressions should be evaluated once."""
+    space = odl.rn(3)
+    op = CountingOperator(space)
+    expr = 2 * op + op * op - op * (op * 3)
+    x = space.element([1, 2, 3])
+    expected = expr(x)
+    op.ncalls = 0
+
+    compiled = odl.operator.compile(expr)
+    assert all_almost_equal(compiled(x), expected)
+    assert op.ncalls == 2
+    # op(x), op(op(x)) and the final linear combination
+    assert compiled.num_steps == 3
+    assert compiled.num_buffers == 2
+
+
+def test_compile_pointwise_fusion():
+    """Pointwise operators and scalars should be fused into one step."""
+    space = odl.rn(3)
+    mult1 = odl.MultiplyOperator(space.element([1, 2, 3]))
+    mult2 = odl.MultiplyOperator(space.element([1, -1, 2]))
+    expr = 2 * mult1 * odl.ScalingOperator(space, 3) * mult2
+    compiled = odl.operator.compile(expr)
+    assert compiled.num_steps == 1
+    assert compiled.num_buffers == 0
+
+    x = space.element([1, 1, 1])
+    assert all_almost_equal(compiled(x), [6, -12, 36])
+
+    # Nonlinear pointwise functions keep their place in the chain
+    expr = mult1 * odl.ufunc_ops.square(space) * mult2 * 2
+    compiled = odl.operator.compile(expr)
+    assert compiled.num_steps == 1
+    assert all_almost_equal(compiled(x), expr(x))
+
+
+def test_compile_tracks_multiplicands():
+    """In-place changes of multiplicands should affect compiled results."""
+    space = odl.rn(3)
+    weight = space.element([1, 2, 3])
+    vector = space.element([1, -1, 2])
+    mult = odl.MultiplyOperator(weight)
+    expr = mult * (2 * mult) * vector + 3 * odl.ufunc_ops.square(space) * mult
+    compiled = odl.operator.compile(expr)
+    x = space.element([1, 1, 1])
+    assert all_almost_equal(compiled(x), expr(x))
+
+    weight[:] = [-1, 0.5, 4]
+    vector[:] = [2, 2, 2]
+    assert all_almost_equal(compiled(x), expr(x))
+
+
+def test_compile_complex_scalars():
+    """Complex scalars must not be moved out of real-linear operators."""
+    space = odl.cn(3)
+    ident = odl.IdentityOperator(space)
+    x = space.element([1 + 2j, 3 - 1j, 0.5j])
+    for part in [odl.RealPart(space), odl.ImagPart(space)]:
+        for expr in [part * (1j * ident),
+                     part * odl.ScalingOperator(space, 2j),
+                     2 * part * (1j * ident) + part,
+                     part * (2 * ident)]:
+            compiled = odl.operator.compile(expr)
+            assert all_almost_equal(compiled(x), expr(x))
+
+    # Complex-linear operators commute with complex scalars
+    expr = odl.MultiplyOperator(space.element([1, 2j, 3])) * (1j * ident)
+    assert all_almost_equal(odl.operator.compile(expr)(x), expr(x))
+
+
+def test_compile_threads():
+    """Concurrent calls should not share buffers."""
+    compiled = odl.operator.compile(2 * LAPLACE * MULT + MULT)
+    inputs = [noise_element(SPACE) for _ in range(8)]
+    expected = [compiled(x) for x in inputs]
+
+    with num_threads(4):
+        results = parallel_map(compiled, inputs)
+    for result, exp in zip(results, expected):
+        assert all_almost_equal(result, exp)
+
+
+def test_compile_errors():
+    """Compilation requires operators between linear spaces."""
+    with pytest.raises(TypeError):
+        odl.operator.compile(odl.solvers.L2Norm(SPACE))
+    compiled = odl.operator.compile(LAPLACE)
+    assert odl.operator.compile(compiled) is compiled
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -791,6 +791,193 @@ def test_nonlinear_functional_operators():
     assert C(x) == pytest.approx(mat(x / 2.0))
 
 
+def test_operator_apply_batch():
+    """Check `Operator.apply_batch` against evaluation in a loop."""
+    mat = np.random.rand(4, 3)
+    op = MultiplyAndSquareOp(mat)
+    x_batch = np.random.rand(2, 5, 3)
+    expected = np.array([[mult_sq_np(mat, x) for x in xs] for xs in x_batch])
+
+    result = op.apply_batch(x_batch)
+    assert result.shape == (2, 5, 4)
+    assert all_almost_equal(result, expected)
+
+    # Given `out`, also non-contiguous
+    out = np.empty((2, 5, 4))
+    assert op.apply_batch(x_batch, out=out) is out
+    assert all_almost_equal(out, expected)
+    out = np.empty((4, 2, 5)).T
+    op.apply_batch(x_batch.swapaxes(0, 1), out=out)
+    assert all_almost_equal(out, expected.swapaxes(0, 1))
+
+    # Single input without batch axes
+    assert all_almost_equal(op.apply_batch(x_batch[0, 0]), expected[0, 0])
+
+    # Composition and scaling of batched operators
+    comp = 2 * (op * odl.ScalingOperator(op.domain, 3.0))
+    expected = np.array([2 * mult_sq_np(mat, 3 * x) for x in x_batch[0]])
+    assert all_almost_equal(comp.apply_batch(x_batch[0]), expected)
+
+    with pytest.raises(ValueError):
+        op.apply_batch(np.zeros((2, 4)))
+    with pytest.raises(ValueError):
+        op.apply_batch(x_batch, out=np.empty((2, 5, 3)))
+
+
+def test_functional_apply_batch():
+    """Check `Operator.apply_batch` for functionals."""
+    r3 = odl.rn(3)
+    op = SumSquaredFunctional(r3)
+    x_batch = np.random.rand(6, 3)
+
+    result = op.apply_batch(x_batch)
+    assert result.shape == (6,)
+    assert all_almost_equal(result, np.sum(x_batch ** 2, axis=1))
+
+    # Adjoint of a linear functional maps from the field
+    func = odl.InnerProductOperator(r3.element([1, 2, 3]))
+    scalars = np.array([1.0, -2.0])
+    assert all_almost_equal(func.adjoint.apply_batch(scalars),
+                            scalars[:, None] * [1, 2, 3])
+
+
+def test_operator_norm_cache():
+    """Check that norm estimates are cached on the operator."""
+    space = odl.uniform_discr(0, 1, 10)
+    op = MatrixOperator(np.random.rand(10, 10), domain=space, range=space)
+    opnorm = op.norm(estimate=True)
+    assert opnorm == pytest.approx(np.linalg.norm(op.matrix, 2), rel=1e-2)
+
+    # Cache hit, also if the estimate would be different
+    op.matrix[:] *= 2
+    assert op.norm(estimate=True) == opnorm
+
+    # Arguments trigger a new estimate, which replaces the cached one
+    ncalls = [0]
+
+    def count_calls(x):
+        ncalls[0] += 1
+
+    new_opnorm = op.norm(estimate=True, callback=count_calls)
+    assert ncalls[0] > 0
+    assert new_opnorm == pytest.approx(2 * opnorm, rel=1e-2)
+    assert op.norm(estimate=True) == new_opnorm
+
+    # Clearing the cache triggers a new estimate without arguments
+    op.matrix[:] *= 2
+    op.clear_norm_cache()
+    assert op.norm(estimate=True) == pytest.approx(4 * opnorm, rel=1e-2)
+
+
+def test_operator_norm_bound():
+    """Check upper norm bounds of composite operators."""
+    space = odl.rn(3)
+    mat = np.random.rand(3, 3)
+    A = MatrixOperator(mat)
+    S = odl.ScalingOperator(space, -2.0)
+    opnorm_A = A.norm(estimate=True)
+
+    assert A.norm_bound() == opnorm_A
+    assert S.norm_bound() == 2
+    assert (A + S).norm_bound() == pytest.approx(opnorm_A + 2)
+    assert (A * S).norm_bound() == pytest.approx(2 * opnorm_A)
+    assert (3 * A).norm_bound() == pytest.approx(3 * opnorm_A)
+    assert (A * 3).norm_bound() == pytest.approx(3 * opnorm_A)
+    assert (A * (A + S)).norm_bound() == pytest.approx(
+        opnorm_A * (opnorm_A + 2))
+
+    # Product space operators
+    assert odl.BroadcastOperator(A, S).norm_bound() == pytest.approx(
+        np.hypot(opnorm_A, 2))
+    assert odl.ReductionOperator(A, S).norm_bound() == pytest.approx(
+        np.hypot(opnorm_A, 2))
+    assert odl.DiagonalOperator(A, S).norm_bound() == pytest.approx(
+        max(opnorm_A, 2))
+    prod_op = odl.ProductSpaceOperator([[A, S], [0, S]])
+    assert prod_op.norm_bound() == pytest.approx(
+        np.linalg.norm([[opnorm_A, 2], [0, 2]], 2))
+
+    # The bounds are valid
+    for op in [A + S, A * S, prod_op]:
+        assert op.norm_bound() >= op.norm(estimate=True) * (1 - 1e-3)
+
+
+def test_call_unchecked():
+    """Unchecked calls should give the same results without checks."""
+    space = odl.uniform_discr(0, 1, 5)
+    other_space = odl.uniform_discr(0, 1, 5)
+    mat = np.random.rand(5, 5)
+    op = MatrixOperator(mat, domain=space, range=space)
+    x = noise_element(space)
+    expected = op(x)
+
+    # Arrays are converted, elements of equal spaces are accepted
+    result = op.call_unchecked(x.asarray())
+    assert result in op.range
+    assert all_almost_equal(result, expected)
+    assert all_almost_equal(op.call_unchecked(other_space.element(x)),
+                            expected)
+    out = op.range.element()
+    assert op.call_unchecked(x, out=out) is out
+    assert all_almost_equal(out, expected)
+
+    # Disabling the checks in a context
+    op = odl.ScalingOperator(odl.rn(3), 2.0)
+    wrong = odl.rn(4).one()
+    with pytest.raises(OpDomainError):
+        op(wrong, out=wrong)
+    with odl.input_checks(False):
+        op(wrong, out=wrong)
+        assert all_almost_equal(wrong, [2, 2, 2, 2])
+        with odl.input_checks(True):
+            with pytest.raises(OpDomainError):
+                op(wrong, out=wrong)
+        op(wrong, out=wrong)
+        assert all_almost_equal(wrong, [4, 4, 4, 4])
+    with pytest.raises(OpDomainError):
+        op(wrong, out=wrong)
+
+
+def test_input_checks_thread_local():
+    """Disabling the checks should only affect the current thread."""
+    space = odl.rn(3)
+    op = odl.IdentityOperator(space)
+    wrong = odl.rn(4).one()
+
+    def call_in_thread(_):
+        try:
+            op(wrong)
+        except OpDomainError:
+            return True
+        return False
+
+    with odl.input_checks(False):
+        with odl.util.num_threads(2):
+            assert all(odl.util.parallel_map(call_in_thread, range(2)))
+
+
+def test_input_checks_in_solver_callbacks():
+    """Solvers should not skip the checks in user callbacks."""
+    space = odl.rn(3)
+    op = odl.ScalingOperator(space, 0.5)
+    wrong = odl.rn(4).one()
+    calls = []
+
+    def check(x):
+        with pytest.raises(OpDomainError):
+            op(wrong, out=wrong)
+        calls.append(x)
+
+    odl.solvers.landweber(op, space.one(), space.one(), niter=2,
+                          projection=check, callback=check)
+    assert len(calls) == 4
+
+    func = odl.solvers.L2NormSquared(space)
+    odl.solvers.steepest_descent(func, space.one(), line_search=0.1,
+                                 maxiter=2, projection=check, callback=check)
+    assert len(calls) == 8
+
+
 # test functions to dispatch
 def f1(x):
     """f1(x)
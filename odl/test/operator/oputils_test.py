@@ -7,11 +7,14 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+import warnings
+
 import numpy as np
 import pytest
 
 import odl
-from odl.operator.oputils import matrix_representation, power_method_opnorm
+from odl.operator.oputils import (
+    lanczos_opnorm, matrix_representation, power_method_opnorm)
 from odl.operator.pspace_ops import ProductSpaceOperator
 from odl.util.testutils import all_almost_equal
 
@@ -211,5 +214,60 @@ def test_power_method_opnorm_exceptions():
         power_method_opnorm(op, maxiter=1, xstart=op.domain.one())
 
 
+def test_lanczos_opnorm():
+    """Test the Lanczos method against known operator norms."""
+    # Symmetric matrix with eigenvalues 1.2 and -1.0
+    mat = np.array([[0.9509044, -0.64566614],
+                    [-0.44583952, -0.95923051]])
+    op = odl.MatrixOperator(mat)
+    assert lanczos_opnorm(op) == pytest.approx(1.2, rel=1e-4)
+
+    # Non-square matrix, start close to the wrong singular vector
+    mat = np.array([[-1.52441557, 5.04276365],
+                    [1.90246927, 2.54424763],
+                    [5.32935411, 0.04573162]])
+    op = odl.MatrixOperator(mat)
+    xstart = odl.rn(2).element([1, 1])
+    assert lanczos_opnorm(op, xstart=xstart) == pytest.approx(6, rel=1e-4)
+
+    # Needs fewer evaluations than the power method for similar accuracy
+    space = odl.uniform_discr([0, 0], [1, 1], (20, 20))
+    grad = odl.Gradient(space)
+    true_opnorm = power_method_opnorm(grad, maxiter=1000, rtol=1e-8)
+    with pytest.warns(RuntimeWarning):
+        est_opnorm = lanczos_opnorm(grad, maxiter=15)
+    assert est_opnorm == pytest.approx(true_opnorm, rel=1e-2)
+
+    # No warning if the tolerance is reached
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        lanczos_opnorm(grad, maxiter=100)
+
+    with pytest.raises(ValueError):
+        lanczos_opnorm(op, maxiter=0)
+    with pytest.raises(ValueError):
+        lanczos_opnorm(op, xstart=op.domain.zero())
+
+
+def test_lanczos_opnorm_product_ops():
+    """Test the Lanczos method with parallel evaluation of components."""
+    space = odl.uniform_discr(0, 1, 10)
+    I = odl.IdentityOperator(space)
+    mat = np.random.rand(10, 10)
+    A = odl.MatrixOperator(mat, domain=space, range=space)
+
+    op = odl.BroadcastOperator(A, 2 * I)
+    true_opnorm = np.linalg.norm(np.vstack([mat, 2 * np.eye(10)]), 2)
+    with odl.util.parallel.num_threads(2):
+        assert lanczos_opnorm(op) == pytest.approx(true_opnorm, rel=1e-4)
+
+    op = odl.ProductSpaceOperator([[A, I], [0, 3 * I]])
+    true_opnorm = np.linalg.norm(np.block([[mat, np.eye(10)],
+                                           [np.zeros((10, 10)),
+                                            3 * np.eye(10)]]), 2)
+    with odl.util.parallel.num_threads(2):
+        assert lanczos_opnorm(op) == pytest.approx(true_opnorm, rel=1e-4)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
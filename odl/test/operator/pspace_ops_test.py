@@ -7,10 +7,16 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+
+import os
+import threading
+
 import pytest
 
 import odl
-from odl.util.testutils import all_almost_equal, simple_fixture
+from odl.tomo.backends.numpy_sparse import NumpySparseImpl
+from odl.util.parallel import num_threads
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
 
 
 base_op = simple_fixture(
@@ -240,5 +246,175 @@ def test_comp_proj_adjoint_slice():
     assert result == proj.adjoint(x, out=proj.domain.element())
 
 
+sampling = simple_fixture(
+    'sampling', ['sequential', 'random', 'herman_meyer', 'golden_angle'])
+
+
+def test_subset_op_sampling(sampling):
+    """Test the visiting orders of the subsets."""
+    I = odl.IdentityOperator(odl.rn(2))
+    for n in [1, 5, 8, 12]:
+        op = odl.SubsetOperator(*([I] * n), sampling=sampling, seed=1)
+        for epoch in range(3):
+            assert sorted(op.epoch_order(epoch)) == list(range(n))
+
+        samples = [op.sample(k)[0] for k in range(2 * n)]
+        assert sorted(samples[:n]) == list(range(n))
+        assert sorted(samples[n:]) == list(range(n))
+
+    op = odl.SubsetOperator(*([I] * 8), sampling='herman_meyer')
+    assert op.epoch_order() == [0, 4, 2, 6, 1, 5, 3, 7]
+    op = odl.SubsetOperator(*([I] * 6), sampling='herman_meyer')
+    assert op.epoch_order() == [0, 3, 1, 4, 2, 5]
+
+    op = odl.SubsetOperator(I, I, I, sampling=lambda k: [2, 1, 0])
+    assert op.epoch_order() == [2, 1, 0]
+
+    with pytest.raises(ValueError):
+        odl.SubsetOperator(I, I, sampling='invalid')
+    with pytest.raises(ValueError):
+        odl.SubsetOperator(I, I, sampling=lambda k: [0, 0]).epoch_order()
+
+
+def test_subset_op_cache():
+    """Test the cached sensitivities and norms of the subsets."""
+    space = odl.rn(3)
+    ops = [odl.ScalingOperator(space, c) for c in [1.0, 2.0, 3.0]]
+    op = odl.SubsetOperator(*ops)
+
+    sens = op.sensitivities
+    assert op.sensitivities is sens
+    for opi, sensi in zip(ops, sens):
+        assert all_almost_equal(sensi, opi.adjoint(opi.range.one()))
+
+    norms = op.subset_norms
+    assert op.subset_norms is norms
+    assert all_almost_equal(norms, [1, 2, 3])
+
+
+def test_subset_op_from_ray_transform():
+    """Test splitting a ray transform into angle subsets."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=7)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy_cpu')
+    op = odl.SubsetOperator.from_ray_transform(ray_trafo, 3)
+    assert len(op) == 3
+
+    phantom = odl.phantom.shepp_logan(space, modified=True)
+    data = ray_trafo(phantom)
+    split_data = op.split_data(data)
+    assert split_data in op.range
+    assert all_almost_equal(op(phantom), split_data)
+    assert all_almost_equal(split_data[1], data.asarray()[1::3])
+
+    with pytest.raises(ValueError):
+        odl.SubsetOperator.from_ray_transform(ray_trafo, 8)
+    with pytest.raises(ValueError):
+        odl.SubsetOperator(*op.operators).split_data(data)
+
+
+def test_subset_op_from_sparse_ray_transform(tmpdir):
+    """Test that sparse subsets use the rows of the full system matrix."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=7)
+    cache_dir = str(tmpdir)
+    proj_space = odl.uniform_discr_frompartition(geometry.partition,
+                                                 weighting=2.0)
+    impl = NumpySparseImpl(geometry, space, proj_space, cache_dir=cache_dir)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl=impl,
+                                      proj_space=proj_space)
+    op = odl.SubsetOperator.from_ray_transform(ray_trafo, 3)
+
+    phantom = odl.phantom.shepp_logan(space, modified=True)
+    data = ray_trafo(phantom)
+    assert all_almost_equal(op(phantom), op.split_data(data))
+    y = op.range.one()
+    assert all_almost_equal(op.adjoint(y),
+                            ray_trafo.adjoint(ray_trafo.range.one()))
+    for sub_op in op:
+        assert sub_op.range.weighting.const == 2.0
+        assert sub_op.get_impl()._parent is impl
+    # Only the full matrix is stored
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_pspace_op_parallel_call():
+    """Test that concurrent evaluation matches serial evaluation."""
+    futures = pytest.importorskip('concurrent.futures')
+    r3 = odl.rn(3)
+    scale = odl.ScalingOperator(r3, 2.0)
+    mult = odl.MultiplyOperator(r3.element([1, -2, 3]))
+    pspace = odl.ProductSpace(r3, 3)
+    ops = [
+        odl.ProductSpaceOperator([[scale, mult, 0],
+                                  [0, 0, 0],
+                                  [mult, 0, scale ** 2]],
+                                 domain=pspace, range=pspace),
+        odl.BroadcastOperator(scale, mult, scale * mult),
+        odl.ReductionOperator(scale, mult, scale * mult),
+        odl.DiagonalOperator(scale, mult, mult * scale),
+    ]
+
+    def with_kwargs(op, **kwargs):
+        if isinstance(op, odl.ProductSpaceOperator):
+            return odl.ProductSpaceOperator(op.ops, op.domain, op.range,
+                                            **kwargs)
+        else:
+            return op.__class__(*op.operators, **kwargs)
+
+    for op in ops + [op.adjoint for op in ops]:
+        x = noise_element(op.domain)
+        expected = op(x)
+
+        with num_threads(4), futures.ThreadPoolExecutor(2) as executor:
+            for kwargs in [{'num_threads': 4}, {'executor': executor}]:
+                par_op = with_kwargs(op, **kwargs)
+                assert all_almost_equal(par_op(x), expected)
+                out = par_op.range.element()
+                assert par_op(x, out=out) is out
+                assert all_almost_equal(out, expected)
+
+
+def test_pspace_op_parallel_options():
+    """Test the per-operator concurrency options."""
+    r3 = odl.rn(3)
+
+    # Sequential evaluation by default, also with several threads
+    threads = set()
+
+    class RecordThread(odl.Operator):
+        def __init__(self):
+            super(RecordThread, self).__init__(r3, r3, linear=True)
+
+        def _call(self, x, out):
+            threads.add(threading.current_thread())
+            out.assign(x)
+
+    op = odl.BroadcastOperator(RecordThread(), 4)
+    assert op.prod_op.num_threads is None
+    with num_threads(4):
+        op(r3.one())
+    assert threads == {threading.current_thread()}
+
+    op = odl.ReductionOperator(odl.IdentityOperator(r3), 3, num_threads=2)
+    assert op.prod_op.num_threads == 2
+    assert op.adjoint.prod_op.num_threads == 2
+    assert op.derivative(op.domain.zero()).prod_op.num_threads == 2
+
+    diag = odl.DiagonalOperator(odl.IdentityOperator(r3), 2, num_threads=1)
+    assert diag.adjoint.num_threads == 1
+    assert diag.inverse.num_threads == 1
+    x = noise_element(diag.domain)
+    with num_threads(4):
+        assert all_almost_equal(diag(x), x)
+
+    with pytest.raises(ValueError):
+        odl.DiagonalOperator(odl.IdentityOperator(r3), 2, num_threads=0)
+    with pytest.raises(TypeError):
+        odl.BroadcastOperator(odl.IdentityOperator(r3), 2, executor=4)
+    with pytest.raises(TypeError):
+        odl.BroadcastOperator(odl.IdentityOperator(r3), 2, nthreads=2)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -191,6 +191,26 @@ def test_pointwise_norm_weighted(exponent):
     assert all_almost_equal(out, true_norm)
 
 
+def test_pointwise_norm_apply_batch(exponent):
+    fspace = odl.uniform_discr([0, 0], [1, 1], (2, 3))
+    vfspace = ProductSpace(fspace, 3)
+    ops = [PointwiseNorm(vfspace, exponent),
+           PointwiseNorm(vfspace, exponent, weighting=[1.0, 2.0, 3.0])]
+    x_batch = np.random.randn(4, 3, 2, 3)
+
+    for pwnorm in ops:
+        expected = np.stack([pwnorm(x).asarray() for x in x_batch])
+        assert all_almost_equal(pwnorm.apply_batch(x_batch), expected)
+
+    # Batched multiplication, also with the field as domain
+    mult = vfspace.element(np.random.rand(3, 2, 3))
+    for op in [odl.MultiplyOperator(mult),
+               odl.MultiplyOperator(mult, domain=vfspace.field)]:
+        xs = np.random.rand(4, *getattr(op.domain, 'shape', ()))
+        expected = np.stack([op(x).asarray() for x in xs])
+        assert all_almost_equal(op.apply_batch(xs), expected)
+
+
 def test_pointwise_norm_gradient_real(exponent):
     # The operator is not differentiable for exponent 'inf'
     if exponent == float('inf'):
@@ -117,6 +117,29 @@ def test_indicator_lp_unit_ball(space, sigma, exponent):
     assert func(norm_less_than_one) == 0
 
 
+def test_indicator_group_l1_unit_ball_radius():
+    """Test the radius of the group-L1 indicator and its scaling."""
+    space = odl.ProductSpace(odl.uniform_discr(0, 1, 7), 2)
+    x = noise_element(space)
+    pw_norm = odl.PointwiseNorm(space)(x)
+    lam = 0.3
+
+    func = odl.solvers.IndicatorGroupL1UnitBall(space, radius=lam)
+    assert func(1.01 * lam * x / pw_norm.ufuncs.max()) == np.inf
+    assert func(0.99 * lam * x / pw_norm.ufuncs.max()) == 0
+
+    # The conjugate of the scaled norm is a ball with the scaled radius
+    func_cc = (lam * odl.solvers.GroupL1Norm(space)).convex_conj
+    assert isinstance(func_cc, odl.solvers.IndicatorGroupL1UnitBall)
+    assert func_cc.radius == lam
+    expected = lam * x / pw_norm.ufuncs.maximum(lam)
+    assert all_almost_equal(func_cc.proximal(2.0)(x), expected)
+
+    # Scaling the argument shrinks the ball
+    func_scaled = odl.solvers.IndicatorGroupL1UnitBall(space) * (1 / lam)
+    assert func_scaled.radius == pytest.approx(lam)
+
+
 def test_L2_norm(space, sigma):
     """Test the L2-norm."""
     func = odl.solvers.L2Norm(space)
@@ -515,6 +515,71 @@ def test_translation_proximal_stepsizes():
     assert all_almost_equal(y_array, expected_result)
 
 
+def test_proximal_cache():
+    """Test caching of proximal operators for scalar step sizes."""
+    space = odl.rn(3)
+    func = odl.solvers.L1Norm(space).translated([1, 2, 3])
+    prox = func.proximal(0.5)
+    assert func.proximal(0.5) is prox
+    assert func.proximal(np.float32(0.5)) is prox
+    assert func.proximal(2.0) is not prox
+
+    # Non-scalar step sizes and keyword arguments are not cached
+    assert func.proximal([0.5] * 3) is not func.proximal([0.5] * 3)
+    assert func.proximal(sigma=0.5) is not prox
+
+    # Setting attributes invalidates the cache
+    func.grad_lipschitz = 1.0
+    assert func.proximal(0.5) is not prox
+
+    # The size is bounded
+    odl.solvers.set_proximal_cache_size(1)
+    try:
+        prox = func.proximal(0.5)
+        func.proximal(2.0)
+        assert func.proximal(0.5) is not prox
+    finally:
+        odl.solvers.set_proximal_cache_size(8)
+    with pytest.raises(ValueError):
+        odl.solvers.set_proximal_cache_size(-1)
+
+    # Subclasses calling the parent proximal get the right operator
+    class ScaledL1(odl.solvers.L1Norm):
+        @property
+        def proximal(self):
+            parent_prox = super(ScaledL1, self).proximal
+            return lambda sigma: parent_prox(2 * sigma)
+
+    x = space.element([1, -2, 3])
+    assert all_almost_equal(ScaledL1(space).proximal(0.5)(x),
+                            odl.solvers.L1Norm(space).proximal(1.0)(x))
+
+
+def test_proximal_cache_solver():
+    """Solvers with constant step sizes should build each proximal once."""
+    space = odl.rn(3)
+    ncalls = [0]
+
+    class CountingL2(odl.solvers.L2NormSquared):
+        @property
+        def proximal(self):
+            parent_prox = super(CountingL2, self).proximal
+
+            def counting_prox(sigma):
+                ncalls[0] += 1
+                return parent_prox(sigma)
+
+            return counting_prox
+
+    f = CountingL2(space)
+    g = [odl.solvers.L1Norm(space)]
+    L = [odl.IdentityOperator(space)]
+    x = space.one()
+    odl.solvers.douglas_rachford_pd(x, f, g, L, niter=10, tau=0.5,
+                                    sigma=[0.5])
+    assert ncalls[0] == 1
+
+
 def test_multiplication_with_vector(space):
     """Test for multiplying a functional with a vector, both left and right."""
     # Less strict checking for single precision
@@ -24,7 +24,9 @@ import numpy as np
                         'conjugate_gradient_normal',
                         'mlem',
                         'osmlem',
-                        'kaczmarz'])
+                        'osmlem_subsets',
+                        'kaczmarz',
+                        'kaczmarz_subsets'])
 def iterative_solver(request):
     """Return a solver given by a name with interface solve(op, x, rhs)."""
     solver_name = request.param
@@ -57,11 +59,20 @@ def iterative_solver(request):
     elif solver_name == 'osmlem':
         def solver(op, x, rhs):
             odl.solvers.osmlem([op, op], x, [rhs, rhs], niter=10)
+    elif solver_name == 'osmlem_subsets':
+        def solver(op, x, rhs):
+            subsets = odl.SubsetOperator(op, op, sampling='herman_meyer')
+            odl.solvers.osmlem(subsets, x, [rhs, rhs], niter=10)
     elif solver_name == 'kaczmarz':
         def solver(op, x, rhs):
             norm2 = op.adjoint(op(x)).norm() / x.norm()
             odl.solvers.kaczmarz([op, op], x, [rhs, rhs], niter=20,
                                  omega=0.5 / norm2)
+    elif solver_name == 'kaczmarz_subsets':
+        def solver(op, x, rhs):
+            subsets = odl.SubsetOperator(op, op, sampling='random', seed=0)
+            odl.solvers.kaczmarz(subsets, x, [rhs, rhs], niter=20,
+                                 omega=None)
     else:
         raise ValueError('solver not valid')
 
@@ -17,7 +17,7 @@ from odl.solvers.nonsmooth.proximal_operators import (
     combine_proximals, proximal_const_func,
     proximal_box_constraint, proximal_nonnegativity,
     proximal_convex_conj_l1, proximal_convex_conj_l1_l2,
-    proximal_l2,
+    proximal_l1_l2, proximal_l2,
     proximal_convex_conj_l2_squared,
     proximal_convex_conj_kl, proximal_convex_conj_kl_cross_entropy)
 from odl.util.testutils import all_almost_equal
@@ -392,6 +392,34 @@ def test_proximal_convconj_l1_product_space():
     assert all_almost_equal(x_verify, x_opt)
 
 
+def test_proximal_l1_l2_blocked(monkeypatch):
+    """Blocked group-L1 proximals should match the unblocked formulas."""
+    import odl.operator.tensor_ops as tensor_ops
+    monkeypatch.setattr(tensor_ops, '_POINTWISE_BLOCK_BYTES', 64)
+
+    space = odl.ProductSpace(odl.uniform_discr([0, 0], [1, 1], (9, 5)), 3)
+    x = odl.phantom.white_noise(space)
+    g = odl.phantom.white_noise(space)
+    x_arr, g_arr = x.asarray(), g.asarray()
+    lam, sigma = 1.5, 0.5
+
+    # Projection onto the pointwise l2 ball with data
+    diff = x_arr - sigma * g_arr
+    norm = np.sqrt(np.sum(diff ** 2, axis=0))
+    expected = lam * diff / np.maximum(lam, norm)
+    prox = proximal_convex_conj_l1_l2(space, lam=lam, g=g)(sigma)
+    assert all_almost_equal(prox(x), expected)
+
+    # Group shrinkage, also with aliased input and output
+    diff = x_arr - g_arr
+    norm = np.sqrt(np.sum(diff ** 2, axis=0))
+    expected = x_arr - diff / np.maximum(norm / (sigma * lam), 1)
+    prox = proximal_l1_l2(space, lam=lam, g=g)(sigma)
+    assert all_almost_equal(prox(x), expected)
+    prox(x, out=x)
+    assert all_almost_equal(x, expected)
+
+
 def test_proximal_convconj_kl_simple_space():
     """Test for proximal factory for the convex conjugate of KL divergence."""
 
@@ -219,6 +219,23 @@ def test_lincomb():
     assert all_almost_equal(z, expected)
 
 
+def test_lincomb_n():
+    H = odl.rn(2)
+    HxH = odl.ProductSpace(H, odl.uniform_discr(0, 1, 3))
+
+    [x_arr, y_arr, z_arr], [x, y, z] = noise_elements(HxH, 3)
+    a, b, c = 3.12, 1.23, -1.0
+
+    expected = [a * xi + b * yi + c * zi
+                for xi, yi, zi in zip(x_arr, y_arr, z_arr)]
+    out = HxH.lincomb_n([a, b, c], [x, y, z])
+    assert all_almost_equal(out, expected)
+
+    # Aliased output
+    HxH.lincomb_n([a, b, c], [x, y, z], out=y)
+    assert all_almost_equal(y, expected)
+
+
 def test_multiply():
     H = odl.rn(2)
     HxH = odl.ProductSpace(H, H)
@@ -11,6 +11,7 @@
 from __future__ import division
 
 import operator
+import os
 import sys
 
 import numpy as np
@@ -23,8 +24,8 @@ from odl.space.npy_tensors import (
     NumpyTensorSpaceConstWeighting, NumpyTensorSpaceCustomDist,
     NumpyTensorSpaceCustomInner, NumpyTensorSpaceCustomNorm)
 from odl.util.testutils import (
-    all_almost_equal, all_equal, noise_array, noise_element, noise_elements,
-    simple_fixture)
+    all_almost_equal, all_equal, dtype_tol, noise_array, noise_element,
+    noise_elements, simple_fixture)
 from odl.util.ufuncs import UFUNCS
 
 # --- Test helpers --- #
@@ -448,6 +449,142 @@ def test_lincomb_discontig(odl_tspace_impl):
             _test_lincomb(tspace, a, b, discontig=True)
 
 
+def test_lincomb_n(tspace):
+    """Validate lincomb_n against direct result using arrays."""
+    coeffs = [1, -1, 0, 3.41]
+
+    [x_arr, y_arr, z_arr, w_arr], [x, y, z, w] = noise_elements(tspace, 4)
+    expected = x_arr - y_arr + 3.41 * w_arr
+    out = tspace.lincomb_n(coeffs, [x, y, z, w])
+    assert all_almost_equal(out, expected)
+
+    # Output aliased with an input, and repeated inputs
+    expected = 2 * x_arr + y_arr - z_arr
+    tspace.lincomb_n([1, 1, -1, 1], [x, y, z, x], out=x)
+    assert all_almost_equal([x, y, z], [expected, y_arr, z_arr])
+
+    # Few terms
+    assert all_almost_equal(tspace.lincomb_n([2], [y]), 2 * y_arr)
+    assert all_almost_equal(tspace.lincomb_n([2, 1], [y, z]),
+                            2 * y_arr + z_arr)
+
+    with pytest.raises(ValueError):
+        tspace.lincomb_n([1, 2], [x])
+    with pytest.raises(ValueError):
+        tspace.lincomb_n([], [])
+    with pytest.raises(LinearSpaceTypeError):
+        tspace.lincomb_n([1, 1], [x, odl.rn((4, 3)).zero()])
+
+
+def test_chunked_large_arrays(odl_floating_dtype, monkeypatch):
+    """Test the chunked code paths used for large arrays."""
+    # Make "large" arrays small enough for a test, and let chunks use BLAS
+    npy_tensors = odl.space.npy_tensors
+    monkeypatch.setattr(npy_tensors, 'THRESHOLD_MEDIUM', 10)
+    monkeypatch.setattr(npy_tensors, 'THRESHOLD_LARGE', 100)
+    monkeypatch.setattr(npy_tensors, 'CHUNK_SIZE', 64)
+
+    tspace = odl.tensor_space((30, 40), dtype=odl_floating_dtype)
+    scalar_values = [0, 1, -1, 3.41]
+    for a in scalar_values:
+        for b in scalar_values:
+            _test_lincomb(tspace, a, b, discontig=False)
+            _test_lincomb(tspace, a, b, discontig=True)
+
+    [xarr, yarr], [x, y] = noise_elements(tspace, n=2)
+    tol = dtype_tol(odl_floating_dtype)
+    assert all_almost_equal(tspace.multiply(x, y), xarr * yarr)
+    assert all_almost_equal(tspace.divide(x, y), xarr / yarr)
+    assert tspace.inner(x, y) == pytest.approx(np.vdot(yarr, xarr), rel=tol)
+    assert tspace.norm(x) == pytest.approx(np.linalg.norm(xarr.ravel()),
+                                           rel=tol)
+    assert tspace.dist(x, y) == pytest.approx(
+        np.linalg.norm((xarr - yarr).ravel()), rel=tol)
+
+    [xarr, yarr, zarr], [x, y, z] = noise_elements(tspace, n=3)
+    tspace.lincomb_n([2, -1, 3], [x, y, z], out=y)
+    assert all_almost_equal(y, 2 * xarr - yarr + 3 * zarr)
+
+    # Mixed memory order, requires blocks along an axis
+    z = tspace.element(np.asfortranarray(yarr))
+    out = tspace.element()
+    tspace.lincomb(2, x, -1, z, out=out)
+    assert all_almost_equal(out, 2 * xarr - yarr)
+    assert tspace.inner(x, z) == pytest.approx(np.vdot(yarr, xarr), rel=tol)
+
+    # Weighting with an array
+    weight = _pos_array(odl.rn((30, 40), dtype=tspace.real_dtype))
+    tspace_w = odl.tensor_space((30, 40), dtype=odl_floating_dtype,
+                                weighting=weight)
+    [xarr, yarr], [x, y] = noise_elements(tspace_w, n=2)
+    assert tspace_w.inner(x, y) == pytest.approx(
+        np.vdot(yarr, xarr * weight), rel=tol)
+
+
+def test_chunked_without_thread_pool(monkeypatch):
+    """Test that chunked arithmetic runs serially without a thread pool."""
+    npy_tensors = odl.space.npy_tensors
+    monkeypatch.setattr(npy_tensors, 'THRESHOLD_LARGE', 100)
+    monkeypatch.setattr(npy_tensors, 'CHUNK_SIZE', 64)
+    # Simulate Python 2 without the `futures` backport
+    monkeypatch.setattr(odl.util.parallel, 'ThreadPoolExecutor', None)
+    monkeypatch.setattr(odl.util.parallel, '_EXECUTOR', None)
+
+    tspace = odl.rn((30, 40))
+    [xarr, yarr], [x, y] = noise_elements(tspace, n=2)
+    with odl.util.num_threads(4):
+        assert all_almost_equal(tspace.lincomb(2, x, -1, y), 2 * xarr - yarr)
+        assert tspace.inner(x, y) == pytest.approx(np.vdot(yarr, xarr))
+
+
+def test_memmap_storage(odl_floating_dtype, monkeypatch, tmpdir):
+    """Test spaces with elements stored in memory-mapped files."""
+    npy_tensors = odl.space.npy_tensors
+    monkeypatch.setattr(npy_tensors, 'CHUNK_SIZE', 64)
+    storage_dir = str(tmpdir)
+    tspace = odl.tensor_space((30, 40), dtype=odl_floating_dtype,
+                              storage='memmap', storage_dir=storage_dir)
+    assert tspace == odl.tensor_space((30, 40), dtype=odl_floating_dtype)
+    assert "storage='memmap'" in repr(tspace)
+    with pytest.raises(ValueError):
+        odl.rn(3, storage='disk')
+    with pytest.raises(ValueError):
+        odl.rn(3, storage_dir=storage_dir)
+
+    [xarr, yarr], [x, y] = noise_elements(tspace, n=2)
+    for elem in [x, tspace.element(), tspace.zero(), tspace.one(), x.copy(),
+                 x.astype(tspace.complex_dtype), x[1:], x + y, np.sin(x)]:
+        assert isinstance(elem.data, np.memmap)
+        assert elem.space.storage == 'memmap'
+    assert all_equal(tspace.zero(), np.zeros(tspace.shape))
+    assert all_equal(tspace.one(), np.ones(tspace.shape))
+    assert all_equal(x.copy(), xarr)
+    # Temporary files are removed right away
+    assert os.listdir(storage_dir) == []
+
+    # Chunked arithmetic, reductions and ufuncs
+    tol = dtype_tol(odl_floating_dtype)
+    tspace.lincomb(2, x, -1, y, out=y)
+    assert all_almost_equal(y, 2 * xarr - yarr)
+    yarr = y.asarray().copy()
+    assert all_almost_equal(tspace.multiply(x, y), xarr * yarr)
+    assert tspace.inner(x, y) == pytest.approx(np.vdot(yarr, xarr), rel=tol)
+    assert tspace.norm(x) == pytest.approx(np.linalg.norm(xarr.ravel()),
+                                           rel=tol)
+    assert tspace.dist(x, y) == pytest.approx(
+        np.linalg.norm((xarr - yarr).ravel()), rel=tol)
+    assert all_almost_equal(np.add(x, 1), xarr + 1)
+    assert all_equal(np.less(x, y), xarr < yarr)
+    out = tspace.element()
+    np.multiply(x, y, out=out)
+    assert all_almost_equal(out, xarr * yarr)
+
+    tspace_1 = odl.tensor_space((30, 40), dtype=odl_floating_dtype,
+                                exponent=1, storage='memmap')
+    assert tspace_1.norm(tspace_1.element(xarr)) == pytest.approx(
+        np.abs(xarr).sum(), rel=tol)
+
+
 def test_lincomb_exceptions(tspace):
     """Test whether lincomb raises correctly for bad output element."""
     other_space = odl.rn((4, 3), impl=tspace.impl)
@@ -0,0 +1,107 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the FBP filtering operator."""
+
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import odl
+from odl.util.parallel import num_threads
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture('geometry_type', ['par2d', 'fan', 'cone3d'])
+filter_type = simple_fixture(
+    'filter_type', ['Ram-Lak', 'Shepp-Logan', 'Cosine', 'Hamming', 'Hann'])
+padding = simple_fixture('padding', [True, False])
+
+
+def _ray_trafo(geometry_type):
+    """Return a small ray transform with the NumPy CPU back-end."""
+    if geometry_type == 'cone3d':
+        space = odl.uniform_discr([-20] * 3, [20] * 3, [32] * 3)
+        geometry = odl.tomo.cone_beam_geometry(space, src_radius=100,
+                                               det_radius=100)
+    else:
+        space = odl.uniform_discr([-20, -20], [20, 20], [64, 64])
+        if geometry_type == 'par2d':
+            geometry = odl.tomo.parallel_beam_geometry(space)
+        else:
+            geometry = odl.tomo.cone_beam_geometry(space, src_radius=100,
+                                                   det_radius=100)
+    return odl.tomo.RayTransform(space, geometry, impl='numpy_cpu')
+
+
+# --- Tests --- #
+
+
+def test_fbp_reconstruction(geometry_type, padding):
+    """FBP should approximately reconstruct the Shepp-Logan phantom."""
+    ray_trafo = _ray_trafo(geometry_type)
+    phantom = odl.phantom.shepp_logan(ray_trafo.domain, modified=True)
+    fbp = odl.tomo.fbp_op(ray_trafo, padding=padding)
+    reco = fbp(ray_trafo(phantom))
+
+    assert (reco - phantom).norm() / phantom.norm() < 0.4
+    # The ramp filter preserves the mean value
+    assert reco.inner(reco.space.one()) == pytest.approx(
+        phantom.inner(phantom.space.one()), rel=0.1)
+
+
+def test_fbp_filter_types(filter_type):
+    """Smoother filters should damp noise more than the plain ramp."""
+    ray_trafo = _ray_trafo('par2d')
+    noise = odl.phantom.white_noise(ray_trafo.range)
+    ram_lak = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Ram-Lak')
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo, filter_type=filter_type)
+    assert filter_op(noise).norm() <= ram_lak(noise).norm() * (1 + 1e-10)
+
+    # Callables are evaluated on the normalized frequencies
+    callable_op = odl.tomo.fbp_filter_op(ray_trafo, filter_type=np.copy)
+    assert all_almost_equal(callable_op(noise), ram_lak(noise))
+
+
+def test_fbp_filter_weighting(geometry_type):
+    """Fused weighting should equal multiplication before filtering."""
+    ray_trafo = _ray_trafo(geometry_type)
+    weights = noise_element(ray_trafo.range)
+    data = noise_element(ray_trafo.range)
+
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo)
+    weighted_op = odl.tomo.fbp_filter_op(ray_trafo, weighting=weights)
+    assert all_almost_equal(weighted_op(data), filter_op(weights * data))
+
+    # Adjoint
+    other = noise_element(ray_trafo.range)
+    assert weighted_op(data).inner(other) == pytest.approx(
+        data.inner(weighted_op.adjoint(other)), rel=1e-6)
+    assert filter_op.adjoint is filter_op
+
+
+def test_fbp_filter_inplace_and_threads():
+    """Aliased input and output and the number of threads should not
+    matter."""
+    ray_trafo = _ray_trafo('cone3d')
+    data = noise_element(ray_trafo.range)
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann')
+
+    with num_threads(1):
+        expected = filter_op(data)
+    with num_threads(4):
+        assert all_almost_equal(filter_op(data), expected)
+        filter_op(data, out=data)
+    assert all_almost_equal(data, expected)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
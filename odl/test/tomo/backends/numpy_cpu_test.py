@@ -0,0 +1,135 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the native NumPy CPU back-end."""
+
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo.backends.numpy_cpu import (
+    numpy_cpu_back_projector, numpy_cpu_forward_projector)
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture(
+    'geometry_type', ['par2d', 'cone2d', 'par3d', 'cone3d']
+)
+
+
+def _geometry_and_space(geometry_type):
+    """Return a small geometry and matching reconstruction space."""
+    # Detector cells roughly match the voxel size, which is required for
+    # the projectors to be close to adjoint
+    apart = odl.uniform_partition(0, 2 * np.pi, 16)
+    if geometry_type.endswith('2d'):
+        space = odl.uniform_discr([-5, -5], [5, 5], (20, 20))
+        dpart = odl.uniform_partition(-12, 12, 48)
+    else:
+        space = odl.uniform_discr([-5, -5, -5], [5, 5, 5], (16, 16, 16))
+        dpart = odl.uniform_partition([-12, -12], [12, 12], (40, 40))
+
+    if geometry_type == 'par2d':
+        geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+    elif geometry_type == 'par3d':
+        geom = odl.tomo.Parallel3dAxisGeometry(apart, dpart)
+    elif geometry_type == 'cone2d':
+        geom = odl.tomo.FanBeamGeometry(apart, dpart, src_radius=20,
+                                        det_radius=10)
+    else:
+        geom = odl.tomo.ConeBeamGeometry(apart, dpart, src_radius=20,
+                                         det_radius=10)
+    return geom, space
+
+
+# --- Tests --- #
+
+
+def test_numpy_cpu_projectors(geometry_type):
+    """Forward and backward projectors on small problems."""
+    geom, space = _geometry_and_space(geometry_type)
+    proj_space = odl.uniform_discr_frompartition(geom.partition)
+    phantom = odl.phantom.cuboid(space, min_pt=[0] * space.ndim,
+                                 max_pt=[3] * space.ndim)
+
+    proj_data = numpy_cpu_forward_projector(phantom, geom, proj_space)
+    assert proj_data.shape == proj_space.shape
+    assert proj_data.norm() > 0
+
+    backproj = numpy_cpu_back_projector(proj_data, geom, space)
+    assert backproj.shape == space.shape
+    assert backproj.norm() > 0
+
+    # Check <Ax, Ax> = <A^* A x, x>
+    assert proj_data.inner(proj_data) == pytest.approx(
+        backproj.inner(phantom), rel=0.05)
+
+
+def test_numpy_cpu_line_integrals(geometry_type):
+    """Projections of a constant volume should give the chord lengths."""
+    geom, space = _geometry_and_space(geometry_type)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_cpu')
+    proj_data = ray_trafo(space.one())
+
+    # Central ray through a side face of the cube at angle 0, length 10
+    mid = tuple(n // 2 for n in geom.det_partition.shape)
+    assert proj_data[(0,) + mid] == pytest.approx(10, rel=0.05)
+    # Rays outside of the shadow of the volume
+    assert np.max(np.abs(proj_data.asarray()[:, 0])) == 0
+
+
+def test_numpy_cpu_num_threads(geometry_type):
+    """Results should not depend on the number of threads."""
+    geom, space = _geometry_and_space(geometry_type)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_cpu')
+    phantom = odl.phantom.cuboid(space)
+    data = ray_trafo.range.one()
+
+    proj_data = ray_trafo(phantom)
+    backproj = ray_trafo.adjoint(data)
+    with odl.util.num_threads(1):
+        assert all_almost_equal(ray_trafo(phantom), proj_data)
+        assert all_almost_equal(ray_trafo.adjoint(data), backproj)
+
+
+def test_numpy_cpu_memmap_storage(tmpdir):
+    """Projections should be written to memory-mapped arrays."""
+    geom, space = _geometry_and_space('cone3d')
+    space_mm = odl.uniform_discr_frompartition(
+        space.partition, storage='memmap', storage_dir=str(tmpdir))
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_cpu')
+    ray_trafo_mm = odl.tomo.RayTransform(space_mm, geom, impl='numpy_cpu')
+    assert ray_trafo_mm.range.tspace.storage == 'memmap'
+
+    phantom = odl.phantom.cuboid(space)
+    proj_data = ray_trafo_mm(space_mm.element(phantom))
+    assert isinstance(proj_data.tensor.data, np.memmap)
+    assert all_almost_equal(proj_data, ray_trafo(phantom))
+
+    backproj = ray_trafo_mm.adjoint(proj_data)
+    assert isinstance(backproj.tensor.data, np.memmap)
+    assert all_almost_equal(backproj, ray_trafo.adjoint(ray_trafo(phantom)))
+
+
+def test_numpy_cpu_unsupported_geometry():
+    """Geometries with several motion parameters are not supported."""
+    space = odl.uniform_discr([-5, -5, -5], [5, 5, 5], (8, 8, 8))
+    apart = odl.uniform_partition([0, 0], [np.pi, np.pi], (4, 4))
+    dpart = odl.uniform_partition([-12, -12], [12, 12], (10, 10))
+    geom = odl.tomo.Parallel3dEulerGeometry(apart, dpart)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_cpu')
+    with pytest.raises(NotImplementedError):
+        ray_trafo(space.one())
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
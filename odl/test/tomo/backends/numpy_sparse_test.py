@@ -0,0 +1,143 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the sparse system matrix back-end."""
+
+from __future__ import division
+
+import os
+
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo.backends.numpy_sparse import (
+    NumpySparseImpl, numpy_sparse_system_matrix)
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture('geometry_type', ['par2d', 'cone3d'])
+
+
+def _geometry_and_space(geometry_type):
+    """Return a small geometry and matching reconstruction space."""
+    apart = odl.uniform_partition(0, 2 * np.pi, 12)
+    if geometry_type == 'par2d':
+        space = odl.uniform_discr([-5, -5], [5, 5], (20, 20))
+        dpart = odl.uniform_partition(-12, 12, 48)
+        geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+    else:
+        space = odl.uniform_discr([-5, -5, -5], [5, 5, 5], (12, 12, 12))
+        dpart = odl.uniform_partition([-12, -12], [12, 12], (24, 24))
+        geom = odl.tomo.ConeBeamGeometry(apart, dpart, src_radius=20,
+                                         det_radius=10)
+    return geom, space
+
+
+# --- Tests --- #
+
+
+def test_numpy_sparse_matches_numpy_cpu(geometry_type):
+    """The matrix should reproduce the ray-driven forward projector."""
+    geom, space = _geometry_and_space(geometry_type)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_sparse')
+    ray_trafo_cpu = odl.tomo.RayTransform(space, geom, impl='numpy_cpu')
+    phantom = odl.phantom.cuboid(space, min_pt=[-2] * space.ndim,
+                                 max_pt=[3] * space.ndim)
+    assert all_almost_equal(ray_trafo(phantom), ray_trafo_cpu(phantom))
+
+
+def test_numpy_sparse_adjoint(geometry_type):
+    """The back-projection should be the exact adjoint."""
+    geom, space = _geometry_and_space(geometry_type)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_sparse')
+    x = noise_element(ray_trafo.domain)
+    y = noise_element(ray_trafo.range)
+    assert ray_trafo(x).inner(y) == pytest.approx(
+        x.inner(ray_trafo.adjoint(y)), rel=1e-6)
+
+
+def test_numpy_sparse_apply_batch(geometry_type):
+    """Batched projection should match projection in a loop."""
+    geom, space = _geometry_and_space(geometry_type)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_sparse')
+    for op in [ray_trafo, ray_trafo.adjoint]:
+        x_batch = np.stack([noise_element(op.domain).asarray()
+                            for _ in range(3)])
+        expected = np.stack([op(x).asarray() for x in x_batch])
+        assert all_almost_equal(op.apply_batch(x_batch), expected)
+
+
+def test_numpy_sparse_disk_cache(geometry_type, tmpdir):
+    """Matrices should be stored once and memory-mapped on reuse."""
+    geom, space = _geometry_and_space(geometry_type)
+    cache_dir = str(tmpdir)
+
+    matrix = numpy_sparse_system_matrix(geom, space, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    # Memory-mapped in read-only mode
+    assert not matrix.data.flags.writeable
+
+    proj_space = odl.uniform_discr_frompartition(geom.partition)
+    impl = NumpySparseImpl(geom, space, proj_space, cache_dir=cache_dir)
+    assert not impl.matrix.data.flags.writeable
+    assert len(os.listdir(cache_dir)) == 1
+    assert (impl.matrix != matrix).nnz == 0
+
+    # A different volume gives a new matrix
+    space2 = odl.uniform_discr(space.min_pt, space.max_pt,
+                               [n + 1 for n in space.shape])
+    numpy_sparse_system_matrix(geom, space2, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_numpy_sparse_angle_subset():
+    """Subset back-ends should use the rows of the full matrix."""
+    geom, space = _geometry_and_space('par2d')
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy_sparse')
+    impl = ray_trafo.get_impl()
+    phantom = odl.phantom.cuboid(space)
+    proj = ray_trafo(phantom).asarray()
+    y = noise_element(ray_trafo.range).asarray()
+
+    def subset(impl, indices):
+        proj_space = odl.uniform_discr_frompartition(
+            impl.geometry[indices].partition)
+        return impl.angle_subset(indices, proj_space)
+
+    for indices in [slice(3, 7), slice(1, None, 3)]:
+        sub_impl = subset(impl, indices)
+        proj_space = sub_impl.proj_space
+        assert sub_impl._matrix is None
+        assert sub_impl.matrix.shape == (proj_space.size, space.size)
+
+        sub_proj = sub_impl.call_forward(phantom, proj_space.element())
+        assert all_almost_equal(sub_proj, proj[indices])
+
+        sub_y = proj_space.element(y[indices])
+        expected = sub_impl.matrix.T.dot(sub_y.asarray().ravel())
+        expected *= proj_space.cell_volume / space.cell_volume
+        back_proj = sub_impl.call_backward(sub_y, space.element())
+        assert all_almost_equal(back_proj, expected.reshape(space.shape))
+
+    # The matrix of contiguous subsets is a view
+    assert np.shares_memory(subset(impl, slice(3, 7)).matrix.data,
+                            impl.matrix.data)
+
+    # Subsets of subsets refer to the full matrix
+    sub_impl = subset(subset(impl, slice(1, None, 2)), slice(None, None, 3))
+    assert sub_impl._parent is impl
+    assert all_almost_equal(
+        sub_impl.call_forward(phantom, sub_impl.proj_space.element()),
+        proj[1::6])
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -12,9 +12,12 @@ from __future__ import division
 import numpy as np
 
 import odl
+from odl.discr.discr_utils import linear_interpolator, point_collocation
 from odl.tomo.backends.skimage_radon import (
+    _resample, _resampling_plan, skimage_proj_space,
     skimage_radon_forward_projector, skimage_radon_back_projector)
 from odl.tomo.util.testutils import skip_if_no_skimage
+from odl.util.testutils import all_almost_equal
 
 
 @skip_if_no_skimage
@@ -44,5 +47,35 @@ def test_skimage_radon_projector_parallel2d():
     assert backproj.norm() > 0
 
 
+def test_skimage_resampling_plan():
+    """Resampling plan should reproduce clamped linear interpolation."""
+    reco_space = odl.uniform_discr([-5, -5], [5, 5], (10, 10))
+    geom = odl.tomo.parallel_beam_geometry(reco_space)
+    proj_space = odl.uniform_discr_frompartition(geom.partition)
+    skimage_range = skimage_proj_space(geom, reco_space, proj_space)
+
+    for src_space, dst_space in [(skimage_range, proj_space),
+                                 (proj_space, skimage_range)]:
+        src = np.random.rand(*src_space.shape)
+        min_x = src_space.domain.min()[1]
+        max_x = src_space.domain.max()[1]
+
+        def clamped_interp(x, out=None):
+            x = (x[0], np.clip(x[1], min_x, max_x))
+            interpolator = linear_interpolator(
+                src, src_space.grid.coord_vectors)
+            return interpolator(x, out=out)
+
+        expected = point_collocation(clamped_interp, dst_space.grid.meshgrid)
+
+        plan = _resampling_plan(src_space, dst_space)
+        if hasattr(_resampling_plan, 'cache_info'):
+            # Only cached with Python 3
+            assert _resampling_plan(src_space, dst_space) is plan
+        result = np.empty(dst_space.shape)
+        _resample(src, plan, out=result)
+        assert all_almost_equal(result, expected)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
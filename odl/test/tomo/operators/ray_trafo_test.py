@@ -28,7 +28,8 @@ impl = simple_fixture(
     name='impl',
     params=[pytest.param('astra_cpu', marks=skip_if_no_astra),
             pytest.param('astra_cuda', marks=skip_if_no_astra_cuda),
-            pytest.param('skimage', marks=skip_if_no_skimage)]
+            pytest.param('skimage', marks=skip_if_no_skimage),
+            'numpy_cpu', 'numpy_sparse']
 )
 
 geometry_params = ['par2d', 'par3d', 'cone2d', 'cone3d', 'helical']
@@ -106,6 +107,17 @@ projectors.extend(
                       'par2d skimage half_uniform'])
 )
 
+projectors.extend(
+    (pytest.param(proj_cfg)
+     for proj_cfg in ['par2d numpy_cpu uniform',
+                      'par2d numpy_cpu half_uniform',
+                      'par2d numpy_cpu random',
+                      'cone2d numpy_cpu uniform',
+                      'cone2d numpy_cpu nonuniform',
+                      'par2d numpy_sparse uniform',
+                      'cone2d numpy_sparse random'])
+)
+
 projector_ids = [
     " geom='{}' - impl='{}' - angles='{}' ".format(*p.values[0].split())
     for p in projectors
@@ -235,7 +247,8 @@ def test_adjoint(projector):
     # Relative tolerance, still rather high due to imperfectly matched
     # adjoint in the cone beam case
     if (
-        parse_version(ASTRA_VERSION) < parse_version('1.8rc1')
+        projector.impl.startswith('astra')
+        and parse_version(ASTRA_VERSION) < parse_version('1.8rc1')
         and isinstance(projector.geometry, odl.tomo.ConeBeamGeometry)
     ):
         rtol = 0.1
@@ -0,0 +1,142 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import odl
+from odl.trafos.backends import (
+    DWT_IMPLS, PYWT_AVAILABLE, dwt_coeff_shapes, dwt_coeff_size, dwt_forward,
+    dwt_inverse, dwt_max_level, precompute_raveled_slices,
+    wavelet_filter_bank)
+from odl.trafos.backends.dwt_engine import DWT_MODES
+from odl.util.parallel import num_threads
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+if PYWT_AVAILABLE:
+    import pywt
+
+# --- pytest fixtures --- #
+
+
+impl = simple_fixture('impl', DWT_IMPLS)
+mode = simple_fixture('mode', DWT_MODES)
+wavelet = simple_fixture('wavelet', ['haar', 'db2', 'db4'])
+shape_axes = simple_fixture(
+    'shape_axes', [((17,), None), ((12, 9), None), ((12, 9), (-1,)),
+                   ((6, 7, 5), (0, 2))])
+
+
+def _setup(shape, wavelet, mode, axes, nlevels=2):
+    """Return the filter bank, coefficient shapes and slices."""
+    bank = wavelet_filter_bank(wavelet)
+    shapes = dwt_coeff_shapes(shape, bank.dec_len, nlevels, mode, axes)
+    return bank, shapes, precompute_raveled_slices(shapes)
+
+
+# --- Tests --- #
+
+
+def test_builtin_filter_banks(wavelet):
+    """The Daubechies filters should be orthonormal and sum to sqrt(2)."""
+    bank = wavelet_filter_bank(wavelet)
+    rec_lo = bank.rec_lo
+    assert rec_lo.sum() == pytest.approx(np.sqrt(2))
+    for shift in range(0, bank.dec_len, 2):
+        inner = np.dot(rec_lo[shift:], rec_lo[:bank.dec_len - shift])
+        assert inner == pytest.approx(1.0 if shift == 0 else 0.0, abs=1e-12)
+    assert all_almost_equal(bank.dec_lo, rec_lo[::-1])
+    assert bank.orthogonal
+
+
+def test_dwt_perfect_reconstruction(impl, mode, wavelet, shape_axes):
+    """Forward and inverse DWT should reproduce the input."""
+    shape, axes = shape_axes
+    _, shapes, slices = _setup(shape, wavelet, mode, axes)
+    x = np.random.rand(*shape)
+
+    coeffs = dwt_forward(x, wavelet, mode, shapes, slices, axes=axes,
+                         impl=impl)
+    assert coeffs.shape == (dwt_coeff_size(shapes),)
+    recon = dwt_inverse(coeffs, wavelet, mode, shapes, slices, shape,
+                        axes=axes, impl=impl)
+    assert all_almost_equal(recon, x)
+
+
+def test_dwt_out_and_batch(impl, shape_axes):
+    """Results should be written to ``out``, batches along axis 0."""
+    shape, axes = shape_axes
+    _, shapes, slices = _setup(shape, 'db2', 'symmetric', axes)
+    x_batch = np.random.rand(3, *shape)
+
+    out = np.empty((3, dwt_coeff_size(shapes)))
+    result = dwt_forward(x_batch, 'db2', 'symmetric', shapes, slices,
+                         axes=axes, out=out, impl=impl)
+    assert result is out
+    for x, coeffs in zip(x_batch, out):
+        assert all_almost_equal(
+            coeffs, dwt_forward(x, 'db2', 'symmetric', shapes, slices,
+                                axes=axes, impl=impl))
+
+    recon = np.empty_like(x_batch)
+    result = dwt_inverse(out, 'db2', 'symmetric', shapes, slices, shape,
+                         axes=axes, out=recon, impl=impl)
+    assert result is recon
+    assert all_almost_equal(recon, x_batch)
+
+
+def test_dwt_threads(mode):
+    """Multithreaded evaluation should give the same result."""
+    shape = (256, 200)
+    _, shapes, slices = _setup(shape, 'db3', mode, None, nlevels=3)
+    x = np.random.rand(*shape)
+
+    with num_threads(1):
+        coeffs = dwt_forward(x, 'db3', mode, shapes, slices)
+        recon = dwt_inverse(coeffs, 'db3', mode, shapes, slices, shape)
+    with num_threads(4):
+        coeffs_mt = dwt_forward(x, 'db3', mode, shapes, slices)
+        recon_mt = dwt_inverse(coeffs, 'db3', mode, shapes, slices, shape)
+    assert np.array_equal(coeffs, coeffs_mt)
+    assert np.array_equal(recon, recon_mt)
+    assert all_almost_equal(recon, x)
+
+
+def test_dwt_periodization_orthogonal():
+    """The periodized DWT with an orthogonal wavelet is an orthogonal map."""
+    shape = (16,)
+    _, shapes, slices = _setup(shape, 'db3', 'periodization', None)
+    matrix = np.array([dwt_forward(e, 'db3', 'periodization', shapes, slices)
+                       for e in np.eye(16)]).T
+    assert all_almost_equal(matrix.T.dot(matrix), np.eye(16))
+
+
+@pytest.mark.skipif(not PYWT_AVAILABLE, reason='`pywt` not available')
+def test_dwt_matches_pywt(mode, shape_axes):
+    """Check shapes and coefficients against PyWavelets."""
+    shape, axes = shape_axes
+    for wavelet in ['db2', 'sym3', 'bior2.2', 'coif1']:
+        bank, shapes, slices = _setup(shape, wavelet, mode, axes)
+        assert shapes == pywt.wavedecn_shapes(shape, wavelet, mode=mode,
+                                              level=2, axes=axes)
+        assert dwt_max_level(shape, bank.dec_len, axes) == (
+            pywt.dwtn_max_level(shape, wavelet, axes))
+
+        x = np.random.rand(*shape)
+        true = pywt.ravel_coeffs(
+            pywt.wavedecn(x, wavelet, mode=mode, level=2, axes=axes),
+            axes=axes)[0]
+        coeffs = dwt_forward(x, wavelet, mode, shapes, slices, axes=axes,
+                             impl='numpy')
+        assert all_almost_equal(coeffs, true)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
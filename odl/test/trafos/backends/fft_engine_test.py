@@ -0,0 +1,134 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import odl
+from odl.trafos.backends import (
+    FFT_IMPLS, clear_fft_plan_cache, fft_call, fft_plan,
+    set_fft_plan_cache_size)
+from odl.trafos.backends import fft_engine
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+# --- pytest fixtures --- #
+
+
+impl = simple_fixture('impl', FFT_IMPLS)
+direction = simple_fixture('direction', ['forward', 'backward'])
+axes = simple_fixture('axes', [None, (0,), (1,), (-1, 0)])
+
+
+@pytest.fixture
+def small_cache():
+    """Use a plan cache of size 2 during the test."""
+    orig_size = fft_engine._PLAN_CACHE_SIZE
+    clear_fft_plan_cache()
+    set_fft_plan_cache_size(2)
+    yield
+    set_fft_plan_cache_size(orig_size)
+    clear_fft_plan_cache()
+
+
+# --- fft_call --- #
+
+
+def test_fft_call_c2c(impl, direction, axes):
+    """Check complex-to-complex transforms against ``numpy.fft``."""
+    arr = (np.random.rand(6, 5) + 1j * np.random.rand(6, 5))
+    np_axes = axes if axes is not None else (0, 1)
+
+    if direction == 'forward':
+        true = np.fft.fftn(arr, axes=np_axes)
+    else:
+        true = np.fft.ifftn(arr, axes=np_axes)
+
+    result = fft_call(arr, direction=direction, axes=axes, impl=impl,
+                      normalise_idft=True)
+    assert all_almost_equal(result, true)
+
+    # Out-of-place with given `out`
+    out = np.empty_like(arr)
+    result = fft_call(arr, out=out, direction=direction, axes=axes,
+                      impl=impl, normalise_idft=True)
+    assert result is out
+    assert all_almost_equal(out, true)
+
+
+def test_fft_call_halfcomplex(impl, axes):
+    """Check real-to-complex and complex-to-real transforms."""
+    arr = np.random.rand(6, 5)
+    np_axes = axes if axes is not None else (0, 1)
+
+    true = np.fft.rfftn(arr, axes=np_axes)
+    arr_ft = fft_call(arr, axes=axes, halfcomplex=True, impl=impl)
+    assert arr_ft.shape == true.shape
+    assert all_almost_equal(arr_ft, true)
+
+    # The odd length of the last axis is taken from `out`
+    out = np.empty_like(arr)
+    fft_call(arr_ft, out, direction='backward', axes=axes, halfcomplex=True,
+             normalise_idft=True, impl=impl)
+    assert all_almost_equal(out, arr)
+
+
+def test_fft_call_unnormalized_backward(impl):
+    """Check that backward transforms are unnormalized by default."""
+    arr = np.random.rand(4, 3) + 1j * np.random.rand(4, 3)
+    result = fft_call(arr, direction='backward', impl=impl)
+    assert all_almost_equal(result, np.fft.ifftn(arr) * arr.size)
+
+
+def test_fft_call_preserve_input(impl):
+    """Check that the input is not changed by default."""
+    arr = np.random.rand(8, 8) + 1j * np.random.rand(8, 8)
+    arr_orig = arr.copy()
+    fft_call(arr, impl=impl)
+    assert np.array_equal(arr, arr_orig)
+
+
+# --- Plan cache --- #
+
+
+def test_fft_plan_cache(small_cache):
+    """Check reuse and LRU eviction of cached plans."""
+    plan1 = fft_plan((4, 4), 'complex128')
+    assert fft_plan((4, 4), 'complex128') is plan1
+    # Different key parameters give different plans
+    plan2 = fft_plan((4, 4), 'complex128', direction='backward')
+    assert plan2 is not plan1
+    assert fft_plan((4, 4), 'float64', halfcomplex=True) is not plan1
+
+    # Cache size 2, `plan1` is the least recently used one
+    assert fft_plan((4, 4), 'complex128', direction='backward') is plan2
+    assert fft_plan((4, 4), 'complex128') is not plan1
+
+    clear_fft_plan_cache()
+    assert fft_plan((4, 4), 'complex128', direction='backward') is not plan2
+
+
+def test_set_fft_plan_cache_size():
+    """Check input validation of the cache size."""
+    with pytest.raises(ValueError):
+        set_fft_plan_cache_size(-1)
+    with pytest.raises(ValueError):
+        set_fft_plan_cache_size(1.5)
+
+
+def test_fft_plan_bad_input():
+    """Check errors for invalid plan parameters."""
+    with pytest.raises(ValueError):
+        fft_plan((4, 4), 'complex128', impl='fftw')
+    with pytest.raises(ValueError):
+        fft_plan((4, 4), 'complex128', direction='up')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
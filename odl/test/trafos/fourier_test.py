@@ -12,6 +12,7 @@ import numpy as np
 import pytest
 
 import odl
+from odl.trafos.backends import SCIPY_FFT_AVAILABLE
 from odl.trafos.fourier import (
     DiscreteFourierTransform, DiscreteFourierTransformInverse,
     FourierTransform)
@@ -29,6 +30,8 @@ from odl.util.testutils import simple_fixture
 impl = simple_fixture(
     'impl',
     [pytest.param('numpy'),
+     pytest.param('scipy', marks=pytest.mark.skipif(
+         not SCIPY_FFT_AVAILABLE, reason='scipy.fft not available')),
      pytest.param('pyfftw', marks=skip_if_no_pyfftw)]
 )
 exponent = simple_fixture('exponent', [2.0, 1.0, float('inf'), 1.5])
@@ -344,6 +347,21 @@ def test_dft_init_plan(impl):
 # ---- FourierTransform ---- #
 
 
+def test_dft_apply_batch(impl):
+    """Check vectorized batch evaluation against a loop."""
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    ops = [DiscreteFourierTransform(space, impl=impl),
+           DiscreteFourierTransform(space, halfcomplex=True, impl=impl),
+           DiscreteFourierTransform(space.complex_space, axes=(1,),
+                                    sign='+', impl=impl)]
+    ops += [op.inverse for op in ops]
+    for op in ops:
+        x_batch = np.stack([noise_element(op.domain).asarray()
+                            for _ in range(3)])
+        expected = np.stack([op(x).asarray() for x in x_batch])
+        assert all_almost_equal(op.apply_batch(x_batch), expected)
+
+
 def test_fourier_trafo_range(exponent, odl_floating_dtype):
     # Check if the range is initialized correctly. Encompasses the init test
     dtype = odl_floating_dtype
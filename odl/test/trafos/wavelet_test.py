@@ -8,9 +8,11 @@
 
 from __future__ import division
 
+import numpy as np
 import pytest
 
 import odl
+from odl.trafos.backends import PYWT_AVAILABLE
 from odl.util.testutils import (
     all_almost_equal, noise_element, simple_fixture, skip_if_no_pywavelets)
 
@@ -25,7 +27,7 @@ nlevels = simple_fixture('nlevels', [2, None])
 axes = simple_fixture('axes', [-1, None])
 wave_impl = simple_fixture(
     'wave_impl',
-    [pytest.param('pywt', marks=skip_if_no_pywavelets)]
+    ['numpy', pytest.param('pywt', marks=skip_if_no_pywavelets)]
 )
 
 
@@ -82,11 +84,14 @@ def test_wavelet_transform(wave_impl, shape_setup, odl_floating_dtype, axes):
     wavelet, pad_mode, nlevels, shape, _ = shape_setup
     ndim = len(shape)
 
+    if wave_impl == 'numpy' and not PYWT_AVAILABLE and wavelet == 'sym2':
+        pytest.skip('wavelet requires `pywt`')
+
     space = odl.uniform_discr([-1] * ndim, [1] * ndim, shape, dtype=dtype)
     image = noise_element(space)
 
     # TODO: check more error scenarios
-    if wave_impl == 'pywt' and pad_mode == 'constant':
+    if pad_mode == 'constant':
         with pytest.raises(ValueError):
             wave_trafo = odl.trafos.WaveletTransform(
                 space, wavelet, nlevels, pad_mode, pad_const=1, impl=wave_impl,
@@ -113,5 +118,43 @@ def test_wavelet_transform(wave_impl, shape_setup, odl_floating_dtype, axes):
     assert all_almost_equal(image, reco_image)
 
 
+def test_wavelet_transform_apply_batch(wave_impl):
+    """Batched transforms should match evaluation in a loop."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (16, 17))
+    wave_trafo = odl.trafos.WaveletTransform(
+        space, 'db2', nlevels=2, pad_mode='symmetric', impl=wave_impl)
+    x_batch = np.random.rand(3, 16, 17)
+
+    coeffs = wave_trafo.apply_batch(x_batch)
+    expected = np.stack([wave_trafo(x).asarray() for x in x_batch])
+    assert all_almost_equal(coeffs, expected)
+    assert all_almost_equal(wave_trafo.inverse.apply_batch(coeffs), x_batch)
+
+
+def test_wavelet_transform_scales(wave_impl):
+    """Scales should be 0 for the approximation and count up the levels."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (16, 16))
+    wave_trafo = odl.trafos.WaveletTransform(
+        space, 'haar', nlevels=2, impl=wave_impl)
+    scales = wave_trafo.scales().asarray()
+    assert np.array_equal(np.bincount(scales.astype(int)), [16, 48, 192])
+
+
+@skip_if_no_pywavelets
+def test_wavelet_impls_match(pad_mode, axes):
+    """The ``'numpy'`` back-end should reproduce the ``'pywt'`` one."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (16, 17))
+    image = noise_element(space)
+    for wavelet in ['db2', 'sym3', 'bior2.2']:
+        trafo_pywt = odl.trafos.WaveletTransform(
+            space, wavelet, 2, pad_mode, impl='pywt', axes=axes)
+        trafo_np = odl.trafos.WaveletTransform(
+            space, wavelet, 2, pad_mode, impl='numpy', axes=axes)
+        coeffs = trafo_pywt(image)
+        assert all_almost_equal(trafo_np(image), coeffs)
+        assert all_almost_equal(trafo_np.inverse(coeffs),
+                                trafo_pywt.inverse(coeffs))
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
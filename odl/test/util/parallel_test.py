@@ -0,0 +1,54 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Unit tests for `parallel`."""
+
+from __future__ import division
+
+import threading
+
+import odl
+from odl.util.parallel import num_threads, parallel_map, set_num_threads
+
+
+def test_parallel_map_order():
+    """Results should be in the order of the inputs."""
+    for n in [1, 2, 3, 8]:
+        with num_threads(4):
+            assert parallel_map(lambda x: x ** 2, range(10), n) == [
+                x ** 2 for x in range(10)]
+
+
+def test_set_num_threads_concurrent():
+    """Changing the pool size must not break running `parallel_map`s."""
+    errors = []
+    stop = threading.Event()
+
+    def run():
+        try:
+            while not stop.is_set():
+                assert parallel_map(abs, range(-8, 8)) == [
+                    abs(i) for i in range(-8, 8)]
+        except Exception as exc:
+            errors.append(exc)
+
+    with num_threads(2):
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            set_num_threads(2 + i % 3)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -0,0 +1,125 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the pool of scratch elements."""
+
+from __future__ import division
+
+import pytest
+
+import odl
+from odl.util.parallel import num_threads, parallel_map
+from odl.util.scratch import (
+    clear_scratch_pool, scratch_element, scratch_elements, scratch_pool_stats,
+    set_scratch_pool_size)
+from odl.util.testutils import all_almost_equal, noise_element
+
+
+@pytest.fixture
+def clean_pool():
+    """Start with an empty pool and restore the default size afterwards."""
+    max_nbytes = scratch_pool_stats()['max_nbytes']
+    clear_scratch_pool()
+    yield
+    set_scratch_pool_size(max_nbytes)
+    clear_scratch_pool()
+
+
+# --- Tests --- #
+
+
+def test_scratch_element_reuse(clean_pool):
+    """Elements should be reused, but never handed out twice."""
+    space = odl.rn(10)
+    with scratch_element(space) as tmp:
+        assert tmp in space
+        first = tmp
+        with scratch_element(space) as tmp2:
+            assert tmp2 is not tmp
+    with scratch_element(space) as tmp:
+        assert tmp is first or tmp is tmp2
+
+    stats = scratch_pool_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['num_elements'] == 2
+    assert stats['nbytes'] == 2 * space.nbytes
+
+    # Given temporaries are used as-is and not pooled
+    given = space.element()
+    with scratch_element(space, given) as tmp:
+        assert tmp is given
+    assert scratch_pool_stats()['num_elements'] == 2
+
+    # Equal but different spaces do not share elements
+    with scratch_element(odl.rn(10)):
+        pass
+    assert scratch_pool_stats()['misses'] == 3
+
+
+def test_scratch_pool_eviction(clean_pool):
+    """The pool should stay below its size, dropping old spaces first."""
+    space1, space2 = odl.rn(10), odl.rn(20)
+    set_scratch_pool_size(space1.nbytes + space2.nbytes)
+    with scratch_elements(space1, space2):
+        pass
+    assert scratch_pool_stats()['num_elements'] == 2
+
+    with scratch_elements(space2, space2):
+        pass
+    stats = scratch_pool_stats()
+    assert stats['nbytes'] <= stats['max_nbytes']
+    assert stats['evictions'] == 2
+    with scratch_element(space1):
+        pass
+    assert scratch_pool_stats()['misses'] == 4
+
+    set_scratch_pool_size(0)
+    assert scratch_pool_stats()['num_elements'] == 0
+    with pytest.raises(ValueError):
+        set_scratch_pool_size(-1)
+
+
+def test_scratch_pool_threads(clean_pool):
+    """Concurrently used elements must be distinct."""
+    space = odl.rn(1000)
+
+    def use_scratch(i):
+        with scratch_element(space) as tmp:
+            tmp[:] = i
+            for _ in range(10):
+                assert all_almost_equal(tmp, space.one() * i)
+        return i
+
+    with num_threads(4):
+        assert parallel_map(use_scratch, range(32)) == list(range(32))
+
+
+def test_composite_operators_use_pool(clean_pool):
+    """Repeated in-place evaluation should not allocate temporaries."""
+    space = odl.uniform_discr([0, 0], [1, 1], (16, 16))
+    grad = odl.Gradient(space)
+    op = odl.BroadcastOperator(odl.IdentityOperator(space), grad)
+    op = odl.operator.OperatorComp(
+        odl.PointwiseNorm(grad.range) * op[1], 2 * odl.IdentityOperator(space))
+    op = op + op
+    x = noise_element(space)
+    expected = op(x)
+
+    out = op.range.element()
+    op(x, out=out)
+    misses = scratch_pool_stats()['misses']
+    for _ in range(3):
+        op(x, out=out)
+        assert all_almost_equal(out, expected)
+    assert scratch_pool_stats()['misses'] == misses
+    assert scratch_pool_stats()['hits'] > 0
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -8,14 +8,34 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import print_function, division, absolute_import
+
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-from odl.discr import ResizingOperator
-from odl.trafos import FourierTransform, PYFFTW_AVAILABLE
+from odl.operator import Operator
+from odl.trafos import PYFFTW_AVAILABLE
+from odl.trafos.backends import fft_call
+from odl.util.parallel import chunk_slices, parallel_map
+from odl.util.utility import indent, signature_string, writable_array
+
+
+__all__ = ('fbp_op', 'fbp_filter_op', 'FBPFilterOperator',
+           'tam_danielson_window', 'parker_weighting',
+           'clear_fbp_filter_cache')
 
 
-__all__ = ('fbp_op', 'fbp_filter_op', 'tam_danielson_window',
-           'parker_weighting')
+# Maximum number of padded data points filtered in one task, bounds the
+# working memory per thread
+_FILTER_TASK_SIZE = 2 ** 18
+
+# Least-recently-used cache of filter spectra, see `_fbp_filter_spectrum`
+_FILTER_CACHE = OrderedDict()
+_FILTER_CACHE_SIZE = 16
+_FILTER_CACHE_LOCK = threading.Lock()
+
+_FBP_FFT_IMPL = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
 
 
 def _axis_in_detector(geometry):
@@ -77,9 +97,12 @@ def _fbp_filter(norm_freq, filter_type, frequency_scaling):
     ...                    filter_type='Hann',
     ...                    frequency_scaling=0.8)
     """
-    filter_type, filter_type_in = str(filter_type).lower(), filter_type
+    filter_type_in = filter_type
+    if not callable(filter_type):
+        filter_type = str(filter_type).lower()
+
     if callable(filter_type):
-        filt = filter_type(norm_freq)
+        filt = np.array(filter_type(norm_freq), dtype=float)
     elif filter_type == 'ram-lak':
         filt = np.copy(norm_freq)
     elif filter_type == 'shepp-logan':
@@ -310,8 +333,324 @@ def parker_weighting(ray_trafo, q=0.25):
         np.broadcast_to(S_sum * scale, ray_trafo.range.shape))
 
 
+def _fft_length(n):
+    """Return the smallest ``m >= n`` that has no prime factors above 5."""
+    m = max(int(n), 1)
+    while True:
+        rest = m
+        for p in (2, 3, 5):
+            while rest % p == 0:
+                rest //= p
+        if rest == 1:
+            return m
+        m += 1
+
+
+def _fbp_filter_params(ray_trafo):
+    """Return axes, directions and scaling of the FBP filter.
+
+    Returns
+    -------
+    axes : tuple of int
+        Axes of ``ray_trafo.range`` along which the data is filtered.
+    directions : tuple of float
+        Components of the filtering direction in ``axes``.
+    factor : float
+        Constant factor of the filter.
+    """
+    geometry = ray_trafo.geometry
+    alen = geometry.motion_params.length
+
+    if ray_trafo.domain.ndim == 2:
+        axes = (1,)
+        directions = (1.0,)
+        scale = 1.0
+
+    elif ray_trafo.domain.ndim == 3:
+        # Find the direction that the filter should be taken in, and use
+        # only the axes along which it varies
+        rot_dir = _rotation_direction_in_detector(geometry)
+        axes = tuple(i + 1 for i in range(2) if rot_dir[i] != 0)
+        directions = tuple(float(rot_dir[i - 1]) for i in axes)
+
+        # Add scaling for cone-beam case
+        if hasattr(geometry, 'src_radius'):
+            scale = (geometry.src_radius
+                     / (geometry.src_radius + geometry.det_radius))
+
+            if geometry.pitch != 0:
+                # In helical geometry the whole volume is not in each
+                # projection and we need to use another weighting.
+                # Ideally each point in the volume effects only
+                # the projections in a half rotation, so we assume that that
+                # is the case.
+                scale *= alen / (np.pi)
+        else:
+            scale = 1.0
+
+    else:
+        raise NotImplementedError('FBP only implemented in 2d and 3d')
+
+    weight = 1
+    if not ray_trafo.range.is_weighted:
+        # Compensate for potentially unweighted range of the ray transform
+        weight *= ray_trafo.range.cell_volume
+
+    if not ray_trafo.domain.is_weighted:
+        # Compensate for potentially unweighted domain of the ray transform
+        weight /= ray_trafo.domain.cell_volume
+
+    return axes, directions, scale * weight / (2 * alen)
+
+
+def _ramp_spectrum(n, cell_side):
+    """Return the DFT of the band-limited ramp filter kernel.
+
+    The kernel is sampled in the spatial domain, see [KS1988], Section 3.3,
+    which avoids the bias of sampling the ramp in the frequency domain,
+    where the zero frequency is set to 0.
+
+    The result approximates ``|xi|`` on the full DFT frequencies of
+    length ``n``.
+
+    References
+    ----------
+    [KS1988] Kak, A C and Slaney, M. *Principles of Computerized
+    Tomographic Imaging*. IEEE Press, 1988.
+    """
+    offsets = np.fft.fftfreq(n, 1.0 / n)
+    kernel = np.zeros(n)
+    kernel[offsets == 0] = 1 / (4 * cell_side ** 2)
+    odd = (np.abs(offsets) % 2 == 1)
+    kernel[odd] = -1 / (np.pi * offsets[odd] * cell_side) ** 2
+    return 2 * np.pi * cell_side * np.real(np.fft.fft(kernel))
+
+
+def _fbp_filter_spectrum(cell_sides, padded_shape, axes, directions, factor,
+                         halfcomplex, filter_type, frequency_scaling):
+    """Return the (cached) FBP filter on the DFT frequencies.
+
+    The filter is evaluated on the frequencies of an FFT along ``axes`` of
+    arrays of shape ``padded_shape``, where the last axis is halved for
+    ``halfcomplex=True``. Other axes have length 1 for broadcasting.
+    Filters are kept in a least-recently-used cache, and the returned
+    array is read-only.
+    """
+    key = (tuple(cell_sides), tuple(padded_shape), axes, directions, factor,
+           halfcomplex, filter_type, frequency_scaling)
+    with _FILTER_CACHE_LOCK:
+        filt = _FILTER_CACHE.get(key)
+        if filt is not None:
+            _FILTER_CACHE[key] = _FILTER_CACHE.pop(key)
+            return filt
+
+    ndim = len(padded_shape)
+    freq = 0
+    max_freq = 0
+    for axis, direction in zip(axes, directions):
+        n = padded_shape[axis]
+        freq_vec = np.fft.fftfreq(n, cell_sides[axis])
+        if halfcomplex and axis == axes[-1]:
+            freq_vec = freq_vec[:n // 2 + 1]
+            freq_vec[-1] = abs(freq_vec[-1])
+        shape = [1] * ndim
+        shape[axis] = -1
+        freq = freq + direction * 2 * np.pi * freq_vec.reshape(shape)
+        # Nyquist frequency of the axis
+        max_freq += abs(direction) * np.pi / cell_sides[axis]
+
+    abs_freq = np.abs(freq)
+    if len(axes) == 1:
+        axis = axes[0]
+        ramp = _ramp_spectrum(padded_shape[axis], cell_sides[axis])
+        ramp = ramp[:abs_freq.size].reshape(abs_freq.shape)
+    else:
+        ramp = abs_freq
+
+    # The window is the filter divided by the ramp, at zero frequency we
+    # use its limit, approximated by the value at a tiny frequency
+    norm_freq = abs_freq / max_freq
+    norm_freq[norm_freq == 0] = 1e-8
+    window = (_fbp_filter(norm_freq, filter_type, frequency_scaling)
+              / norm_freq)
+    filt = ramp * window * factor
+    filt.setflags(write=False)
+
+    with _FILTER_CACHE_LOCK:
+        _FILTER_CACHE[key] = filt
+        while len(_FILTER_CACHE) > _FILTER_CACHE_SIZE:
+            _FILTER_CACHE.popitem(last=False)
+    return filt
+
+
+def clear_fbp_filter_cache():
+    """Remove all filters from the cache used by `FBPFilterOperator`."""
+    with _FILTER_CACHE_LOCK:
+        _FILTER_CACHE.clear()
+
+
+class FBPFilterOperator(Operator):
+
+    """Filtering part of the filtered back-projection.
+
+    The data is zero-padded along the detector axes, transformed with a
+    real-to-complex FFT, multiplied with the FBP filter and transformed
+    back. For filtering along one axis, the ramp part of the filter is
+    computed from the band-limited ramp kernel in the spatial domain,
+    which gives the correct response at zero frequency. The filter
+    spectrum is cached per data space, filtering direction and filter
+    parameters, such that creating a new operator for the same setting
+    is cheap.
+
+    Evaluation streams over chunks of angles, which are distributed over
+    the thread pool from `odl.util.parallel`. Each chunk is padded,
+    weighted, filtered and written to the output in one pass, such that
+    no full-size temporaries are created.
+    """
+
+    def __init__(self, ray_trafo, padding=True, filter_type='Ram-Lak',
+                 frequency_scaling=1.0, weighting=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform`
+            The ray transform whose data should be filtered.
+        padding : bool, optional
+            If ``True``, zero-pad the data to at least twice the size
+            along the filtered axes to avoid wrap-around artifacts of the
+            circular convolution.
+        filter_type : optional
+            The type of filter to be used, see `fbp_filter_op`.
+        frequency_scaling : float, optional
+            Relative cutoff frequency for the filter.
+        weighting : `array-like` or ``ray_trafo.range`` element, optional
+            Weights that are applied to the data before filtering.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], [64, 64])
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=30)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry,
+        ...                                   impl='numpy_cpu')
+        >>> filter_op = FBPFilterOperator(ray_trafo, filter_type='Hann')
+        >>> filtered = filter_op(ray_trafo(odl.phantom.shepp_logan(space)))
+        >>> filtered.space == ray_trafo.range
+        True
+        """
+        super(FBPFilterOperator, self).__init__(
+            ray_trafo.range, ray_trafo.range, linear=True)
+        self.__ray_trafo = ray_trafo
+        self.__padding = bool(padding)
+        self.__filter_type = filter_type
+        self.__frequency_scaling = float(frequency_scaling)
+
+        axes, directions, factor = _fbp_filter_params(ray_trafo)
+        padded_shape = list(self.domain.shape)
+        if self.padding:
+            for axis in axes:
+                padded_shape[axis] = _fft_length(2 * padded_shape[axis] - 1)
+        self.__axes = axes
+        self.__padded_shape = tuple(padded_shape)
+        self.__halfcomplex = self.domain.is_real
+        self.__filter = _fbp_filter_spectrum(
+            self.domain.cell_sides, self.__padded_shape, axes, directions,
+            factor, self.__halfcomplex, filter_type, self.frequency_scaling)
+
+        if weighting is None:
+            self.__weighting = None
+        else:
+            self.__weighting = np.broadcast_to(
+                np.asarray(weighting, dtype=self.domain.real_dtype),
+                self.domain.shape)
+
+    @property
+    def ray_trafo(self):
+        """The ray transform whose data is filtered."""
+        return self.__ray_trafo
+
+    @property
+    def padding(self):
+        """Whether the data is zero-padded before filtering."""
+        return self.__padding
+
+    @property
+    def filter_type(self):
+        """The type of the FBP filter."""
+        return self.__filter_type
+
+    @property
+    def frequency_scaling(self):
+        """Relative cutoff frequency of the filter."""
+        return self.__frequency_scaling
+
+    @property
+    def weighting(self):
+        """Weights applied before filtering, or ``None``."""
+        return self.__weighting
+
+    def _call(self, x, out):
+        """Filter ``x`` and write the result to ``out``."""
+        x_arr = x.asarray()
+        region = tuple(slice(0, n) for n in self.domain.shape)
+        chunk_size = max(1, _FILTER_TASK_SIZE //
+                         int(np.prod(self.__padded_shape[1:])))
+        buffer_dtype = (self.domain.real_dtype if self.__halfcomplex
+                        else self.domain.dtype)
+
+        with writable_array(out) as out_arr:
+
+            def filter_chunk(slc):
+                """Filter the data at the angle indices ``slc``."""
+                num_angles = slc.stop - slc.start
+                padded = np.zeros((num_angles,) + self.__padded_shape[1:],
+                                  dtype=buffer_dtype)
+                if self.weighting is None:
+                    padded[region] = x_arr[slc]
+                else:
+                    np.multiply(x_arr[slc], self.weighting[slc],
+                                out=padded[region])
+
+                spectrum = fft_call(
+                    padded, axes=self.__axes, halfcomplex=self.__halfcomplex,
+                    impl=_FBP_FFT_IMPL, threads=1)
+                spectrum *= self.__filter
+                fft_call(spectrum, out=padded, direction='backward',
+                         axes=self.__axes, halfcomplex=self.__halfcomplex,
+                         normalise_idft=True, impl=_FBP_FFT_IMPL, threads=1,
+                         preserve_input=False)
+                out_arr[slc] = padded[region]
+
+            parallel_map(filter_chunk,
+                         chunk_slices(self.domain.shape[0], chunk_size))
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator.
+
+        The filter itself is self-adjoint, and the weighting is applied
+        after filtering in the adjoint.
+        """
+        if self.weighting is None:
+            return self
+        unweighted = FBPFilterOperator(
+            self.ray_trafo, self.padding, self.filter_type,
+            self.frequency_scaling)
+        return self.range.element(self.weighting) * unweighted
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        posargs = [self.ray_trafo]
+        optargs = [('padding', self.padding, True),
+                   ('filter_type', self.filter_type, 'Ram-Lak'),
+                   ('frequency_scaling', self.frequency_scaling, 1.0)]
+        sig_str = signature_string(posargs, optargs, mod=['!r', '!r'],
+                                   sep=[',\n', ', ', ',\n'])
+        return '{}(\n{}\n)'.format(self.__class__.__name__, indent(sig_str))
+
+
 def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-                  frequency_scaling=1.0):
+                  frequency_scaling=1.0, weighting=None):
     """Create a filter operator for FBP from a `RayTransform`.
 
     Parameters
@@ -353,129 +692,28 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         The normalized frequencies are rescaled so that they fit into the range
         [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
         set to zero.
+    weighting : `array-like` or ``ray_trafo.range`` element, optional
+        Weights that are applied to the data before filtering, e.g.,
+        `parker_weighting` or `tam_danielson_window`. The multiplication
+        is done in the same pass as the filtering.
 
     Returns
     -------
-    filter_op : `Operator`
+    filter_op : `FBPFilterOperator`
         Filtering operator for FBP based on ``ray_trafo``.
 
     See Also
     --------
+    FBPFilterOperator : Details on the implementation
     tam_danielson_window : Windowing for helical data
+    parker_weighting : Weighting for short scan data
     """
-    impl = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
-    alen = ray_trafo.geometry.motion_params.length
-
-    if ray_trafo.domain.ndim == 2:
-        # Define ramp filter
-        def fourier_filter(x):
-            abs_freq = np.abs(x[1])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = 1 / (2 * alen)
-            return filt * np.max(abs_freq) * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            ran_shp = (ray_trafo.range.shape[0],
-                       ray_trafo.range.shape[1] * 2 - 1)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=1, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=1, impl=impl)
-
-    elif ray_trafo.domain.ndim == 3:
-        # Find the direction that the filter should be taken in
-        rot_dir = _rotation_direction_in_detector(ray_trafo.geometry)
-
-        # Find what axes should be used in the fourier transform
-        used_axes = (rot_dir != 0)
-        if used_axes[0] and not used_axes[1]:
-            axes = [1]
-        elif not used_axes[0] and used_axes[1]:
-            axes = [2]
-        else:
-            axes = [1, 2]
-
-        # Add scaling for cone-beam case
-        if hasattr(ray_trafo.geometry, 'src_radius'):
-            scale = (ray_trafo.geometry.src_radius
-                     / (ray_trafo.geometry.src_radius
-                        + ray_trafo.geometry.det_radius))
-
-            if ray_trafo.geometry.pitch != 0:
-                # In helical geometry the whole volume is not in each
-                # projection and we need to use another weighting.
-                # Ideally each point in the volume effects only
-                # the projections in a half rotation, so we assume that that
-                # is the case.
-                scale *= alen / (np.pi)
-        else:
-            scale = 1.0
-
-        # Define ramp filter
-        def fourier_filter(x):
-            # If axis is aligned to a coordinate axis, save some memory and
-            # time by using broadcasting
-            if not used_axes[0]:
-                abs_freq = np.abs(rot_dir[1] * x[2])
-            elif not used_axes[1]:
-                abs_freq = np.abs(rot_dir[0] * x[1])
-            else:
-                abs_freq = np.abs(rot_dir[0] * x[1] + rot_dir[1] * x[2])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = scale * np.max(abs_freq) / (2 * alen)
-            return filt * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            if used_axes[0]:
-                padded_shape_u = ray_trafo.range.shape[1] * 2 - 1
-            else:
-                padded_shape_u = ray_trafo.range.shape[1]
-
-            if used_axes[1]:
-                padded_shape_v = ray_trafo.range.shape[2] * 2 - 1
-            else:
-                padded_shape_v = ray_trafo.range.shape[2]
-
-            ran_shp = (ray_trafo.range.shape[0],
-                       padded_shape_u,
-                       padded_shape_v)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=axes, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=axes, impl=impl)
-    else:
-        raise NotImplementedError('FBP only implemented in 2d and 3d')
-
-    # Create ramp in the detector direction
-    ramp_function = fourier.range.element(fourier_filter)
-
-    weight = 1
-    if not ray_trafo.range.is_weighted:
-        # Compensate for potentially unweighted range of the ray transform
-        weight *= ray_trafo.range.cell_volume
-
-    if not ray_trafo.domain.is_weighted:
-        # Compensate for potentially unweighted domain of the ray transform
-        weight /= ray_trafo.domain.cell_volume
-
-    ramp_function *= weight
-
-    # Create ramp filter via the convolution formula with fourier transforms
-    return fourier.inverse * ramp_function * fourier
+    return FBPFilterOperator(ray_trafo, padding, filter_type,
+                             frequency_scaling, weighting)
 
 
 def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-           frequency_scaling=1.0):
+           frequency_scaling=1.0, weighting=None):
     """Create filtered back-projection operator from a `RayTransform`.
 
     The filtered back-projection is an approximate inverse to the ray
@@ -520,6 +758,10 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         The normalized frequencies are rescaled so that they fit into the range
         [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
         set to zero.
+    weighting : `array-like` or ``ray_trafo.range`` element, optional
+        Weights that are applied to the data before filtering, e.g.,
+        `parker_weighting` or `tam_danielson_window`. The multiplication
+        is fused with the filtering.
 
     Returns
     -------
@@ -532,7 +774,7 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
     parker_weighting : Windowing for overcomplete fan-beam data.
     """
     return ray_trafo.adjoint * fbp_filter_op(ray_trafo, padding, filter_type,
-                                             frequency_scaling)
+                                             frequency_scaling, weighting)
 
 
 if __name__ == '__main__':
@@ -13,6 +13,8 @@ from __future__ import absolute_import
 from .astra_cpu import *
 from .astra_cuda import *
 from .astra_setup import *
+from .numpy_cpu import *
+from .numpy_sparse import *
 from .skimage_radon import *
 from .util import *
 
@@ -20,5 +22,7 @@ __all__ = ()
 __all__ += astra_cpu.__all__
 __all__ += astra_cuda.__all__
 __all__ += astra_setup.__all__
+__all__ += numpy_cpu.__all__
+__all__ += numpy_sparse.__all__
 __all__ += util.__all__
 __all__ += skimage_radon.__all__
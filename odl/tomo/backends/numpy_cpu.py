@@ -0,0 +1,513 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Native ray transform in 2d and 3d using NumPy on the CPU.
+
+The forward projector is ray-driven: it samples each ray inside the
+volume at roughly one point per voxel and integrates the (multi-)linearly
+interpolated volume values. The back-projector is voxel-driven: it maps
+each voxel onto the detector, linearly interpolates the projection data
+there and weights the result with the Jacobian of the ray coordinates.
+The two are adjoint to each other up to discretization errors.
+
+Both run on tiles of moderate size that are processed in parallel by
+the thread pool from `odl.util.parallel`.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from itertools import product
+
+import numpy as np
+
+from odl.discr import DiscretizedSpace, DiscretizedSpaceElement
+from odl.tomo.backends.util import _add_default_complex_impl
+from odl.tomo.geometry import (
+    DivergentBeamGeometry, Flat1dDetector, Flat2dDetector, Geometry,
+    ParallelBeamGeometry)
+from odl.util.parallel import chunk_slices, parallel_map
+from odl.util.utility import writable_array
+
+__all__ = (
+    'numpy_cpu_forward_projector',
+    'numpy_cpu_back_projector',
+)
+
+
+# Sampling distance along rays, relative to the smallest voxel size
+RAY_STEP = 1.0
+# Maximum number of ray sample points or voxels in one task, bounds the
+# working memory per thread
+MAX_TASK_SIZE = 2 ** 18
+
+
+def _check_geometry(geometry, vol_space):
+    """Raise if ``geometry`` is not supported by this backend."""
+    if not isinstance(geometry, Geometry):
+        raise TypeError(
+            '`geometry` must be a `Geometry` instance, got {!r}'
+            ''.format(geometry)
+        )
+    if not isinstance(geometry,
+                      (ParallelBeamGeometry, DivergentBeamGeometry)):
+        raise TypeError(
+            'geometry {!r} is neither parallel beam nor divergent beam'
+            ''.format(geometry)
+        )
+    if geometry.ndim not in (2, 3):
+        raise ValueError(
+            'only 2d and 3d geometries are supported, got `ndim` {}'
+            ''.format(geometry.ndim)
+        )
+    if geometry.motion_params.ndim != 1:
+        raise NotImplementedError(
+            'geometries with more than one motion parameter are not '
+            'supported'
+        )
+    if not isinstance(geometry.detector, (Flat1dDetector, Flat2dDetector)):
+        raise NotImplementedError(
+            'only flat detectors are supported, got {!r}'
+            ''.format(geometry.detector)
+        )
+    if vol_space.ndim != geometry.ndim:
+        raise ValueError(
+            'dimensions {} of volume space and {} of geometry do not match'
+            ''.format(vol_space.ndim, geometry.ndim)
+        )
+
+
+def _detector_frame(geometry, angles):
+    """Return detector reference points, axes and normals for ``angles``.
+
+    Returns
+    -------
+    refpts : `numpy.ndarray`, shape ``(n, ndim)``
+        Detector reference points.
+    axes : `numpy.ndarray`, shape ``(n, ndim - 1, ndim)``
+        Detector axes, i.e., ``axes[k, i]`` is the vector along which the
+        ``i``-th detector parameter moves for the ``k``-th angle.
+    normals : `numpy.ndarray`, shape ``(n, ndim)``
+        Vectors ``normals[k]`` such that ``det(axes[k], w)`` is equal to
+        ``dot(normals[k], w)`` for all vectors ``w``.
+    """
+    angles = np.array(angles, dtype=float, ndmin=1)
+    refpts = geometry.det_refpoint(angles).reshape(-1, geometry.ndim)
+    rot = geometry.rotation_matrix(angles).reshape(
+        (-1, geometry.ndim, geometry.ndim))
+    if geometry.ndim == 2:
+        det_axes = np.array([geometry.detector.axis])
+    else:
+        det_axes = np.array(geometry.detector.axes)
+    axes = np.einsum('kij,aj->kai', rot, det_axes)
+
+    if geometry.ndim == 2:
+        normals = np.stack([-axes[:, 0, 1], axes[:, 0, 0]], axis=-1)
+    else:
+        normals = np.cross(axes[:, 0], axes[:, 1])
+    return refpts, axes, normals
+
+
+def _interp_corners(shape, indices, zero_outside=False):
+    """Return flat indices and weights of multilinear interpolation.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the regular grid on which values are interpolated.
+    indices : sequence of `numpy.ndarray`
+        Broadcastable arrays of (fractional) indices, one per axis.
+    zero_outside : bool, optional
+        If ``True``, points that are farther than half a cell from the
+        grid get zero weight. Otherwise, and between the outermost
+        grid points and the cell boundaries, the nearest value is used.
+
+    Returns
+    -------
+    corners : list of tuple
+        For each of the ``2 ** len(shape)`` corners of the interpolation
+        cells, a pair ``(flat_idx, weight)`` of arrays (or scalars) such
+        that the interpolated value is the sum of
+        ``weight * arr.ravel()[flat_idx]`` over all corners.
+    """
+    strides = np.cumprod((tuple(shape[1:]) + (1,))[::-1])[::-1]
+
+    lower, weights = [], []
+    mask = None
+    for idx, n, stride in zip(indices, shape, strides):
+        if zero_outside:
+            inside = (idx >= -0.5) & (idx <= n - 0.5)
+            mask = inside if mask is None else mask & inside
+        idx = np.clip(idx, 0, n - 1)
+        i0 = np.minimum(idx.astype(np.intp), max(n - 2, 0))
+        weights.append((idx - i0) if n > 1 else np.zeros_like(idx))
+        lower.append((i0 * stride, stride if n > 1 else 0))
+
+    corners = []
+    for corner in product((0, 1), repeat=len(shape)):
+        flat_idx = 0
+        weight = 1.0
+        for c, (base, stride), w in zip(corner, lower, weights):
+            flat_idx = flat_idx + (base + stride if c else base)
+            weight = weight * (w if c else 1 - w)
+        if mask is not None:
+            weight = weight * mask
+        corners.append((flat_idx, weight))
+    return corners
+
+
+def _interp_linear(arr, indices, zero_outside=False):
+    """Multilinear interpolation of ``arr`` at float ``indices``.
+
+    See `_interp_corners` for the meaning of the parameters.
+
+    Returns
+    -------
+    values : `numpy.ndarray`
+        Interpolated values with the broadcast shape of ``indices``.
+    """
+    shape = np.broadcast(*indices).shape
+    flat_arr = arr.ravel()
+    values = np.zeros(shape, dtype=np.result_type(arr.dtype, float))
+    for flat_idx, weight in _interp_corners(arr.shape, indices,
+                                            zero_outside):
+        values += weight * flat_arr[flat_idx]
+    return values
+
+
+def _ray_samples(vol_space, geometry, angle_idx, row_slc, frame):
+    """Return sample points of rays for one angle and some detector rows.
+
+    Returns
+    -------
+    indices : list of `numpy.ndarray`
+        Sample points in index coordinates of ``vol_space.grid``, one
+        array of shape ``(rows, [cols,] num_samples)`` per axis.
+    steps : `numpy.ndarray`
+        Sampling distance of each ray, shape ``(rows, [cols])``.
+    """
+    ndim = geometry.ndim
+    refpts, axes, _ = frame
+    det_grid = geometry.det_grid
+    k = angle_idx
+
+    # Detector points of this tile, shape (rows, [cols,] ndim)
+    coords = list(det_grid.coord_vectors)
+    coords[0] = coords[0][row_slc]
+    dparams = np.meshgrid(*coords, indexing='ij', sparse=True)
+    det_pts = refpts[k] + sum(p[..., None] * axes[k, i]
+                              for i, p in enumerate(dparams))
+
+    if isinstance(geometry, DivergentBeamGeometry):
+        origins = geometry.src_position(geometry.angles[k]).reshape(
+            (1,) * (ndim - 1) + (ndim,))
+        dirs = det_pts - origins
+        dirs /= np.linalg.norm(dirs, axis=-1, keepdims=True)
+        t_lower = 0.0
+    else:
+        direction = -geometry.det_to_src(
+            geometry.angles[k], det_grid.mid_pt if ndim == 3 else 0)
+        direction = direction / np.linalg.norm(direction)
+        origins = det_pts
+        dirs = np.broadcast_to(direction, det_pts.shape)
+        t_lower = -np.inf
+
+    # Intersect rays with the bounding box of the volume
+    min_pt = vol_space.domain.min_pt
+    max_pt = vol_space.domain.max_pt
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (min_pt - origins) / dirs
+        t2 = (max_pt - origins) / dirs
+    t_min = np.maximum(np.nanmax(np.minimum(t1, t2), axis=-1), t_lower)
+    t_max = np.nanmin(np.maximum(t1, t2), axis=-1)
+    lengths = np.maximum(t_max - t_min, 0)
+    # Rays missing the volume get zero length at a finite position
+    lengths[~np.isfinite(lengths)] = 0
+    t_min = np.where(lengths > 0, t_min, 0)
+
+    # Midpoint rule with the same number of samples for all rays
+    step = RAY_STEP * min(vol_space.cell_sides)
+    num_samples = max(int(np.ceil(lengths.max() / step)), 1)
+    steps = lengths / num_samples
+    t = (t_min[..., None] +
+         (np.arange(num_samples) + 0.5) * steps[..., None])
+
+    # Convert to index coordinates of the volume grid
+    vol_min = vol_space.grid.min_pt
+    cell_sides = vol_space.cell_sides
+    indices = [((origins[..., i, None] - vol_min[i]) +
+                t * dirs[..., i, None]) / cell_sides[i]
+               for i in range(ndim)]
+    return indices, steps
+
+
+def _forward_tile(vol_arr, vol_space, geometry, angle_idx, row_slc,
+                  frame):
+    """Return line integrals for one angle and a range of detector rows."""
+    indices, steps = _ray_samples(vol_space, geometry, angle_idx, row_slc,
+                                  frame)
+    values = _interp_linear(vol_arr, indices)
+    return np.sum(values, axis=-1) * steps
+
+
+def _forward_tasks(vol_space, geometry):
+    """Return ``(angle_idx, row_slice)`` tasks for the forward projector.
+
+    Each task covers a range of detector rows for one angle such that the
+    number of ray sample points stays below `MAX_TASK_SIZE`.
+    """
+    det_shape = geometry.det_partition.shape
+    max_length = np.linalg.norm(vol_space.domain.extent)
+    num_samples = int(np.ceil(max_length /
+                              (RAY_STEP * min(vol_space.cell_sides))))
+    row_size = int(np.prod(det_shape[1:])) * num_samples
+    row_slices = chunk_slices(det_shape[0],
+                              max(1, MAX_TASK_SIZE // row_size))
+    return [(k, slc) for k in range(len(geometry.angles))
+            for slc in row_slices]
+
+
+def _backward_slab(proj_arr, vol_space, geometry, slab_slc, frame):
+    """Return the back-projection onto a slab of the volume."""
+    ndim = geometry.ndim
+    refpts, axes, normals = frame
+    det_grid = geometry.det_grid
+    det_min = det_grid.min_pt
+    det_cell_sides = geometry.det_partition.cell_sides
+
+    coords = list(vol_space.grid.coord_vectors)
+    coords[0] = coords[0][slab_slc]
+    x = np.meshgrid(*coords, indexing='ij', sparse=True)
+    slab_shape = tuple(len(c) for c in coords)
+    result = np.zeros(slab_shape)
+
+    for k, angle in enumerate(geometry.angles):
+        n = normals[k]
+        # Dual basis of the detector axes, maps points in the detector
+        # plane to detector parameters
+        dual = np.linalg.pinv(axes[k].T)
+
+        if isinstance(geometry, DivergentBeamGeometry):
+            src = geometry.src_position(angle)
+            x_min_src = [xi - si for xi, si in zip(x, src)]
+            denom = sum(ni * xi for ni, xi in zip(n, x_min_src))
+            numer = np.dot(n, refpts[k] - src)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                lam = numer / denom
+                dist = np.sqrt(sum(xi ** 2 for xi in x_min_src))
+                # Jacobian of the map (det. params, ray param.) -> volume
+                weight = (np.abs(numer) ** (ndim - 1) * dist /
+                          np.abs(denom) ** ndim)
+            weight[~np.isfinite(weight) | (lam <= 0)] = 0
+            src_min_ref = src - refpts[k]
+            det_params = [
+                np.dot(b, src_min_ref) +
+                lam * sum(bj * xj for bj, xj in zip(b, x_min_src))
+                for b in dual]
+        else:
+            direction = -geometry.det_to_src(
+                angle, det_grid.mid_pt if ndim == 3 else 0)
+            direction = direction / np.linalg.norm(direction)
+            n_dot_d = np.dot(n, direction)
+            # Detector parameters are affine functions of the position
+            det_params = []
+            for b in dual:
+                coeffs = b - np.dot(b, direction) / n_dot_d * n
+                offset = np.dot(coeffs, -refpts[k])
+                det_params.append(
+                    offset + sum(c * xi for c, xi in zip(coeffs, x)))
+            weight = 1 / abs(n_dot_d)
+
+        indices = [(p - det_min[i]) / det_cell_sides[i]
+                   for i, p in enumerate(det_params)]
+        result += weight * _interp_linear(proj_arr[k], indices,
+                                          zero_outside=True)
+
+    return result
+
+
+def numpy_cpu_forward_projector(vol_data, geometry, proj_space, out=None):
+    """Run a forward projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    vol_data : `DiscretizedSpaceElement`
+        Volume data to which the forward projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscretizedSpace`
+        Space to which the calling operator maps.
+    out : ``proj_space`` element, optional
+        Element of the projection space to which the result is written. If
+        ``None``, an element in ``proj_space`` is created.
+
+    Returns
+    -------
+    out : ``proj_space`` element
+        Projection data resulting from the application of the projector.
+        If ``out`` was provided, the returned object is a reference to it.
+    """
+    if not isinstance(vol_data, DiscretizedSpaceElement):
+        raise TypeError(
+            'volume data {!r} is not a `DiscretizedSpaceElement` instance'
+            ''.format(vol_data)
+        )
+    if not isinstance(proj_space, DiscretizedSpace):
+        raise TypeError(
+            '`proj_space` {!r} is not a DiscretizedSpace instance.'
+            ''.format(proj_space)
+        )
+    _check_geometry(geometry, vol_data.space)
+    if out is None:
+        out = proj_space.element()
+    elif out not in proj_space:
+        raise TypeError(
+            '`out` {} is neither None nor a `DiscretizedSpaceElement` '
+            'instance'.format(out)
+        )
+
+    vol_space = vol_data.space
+    vol_arr = vol_data.asarray()
+    frame = _detector_frame(geometry, geometry.angles)
+    tasks = _forward_tasks(vol_space, geometry)
+
+    with writable_array(out) as out_arr:
+        def run_task(task):
+            k, row_slc = task
+            out_arr[k, row_slc] = _forward_tile(
+                vol_arr, vol_space, geometry, k, row_slc, frame)
+
+        parallel_map(run_task, tasks)
+
+    return out
+
+
+def numpy_cpu_back_projector(proj_data, geometry, vol_space, out=None):
+    """Run a back-projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    proj_data : `DiscretizedSpaceElement`
+        Projection data to which the back-projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    vol_space : `DiscretizedSpace`
+        Space to which the calling operator maps.
+    out : ``vol_space`` element, optional
+        Element of the reconstruction space to which the result is written.
+        If ``None``, an element in ``vol_space`` is created.
+
+    Returns
+    -------
+    out : ``vol_space`` element
+        Reconstruction data resulting from the application of the backward
+        projector. If ``out`` was provided, the returned object is a
+        reference to it.
+    """
+    if not isinstance(proj_data, DiscretizedSpaceElement):
+        raise TypeError(
+            'projection data {!r} is not a `DiscretizedSpaceElement` '
+            'instance'.format(proj_data)
+        )
+    if not isinstance(vol_space, DiscretizedSpace):
+        raise TypeError(
+            'volume space {!r} is not a DiscretizedSpace instance'
+            ''.format(vol_space)
+        )
+    _check_geometry(geometry, vol_space)
+    if out is None:
+        out = vol_space.element()
+    elif out not in vol_space:
+        raise TypeError(
+            '`out` {} is neither None nor a `DiscretizedSpaceElement` '
+            'instance'.format(out)
+        )
+
+    proj_arr = proj_data.asarray()
+    frame = _detector_frame(geometry, geometry.angles)
+
+    # Split the volume into slabs along the first axis
+    slice_size = int(np.prod(vol_space.shape[1:]))
+    slab_slices = chunk_slices(vol_space.shape[0],
+                               max(1, MAX_TASK_SIZE // slice_size))
+
+    with writable_array(out) as out_arr:
+        def run_task(slab_slc):
+            out_arr[slab_slc] = _backward_slab(
+                proj_arr, vol_space, geometry, slab_slc, frame)
+
+        parallel_map(run_task, slab_slices)
+
+    # The voxel-driven sum approximates the transpose of the forward
+    # projector times the ratio of detector cell and voxel volumes. The
+    # adjoint additionally contains the ratio of the space weightings.
+    scaling_factor = float(proj_data.space.weighting.const)
+    scaling_factor /= float(vol_space.weighting.const)
+    scaling_factor *= vol_space.cell_volume
+    scaling_factor /= geometry.det_partition.cell_volume
+    out *= scaling_factor
+
+    return out
+
+
+class NumpyCpuImpl:
+    """Native NumPy CPU backend of the `RayTransform` operator."""
+
+    def __init__(self, geometry, vol_space, proj_space):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        vol_space : `DiscretizedSpace`
+            Reconstruction space, the space of the images to be forward
+            projected.
+        proj_space : `DiscretizedSpace`
+            Projection space, the space of the result.
+        """
+        if not isinstance(vol_space, DiscretizedSpace):
+            raise TypeError(
+                '`vol_space` must be a `DiscretizedSpace` instance, got {!r}'
+                ''.format(vol_space)
+            )
+        if not isinstance(proj_space, DiscretizedSpace):
+            raise TypeError(
+                '`proj_space` must be a `DiscretizedSpace` instance, got {!r}'
+                ''.format(proj_space)
+            )
+        _check_geometry(geometry, vol_space)
+
+        self.geometry = geometry
+        self._vol_space = vol_space
+        self._proj_space = proj_space
+
+    @property
+    def vol_space(self):
+        return self._vol_space
+
+    @property
+    def proj_space(self):
+        return self._proj_space
+
+    @_add_default_complex_impl
+    def call_forward(self, x, out, **kwargs):
+        return numpy_cpu_forward_projector(
+            x, self.geometry, self.proj_space.real_space, out
+        )
+
+    @_add_default_complex_impl
+    def call_backward(self, x, out, **kwargs):
+        return numpy_cpu_back_projector(
+            x, self.geometry, self.vol_space.real_space, out
+        )
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+
+    run_doctests()
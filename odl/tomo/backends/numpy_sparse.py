@@ -0,0 +1,540 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Ray transform as precomputed sparse system matrix.
+
+The matrix contains the ray weights of the ray-driven projector from
+`odl.tomo.backends.numpy_cpu`. It is computed once per geometry and
+volume space, optionally stored on disk, and reused for all subsequent
+forward and backward projections. The back-projection uses the transposed
+matrix and is therefore the exact adjoint of the forward projection.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import os
+import tempfile
+from functools import reduce
+
+import numpy as np
+
+from odl.discr import DiscretizedSpace, DiscretizedSpaceElement
+from odl.tomo.backends.numpy_cpu import (
+    _check_geometry, _detector_frame, _forward_tasks, _interp_corners,
+    _ray_samples, RAY_STEP)
+from odl.tomo.backends.util import _add_default_complex_impl
+from odl.tomo.geometry import DivergentBeamGeometry
+from odl.util.parallel import chunk_slices, get_num_threads, parallel_map
+from odl.util.utility import writable_array
+
+__all__ = (
+    'numpy_sparse_system_matrix',
+    'numpy_sparse_forward_projector',
+    'numpy_sparse_back_projector',
+)
+
+
+# Default directory for cached system matrices, used if no `cache_dir` is
+# given. `None` means that matrices are not stored on disk.
+CACHE_DIR = None
+
+# Version of the on-disk format, part of the cache key
+_CACHE_FORMAT_VERSION = 1
+
+
+def _cache_key(geometry, vol_space):
+    """Return a string that identifies the system matrix of a setup.
+
+    The key is derived from the detector and source positions for all
+    angles, the detector and volume grids and the data type, i.e., from
+    everything the matrix entries depend on.
+    """
+    sha = hashlib.sha1()
+
+    def update(arr):
+        arr = np.ascontiguousarray(arr, dtype=float)
+        sha.update(str(arr.shape).encode())
+        sha.update(arr.tobytes())
+
+    sha.update('{} {} {}'.format(_CACHE_FORMAT_VERSION, RAY_STEP,
+                                 vol_space.dtype).encode())
+    sha.update(repr(geometry).encode())
+    angles = geometry.angles
+    update(angles)
+    for arr in _detector_frame(geometry, angles):
+        update(arr)
+    if isinstance(geometry, DivergentBeamGeometry):
+        update(geometry.src_position(angles))
+    else:
+        update(geometry.det_to_src(angles, geometry.det_grid.mid_pt))
+    for vec in geometry.det_grid.coord_vectors:
+        update(vec)
+    update(vol_space.domain.min_pt)
+    update(vol_space.domain.max_pt)
+    for vec in vol_space.grid.coord_vectors:
+        update(vec)
+    return sha.hexdigest()
+
+
+def _compute_system_matrix(geometry, vol_space):
+    """Compute the system matrix in CSR format, in parallel."""
+    import scipy.sparse
+
+    frame = _detector_frame(geometry, geometry.angles)
+    num_cols = vol_space.size
+    dtype = vol_space.real_space.dtype
+
+    def build_block(task):
+        k, row_slc = task
+        indices, steps = _ray_samples(vol_space, geometry, k, row_slc,
+                                      frame)
+        num_rays = steps.size
+        num_samples = indices[0].shape[-1]
+        rows = np.repeat(np.arange(num_rays), num_samples)
+        cols, vals = [], []
+        for flat_idx, weight in _interp_corners(vol_space.shape, indices):
+            cols.append(np.broadcast_to(
+                flat_idx, indices[0].shape).ravel())
+            vals.append((weight * steps[..., None]).ravel())
+
+        block = scipy.sparse.coo_matrix(
+            (np.concatenate(vals).astype(dtype),
+             (np.tile(rows, len(cols)), np.concatenate(cols))),
+            shape=(num_rays, num_cols)).tocsr()
+        block.eliminate_zeros()
+        return block
+
+    # Tasks are ordered by angle and detector row, so stacking the blocks
+    # gives the rows in the order of the projection data
+    tasks = _forward_tasks(vol_space, geometry)
+    blocks = parallel_map(build_block, tasks)
+    return scipy.sparse.vstack(blocks, format='csr')
+
+
+def _load_matrix(path, shape):
+    """Load a CSR matrix from ``path`` with memory-mapped arrays."""
+    import scipy.sparse
+
+    arrays = [np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+              for name in ('data', 'indices', 'indptr')]
+    return scipy.sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def _save_matrix(matrix, path):
+    """Save the arrays of a CSR matrix as ``.npy`` files in ``path``.
+
+    The files are first written to a temporary directory which is then
+    renamed, such that concurrent readers never see partial data.
+    """
+    parent = os.path.dirname(path)
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+    tmp_path = tempfile.mkdtemp(dir=parent)
+    for name in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(tmp_path, name + '.npy'),
+                getattr(matrix, name))
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # Another process has stored the same matrix in the meantime
+        for name in os.listdir(tmp_path):
+            os.remove(os.path.join(tmp_path, name))
+        os.rmdir(tmp_path)
+
+
+def numpy_sparse_system_matrix(geometry, vol_space, cache_dir=None):
+    """Return the system matrix of the ray transform.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the tomographic setup. The same geometries as
+        for `numpy_cpu_forward_projector` are supported.
+    vol_space : `DiscretizedSpace`
+        Reconstruction space.
+    cache_dir : str, optional
+        Directory in which the matrix is stored under a key derived
+        from ``geometry`` and ``vol_space``. If the matrix is found there,
+        it is loaded with memory-mapped arrays instead of being computed.
+        Default: `CACHE_DIR`, and no disk cache if that is ``None``.
+
+    Returns
+    -------
+    matrix : `scipy.sparse.csr_matrix`
+        Matrix of shape ``(proj_size, vol_space.size)``, where rows
+        correspond to the flattened projection data and columns to the
+        flattened volume, both in C order. The entries are the ray
+        weights, i.e., no cell volumes or other scaling are included.
+    """
+    _check_geometry(geometry, vol_space)
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+    shape = (geometry.partition.size, vol_space.size)
+
+    if cache_dir is None:
+        return _compute_system_matrix(geometry, vol_space)
+
+    path = os.path.join(os.path.expanduser(cache_dir),
+                        _cache_key(geometry, vol_space))
+    if not os.path.isdir(path):
+        _save_matrix(_compute_system_matrix(geometry, vol_space), path)
+    return _load_matrix(path, shape)
+
+
+def _csr_row_view(matrix, start, stop):
+    """Return rows ``start:stop`` of a CSR matrix without copying data.
+
+    In contrast to ``matrix[start:stop]``, the returned matrix shares its
+    ``data`` and ``indices`` arrays with ``matrix``, which makes this
+    suitable for memory-mapped matrices.
+    """
+    import scipy.sparse
+
+    i0, i1 = matrix.indptr[start], matrix.indptr[stop]
+    # Assign the arrays directly since the constructor copies small slices
+    # of large arrays
+    view = scipy.sparse.csr_matrix((stop - start, matrix.shape[1]),
+                                   dtype=matrix.dtype)
+    view.data = matrix.data[i0:i1]
+    view.indices = matrix.indices[i0:i1]
+    view.indptr = matrix.indptr[start:stop + 1] - i0
+    return view
+
+
+def _row_blocks(matrix, rows=None):
+    """Split the rows of ``matrix`` into blocks for the threads.
+
+    Parameters
+    ----------
+    matrix : `scipy.sparse.csr_matrix`
+        Matrix to be split.
+    rows : sequence of tuple, optional
+        Ranges ``(start, stop)`` of the rows of ``matrix`` that are used,
+        in this order. Default: all rows.
+
+    Returns
+    -------
+    blocks : list of list
+        One list per thread with pairs ``(slc, view)``, where ``view``
+        are rows of ``matrix`` and ``slc`` their position among the
+        selected rows.
+    """
+    if rows is None:
+        rows = [(0, matrix.shape[0])]
+    num_rows = sum(stop - start for start, stop in rows)
+    num_blocks = max(1, min(get_num_threads(), num_rows))
+    block_size = -(-num_rows // num_blocks)
+
+    blocks = []
+    for chunk in chunk_slices(num_rows, block_size):
+        parts = []
+        offset = 0
+        for start, stop in rows:
+            lo = max(chunk.start, offset)
+            hi = min(chunk.stop, offset + stop - start)
+            if lo < hi:
+                parts.append((slice(lo, hi),
+                              _csr_row_view(matrix, start + lo - offset,
+                                            start + hi - offset)))
+            offset += stop - start
+        blocks.append(parts)
+    return blocks
+
+
+def numpy_sparse_forward_projector(vol_data, matrix, proj_space,
+                                   out=None, rows=None):
+    """Run a forward projection with a precomputed system matrix.
+
+    Parameters
+    ----------
+    vol_data : `DiscretizedSpaceElement`
+        Volume data to which the forward projector is applied.
+    matrix : `scipy.sparse.csr_matrix`
+        System matrix as returned by `numpy_sparse_system_matrix`.
+    proj_space : `DiscretizedSpace`
+        Space to which the calling operator maps.
+    out : ``proj_space`` element, optional
+        Element of the projection space to which the result is written. If
+        ``None``, an element in ``proj_space`` is created.
+    rows : sequence of tuple, optional
+        Ranges ``(start, stop)`` of the rows of ``matrix`` that make up
+        the projector, in the order of the projection data. This allows
+        projecting onto a subset of the angles without copying rows.
+        Default: all rows.
+
+    Returns
+    -------
+    out : ``proj_space`` element
+        Projection data resulting from the application of the projector.
+        If ``out`` was provided, the returned object is a reference to it.
+    """
+    if not isinstance(vol_data, DiscretizedSpaceElement):
+        raise TypeError(
+            'volume data {!r} is not a `DiscretizedSpaceElement` instance'
+            ''.format(vol_data)
+        )
+    if out is None:
+        out = proj_space.element()
+
+    x = vol_data.asarray().ravel()
+    result = np.empty(proj_space.size, dtype=proj_space.dtype)
+
+    def run_block(block):
+        for slc, view in block:
+            result[slc] = view.dot(x)
+
+    parallel_map(run_block, _row_blocks(matrix, rows))
+    with writable_array(out) as out_arr:
+        out_arr[:] = result.reshape(out_arr.shape)
+    return out
+
+
+def numpy_sparse_back_projector(proj_data, matrix, vol_space, out=None,
+                                rows=None):
+    """Run a back-projection with a precomputed system matrix.
+
+    Parameters
+    ----------
+    proj_data : `DiscretizedSpaceElement`
+        Projection data to which the back-projector is applied.
+    matrix : `scipy.sparse.csr_matrix`
+        System matrix as returned by `numpy_sparse_system_matrix`.
+    vol_space : `DiscretizedSpace`
+        Space to which the calling operator maps.
+    out : ``vol_space`` element, optional
+        Element of the reconstruction space to which the result is written.
+        If ``None``, an element in ``vol_space`` is created.
+    rows : sequence of tuple, optional
+        Ranges ``(start, stop)`` of the rows of ``matrix`` that make up
+        the projector, see `numpy_sparse_forward_projector`.
+
+    Returns
+    -------
+    out : ``vol_space`` element
+        Reconstruction data resulting from the application of the backward
+        projector. If ``out`` was provided, the returned object is a
+        reference to it.
+    """
+    if not isinstance(proj_data, DiscretizedSpaceElement):
+        raise TypeError(
+            'projection data {!r} is not a `DiscretizedSpaceElement` '
+            'instance'.format(proj_data)
+        )
+    if out is None:
+        out = vol_space.element()
+
+    y = proj_data.asarray().ravel()
+
+    # Each thread back-projects a block of rows, the partial volumes are
+    # summed in a fixed order
+    def run_block(block):
+        return reduce(np.add, [view.T.dot(y[slc]) for slc, view in block])
+
+    result = reduce(np.add, parallel_map(run_block,
+                                         _row_blocks(matrix, rows)))
+
+    # Adjoint with respect to the weighted inner products of the spaces
+    scaling_factor = float(proj_data.space.weighting.const)
+    scaling_factor /= float(vol_space.weighting.const)
+    result *= scaling_factor
+
+    with writable_array(out) as out_arr:
+        out_arr[:] = result.reshape(out_arr.shape)
+    return out
+
+
+class NumpySparseImpl:
+    """Sparse system matrix backend of the `RayTransform` operator."""
+
+    def __init__(self, geometry, vol_space, proj_space, cache_dir=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        vol_space : `DiscretizedSpace`
+            Reconstruction space, the space of the images to be forward
+            projected.
+        proj_space : `DiscretizedSpace`
+            Projection space, the space of the result.
+        cache_dir : str, optional
+            Directory for storing the system matrix on disk, see
+            `numpy_sparse_system_matrix`.
+        """
+        if not isinstance(vol_space, DiscretizedSpace):
+            raise TypeError(
+                '`vol_space` must be a `DiscretizedSpace` instance, got {!r}'
+                ''.format(vol_space)
+            )
+        if not isinstance(proj_space, DiscretizedSpace):
+            raise TypeError(
+                '`proj_space` must be a `DiscretizedSpace` instance, got {!r}'
+                ''.format(proj_space)
+            )
+        _check_geometry(geometry, vol_space)
+
+        self.geometry = geometry
+        self._vol_space = vol_space
+        self._proj_space = proj_space
+        self.cache_dir = cache_dir
+        self._matrix = None
+        # For angle subsets: back-end of the full geometry, its angle
+        # indices and the corresponding row ranges of its matrix
+        self._parent = None
+        self._angles = None
+        self._rows = None
+
+    @property
+    def vol_space(self):
+        return self._vol_space
+
+    @property
+    def proj_space(self):
+        return self._proj_space
+
+    @property
+    def matrix(self):
+        """System matrix, computed or loaded on first access.
+
+        For an `angle_subset`, this matrix consists of rows of the matrix
+        of the full geometry. It shares data with that matrix if the
+        angles are contiguous and is a copy otherwise. The projectors
+        never copy rows.
+        """
+        if self._parent is not None:
+            views = [_csr_row_view(self._parent.matrix, start, stop)
+                     for start, stop in self._rows]
+            if len(views) == 1:
+                return views[0]
+            import scipy.sparse
+            return scipy.sparse.vstack(views, format='csr')
+
+        if self._matrix is None:
+            self._matrix = numpy_sparse_system_matrix(
+                self.geometry, self.vol_space.real_space, self.cache_dir
+            )
+        return self._matrix
+
+    @property
+    def _full_matrix(self):
+        """Matrix from which the rows in ``self._rows`` are taken."""
+        if self._parent is not None:
+            return self._parent.matrix
+        else:
+            return self.matrix
+
+    def angle_subset(self, indices, proj_space):
+        """Return a back-end for a subset of the angles.
+
+        The returned back-end does not compute a matrix of its own but
+        uses the rows of this back-end's matrix, for arbitrary angle
+        indices, e.g., interleaved subsets ``slice(i, None, n)``.
+
+        Parameters
+        ----------
+        indices : slice or sequence of int
+            Indices of the angles in the subset.
+        proj_space : `DiscretizedSpace`
+            Projection space of the subset, with shape
+            ``self.geometry[indices].partition.shape``.
+
+        Returns
+        -------
+        impl : `NumpySparseImpl`
+            Back-end for the geometry ``self.geometry[indices]``.
+        """
+        angles = np.arange(len(self.geometry.angles))[indices]
+        if angles.ndim != 1:
+            raise ValueError('`indices` {!r} do not select a sequence of '
+                             'angles'.format(indices))
+        if self._parent is None:
+            parent = self
+        else:
+            parent = self._parent
+            angles = self._angles[angles]
+
+        impl = NumpySparseImpl(self.geometry[indices], self.vol_space,
+                               proj_space, cache_dir=self.cache_dir)
+        impl._parent = parent
+        impl._angles = angles
+
+        # Rows of consecutive angles are merged into one range
+        rows_per_angle = self.geometry.det_partition.size
+        impl._rows = []
+        for angle in angles:
+            start = int(angle) * rows_per_angle
+            if impl._rows and impl._rows[-1][1] == start:
+                impl._rows[-1] = (impl._rows[-1][0], start + rows_per_angle)
+            else:
+                impl._rows.append((start, start + rows_per_angle))
+        return impl
+
+    @_add_default_complex_impl
+    def call_forward(self, x, out, **kwargs):
+        return numpy_sparse_forward_projector(
+            x, self._full_matrix, self.proj_space.real_space, out,
+            rows=self._rows
+        )
+
+    @_add_default_complex_impl
+    def call_backward(self, x, out, **kwargs):
+        return numpy_sparse_back_projector(
+            x, self._full_matrix, self.vol_space.real_space, out,
+            rows=self._rows
+        )
+
+    def call_forward_batch(self, x_batch, out):
+        """Forward project a stack of volumes with one matrix product.
+
+        Parameters
+        ----------
+        x_batch : `numpy.ndarray`
+            Array of shape ``(N,) + vol_space.shape``.
+        out : `numpy.ndarray`
+            Array of shape ``(N,) + proj_space.shape`` to which the
+            result is written.
+        """
+        x_mat = x_batch.reshape((x_batch.shape[0], -1)).T
+        out_mat = out.reshape((out.shape[0], -1))
+
+        def run_block(block):
+            for slc, view in block:
+                out_mat[:, slc] = view.dot(x_mat).T
+
+        parallel_map(run_block, _row_blocks(self._full_matrix, self._rows))
+
+    def call_backward_batch(self, x_batch, out):
+        """Back-project a stack of sinograms with one matrix product.
+
+        Parameters
+        ----------
+        x_batch : `numpy.ndarray`
+            Array of shape ``(N,) + proj_space.shape``.
+        out : `numpy.ndarray`
+            Array of shape ``(N,) + vol_space.shape`` to which the
+            result is written.
+        """
+        y_mat = x_batch.reshape((x_batch.shape[0], -1)).T
+
+        def run_block(block):
+            return reduce(np.add, [view.T.dot(y_mat[slc])
+                                   for slc, view in block])
+
+        result = reduce(np.add, parallel_map(
+            run_block, _row_blocks(self._full_matrix, self._rows)))
+        result *= (float(self.proj_space.weighting.const) /
+                   float(self.vol_space.weighting.const))
+        out.reshape((out.shape[0], -1))[:] = result.T
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+
+    run_doctests()
@@ -16,10 +16,10 @@ import numpy as np
 
 from odl.discr import (
     DiscretizedSpace, uniform_discr_frompartition, uniform_partition)
-from odl.discr.discr_utils import linear_interpolator, point_collocation
+from odl.discr.discr_utils import _compute_linear_weights_edge
 from odl.tomo.backends.util import _add_default_complex_impl
 from odl.tomo.geometry import Geometry, Parallel2dGeometry
-from odl.util.utility import writable_array
+from odl.util.utility import cache_arguments, writable_array
 
 try:
     import skimage
@@ -37,28 +37,63 @@ __all__ = (
 
 def skimage_proj_space(geometry, volume_space, proj_space):
     """Create a projection space adapted to the skimage radon geometry."""
+    return _skimage_proj_space(
+        geometry.motion_partition, volume_space, proj_space.dtype
+    )
+
+
+@cache_arguments
+def _skimage_proj_space(motion_partition, volume_space, dtype):
+    """Cached implementation of `skimage_proj_space`."""
     padded_size = int(np.ceil(volume_space.shape[0] * np.sqrt(2)))
     det_width = volume_space.domain.extent[0] * np.sqrt(2)
     det_part = uniform_partition(-det_width / 2, det_width / 2, padded_size)
 
-    part = geometry.motion_partition.insert(1, det_part)
-    space = uniform_discr_frompartition(part, dtype=proj_space.dtype)
+    part = motion_partition.insert(1, det_part)
+    space = uniform_discr_frompartition(part, dtype=dtype)
     return space
 
 
-def clamped_interpolation(skimage_range, sinogram):
-    """Return interpolator that clamps points to min/max of the space."""
-    min_x = skimage_range.domain.min()[1]
-    max_x = skimage_range.domain.max()[1]
+@cache_arguments
+def _resampling_plan(src_space, dst_space):
+    """Return indices and weights for resampling along the detector axis.
 
-    def _interpolator(x, out=None):
-        x = (x[0], np.clip(x[1], min_x, max_x))
-        interpolator = linear_interpolator(
-            sinogram, skimage_range.grid.coord_vectors
-        )
-        return interpolator(x, out=out)
+    The values are those of linear interpolation of data on
+    ``src_space.grid`` at the points of ``dst_space.grid``, where the
+    points are clamped to the domain of ``src_space``. Both spaces must
+    have the same angle grid, which is therefore left untouched.
+
+    Returns
+    -------
+    plan : tuple of `numpy.ndarray`
+        Indices ``idx_lo, idx_hi`` and weights ``w_lo, w_hi`` such that
+        ``w_lo * src[:, idx_lo] + w_hi * src[:, idx_hi]`` is the
+        interpolated data.
+    """
+    cvec = src_space.grid.coord_vectors[1]
+    x = np.clip(dst_space.grid.coord_vectors[1],
+                src_space.domain.min()[1], src_space.domain.max()[1])
+
+    idcs = np.searchsorted(cvec, x) - 1
+    idcs = np.clip(idcs, 0, cvec.size - 2)
+    norm_dist = (x - cvec[idcs]) / (cvec[idcs + 1] - cvec[idcs])
+    w_lo, w_hi, (idx_lo, idx_hi) = _compute_linear_weights_edge(
+        idcs, norm_dist)
+    return idx_lo, idx_hi, w_lo, w_hi
 
-    return _interpolator
+
+def _resample(src_arr, plan, out, scale=1.0):
+    """Resample ``src_arr`` along axis 1 with ``plan``, writing to ``out``.
+
+    The result is multiplied by ``scale``.
+    """
+    idx_lo, idx_hi, w_lo, w_hi = plan
+    np.take(src_arr, idx_lo, axis=1, out=out)
+    out *= w_lo * scale
+    tmp = np.take(src_arr, idx_hi, axis=1)
+    tmp *= w_hi * scale
+    out += tmp
+    return out
 
 
 def skimage_radon_forward_projector(volume, geometry, proj_space, out=None):
@@ -89,25 +124,21 @@ def skimage_radon_forward_projector(volume, geometry, proj_space, out=None):
 
     theta = np.degrees(geometry.angles)
     skimage_range = skimage_proj_space(geometry, volume.space, proj_space)
+    plan = _resampling_plan(skimage_range, proj_space)
 
     # Rotate volume from (x, y) to (rows, cols), then project
     sino_arr = radon(
         np.rot90(volume.asarray(), 1), theta=theta, circle=False
     )
-    sinogram = skimage_range.element(sino_arr.T)
 
     if out is None:
         out = proj_space.element()
 
+    # Resample from (det, angles) in the skimage range directly to
+    # (angles, det) in `out`, including the scaling
     with writable_array(out) as out_arr:
-        point_collocation(
-            clamped_interpolation(skimage_range, sinogram),
-            proj_space.grid.meshgrid,
-            out=out_arr,
-        )
-
-    scale = volume.space.cell_sides[0]
-    out *= scale
+        _resample(sino_arr.T, plan, out=out_arr,
+                  scale=volume.space.cell_sides[0])
 
     return out
 
@@ -137,14 +168,12 @@ def skimage_radon_back_projector(sinogram, geometry, vol_space, out=None):
 
     theta = np.degrees(geometry.angles)
     skimage_range = skimage_proj_space(geometry, vol_space, sinogram.space)
+    plan = _resampling_plan(sinogram.space, skimage_range)
 
-    skimage_sinogram = skimage_range.element()
-    with writable_array(skimage_sinogram) as sino_arr:
-        point_collocation(
-            clamped_interpolation(sinogram.space, sinogram),
-            skimage_range.grid.meshgrid,
-            out=sino_arr,
-        )
+    # Resample to the transposed skimage layout (det, angles)
+    skimage_sino_arr = np.empty(skimage_range.shape[::-1],
+                                dtype=sinogram.dtype).T
+    _resample(sinogram.asarray(), plan, out=skimage_sino_arr)
 
     if out is None:
         out = vol_space.element()
@@ -160,13 +189,12 @@ def skimage_radon_back_projector(sinogram, geometry, vol_space, out=None):
 
     # Rotate back from (rows, cols) to (x, y), then back-project (no filter)
     backproj = iradon(
-        skimage_sinogram.asarray().T,
+        skimage_sino_arr.T,
         theta,
         output_size=vol_space.shape[0],
         circle=False,
         **filter_disable
     )
-    out[:] = np.rot90(backproj, -1)
 
     # Empirically determined value, gives correct scaling
     scaling_factor = 4 * geometry.motion_params.length / (2 * np.pi)
@@ -179,8 +207,9 @@ def skimage_radon_back_projector(sinogram, geometry, vol_space, out=None):
     scaling_factor *= sinogram.space.weighting.const / proj_weighting
     scaling_factor /= vol_space.weighting.const / vol_space.cell_volume
 
-    # Correctly scale the output
-    out *= scaling_factor
+    # Write the correctly scaled output
+    with writable_array(out) as out_arr:
+        np.multiply(np.rot90(backproj, -1), scaling_factor, out=out_arr)
 
     return out
 
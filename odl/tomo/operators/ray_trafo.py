@@ -16,11 +16,13 @@ import numpy as np
 
 from odl.discr import DiscretizedSpace
 from odl.operator import Operator
-from odl.space.weighting import ConstWeighting
+from odl.space.weighting import ArrayWeighting, ConstWeighting
 from odl.tomo.backends import (
     ASTRA_AVAILABLE, ASTRA_CUDA_AVAILABLE, SKIMAGE_AVAILABLE)
 from odl.tomo.backends.astra_cpu import AstraCpuImpl
 from odl.tomo.backends.astra_cuda import AstraCudaImpl
+from odl.tomo.backends.numpy_cpu import NumpyCpuImpl
+from odl.tomo.backends.numpy_sparse import NumpySparseImpl
 from odl.tomo.backends.skimage_radon import SkImageImpl
 from odl.tomo.geometry import Geometry
 from odl.util import is_string
@@ -28,6 +30,8 @@ from odl.util import is_string
 # RAY_TRAFO_IMPLS are used by `RayTransform` when no `impl` is given.
 # The last inserted implementation has highest priority.
 RAY_TRAFO_IMPLS = OrderedDict()
+RAY_TRAFO_IMPLS['numpy_sparse'] = NumpySparseImpl
+RAY_TRAFO_IMPLS['numpy_cpu'] = NumpyCpuImpl
 if SKIMAGE_AVAILABLE:
     RAY_TRAFO_IMPLS['skimage'] = SkImageImpl
 if ASTRA_AVAILABLE:
@@ -55,13 +59,23 @@ class RayTransform(Operator):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
-            Implementation back-end for the transform. Supported back-ends:
+        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage', 'numpy_cpu',
+                'numpy_sparse'}, optional
+            Implementation back-end for the transform.
+            Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy_cpu'``: native multithreaded NumPy implementation,
+              2D or 3D parallel beam and divergent beam geometries with
+              flat detector. Always available, but slower than ASTRA.
+            - ``'numpy_sparse'``: same as ``'numpy_cpu'``, but with the
+              projector stored as a sparse matrix. This is faster for
+              repeated evaluations, at the expense of memory and an
+              initial setup time. Pass a ``NumpySparseImpl`` instance
+              with ``cache_dir`` to store the matrix on disk.
 
             For the default ``None``, the fastest available back-end is
             used.
@@ -122,10 +136,19 @@ class RayTransform(Operator):
             else:
                 raise NotImplementedError('unknown weighting of domain')
 
+            # Use the same storage as the volume, e.g., memory-mapped files
+            # for out-of-core data
+            if getattr(vol_space.tspace, 'storage', 'memory') == 'memmap':
+                storage_kwargs = {
+                    'storage': 'memmap',
+                    'storage_dir': vol_space.tspace.storage_dir}
+            else:
+                storage_kwargs = {}
             proj_tspace = vol_space.tspace_type(
                 geometry.partition.shape,
                 weighting=weighting,
                 dtype=dtype,
+                **storage_kwargs
             )
 
             if geometry.motion_partition.ndim == 0:
@@ -316,10 +339,94 @@ class RayTransform(Operator):
         """
         return self.get_impl(self.use_cache).call_forward(x, out, **kwargs)
 
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``.
+
+        Backends can provide a vectorized ``call_forward_batch(x_batch,
+        out)`` method, otherwise the default loop over the batch is used.
+        """
+        impl = self.get_impl(self.use_cache)
+        if hasattr(impl, 'call_forward_batch'):
+            impl.call_forward_batch(x_batch, out)
+        else:
+            super(RayTransform, self)._apply_batch(x_batch, out)
+
     @property
     def geometry(self):
         return self._geometry
 
+    def angle_subset(self, indices):
+        """Return the ray transform for a subset of the angles.
+
+        Parameters
+        ----------
+        indices : slice
+            Indices of the angles in the subset, e.g.,
+            ``slice(1, None, 4)`` for every fourth angle starting with
+            the second one.
+
+        Returns
+        -------
+        subset_trafo : `RayTransform`
+            Ray transform with geometry ``self.geometry[indices]``. Its
+            range is the corresponding part of `range`, with the same
+            weighting. Back-ends with an ``angle_subset`` method, like
+            ``'numpy_sparse'``, share their data with this operator.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry,
+        ...                                   impl='numpy_sparse')
+        >>> subset_trafo = ray_trafo.angle_subset(slice(1, None, 2))
+        >>> subset_trafo.range.shape
+        (3, 17)
+        >>> phantom = odl.phantom.shepp_logan(space)
+        >>> np.allclose(subset_trafo(phantom), ray_trafo(phantom)[1::2])
+        True
+        """
+        geometry = self.geometry[indices]
+
+        proj_space = self.range
+        if not proj_space.is_weighted:
+            weighting = None
+        elif isinstance(proj_space.weighting, ConstWeighting):
+            weighting = proj_space.weighting.const
+        elif isinstance(proj_space.weighting, ArrayWeighting):
+            weighting = proj_space.weighting.array[indices]
+        else:
+            raise NotImplementedError('unknown weighting of range')
+        if getattr(proj_space.tspace, 'storage', 'memory') == 'memmap':
+            storage_kwargs = {
+                'storage': 'memmap',
+                'storage_dir': proj_space.tspace.storage_dir}
+        else:
+            storage_kwargs = {}
+        subset_tspace = proj_space.tspace_type(
+            geometry.partition.shape,
+            weighting=weighting,
+            dtype=proj_space.dtype,
+            exponent=proj_space.exponent,
+            **storage_kwargs
+        )
+        subset_space = DiscretizedSpace(
+            geometry.partition, subset_tspace,
+            axis_labels=proj_space.axis_labels
+        )
+
+        if hasattr(self._impl_type, 'angle_subset'):
+            impl = self.get_impl(self.use_cache).angle_subset(
+                indices, subset_space)
+        elif self.impl in RAY_TRAFO_IMPLS:
+            impl = self.impl
+        else:
+            impl = self._impl_type
+
+        return RayTransform(self.domain, geometry, impl=impl,
+                            proj_space=subset_space,
+                            use_cache=self.use_cache, **self._extra_kwargs)
+
     @property
     def adjoint(self):
         """Adjoint of this operator.
@@ -364,6 +471,15 @@ class RayTransform(Operator):
                         ray_trafo.use_cache
                     ).call_backward(x, out, **kwargs)
 
+                def _apply_batch(self, x_batch, out):
+                    """Implement ``self.apply_batch(x_batch, out)``."""
+                    impl = ray_trafo.get_impl(ray_trafo.use_cache)
+                    if hasattr(impl, 'call_backward_batch'):
+                        impl.call_backward_batch(x_batch, out)
+                    else:
+                        super(RayBackProjection, self)._apply_batch(
+                            x_batch, out)
+
                 @property
                 def geometry(self):
                     return ray_trafo.geometry
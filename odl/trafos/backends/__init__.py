@@ -10,9 +10,13 @@
 
 from __future__ import absolute_import
 
+from .dwt_engine import *
+from .fft_engine import *
 from .pyfftw_bindings import *
 from .pywt_bindings import *
 
 __all__ = ()
+__all__ += dwt_engine.__all__
+__all__ += fft_engine.__all__
 __all__ += pyfftw_bindings.__all__
 __all__ += pywt_bindings.__all__
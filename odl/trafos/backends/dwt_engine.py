@@ -0,0 +1,872 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Separable multilevel DWT working on raveled coefficient arrays.
+
+The coefficients of an n-dimensional multilevel wavelet decomposition are
+stored in one flat array, using the layout of `pywt.ravel_coeffs`. The
+functions in this module write each subband directly into its slice of
+that array, and the inverse reads the subbands directly from those slices.
+Hence, no nested coefficient lists and no extra copies for raveling are
+needed.
+
+Two back-ends for the 1D filter bank steps are available:
+
+- ``'numpy'`` (always available) applies the analysis and synthesis
+  filters as polyphase sums of strided slices and writes into the
+  preallocated subbands. Large arrays are split along a non-filtered
+  axis, or along the batch axis, and processed in the ODL thread pool.
+  The filters are taken from PyWavelets if installed. Otherwise, the
+  Haar and Daubechies wavelets ``'db1'`` to ``'db4'`` are available.
+- ``'pywt'`` uses `pywt.dwt` and `pywt.idwt` for the 1D steps.
+
+The conventions for boundary handling and coefficient sizes are the
+same as in PyWavelets, such that both back-ends produce the same
+coefficients.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from functools import partial
+from itertools import product
+from math import factorial
+
+import numpy as np
+
+from odl.trafos.backends.pywt_bindings import PYWT_AVAILABLE, pywt_wavelet
+from odl.util import normalized_axes_tuple
+from odl.util.parallel import chunk_slices, get_num_threads, parallel_map
+
+if PYWT_AVAILABLE:
+    import pywt
+
+__all__ = (
+    'DWT_IMPLS',
+    'WaveletFilterBank',
+    'wavelet_filter_bank',
+    'dwt_max_level',
+    'dwt_coeff_shapes',
+    'dwt_coeff_size',
+    'dwt_forward',
+    'dwt_inverse',
+)
+
+
+DWT_IMPLS = ('numpy',)
+if PYWT_AVAILABLE:
+    DWT_IMPLS += ('pywt',)
+
+DWT_MODES = ('zero', 'constant', 'symmetric', 'reflect', 'periodic',
+             'smooth', 'antisymmetric', 'antireflect', 'periodization')
+
+# Arrays up to this size are transformed single-threaded
+_THREADING_MIN_SIZE = 2 ** 15
+
+# Maximum order of the built-in Daubechies wavelets
+_MAX_BUILTIN_DB = 4
+
+
+class WaveletFilterBank(object):
+
+    """Analysis and synthesis filters of a discrete wavelet.
+
+    Instances are usually created with `wavelet_filter_bank`. The filter
+    conventions are those of `pywt.Wavelet.filter_bank`.
+    """
+
+    def __init__(self, name, dec_lo, dec_hi, rec_lo, rec_hi,
+                 orthogonal=False, biorthogonal=False):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        name : str
+            Name of the wavelet.
+        dec_lo, dec_hi, rec_lo, rec_hi : `array-like`
+            Low- and high-pass filters for decomposition and
+            reconstruction. All filters must have the same even length.
+        orthogonal, biorthogonal : bool, optional
+            Whether the wavelet is orthogonal or biorthogonal.
+        """
+        self.name = str(name)
+        filters = [np.array(f, dtype=float, ndmin=1)
+                   for f in (dec_lo, dec_hi, rec_lo, rec_hi)]
+        lengths = set(len(f) for f in filters)
+        if len(lengths) != 1 or filters[0].size % 2 or filters[0].size < 2:
+            raise ValueError('filters must have the same positive even '
+                             'length, got lengths {}'
+                             ''.format([len(f) for f in filters]))
+        self.dec_lo, self.dec_hi, self.rec_lo, self.rec_hi = filters
+        self.orthogonal = bool(orthogonal)
+        self.biorthogonal = bool(biorthogonal)
+
+    @property
+    def dec_len(self):
+        """Length of the decomposition filters."""
+        return self.dec_lo.size
+
+    @property
+    def filter_bank(self):
+        """Tuple ``(dec_lo, dec_hi, rec_lo, rec_hi)`` of the filters."""
+        return self.dec_lo, self.dec_hi, self.rec_lo, self.rec_hi
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, dec_len={})'.format(self.__class__.__name__,
+                                             self.name, self.dec_len)
+
+
+def _daubechies_rec_lo(order):
+    """Return the reconstruction low-pass filter of ``'db<order>'``.
+
+    The filter is obtained by spectral factorization, choosing the
+    minimum-phase roots as in PyWavelets.
+    """
+    if order == 1:
+        return np.array([1.0, 1.0]) / np.sqrt(2)
+
+    # Roots of the Bezout polynomial in y = sin^2(w/2), mapped to z
+    poly = [factorial(order - 1 + k) // (factorial(k) * factorial(order - 1))
+            for k in range(order)][::-1]
+    q = np.poly1d([1])
+    for y in np.roots(poly).astype(complex):
+        part = 2 * np.sqrt(y * (y - 1))
+        const = 1 - 2 * y
+        z = const + part
+        if abs(z) < 1:
+            z = const - part
+        q = q * [1, -z]
+    rec_lo = np.real((np.poly1d([1, 1]) ** order * q).c)[::-1]
+    return rec_lo / rec_lo.sum() * np.sqrt(2)
+
+
+def wavelet_filter_bank(wavelet):
+    """Return the filter bank of ``wavelet``.
+
+    Parameters
+    ----------
+    wavelet : str, `pywt.Wavelet` or `WaveletFilterBank`
+        Specification of the wavelet. Without PyWavelets, only the
+        names ``'haar'`` and ``'db1'`` to ``'db4'`` are supported.
+
+    Returns
+    -------
+    filter_bank : `WaveletFilterBank`
+
+    Examples
+    --------
+    >>> bank = wavelet_filter_bank('haar')
+    >>> bank.dec_len
+    2
+    >>> bank.orthogonal
+    True
+    """
+    if isinstance(wavelet, WaveletFilterBank):
+        return wavelet
+
+    if PYWT_AVAILABLE:
+        wavelet = pywt_wavelet(wavelet)
+        return WaveletFilterBank(
+            wavelet.name, *wavelet.filter_bank,
+            orthogonal=wavelet.orthogonal, biorthogonal=wavelet.biorthogonal)
+
+    name, name_in = getattr(wavelet, 'name', str(wavelet)).lower(), wavelet
+    if name == 'haar':
+        order = 1
+    elif (name.startswith('db') and name[2:].isdigit() and
+          1 <= int(name[2:]) <= _MAX_BUILTIN_DB):
+        order = int(name[2:])
+    else:
+        raise ValueError("wavelet {!r} not available without PyWavelets"
+                         "".format(name_in))
+
+    rec_lo = _daubechies_rec_lo(order)
+    signs = (-1) ** np.arange(rec_lo.size)
+    rec_hi = signs * rec_lo[::-1]
+    return WaveletFilterBank(name, rec_lo[::-1], rec_hi[::-1], rec_lo, rec_hi,
+                             orthogonal=True, biorthogonal=True)
+
+
+def _coeff_len(size, filter_len, mode):
+    """Return the number of coefficients per band of a 1D DWT step."""
+    if mode == 'periodization':
+        return (size + 1) // 2
+    else:
+        return (size + filter_len - 1) // 2
+
+
+def dwt_max_level(shape, filter_len, axes=None):
+    """Return the maximum useful number of decomposition levels.
+
+    This is equivalent to `pywt.dwtn_max_level`.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        Shape of the input data.
+    filter_len : int
+        Length of the decomposition filters.
+    axes : sequence of ints, optional
+        Axes over which the transform is computed. ``None`` means all
+        axes.
+
+    Returns
+    -------
+    max_level : int
+
+    Examples
+    --------
+    >>> dwt_max_level((64, 64), filter_len=4)
+    4
+    >>> dwt_max_level((64, 8), filter_len=2, axes=(0,))
+    6
+    """
+    if axes is None:
+        axes = range(len(shape))
+    axes = normalized_axes_tuple(axes, len(shape))
+    levels = []
+    for axis in axes:
+        size = shape[axis]
+        if size < filter_len - 1:
+            levels.append(0)
+        else:
+            levels.append(int(np.floor(np.log2(size / (filter_len - 1)))))
+    return min(levels)
+
+
+def dwt_coeff_shapes(shape, filter_len, nlevels, mode, axes=None):
+    """Return the subband shapes of a multilevel DWT.
+
+    This is equivalent to `pywt.wavedecn_shapes`.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        Shape of the input data.
+    filter_len : int
+        Length of the decomposition filters.
+    nlevels : nonnegative int
+        Number of decomposition levels.
+    mode : str
+        PyWavelets signal extension mode, see ``DWT_MODES``.
+    axes : sequence of ints, optional
+        Axes over which the transform is computed. ``None`` means all
+        axes.
+
+    Returns
+    -------
+    coeff_shapes : list
+        Shape of the approximation coefficients, followed by one
+        dictionary of detail coefficient shapes per level, starting with
+        the coarsest level.
+
+    Examples
+    --------
+    >>> dwt_coeff_shapes((8,), filter_len=2, nlevels=2, mode='zero')
+    [(2,), {'d': (2,)}, {'d': (4,)}]
+    """
+    if axes is None:
+        axes = range(len(shape))
+    axes = normalized_axes_tuple(axes, len(shape))
+    keys = [''.join(key) for key in product('ad', repeat=len(axes))][1:]
+
+    shape = list(shape)
+    details = []
+    for _ in range(int(nlevels)):
+        for axis in axes:
+            shape[axis] = _coeff_len(shape[axis], filter_len, mode)
+        details.append({key: tuple(shape) for key in keys})
+    return [tuple(shape)] + details[::-1]
+
+
+def dwt_coeff_size(coeff_shapes):
+    """Return the total number of coefficients of a multilevel DWT.
+
+    This is equivalent to `pywt.wavedecn_size`.
+
+    Parameters
+    ----------
+    coeff_shapes : list
+        Subband shapes as returned by `dwt_coeff_shapes`.
+
+    Returns
+    -------
+    size : int
+
+    Examples
+    --------
+    >>> shapes = dwt_coeff_shapes((8, 8), filter_len=2, nlevels=2,
+    ...                           mode='zero')
+    >>> dwt_coeff_size(shapes)
+    64
+    """
+    size = int(np.prod(coeff_shapes[0]))
+    for details in coeff_shapes[1:]:
+        size += sum(int(np.prod(shape)) for shape in details.values())
+    return size
+
+
+# --- Signal extension --- #
+
+
+def _axis_slice(ndim, axis, slc):
+    """Return an index applying ``slc`` along ``axis``."""
+    index = [slice(None)] * ndim
+    index[axis] = slc
+    return tuple(index)
+
+
+def _extend(x, axis, left, right, mode):
+    """Extend ``x`` along ``axis`` according to the PyWavelets ``mode``."""
+    n = x.shape[axis]
+    if left == right == 0:
+        return x
+    if mode in ('smooth', 'antireflect') and n == 1:
+        mode = 'constant'
+
+    if mode in ('zero', 'constant', 'symmetric', 'reflect', 'periodic'):
+        np_mode = {'zero': 'constant', 'constant': 'edge',
+                   'symmetric': 'symmetric', 'reflect': 'reflect',
+                   'periodic': 'wrap'}[mode]
+        pad_width = [(0, 0)] * x.ndim
+        pad_width[axis] = (left, right)
+        return np.pad(x, pad_width, mode=np_mode)
+
+    elif mode == 'smooth':
+        # Linear extrapolation with the slope at the boundary
+        shape = [1] * x.ndim
+        shape[axis] = -1
+        first = x[_axis_slice(x.ndim, axis, slice(0, 1))]
+        last = x[_axis_slice(x.ndim, axis, slice(n - 1, n))]
+        slope_l = first - x[_axis_slice(x.ndim, axis, slice(1, 2))]
+        slope_r = last - x[_axis_slice(x.ndim, axis, slice(n - 2, n - 1))]
+        steps_l = np.arange(left, 0, -1).reshape(shape)
+        steps_r = np.arange(1, right + 1).reshape(shape)
+        return np.concatenate([first + steps_l * slope_l, x,
+                               last + steps_r * slope_r], axis=axis)
+
+    elif mode == 'antisymmetric':
+        # Sign-flipped half-sample reflection, periodic with period 2 * n
+        idcs = np.arange(-left, n + right) % (2 * n)
+        flip = idcs >= n
+        idcs[flip] = 2 * n - 1 - idcs[flip]
+        shape = [1] * x.ndim
+        shape[axis] = -1
+        signs = np.where(flip, -1, 1).reshape(shape)
+        return np.take(x, idcs, axis=axis) * signs
+
+    elif mode == 'antireflect':
+        # Point reflection at the boundary samples, repeated if necessary
+        while left > 0 or right > 0:
+            n = x.shape[axis]
+            num_l, num_r = min(left, n - 1), min(right, n - 1)
+            first = x[_axis_slice(x.ndim, axis, slice(0, 1))]
+            last = x[_axis_slice(x.ndim, axis, slice(n - 1, n))]
+            refl_l = x[_axis_slice(x.ndim, axis, slice(num_l, 0, -1))]
+            stop_r = n - 2 - num_r if num_r < n - 1 else None
+            refl_r = x[_axis_slice(x.ndim, axis, slice(n - 2, stop_r, -1))]
+            x = np.concatenate([2 * first - refl_l, x, 2 * last - refl_r],
+                               axis=axis)
+            left -= num_l
+            right -= num_r
+        return x
+
+    else:
+        raise ValueError("`mode` '{}' not understood".format(mode))
+
+
+# --- 1D filter bank steps --- #
+
+
+def _band_shape(shape, axis, size):
+    """Return ``shape`` with ``size`` along ``axis``."""
+    shape = list(shape)
+    shape[axis] = size
+    return tuple(shape)
+
+
+def _chunked(func, arrays, axis, num_threads):
+    """Call ``func`` on chunks of ``arrays`` along an axis other than ``axis``.
+
+    All arrays must have the same shape except along ``axis``. Chunks are
+    processed in the ODL thread pool.
+    """
+    ref = arrays[0]
+    if num_threads is None:
+        num_threads = get_num_threads()
+    if num_threads <= 1 or ref.ndim == 1 or ref.size < _THREADING_MIN_SIZE:
+        func(*arrays)
+        return
+
+    chunk_axis = max((i for i in range(ref.ndim) if i != axis),
+                     key=lambda i: ref.shape[i])
+    length = ref.shape[chunk_axis]
+    chunk_size = -(-length // num_threads)
+
+    def run(slc):
+        index = _axis_slice(ref.ndim, chunk_axis, slc)
+        func(*[arr[index] for arr in arrays])
+
+    parallel_map(run, chunk_slices(length, chunk_size),
+                 num_threads=num_threads)
+
+
+def _analysis_numpy(x, out_lo, out_hi, axis, bank, mode):
+    """Write the 1D analysis of ``x`` along ``axis`` to the outputs.
+
+    With ``ext`` the extended signal, the coefficients are ::
+
+        out[k] = sum_j filter[j] * ext[F - 1 - j + 2 * k],
+
+    which reproduces the boundary handling of PyWavelets.
+    """
+    flen = bank.dec_len
+    num = out_lo.shape[axis]
+    if mode == 'periodization':
+        if x.shape[axis] % 2:
+            last = x[_axis_slice(x.ndim, axis, slice(-1, None))]
+            x = np.concatenate([x, last], axis=axis)
+        ext = _extend(x, axis, flen // 2 - 1, flen // 2 - 1, 'periodic')
+    else:
+        ext = _extend(x, axis, flen - 2, 2 * num - x.shape[axis], mode)
+
+    tmp = np.empty_like(out_lo)
+    for out, filt in ((out_lo, bank.dec_lo), (out_hi, bank.dec_hi)):
+        out.fill(0)
+        for j, coeff in enumerate(filt):
+            if coeff == 0:
+                continue
+            start = flen - 1 - j
+            seg = ext[_axis_slice(ext.ndim, axis,
+                                  slice(start, start + 2 * num - 1, 2))]
+            np.multiply(seg, coeff, out=tmp)
+            out += tmp
+
+
+def _synthesis_numpy(lo, hi, out, axis, bank, mode):
+    """Write the 1D synthesis from ``lo`` and ``hi`` along ``axis`` to ``out``.
+
+    This is the transpose of the analysis with the time-reversed
+    reconstruction filters, restricted to the samples that do not depend
+    on the signal extension. In ``'periodization'`` mode, contributions
+    beyond the boundaries are wrapped around instead.
+    """
+    flen = bank.dec_len
+    num = lo.shape[axis]
+    size = out.shape[axis]
+    ndim = out.ndim
+    out.fill(0)
+    tmp = np.empty_like(lo)
+    for coeffs, filt in ((lo, bank.rec_lo), (hi, bank.rec_hi)):
+        for i, coeff in enumerate(filt):
+            if coeff == 0:
+                continue
+            np.multiply(coeffs, coeff, out=tmp)
+            if mode == 'periodization':
+                # Full index i + 2 * k maps to (i + 2 * k - offset) % size
+                offset = i - (flen // 2 - 1)
+                parity = offset % 2
+                shift = ((offset - parity) // 2) % num
+                dst = out[_axis_slice(ndim, axis, slice(parity, None, 2))]
+                dst[_axis_slice(ndim, axis, slice(shift, None))] += tmp[
+                    _axis_slice(ndim, axis, slice(0, num - shift))]
+                dst[_axis_slice(ndim, axis, slice(0, shift))] += tmp[
+                    _axis_slice(ndim, axis, slice(num - shift, None))]
+            else:
+                # Full index i + 2 * k maps to i + 2 * k - (F - 2)
+                k_min = max(0, -(-(flen - 2 - i) // 2))
+                k_max = min(num, (size - 1 + flen - 2 - i) // 2 + 1)
+                if k_max <= k_min:
+                    continue
+                start = i + 2 * k_min - (flen - 2)
+                dst = out[_axis_slice(
+                    ndim, axis, slice(start, start + 2 * (k_max - k_min), 2))]
+                dst += tmp[_axis_slice(ndim, axis, slice(k_min, k_max))]
+
+
+def _analysis(x, axis, wavelet, mode, impl, num_threads, out_lo=None,
+              out_hi=None):
+    """Return the low- and high-pass bands of ``x`` along ``axis``."""
+    num = _coeff_len(x.shape[axis], wavelet.dec_len, mode)
+    band_shape = _band_shape(x.shape, axis, num)
+    dtype = np.result_type(x.dtype, np.float32)
+    if out_lo is None:
+        out_lo = np.empty(band_shape, dtype=dtype)
+    if out_hi is None:
+        out_hi = np.empty(band_shape, dtype=dtype)
+
+    if impl == 'numpy':
+        func = partial(_analysis_numpy, axis=axis, bank=wavelet, mode=mode)
+        _chunked(func, [x, out_lo, out_hi], axis, num_threads)
+    else:
+        lo, hi = pywt.dwt(x, wavelet, mode=mode, axis=axis)
+        out_lo[:] = lo
+        out_hi[:] = hi
+    return out_lo, out_hi
+
+
+def _synthesis(lo, hi, axis, wavelet, mode, impl, num_threads, out=None):
+    """Return the 1D inverse DWT of ``lo`` and ``hi`` along ``axis``."""
+    if lo.shape != hi.shape:
+        raise ValueError('shape mismatch between approximation and detail '
+                         'coefficients: {} != {}'.format(lo.shape, hi.shape))
+    num = lo.shape[axis]
+    if mode == 'periodization':
+        size = 2 * num
+    else:
+        size = 2 * num - wavelet.dec_len + 2
+    if size < 1:
+        raise ValueError('too few coefficients ({}) along axis {} for a '
+                         'filter of length {}'
+                         ''.format(num, axis, wavelet.dec_len))
+    if out is None:
+        out = np.empty(_band_shape(lo.shape, axis, size),
+                       dtype=np.result_type(lo.dtype, hi.dtype, np.float32))
+
+    if impl == 'numpy':
+        func = partial(_synthesis_numpy, axis=axis, bank=wavelet, mode=mode)
+        _chunked(func, [lo, hi, out], axis, num_threads)
+    else:
+        out[:] = pywt.idwt(lo, hi, wavelet, mode=mode, axis=axis)
+    return out
+
+
+# --- Multilevel transforms --- #
+
+
+def _subband_view(arr, slc, shape):
+    """Return the subband ``slc`` of ``arr`` with ``shape`` as a view.
+
+    Leading axes of ``arr`` are batch axes.
+    """
+    batch_shape = arr.shape[:-1]
+    return arr[..., slc].reshape(batch_shape + tuple(shape))
+
+
+def _check_args(wavelet, mode, coeff_shapes, axes, impl):
+    """Return normalized arguments for `dwt_forward` and `dwt_inverse`.
+
+    For ``impl='pywt'``, the wavelet is returned as `pywt.Wavelet`,
+    otherwise as `WaveletFilterBank`.
+    """
+    impl, impl_in = str(impl).lower(), impl
+    if impl not in DWT_IMPLS:
+        raise ValueError("`impl` '{}' not supported".format(impl_in))
+    mode, mode_in = str(mode).lower(), mode
+    if mode not in DWT_MODES:
+        raise ValueError("`mode` '{}' not understood".format(mode_in))
+    if impl == 'pywt':
+        if isinstance(wavelet, WaveletFilterBank):
+            wavelet = pywt.Wavelet(wavelet.name,
+                                   filter_bank=wavelet.filter_bank)
+        else:
+            wavelet = pywt_wavelet(wavelet)
+    else:
+        wavelet = wavelet_filter_bank(wavelet)
+
+    ndim = len(coeff_shapes[0])
+    if axes is None:
+        axes = range(ndim)
+    axes = normalized_axes_tuple(axes, ndim)
+    return wavelet, mode, impl, axes
+
+
+def _batch_map(func, arrays, num_threads):
+    """Evaluate ``func`` on chunks of the leading axis of ``arrays``.
+
+    ``func`` is called with the chunks and ``num_threads=1``.
+    """
+    if num_threads is None:
+        num_threads = get_num_threads()
+    nbatch = arrays[0].shape[0]
+    if (num_threads <= 1 or nbatch <= 1 or
+            arrays[0].size < _THREADING_MIN_SIZE):
+        func(*arrays, num_threads=num_threads)
+        return
+
+    chunk_size = -(-nbatch // num_threads)
+    parallel_map(lambda slc: func(*[arr[slc] for arr in arrays],
+                                  num_threads=1),
+                 chunk_slices(nbatch, chunk_size), num_threads=num_threads)
+
+
+def dwt_forward(x, wavelet, mode, coeff_shapes, coeff_slices, axes=None,
+                out=None, impl='numpy', num_threads=None):
+    """Compute a multilevel DWT and store the raveled coefficients.
+
+    Parameters
+    ----------
+    x : `array-like`
+        Input data. Leading axes beyond ``len(coeff_shapes[0])`` are
+        treated as batch axes.
+    wavelet : str, `pywt.Wavelet` or `WaveletFilterBank`
+        Wavelet to be used.
+    mode : str
+        PyWavelets signal extension mode, see ``DWT_MODES``.
+    coeff_shapes : list
+        Subband shapes as returned by `dwt_coeff_shapes`.
+    coeff_slices : list
+        Slices of the subbands in the raveled coefficients as returned
+        by `precompute_raveled_slices`.
+    axes : sequence of ints, optional
+        Axes over which the transform is computed, relative to the
+        non-batch axes. ``None`` means all axes.
+    out : `numpy.ndarray`, optional
+        Array of shape ``batch_shape + (ncoeffs,)`` to which the
+        coefficients are written.
+    impl : str, optional
+        Back-end for the 1D filter bank steps, see ``DWT_IMPLS``.
+    num_threads : positive int, optional
+        Number of threads to use. For ``None``, the value of
+        `odl.util.parallel.get_num_threads` is used.
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        Raveled coefficients. If ``out`` was given, the returned object
+        is a reference to it.
+
+    Examples
+    --------
+    >>> from odl.trafos.backends import precompute_raveled_slices
+    >>> shapes = dwt_coeff_shapes((4,), 2, nlevels=1, mode='zero')
+    >>> slices = precompute_raveled_slices(shapes)
+    >>> coeffs = dwt_forward([1.0, 1.0, 2.0, 0.0], 'haar', 'zero', shapes,
+    ...                      slices)
+    >>> np.allclose(coeffs * np.sqrt(2), [2, 2, 0, 2])
+    True
+    """
+    wavelet, mode, impl, axes = _check_args(wavelet, mode, coeff_shapes,
+                                            axes, impl)
+    x = np.asarray(x)
+    nbatch = x.ndim - len(coeff_shapes[0])
+    if nbatch < 0:
+        raise ValueError('`x` must have at least {} dimensions, got {}'
+                         ''.format(len(coeff_shapes[0]), x.ndim))
+
+    batch_shape = x.shape[:nbatch]
+    size = dwt_coeff_size(coeff_shapes)
+    out_shape = batch_shape + (size,)
+    if out is None:
+        out = np.empty(out_shape, dtype=np.result_type(x.dtype, np.float32))
+    elif out.shape != out_shape:
+        raise ValueError('`out` must have shape {}, got {}'
+                         ''.format(out_shape, out.shape))
+
+    # Work with exactly one batch axis
+    x_flat = x.reshape((-1,) + x.shape[nbatch:])
+    out_flat = out.reshape((-1, size))
+    batch_axes = tuple(axis + 1 for axis in axes)
+
+    def forward(x, out, num_threads):
+        a = x
+        nlevels = len(coeff_shapes) - 1
+        # The finest level is the last entry of the coefficient lists
+        for level in range(nlevels, 0, -1):
+            details = {key: _subband_view(out, slc, coeff_shapes[level][key])
+                       for key, slc in coeff_slices[level].items()}
+            approx = None
+            if level == 1:
+                approx = _subband_view(out, coeff_slices[0], coeff_shapes[0])
+            a = _dwtn_level(a, details, approx, wavelet, mode, batch_axes,
+                            impl, num_threads)
+        if nlevels == 0:
+            _subband_view(out, coeff_slices[0], coeff_shapes[0])[:] = x
+
+    _batch_map(forward, [x_flat, out_flat], num_threads)
+    if not np.may_share_memory(out_flat, out):
+        out[:] = out_flat.reshape(out_shape)
+    return out
+
+
+def _dwtn_level(a, details, approx, wavelet, mode, axes, impl, num_threads):
+    """Compute one level of the separable DWT of ``a``.
+
+    The detail bands are written to the arrays in ``details``, the
+    approximation to ``approx`` if given. The approximation is returned.
+    """
+    subbands = [('', a)]
+    for i, axis in enumerate(axes):
+        last = (i == len(axes) - 1)
+        new_subbands = []
+        for key, arr in subbands:
+            out_lo = out_hi = None
+            if last:
+                out_lo = details.get(key + 'a', approx)
+                out_hi = details[key + 'd']
+            lo, hi = _analysis(arr, axis, wavelet, mode, impl, num_threads,
+                               out_lo, out_hi)
+            new_subbands.extend([(key + 'a', lo), (key + 'd', hi)])
+        subbands = new_subbands
+    return subbands[0][1]
+
+
+def _idwtn_level(a, details, wavelet, mode, axes, impl, num_threads,
+                 out=None):
+    """Return one level of the separable inverse DWT.
+
+    The result is written to ``out`` if given.
+    """
+    coeffs = dict(details)
+    coeffs['a' * len(axes)] = a
+    for key_len in reversed(range(len(axes))):
+        axis = axes[key_len]
+        new_coeffs = {}
+        for key in product('ad', repeat=key_len):
+            key = ''.join(key)
+            new_coeffs[key] = _synthesis(
+                coeffs[key + 'a'], coeffs[key + 'd'], axis, wavelet, mode,
+                impl, num_threads, out if key_len == 0 else None)
+        coeffs = new_coeffs
+    return coeffs['']
+
+
+def _crop_slices(recon_shape, shape):
+    """Return the index that crops ``recon_shape`` to ``shape``."""
+    # If the original shape was odd along any transformed axes it
+    # will have been rounded up to the next even size after the
+    # reconstruction. The extra sample should be discarded.
+    # The underlying reason is decimation by two in reconstruction
+    # must keep ceil(N/2) samples in each band for perfect
+    # reconstruction. Reconstruction then upsamples by two.
+    # When N is odd, (2 * np.ceil(N/2)) != N.
+    recon_slc = []
+    for i, (n_recon, n_intended) in enumerate(zip(recon_shape, shape)):
+        if n_recon == n_intended + 1:
+            # Upsampling added one entry too much in this axis,
+            # drop last one
+            recon_slc.append(slice(-1))
+        elif n_recon == n_intended:
+            recon_slc.append(slice(None))
+        else:
+            raise ValueError(
+                'in axis {}: expected size {} or {} in '
+                '`recon_shape`, got {}'
+                ''.format(i, n_recon - 1, n_recon, n_intended))
+    return tuple(recon_slc)
+
+
+def dwt_inverse(coeffs, wavelet, mode, coeff_shapes, coeff_slices, shape,
+                axes=None, out=None, impl='numpy', num_threads=None):
+    """Reconstruct data from raveled multilevel DWT coefficients.
+
+    The subbands are read directly from their slices in ``coeffs``.
+
+    Parameters
+    ----------
+    coeffs : `array-like`
+        Raveled coefficients as computed by `dwt_forward`. Leading axes
+        are treated as batch axes.
+    wavelet : str, `pywt.Wavelet` or `WaveletFilterBank`
+        Wavelet to be used.
+    mode : str
+        PyWavelets signal extension mode, see ``DWT_MODES``.
+    coeff_shapes : list
+        Subband shapes as returned by `dwt_coeff_shapes`.
+    coeff_slices : list
+        Slices of the subbands in the raveled coefficients as returned
+        by `precompute_raveled_slices`.
+    shape : sequence of ints
+        Shape of the reconstructed data, without batch axes.
+    axes : sequence of ints, optional
+        Axes over which the transform is computed, relative to the
+        non-batch axes. ``None`` means all axes.
+    out : `numpy.ndarray`, optional
+        Array of shape ``batch_shape + shape`` to which the result is
+        written.
+    impl : str, optional
+        Back-end for the 1D filter bank steps, see ``DWT_IMPLS``.
+    num_threads : positive int, optional
+        Number of threads to use. For ``None``, the value of
+        `odl.util.parallel.get_num_threads` is used.
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        Reconstructed data. If ``out`` was given, the returned object is
+        a reference to it.
+
+    Examples
+    --------
+    >>> from odl.trafos.backends import precompute_raveled_slices
+    >>> shapes = dwt_coeff_shapes((5,), 4, nlevels=1, mode='symmetric')
+    >>> slices = precompute_raveled_slices(shapes)
+    >>> x = [1.0, 2.0, 0.0, -1.0, 3.0]
+    >>> coeffs = dwt_forward(x, 'db2', 'symmetric', shapes, slices)
+    >>> recon = dwt_inverse(coeffs, 'db2', 'symmetric', shapes, slices,
+    ...                     shape=(5,))
+    >>> np.allclose(recon, x)
+    True
+    """
+    wavelet, mode, impl, axes = _check_args(wavelet, mode, coeff_shapes,
+                                            axes, impl)
+    coeffs = np.asarray(coeffs)
+    shape = tuple(int(n) for n in shape)
+    size = dwt_coeff_size(coeff_shapes)
+    if coeffs.shape[-1:] != (size,):
+        raise ValueError('`coeffs` must have shape (*, {}), got {}'
+                         ''.format(size, coeffs.shape))
+
+    batch_shape = coeffs.shape[:-1]
+    out_shape = batch_shape + shape
+    if out is None:
+        out = np.empty(out_shape,
+                       dtype=np.result_type(coeffs.dtype, np.float32))
+    elif out.shape != out_shape:
+        raise ValueError('`out` must have shape {}, got {}'
+                         ''.format(out_shape, out.shape))
+
+    coeffs_flat = coeffs.reshape((-1, size))
+    if out.flags.c_contiguous:
+        out_flat = out.reshape((-1,) + shape)
+    else:
+        out_flat = np.empty((coeffs_flat.shape[0],) + shape, dtype=out.dtype)
+    batch_axes = tuple(axis + 1 for axis in axes)
+
+    # Shape of the reconstruction before cropping odd sizes
+    recon_shape = list(coeff_shapes[0])
+    for level in range(1, len(coeff_shapes)):
+        detail_shape = next(iter(coeff_shapes[level].values()))
+        for axis in axes:
+            if mode == 'periodization':
+                recon_shape[axis] = 2 * detail_shape[axis]
+            else:
+                recon_shape[axis] = (2 * detail_shape[axis] -
+                                     wavelet.dec_len + 2)
+    crop = (slice(None),) + _crop_slices(recon_shape, shape)
+
+    def inverse(coeffs, out, num_threads):
+        a = _subband_view(coeffs, coeff_slices[0], coeff_shapes[0])
+        nlevels = len(coeff_shapes) - 1
+        for level in range(1, nlevels + 1):
+            details = {
+                key: _subband_view(coeffs, slc, coeff_shapes[level][key])
+                for key, slc in coeff_slices[level].items()}
+            detail_shape = next(iter(details.values())).shape
+            if a.shape != detail_shape:
+                # The approximation from the previous level may exceed the
+                # size of the stored details by 1 along some axes
+                a = a[tuple(slice(n) for n in detail_shape)]
+
+            level_out = None
+            if level == nlevels and tuple(recon_shape) == shape:
+                level_out = out
+            a = _idwtn_level(a, details, wavelet, mode, batch_axes, impl,
+                             num_threads, level_out)
+        if a is not out:
+            out[:] = a[crop]
+
+    _batch_map(inverse, [coeffs_flat, out_flat], num_threads)
+    if not np.may_share_memory(out_flat, out):
+        out[:] = out_flat.reshape(out_shape)
+    return out
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
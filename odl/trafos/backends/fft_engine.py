@@ -0,0 +1,402 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Process-wide FFT plans for the available FFT back-ends.
+
+All FFT calls in `odl.trafos` go through this module. Plans are created
+once per combination of array shapes, data types, axes, half-complex flag,
+direction and back-end, and kept in a least-recently-used cache that is
+shared between all operators. Hence, creating a new operator for a
+transform that has been computed before does not require new planning.
+
+Supported back-ends are ``'numpy'`` (always available), ``'scipy'``
+(``scipy.fft`` with its worker pool, SciPy >= 1.4) and ``'pyfftw'``. The
+number of threads is taken from `odl.util.parallel.get_num_threads`.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from odl.trafos.backends.pyfftw_bindings import (
+    PYFFTW_AVAILABLE, _pyfftw_destroys_input, pyfftw_call)
+from odl.util import complex_dtype, is_real_dtype, normalized_axes_tuple
+from odl.util.parallel import get_num_threads
+
+try:
+    import scipy.fft
+    SCIPY_FFT_AVAILABLE = True
+except ImportError:
+    SCIPY_FFT_AVAILABLE = False
+
+if PYFFTW_AVAILABLE:
+    import pyfftw
+
+__all__ = (
+    'FFT_IMPLS',
+    'SCIPY_FFT_AVAILABLE',
+    'fft_plan',
+    'fft_call',
+    'clear_fft_plan_cache',
+    'set_fft_plan_cache_size',
+)
+
+
+FFT_IMPLS = ('numpy',)
+if SCIPY_FFT_AVAILABLE:
+    FFT_IMPLS += ('scipy',)
+if PYFFTW_AVAILABLE:
+    FFT_IMPLS += ('pyfftw',)
+
+# Arrays up to this size are transformed single-threaded
+_THREADING_MIN_SIZE = 4096
+
+_PLAN_CACHE = OrderedDict()
+_PLAN_CACHE_SIZE = 32
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+class FftPlan(object):
+
+    """FFT of fixed shape, data type and axes.
+
+    Instances are created with `fft_plan` and should not be instantiated
+    directly. For the ``'pyfftw'`` back-end, the FFTW plan is created on
+    the first call, and reused for all further calls.
+    """
+
+    def __init__(self, impl, shape_in, dtype_in, shape_out, dtype_out, axes,
+                 halfcomplex, direction, threads, planning_effort, inplace):
+        """Initialize a new instance. See `fft_plan` for the parameters."""
+        self.impl = impl
+        self.shape_in = shape_in
+        self.dtype_in = dtype_in
+        self.shape_out = shape_out
+        self.dtype_out = dtype_out
+        self.axes = axes
+        self.halfcomplex = halfcomplex
+        self.direction = direction
+        self.threads = threads
+        self.planning_effort = planning_effort
+        self.inplace = inplace
+
+        # Number of points of the transform, used for (un)normalizing
+        real_shape = shape_in if direction == 'forward' else shape_out
+        self.num_points = int(np.prod([real_shape[i] for i in axes]))
+
+        self._fftw_plan = None
+        self._lock = threading.Lock()
+
+    def __call__(self, array_in, out=None, normalise_idft=False,
+                 preserve_input=True):
+        """Compute the FFT of ``array_in``.
+
+        Parameters
+        ----------
+        array_in : `numpy.ndarray`
+            Array to be transformed, must have the shape and data type of
+            this plan.
+        out : `numpy.ndarray`, optional
+            Array to which the result is written. It may be aliased with
+            ``array_in`` for complex-to-complex transforms, which requires
+            an in-place plan for the ``'pyfftw'`` back-end.
+        normalise_idft : bool, optional
+            If ``True``, the result of a backward transform is divided by
+            the number of points, such that it is the inverse of the
+            forward transform.
+        preserve_input : bool, optional
+            If ``False``, the back-end may overwrite ``array_in``.
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            Result of the transform. If ``out`` was given, the returned
+            object is a reference to it.
+        """
+        if self.impl == 'pyfftw':
+            return self._call_pyfftw(array_in, out, normalise_idft,
+                                     preserve_input)
+
+        if self.impl == 'numpy':
+            module, extra_kwargs = np.fft, {}
+        else:
+            module, extra_kwargs = scipy.fft, {'workers': self.threads}
+
+        if self.direction == 'forward':
+            if self.halfcomplex:
+                result = module.rfftn(array_in, axes=self.axes,
+                                      **extra_kwargs)
+            else:
+                result = module.fftn(array_in, axes=self.axes,
+                                     **extra_kwargs)
+        else:
+            if self.halfcomplex:
+                s = [self.shape_out[i] for i in self.axes]
+                result = module.irfftn(array_in, s=s, axes=self.axes,
+                                       **extra_kwargs)
+            else:
+                result = module.ifftn(array_in, axes=self.axes,
+                                      **extra_kwargs)
+            # NumPy and SciPy normalize the inverse transform
+            if not normalise_idft:
+                result *= self.num_points
+
+        if out is None:
+            return result.astype(self.dtype_out, copy=False)
+        else:
+            out[:] = result
+            return out
+
+    def _call_pyfftw(self, array_in, out, normalise_idft, preserve_input):
+        """Implement ``self(array_in, out, ...)`` with pyfftw."""
+        if self.inplace:
+            array_out = array_in
+        elif (out is not None and out.flags.c_contiguous and
+              out.ctypes.data % pyfftw.simd_alignment == 0):
+            array_out = out
+        else:
+            # The plan requires the same memory layout in all calls
+            array_out = pyfftw.empty_aligned(self.shape_out, self.dtype_out)
+
+        if (preserve_input and not self.inplace and
+                _pyfftw_destroys_input([self.planning_effort],
+                                       self.direction, self.halfcomplex,
+                                       array_in.ndim)):
+            array_in = array_in.copy()
+
+        # The plan keeps references to the arrays, hence calls must not
+        # overlap
+        with self._lock:
+            self._fftw_plan = pyfftw_call(
+                array_in, array_out, direction=self.direction,
+                axes=self.axes, halfcomplex=self.halfcomplex,
+                fftw_plan=self._fftw_plan,
+                planning_effort=self.planning_effort, threads=self.threads,
+                normalise_idft=normalise_idft)
+
+        if out is None:
+            return array_out
+        elif array_out is not out:
+            out[:] = array_out
+        return out
+
+
+def _out_shape_dtype(shape, dtype, axes, halfcomplex, direction, s=None):
+    """Return shape and data type of the FFT output."""
+    shape_out = list(shape)
+    if halfcomplex and direction == 'forward':
+        shape_out[axes[-1]] = shape[axes[-1]] // 2 + 1
+        dtype_out = complex_dtype(dtype)
+    elif halfcomplex:
+        if s is None:
+            shape_out[axes[-1]] = 2 * (shape[axes[-1]] - 1)
+        else:
+            for i, n in zip(axes, s):
+                shape_out[i] = n
+        dtype_out = np.empty(0, dtype=dtype).real.dtype
+    else:
+        dtype_out = complex_dtype(dtype)
+    return tuple(shape_out), dtype_out
+
+
+def fft_plan(shape, dtype, axes=None, halfcomplex=False, direction='forward',
+             impl='numpy', s=None, threads=None, planning_effort='estimate',
+             inplace=False):
+    """Return a cached FFT plan.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        Shape of the input array.
+    dtype :
+        Data type of the input array.
+    axes : int or sequence of ints, optional
+        Dimensions along which to take the transform. ``None`` means
+        using all axes.
+    halfcomplex : bool, optional
+        If ``True``, use the half-complex variant, i.e., a real-to-complex
+        forward or complex-to-real backward transform, where the last axis
+        in ``axes`` is halved on the complex side.
+    direction : {'forward', 'backward'}, optional
+        Direction of the transform. The forward transform uses a negative
+        sign in the exponent.
+    impl : str, optional
+        Back-end for the FFT, one of `FFT_IMPLS`.
+    s : sequence of ints, optional
+        Lengths of the output along ``axes`` for a half-complex backward
+        transform. By default, the last axis is assumed to have even
+        length.
+    threads : positive int, optional
+        Number of threads to use. By default, the number from
+        `odl.util.parallel.get_num_threads` is used for arrays of size
+        larger than 4096, otherwise 1.
+    planning_effort : str, optional
+        Flag for the amount of effort put into finding an optimal FFTW
+        plan, only used by the ``'pyfftw'`` back-end. See `pyfftw_call`.
+    inplace : bool, optional
+        If ``True``, the plan computes the transform in-place, i.e., the
+        result is written to the input array. Only used by the
+        ``'pyfftw'`` back-end.
+
+    Returns
+    -------
+    plan : `FftPlan`
+        Callable FFT plan, shared with all other callers using the same
+        parameters.
+
+    Examples
+    --------
+    >>> plan = fft_plan((4,), float, halfcomplex=True)
+    >>> plan.shape_out
+    (3,)
+    >>> plan(np.array([1.0, 0.0, 0.0, 0.0]))
+    array([ 1.+0.j,  1.+0.j,  1.+0.j])
+    >>> fft_plan((4,), float, halfcomplex=True) is plan
+    True
+    """
+    impl, impl_in = str(impl).lower(), impl
+    if impl not in FFT_IMPLS:
+        raise ValueError('`impl` {!r} not supported'.format(impl_in))
+    direction, direction_in = str(direction).lower(), direction
+    if direction not in ('forward', 'backward'):
+        raise ValueError('`direction` {!r} not understood'
+                         ''.format(direction_in))
+
+    shape = tuple(int(n) for n in shape)
+    dtype = np.dtype(dtype)
+    if axes is None:
+        axes = tuple(range(len(shape)))
+    axes = normalized_axes_tuple(axes, len(shape))
+    halfcomplex = bool(halfcomplex)
+    if halfcomplex and direction == 'forward' and not is_real_dtype(dtype):
+        raise ValueError('half-complex forward transform requires real '
+                         'input, got dtype {}'.format(dtype))
+    if s is not None:
+        s = tuple(int(n) for n in s)
+
+    if threads is None:
+        size = int(np.prod(shape))
+        threads = get_num_threads() if size > _THREADING_MIN_SIZE else 1
+    threads = int(threads)
+    if impl == 'pyfftw':
+        inplace = bool(inplace)
+    else:
+        planning_effort = None
+        inplace = False
+
+    key = (impl, shape, dtype, axes, halfcomplex, direction, s, threads,
+           planning_effort, inplace)
+    with _PLAN_CACHE_LOCK:
+        plan = _PLAN_CACHE.get(key, None)
+        if plan is not None:
+            _PLAN_CACHE[key] = _PLAN_CACHE.pop(key)
+            return plan
+
+        shape_out, dtype_out = _out_shape_dtype(
+            shape, dtype, axes, halfcomplex, direction, s)
+        plan = FftPlan(impl, shape, dtype, shape_out, dtype_out, axes,
+                       halfcomplex, direction, threads, planning_effort,
+                       inplace)
+        _PLAN_CACHE[key] = plan
+        while len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+        return plan
+
+
+def fft_call(array_in, out=None, direction='forward', axes=None,
+             halfcomplex=False, normalise_idft=False, impl='numpy',
+             preserve_input=True, **kwargs):
+    """Compute an FFT with a cached plan.
+
+    Parameters
+    ----------
+    array_in : `numpy.ndarray`
+        Array to be transformed.
+    out : `numpy.ndarray`, optional
+        Array to which the result is written. For a half-complex backward
+        transform, its shape determines the lengths of the output axes.
+    direction : {'forward', 'backward'}, optional
+        Direction of the transform.
+    axes : int or sequence of ints, optional
+        Dimensions along which to take the transform. ``None`` means
+        using all axes.
+    halfcomplex : bool, optional
+        If ``True``, use the half-complex variant of the transform.
+    normalise_idft : bool, optional
+        If ``True``, the result of a backward transform is divided by the
+        number of points.
+    impl : str, optional
+        Back-end for the FFT, one of `FFT_IMPLS`.
+    preserve_input : bool, optional
+        If ``False``, the back-end may overwrite ``array_in``.
+    kwargs :
+        Further keyword arguments passed to `fft_plan`.
+
+    Returns
+    -------
+    out : `numpy.ndarray`
+        Result of the transform. If ``out`` was given, the returned object
+        is a reference to it.
+
+    Examples
+    --------
+    Unnormalized backward transforms compute the trigonometric sum only:
+
+    >>> fft_call(np.ones(4), direction='backward')
+    array([ 4.+0.j,  0.+0.j,  0.+0.j,  0.+0.j])
+    >>> fft_call(np.ones(4), direction='backward', normalise_idft=True)
+    array([ 1.+0.j,  0.+0.j,  0.+0.j,  0.+0.j])
+    """
+    if (out is not None and halfcomplex and direction == 'backward' and
+            kwargs.get('s', None) is None):
+        if axes is None:
+            axes = tuple(range(array_in.ndim))
+        axes = normalized_axes_tuple(axes, array_in.ndim)
+        kwargs['s'] = [out.shape[i] for i in axes]
+    if out is not None and 'inplace' not in kwargs:
+        kwargs['inplace'] = np.may_share_memory(array_in, out)
+
+    plan = fft_plan(array_in.shape, array_in.dtype, axes=axes,
+                    halfcomplex=halfcomplex, direction=direction, impl=impl,
+                    **kwargs)
+    return plan(array_in, out=out, normalise_idft=normalise_idft,
+                preserve_input=preserve_input)
+
+
+def clear_fft_plan_cache():
+    """Remove all plans from the process-wide FFT plan cache."""
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE.clear()
+
+
+def set_fft_plan_cache_size(size):
+    """Set the maximum number of plans in the FFT plan cache.
+
+    Parameters
+    ----------
+    size : nonnegative int
+        New maximum number of cached plans. The least recently used plans
+        are removed if there are more than ``size`` plans in the cache.
+    """
+    global _PLAN_CACHE_SIZE
+    size, size_in = int(size), size
+    if size != size_in or size < 0:
+        raise ValueError('`size` must be a nonnegative integer, got {!r}'
+                         ''.format(size_in))
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE_SIZE = size
+        while len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -15,6 +15,7 @@ import numpy as np
 from odl.discr import DiscretizedSpace, uniform_discr
 from odl.operator import Operator
 from odl.set import ComplexNumbers, RealNumbers
+from odl.trafos.backends.fft_engine import FFT_IMPLS, fft_call
 from odl.trafos.backends.pyfftw_bindings import (
     PYFFTW_AVAILABLE, _flag_pyfftw_to_odl, pyfftw_call)
 from odl.trafos.util import (
@@ -28,13 +29,34 @@ __all__ = ('DiscreteFourierTransform', 'DiscreteFourierTransformInverse',
            'FourierTransform', 'FourierTransformInverse')
 
 
-_SUPPORTED_FOURIER_IMPLS = ('numpy',)
+_SUPPORTED_FOURIER_IMPLS = FFT_IMPLS
 _DEFAULT_FOURIER_IMPL = 'numpy'
 if PYFFTW_AVAILABLE:
-    _SUPPORTED_FOURIER_IMPLS += ('pyfftw',)
     _DEFAULT_FOURIER_IMPL = 'pyfftw'
 
 
+def _pyfftw_call_cached(op, array_in, array_out, normalise_idft,
+                        preserve_input=True, **kwargs):
+    """Run the pyfftw transform of ``op`` on the given arrays.
+
+    The plan created by ``op.init_fftw_plan`` is used if it exists, and
+    also if special planning options are given in ``kwargs``. Otherwise,
+    the plan is taken from the process-wide FFT plan cache.
+    """
+    direction = 'forward' if op.sign == '-' else 'backward'
+    if (op._fftw_plan is not None or
+            set(kwargs) - {'planning_effort', 'threads'}):
+        op._fftw_plan = pyfftw_call(
+            array_in, array_out, direction=direction, axes=op.axes,
+            halfcomplex=op.halfcomplex, fftw_plan=op._fftw_plan,
+            normalise_idft=normalise_idft, **kwargs)
+    else:
+        fft_call(array_in, array_out, direction=direction, axes=op.axes,
+                 halfcomplex=op.halfcomplex, normalise_idft=normalise_idft,
+                 impl='pyfftw', preserve_input=preserve_input, **kwargs)
+    return array_out
+
+
 class DiscreteFourierTransformBase(Operator):
 
     """Base class for discrete fourier transform classes."""
@@ -74,9 +96,11 @@ class DiscreteFourierTransformBase(Operator):
             arrays.
             Otherwise, calculate the full complex FFT. If ``dom_dtype``
             is a complex type, this option has no effect.
-        impl : {'numpy', 'pyfftw', ``None``}, optional
+        impl : {'numpy', 'scipy', 'pyfftw', ``None``}, optional
             Backend for the FFT implementation. The 'pyfftw' backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
         """
         if not isinstance(domain, DiscretizedSpace):
@@ -169,10 +193,10 @@ class DiscreteFourierTransformBase(Operator):
             Call pyfftw backend directly
         """
         # TODO: Implement zero padding
-        if self.impl == 'numpy':
-            out[:] = self._call_numpy(x.asarray())
-        else:
+        if self.impl == 'pyfftw':
             out[:] = self._call_pyfftw(x.asarray(), out.asarray(), **kwargs)
+        else:
+            out[:] = self._call_numpy(x.asarray())
 
     @property
     def impl(self):
@@ -283,13 +307,8 @@ class DiscreteFourierTransformBase(Operator):
             pass
         effort = flags[0] if flags else 'measure'
 
-        direction = 'forward' if self.sign == '-' else 'backward'
-        self._fftw_plan = pyfftw_call(
-            x, out, direction=direction, axes=self.axes,
-            halfcomplex=self.halfcomplex, planning_effort=effort,
-            fftw_plan=self._fftw_plan, normalise_idft=False)
-
-        return out
+        return _pyfftw_call_cached(self, x, out, normalise_idft=False,
+                                   planning_effort=effort, **kwargs)
 
     def init_fftw_plan(self, planning_effort='measure', **kwargs):
         """Initialize the FFTW plan for this transform for later use.
@@ -411,9 +430,11 @@ class DiscreteFourierTransform(DiscreteFourierTransformBase):
             arrays.
             Otherwise, calculate the full complex FFT. If ``dom_dtype``
             is a complex type, this option has no effect.
-        impl : {'numpy', 'pyfftw'}, optional
+        impl : {'numpy', 'scipy', 'pyfftw'}, optional
             Backend for the FFT implementation. The ``'pyfftw'`` backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
 
         Examples
@@ -455,15 +476,17 @@ class DiscreteFourierTransform(DiscreteFourierTransformBase):
         """
         assert isinstance(x, np.ndarray)
 
-        if self.halfcomplex:
-            return np.fft.rfftn(x, axes=self.axes)
-        else:
-            if self.sign == '-':
-                return np.fft.fftn(x, axes=self.axes)
-            else:
-                # Need to undo Numpy IFFT scaling
-                return (np.prod(np.take(self.domain.shape, self.axes)) *
-                        np.fft.ifftn(x, axes=self.axes))
+        direction = 'forward' if self.sign == '-' else 'backward'
+        return fft_call(x, direction=direction, axes=self.axes,
+                        halfcomplex=self.halfcomplex, impl=self.impl)
+
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        # Transform axes are shifted by the batch axis
+        axes = tuple(i + 1 for i in self.axes)
+        direction = 'forward' if self.sign == '-' else 'backward'
+        fft_call(x_batch, out, direction=direction, axes=axes,
+                 halfcomplex=self.halfcomplex, impl=self.impl)
 
     def _call_pyfftw(self, x, out, **kwargs):
         """Implement ``self(x[, out, **kwargs])`` using pyfftw.
@@ -490,13 +513,8 @@ class DiscreteFourierTransform(DiscreteFourierTransformBase):
             pass
         effort = flags[0] if flags else 'measure'
 
-        direction = 'forward' if self.sign == '-' else 'backward'
-        self._fftw_plan = pyfftw_call(
-            x, out, direction=direction, axes=self.axes,
-            halfcomplex=self.halfcomplex, planning_effort=effort,
-            fftw_plan=self._fftw_plan, normalise_idft=False)
-
-        return out
+        return _pyfftw_call_cached(self, x, out, normalise_idft=False,
+                                   planning_effort=effort, **kwargs)
 
     @property
     def inverse(self):
@@ -564,9 +582,11 @@ class DiscreteFourierTransformInverse(DiscreteFourierTransformBase):
             ``floor(N[i]/2) + 1`` in this axis ``i``.
             Otherwise, domain and range have the same shape. If
             ``range`` is a complex space, this option has no effect.
-        impl : {'numpy', 'pyfftw'}, optional
+        impl : {'numpy', 'scipy', 'pyfftw'}, optional
             Backend for the FFT implementation. The 'pyfftw' backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
 
         Examples
@@ -612,14 +632,33 @@ class DiscreteFourierTransformInverse(DiscreteFourierTransformBase):
         out : `numpy.ndarray`
             Result of the transform
         """
+        direction = 'forward' if self.sign == '-' else 'backward'
         if self.halfcomplex:
-            return np.fft.irfftn(x, axes=self.axes)
+            s = [self.range.shape[i] for i in self.axes]
         else:
-            if self.sign == '+':
-                return np.fft.ifftn(x, axes=self.axes)
-            else:
-                return (np.fft.fftn(x, axes=self.axes) /
-                        np.prod(np.take(self.domain.shape, self.axes)))
+            s = None
+        out = fft_call(x, direction=direction, axes=self.axes,
+                       halfcomplex=self.halfcomplex, normalise_idft=True,
+                       impl=self.impl, s=s)
+        if self.sign == '-':
+            out /= np.prod(np.take(self.domain.shape, self.axes))
+        return out
+
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        # Transform axes are shifted by the batch axis
+        axes = tuple(i + 1 for i in self.axes)
+        direction = 'forward' if self.sign == '-' else 'backward'
+        if self.halfcomplex or self.range.is_complex:
+            fft_call(x_batch, out, direction=direction, axes=axes,
+                     halfcomplex=self.halfcomplex, normalise_idft=True,
+                     impl=self.impl)
+        else:
+            # C2C transform with real output, discard the imaginary part
+            out[:] = fft_call(x_batch, direction=direction, axes=axes,
+                              normalise_idft=True, impl=self.impl).real
+        if self.sign == '-':
+            out /= np.prod(np.take(self.domain.shape, self.axes))
 
     def _call_pyfftw(self, x, out, **kwargs):
         """Implement ``self(x[, out, **kwargs])`` using pyfftw.
@@ -669,11 +708,8 @@ class DiscreteFourierTransformInverse(DiscreteFourierTransformBase):
             pass
         effort = flags[0] if flags else 'measure'
 
-        direction = 'forward' if self.sign == '-' else 'backward'
-        self._fftw_plan = pyfftw_call(
-            x, out, direction=direction, axes=self.axes,
-            halfcomplex=self.halfcomplex, planning_effort=effort,
-            fftw_plan=self._fftw_plan, normalise_idft=True)
+        _pyfftw_call_cached(self, x, out, normalise_idft=True,
+                            planning_effort=effort, **kwargs)
 
         # Need to normalize for 'forward', no way to force pyfftw
         if self.sign == '-':
@@ -736,9 +772,11 @@ class FourierTransformBase(Operator):
             is determined from ``domain`` and the other parameters. The
             exponent is chosen to be the conjugate ``p / (p - 1)``,
             which reads as 'inf' for p=1 and 1 for p='inf'.
-        impl : {'numpy', 'pyfftw'}, optional
+        impl : {'numpy', 'scipy', 'pyfftw'}, optional
             Backend for the FFT implementation. The 'pyfftw' backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
         axes : int or sequence of ints, optional
             Dimensions along which to take the transform.
@@ -902,11 +940,11 @@ class FourierTransformBase(Operator):
             Call pyfftw backend directly
         """
         # TODO: Implement zero padding
-        if self.impl == 'numpy':
-            out[:] = self._call_numpy(x.asarray())
-        else:
+        if self.impl == 'pyfftw':
             # 0-overhead assignment if asarray() does not copy
             out[:] = self._call_pyfftw(x.asarray(), out.asarray(), **kwargs)
+        else:
+            out[:] = self._call_numpy(x.asarray())
 
     def _call_numpy(self, x):
         """Return ``self(x)`` for numpy back-end.
@@ -1189,9 +1227,11 @@ class FourierTransform(FourierTransformBase):
             is determined from ``domain`` and the other parameters. The
             exponent is chosen to be the conjugate ``p / (p - 1)``,
             which reads as 'inf' for p=1 and 1 for p='inf'.
-        impl : {'numpy', 'pyfftw'}, optional
+        impl : {'numpy', 'scipy', 'pyfftw'}, optional
             Backend for the FFT implementation. The 'pyfftw' backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
         axes : int or sequence of ints, optional
             Dimensions along which to take the transform.
@@ -1318,16 +1358,10 @@ class FourierTransform(FourierTransformBase):
         preproc = self._preprocess(x)
 
         # The actual call to the FFT library, out-of-place unfortunately
-        if self.halfcomplex:
-            out = np.fft.rfftn(preproc, axes=self.axes)
-        else:
-            if self.sign == '-':
-                out = np.fft.fftn(preproc, axes=self.axes)
-            else:
-                out = np.fft.ifftn(preproc, axes=self.axes)
-                # Numpy's FFT normalizes by 1 / prod(shape[axes]), we
-                # need to undo that
-                out *= np.prod(np.take(self.domain.shape, self.axes))
+        direction = 'forward' if self.sign == '-' else 'backward'
+        out = fft_call(preproc, direction=direction, axes=self.axes,
+                       halfcomplex=self.halfcomplex, impl=self.impl,
+                       preserve_input=False)
 
         # Post-processing accounting for shift, scaling and interpolation
         self._postprocess(out, out=out)
@@ -1376,10 +1410,8 @@ class FourierTransform(FourierTransformBase):
         # The actual call to the FFT library. We store the plan for re-use.
         # The FFT is calculated in-place, except if the range is real and
         # we don't use halfcomplex.
-        direction = 'forward' if self.sign == '-' else 'backward'
-        self._fftw_plan = pyfftw_call(
-            preproc, out, direction=direction, halfcomplex=self.halfcomplex,
-            axes=self.axes, normalise_idft=False, **kwargs)
+        _pyfftw_call_cached(self, preproc, out, normalise_idft=False,
+                            preserve_input=False, **kwargs)
 
         assert is_complex_floating_dtype(out.dtype)
 
@@ -1427,9 +1459,11 @@ class FourierTransformInverse(FourierTransformBase):
             domain is determined from ``range`` and the other parameters.
             The exponent is chosen to be the conjugate ``p / (p - 1)``,
             which reads as 'inf' for p=1 and 1 for p='inf'.
-        impl : {'numpy', 'pyfftw'}, optional
+        impl : {'numpy', 'scipy', 'pyfftw'}, optional
             Backend for the FFT implementation. The 'pyfftw' backend
             is faster but requires the ``pyfftw`` package.
+            The ``'scipy'`` backend uses multiple threads of
+            ``scipy.fft``.
             ``None`` selects the fastest available backend.
         axes : int or sequence of ints, optional
             Dimensions along which to take the transform.
@@ -1555,18 +1589,18 @@ class FourierTransformInverse(FourierTransformBase):
         preproc = self._preprocess(x)
 
         # The actual call to the FFT library
-        # Normalization by 1 / prod(shape[axes]) is done by Numpy's FFT if
-        # one of the "i" functions is used. For sign='-' we need to do it
-        # ourselves.
+        # Normalization by 1 / prod(shape[axes]) is done by the backward
+        # FFT. For sign='-' we need to do it ourselves.
+        direction = 'forward' if self.sign == '-' else 'backward'
         if self.halfcomplex:
-            s = np.asarray(self.range.shape)[list(self.axes)]
-            out = np.fft.irfftn(preproc, axes=self.axes, s=s)
+            s = [self.range.shape[i] for i in self.axes]
         else:
-            if self.sign == '-':
-                out = np.fft.fftn(preproc, axes=self.axes)
-                out /= np.prod(np.take(self.domain.shape, self.axes))
-            else:
-                out = np.fft.ifftn(preproc, axes=self.axes)
+            s = None
+        out = fft_call(preproc, direction=direction, axes=self.axes,
+                       halfcomplex=self.halfcomplex, normalise_idft=True,
+                       impl=self.impl, preserve_input=False, s=s)
+        if self.sign == '-':
+            out /= np.prod(np.take(self.domain.shape, self.axes))
 
         # Post-processing in IFT = pre-processing in FT (in-place)
         self._postprocess(out, out=out)
@@ -1619,22 +1653,15 @@ class FourierTransformInverse(FourierTransformBase):
             preproc = self._preprocess(x)
 
         # The actual call to the FFT library. We store the plan for re-use.
-        direction = 'forward' if self.sign == '-' else 'backward'
         if self.range.field == RealNumbers() and not self.halfcomplex:
             # Need to use a complex array as out if we do C2R since the
             # FFT has to be C2C
-            self._fftw_plan = pyfftw_call(
-                preproc, preproc, direction=direction,
-                halfcomplex=self.halfcomplex, axes=self.axes,
-                normalise_idft=True, **kwargs)
             fft_arr = preproc
         else:
             # Only here we can use out directly
-            self._fftw_plan = pyfftw_call(
-                preproc, out, direction=direction,
-                halfcomplex=self.halfcomplex, axes=self.axes,
-                normalise_idft=True, **kwargs)
             fft_arr = out
+        _pyfftw_call_cached(self, preproc, fft_arr, normalise_idft=True,
+                            preserve_input=False, **kwargs)
 
         # Normalization is only done for 'backward', we need it for 'forward',
         # too.
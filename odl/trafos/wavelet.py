@@ -14,13 +14,17 @@ import numpy as np
 
 from odl.discr import DiscretizedSpace
 from odl.operator import Operator
+from odl.trafos.backends.dwt_engine import (
+    dwt_coeff_shapes, dwt_coeff_size, dwt_forward, dwt_inverse, dwt_max_level,
+    wavelet_filter_bank)
 from odl.trafos.backends.pywt_bindings import (
     PYWT_AVAILABLE, precompute_raveled_slices, pywt_pad_mode, pywt_wavelet)
+from odl.util import writable_array
 
 __all__ = ('WaveletTransform', 'WaveletTransformInverse')
 
 
-_SUPPORTED_WAVELET_IMPLS = ()
+_SUPPORTED_WAVELET_IMPLS = ('numpy',)
 if PYWT_AVAILABLE:
     _SUPPORTED_WAVELET_IMPLS += ('pywt',)
     import pywt
@@ -44,7 +48,7 @@ class WaveletTransformBase(Operator):
             Domain of the forward wavelet transform (the "image domain").
             In the case of ``variant in ('inverse', 'adjoint')``, this
             space is the range of the operator.
-        wavelet : string or `pywt.Wavelet`
+        wavelet : string, `pywt.Wavelet` or `WaveletFilterBank`
             Specification of the wavelet to be used in the transform.
             If a string is given, it is converted to a `pywt.Wavelet`.
             Use `pywt.wavelist` to get a list of available wavelets.
@@ -124,8 +128,13 @@ class WaveletTransformBase(Operator):
             Constant value to use if ``pad_mode == 'constant'``. Ignored
             otherwise. Constants other than 0 are not supported by the
             ``pywt`` back-end.
-        impl : {'pywt'}, optional
-            Back-end for the wavelet transform.
+        impl : {'pywt', 'numpy'}, optional
+            Back-end for the wavelet transform. ``'pywt'`` uses
+            PyWavelets for the 1D filter bank steps, ``'numpy'`` the
+            multithreaded implementation in
+            `odl.trafos.backends.dwt_engine`. Without PyWavelets, the
+            latter supports the ``'haar'`` and ``'db1'`` to ``'db4'``
+            wavelets.
         axes : sequence of ints, optional
             Axes over which the DWT that created ``coeffs`` was performed.  The
             default value of ``None`` corresponds to all axes. When not all
@@ -157,23 +166,21 @@ class WaveletTransformBase(Operator):
             raise ValueError("too many axes")
         self.axes = tuple(axes)
 
+        self.filter_bank = wavelet_filter_bank(wavelet)
         if nlevels is None:
-            nlevels = pywt.dwtn_max_level(space.shape, wavelet, self.axes)
+            nlevels = dwt_max_level(space.shape, self.filter_bank.dec_len,
+                                    self.axes)
         self.__nlevels, nlevels_in = int(nlevels), nlevels
         if self.nlevels != nlevels_in:
             raise ValueError('`nlevels` must be integer, got {}'
                              ''.format(nlevels_in))
 
-        self.__impl, impl_in = str(impl).lower(), impl
-        if self.impl not in _SUPPORTED_WAVELET_IMPLS:
-            raise ValueError("`impl` '{}' not supported".format(impl_in))
-
         self.__wavelet = getattr(wavelet, 'name', str(wavelet).lower())
         self.__pad_mode = str(pad_mode).lower()
         self.__pad_const = space.field.element(pad_const)
+        self.pywt_pad_mode = pywt_pad_mode(pad_mode, pad_const)
 
         if self.impl == 'pywt':
-            self.pywt_pad_mode = pywt_pad_mode(pad_mode, pad_const)
             self.pywt_wavelet = pywt_wavelet(self.wavelet)
             # determine coefficient shapes (without running wavedecn)
             self._coeff_shapes = pywt.wavedecn_shapes(
@@ -182,9 +189,15 @@ class WaveletTransformBase(Operator):
             # precompute slices into the (raveled) coeffs
             self._coeff_slices = precompute_raveled_slices(self._coeff_shapes)
             coeff_size = pywt.wavedecn_size(self._coeff_shapes)
-            coeff_space = space.tspace_type(coeff_size, dtype=space.dtype)
+        elif self.impl == 'numpy':
+            self._coeff_shapes = dwt_coeff_shapes(
+                space.shape, self.filter_bank.dec_len, self.nlevels,
+                self.pywt_pad_mode, self.axes)
+            self._coeff_slices = precompute_raveled_slices(self._coeff_shapes)
+            coeff_size = dwt_coeff_size(self._coeff_shapes)
         else:
             raise RuntimeError("bad `impl` '{}'".format(self.impl))
+        coeff_space = space.tspace_type(coeff_size, dtype=space.dtype)
 
         variant, variant_in = str(variant).lower(), variant
         if variant not in ('forward', 'inverse', 'adjoint'):
@@ -227,12 +240,20 @@ class WaveletTransformBase(Operator):
     @property
     def is_orthogonal(self):
         """Whether or not the wavelet basis is orthogonal."""
-        return self.pywt_wavelet.orthogonal
+        return self.filter_bank.orthogonal
 
     @property
     def is_biorthogonal(self):
         """Whether or not the wavelet basis is bi-orthogonal."""
-        return self.pywt_wavelet.biorthogonal
+        return self.filter_bank.biorthogonal
+
+    @property
+    def _engine_wavelet(self):
+        """Wavelet object passed to the DWT engine."""
+        if self.impl == 'pywt':
+            return self.pywt_wavelet
+        else:
+            return self.filter_bank
 
     def scales(self):
         """Get the scales of each coefficient.
@@ -243,25 +264,16 @@ class WaveletTransformBase(Operator):
             The scale of each coefficient, given by an integer. 0 for the
             lowest resolution and self.nlevels for the highest.
         """
-        if self.impl == 'pywt':
-            if self.__variant == 'forward':
-                discr_space = self.domain
-                wavelet_space = self.range
-            else:
-                discr_space = self.range
-                wavelet_space = self.domain
-
-            shapes = pywt.wavedecn_shapes(discr_space.shape, self.pywt_wavelet,
-                                          mode=self.pywt_pad_mode,
-                                          level=self.nlevels, axes=self.axes)
-            coeff_list = [np.full(shapes[0], 0)]
-            for i in range(1, 1 + len(shapes[1:])):
-                coeff_list.append({k: np.full(shapes[i][k], i)
-                                   for k in shapes[i].keys()})
-            coeffs = pywt.ravel_coeffs(coeff_list, axes=self.axes)[0]
-            return wavelet_space.element(coeffs)
+        if self.__variant == 'forward':
+            wavelet_space = self.range
         else:
-            raise RuntimeError("bad `impl` '{}'".format(self.impl))
+            wavelet_space = self.domain
+
+        scales = np.zeros(wavelet_space.shape, dtype=int)
+        for i, slices in enumerate(self._coeff_slices[1:], start=1):
+            for slc in slices.values():
+                scales[slc] = i
+        return wavelet_space.element(scales)
 
 
 class WaveletTransform(WaveletTransformBase):
@@ -276,7 +288,7 @@ class WaveletTransform(WaveletTransformBase):
         ----------
         domain : `DiscretizedSpace`
             Domain of the wavelet transform (the "image domain").
-        wavelet : string or `pywt.Wavelet`
+        wavelet : string, `pywt.Wavelet` or `WaveletFilterBank`
             Specification of the wavelet to be used in the transform.
             If a string is given, it is converted to a `pywt.Wavelet`.
             Use `pywt.wavelist` to get a list of available wavelets.
@@ -354,8 +366,13 @@ class WaveletTransform(WaveletTransformBase):
             Constant value to use if ``pad_mode == 'constant'``. Ignored
             otherwise. Constants other than 0 are not supported by the
             ``pywt`` back-end.
-        impl : {'pywt'}, optional
-            Backend for the wavelet transform.
+        impl : {'pywt', 'numpy'}, optional
+            Back-end for the wavelet transform. ``'pywt'`` uses
+            PyWavelets for the 1D filter bank steps, ``'numpy'`` the
+            multithreaded implementation in
+            `odl.trafos.backends.dwt_engine`. Without PyWavelets, the
+            latter supports the ``'haar'`` and ``'db1'`` to ``'db4'``
+            wavelets.
         axes : sequence of ints, optional
             Axes over which the DWT that created ``coeffs`` was performed.  The
             default value of ``None`` corresponds to all axes. When not all
@@ -423,15 +440,18 @@ class WaveletTransform(WaveletTransformBase):
             space=domain, wavelet=wavelet, nlevels=nlevels, variant='forward',
             pad_mode=pad_mode, pad_const=pad_const, impl=impl, axes=axes)
 
-    def _call(self, x):
-        """Return wavelet transform of ``x``."""
-        if self.impl == 'pywt':
-            coeffs = pywt.wavedecn(
-                x, wavelet=self.pywt_wavelet, level=self.nlevels,
-                mode=self.pywt_pad_mode, axes=self.axes)
-            return pywt.ravel_coeffs(coeffs, axes=self.axes)[0]
-        else:
-            raise RuntimeError("bad `impl` '{}'".format(self.impl))
+    def _call(self, x, out):
+        """Write the wavelet transform of ``x`` to ``out``."""
+        with writable_array(out) as out_arr:
+            dwt_forward(x.asarray(), self._engine_wavelet, self.pywt_pad_mode,
+                        self._coeff_shapes, self._coeff_slices,
+                        axes=self.axes, out=out_arr, impl=self.impl)
+
+    def _apply_batch(self, x_batch, out):
+        """Implement ``self.apply_batch(x_batch, out)``."""
+        dwt_forward(x_batch, self._engine_wavelet, self.pywt_pad_mode,
+                    self._coeff_shapes, self._coeff_slices, axes=self.axes,
+                    out=out, impl=self.impl)
 
     @property
     def adjoint(self):
@@ -467,8 +487,9 @@ class WaveletTransform(WaveletTransformBase):
         adjoint
         """
         return WaveletTransformInverse(
-            range=self.domain, wavelet=self.pywt_wavelet, nlevels=self.nlevels,
-            pad_mode=self.pad_mode, pad_const=self.pad_const, impl=self.impl,
+            range=self.domain, wavelet=self._engine_wavelet,
+            nlevels=self.nlevels, pad_mode=self.pad_mode,
+            pad_const=self.pad_const, impl=self.impl,
             axes=self.axes)
 
 
@@ -490,7 +511,7 @@ class WaveletTransformInverse(WaveletTransformBase):
         range : `DiscretizedSpace`
             Domain of the forward wavelet transform (the "image domain"),
             which is the range of this inverse transform.
-        wavelet : string or `pywt.Wavelet`
+        wavelet : string, `pywt.Wavelet` or `WaveletFilterBank`
             Specification of the wavelet to be used in the transform.
             If a string is given, it is converted to a `pywt.Wavelet`.
             Use `pywt.wavelist` to get a list of available wavelets.
@@ -568,8 +589,13 @@ class WaveletTransformInverse(WaveletTransformBase):
             Constant value to use if ``pad_mode == 'constant'``. Ignored
             otherwise. Constants other than 0 are not supported by the
             ``pywt`` back-end.
-        impl : {'pywt'}, optional
-            Back-end for the wavelet transform.
+        impl : {'pywt', 'numpy'}, optional
+            Back-end for the wavelet transform. ``'pywt'`` uses
+            PyWavelets for the 1D filter bank steps, ``'numpy'`` the
+            multithreaded implementation in
+            `odl.trafos.backends.dwt_engine`. Without PyWavelets, the
+            latter supports the ``'haar'`` and ``'db1'`` to ``'db4'``
+            wavelets.
         axes : sequence of ints, optional
             Axes over which the DWT that created ``coeffs`` was performed.  The
             default value of ``None`` corresponds to all axes. When not all
@@ -604,44 +630,19 @@ class WaveletTransformInverse(WaveletTransformBase):
             space=range, wavelet=wavelet, variant='inverse', nlevels=nlevels,
             pad_mode=pad_mode, pad_const=pad_const, impl=impl, axes=axes)
 
-    def _call(self, coeffs):
-        """Return the inverse wavelet transform of ``coeffs``."""
-        if self.impl == 'pywt':
-            coeffs = pywt.unravel_coeffs(coeffs,
-                                         coeff_slices=self._coeff_slices,
-                                         coeff_shapes=self._coeff_shapes,
-                                         output_format='wavedecn')
-            recon = pywt.waverecn(
-                coeffs, wavelet=self.pywt_wavelet, mode=self.pywt_pad_mode,
-                axes=self.axes)
-            recon_shape = self.range.shape
-            if recon.shape != recon_shape:
-                # If the original shape was odd along any transformed axes it
-                # will have been rounded up to the next even size after the
-                # reconstruction. The extra sample should be discarded.
-                # The underlying reason is decimation by two in reconstruction
-                # must keep ceil(N/2) samples in each band for perfect
-                # reconstruction. Reconstruction then upsamples by two.
-                # When N is odd, (2 * np.ceil(N/2)) != N.
-                recon_slc = []
-                for i, (n_recon, n_intended) in enumerate(zip(recon.shape,
-                                                              recon_shape)):
-                    if n_recon == n_intended + 1:
-                        # Upsampling added one entry too much in this axis,
-                        # drop last one
-                        recon_slc.append(slice(-1))
-                    elif n_recon == n_intended:
-                        recon_slc.append(slice(None))
-                    else:
-                        raise ValueError(
-                            'in axis {}: expected size {} or {} in '
-                            '`recon_shape`, got {}'
-                            ''.format(i, n_recon - 1, n_recon,
-                                      n_intended))
-                recon = recon[tuple(recon_slc)]
-            return recon
-        else:
-            raise RuntimeError("bad `impl` '{}'".format(self.impl))
+    def _call(self, coeffs, out):
+        """Write the inverse wavelet transform of ``coeffs`` to ``out``."""
+        with writable_array(out) as out_arr:
+            dwt_inverse(coeffs.asarray(), self._engine_wavelet,
+                        self.pywt_pad_mode, self._coeff_shapes,
+                        self._coeff_slices, self.range.shape, axes=self.axes,
+                        out=out_arr, impl=self.impl)
+
+    def _apply_batch(self, coeffs_batch, out):
+        """Implement ``self.apply_batch(coeffs_batch, out)``."""
+        dwt_inverse(coeffs_batch, self._engine_wavelet, self.pywt_pad_mode,
+                    self._coeff_shapes, self._coeff_slices, self.range.shape,
+                    axes=self.axes, out=out, impl=self.impl)
 
     @property
     def adjoint(self):
@@ -681,8 +682,9 @@ class WaveletTransformInverse(WaveletTransformBase):
         adjoint
         """
         return WaveletTransform(
-            domain=self.range, wavelet=self.pywt_wavelet, nlevels=self.nlevels,
-            pad_mode=self.pad_mode, pad_const=self.pad_const, impl=self.impl,
+            domain=self.range, wavelet=self._engine_wavelet,
+            nlevels=self.nlevels, pad_mode=self.pad_mode,
+            pad_const=self.pad_const, impl=self.impl,
             axes=self.axes)
 
 
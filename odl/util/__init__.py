@@ -14,6 +14,8 @@ from .graphics import *
 from .normalize import *
 from .npy_compat import *
 from .numerics import *
+from .parallel import *
+from .scratch import *
 from .testutils import *
 from .utility import *
 from .vectorization import *
@@ -24,6 +26,8 @@ __all__ += graphics.__all__
 __all__ += normalize.__all__
 __all__ += npy_compat.__all__
 __all__ += numerics.__all__
+__all__ += parallel.__all__
+__all__ += scratch.__all__
 __all__ += testutils.__all__
 __all__ += utility.__all__
 __all__ += vectorization.__all__
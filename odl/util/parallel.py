@@ -0,0 +1,240 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Utilities for thread-parallel execution of array operations."""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+from contextlib import contextmanager
+from multiprocessing import cpu_count
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2 without the `futures` backport, everything runs serially
+    ThreadPoolExecutor = None
+
+__all__ = (
+    'get_num_threads',
+    'set_num_threads',
+    'num_threads',
+    'chunk_slices',
+    'parallel_map',
+)
+
+
+_NUM_THREADS = None
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+_WORKER_STATE = threading.local()
+
+
+def get_num_threads():
+    """Return the number of threads used by ODL's parallel code paths.
+
+    The default is the number of CPUs of the machine, see
+    `set_num_threads` for changing this value.
+
+    Examples
+    --------
+    >>> with num_threads(3):
+    ...     print(get_num_threads())
+    3
+    """
+    if _NUM_THREADS is None:
+        return cpu_count()
+    else:
+        return _NUM_THREADS
+
+
+def set_num_threads(num):
+    """Set the number of threads used by ODL's parallel code paths.
+
+    Parameters
+    ----------
+    num : positive int or None
+        Number of worker threads. ``None`` means that the number of
+        CPUs of the machine is used. With ``num=1``, all work is done
+        in the calling thread.
+
+    Notes
+    -----
+    The previous thread pool is shut down without waiting. This is safe
+    while other threads use `parallel_map`: their tasks are either
+    submitted to the old pool before the shutdown and still run, or to a
+    new pool with the new size.
+    """
+    global _NUM_THREADS, _EXECUTOR
+    if num is not None:
+        num, num_in = int(num), num
+        if num != num_in or num < 1:
+            raise ValueError('`num` must be a positive integer or None, '
+                             'got {!r}'.format(num_in))
+
+    with _EXECUTOR_LOCK:
+        _NUM_THREADS = num
+        # The pool is re-created lazily with the new size
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+@contextmanager
+def num_threads(num):
+    """Context manager to temporarily change the number of threads.
+
+    Parameters
+    ----------
+    num : positive int or None
+        Number of worker threads inside the context, see
+        `set_num_threads`.
+
+    Examples
+    --------
+    Run everything in the calling thread:
+
+    >>> with num_threads(1):
+    ...     print(get_num_threads())
+    1
+    """
+    orig_num = _NUM_THREADS
+    set_num_threads(num)
+    try:
+        yield
+    finally:
+        set_num_threads(orig_num)
+
+
+def _submit(func, args):
+    """Submit ``func(arg)`` for all ``args`` to the shared thread pool.
+
+    The pool is created if necessary. All tasks are submitted while
+    holding the pool lock, such that `set_num_threads` cannot shut the
+    pool down in between; tasks submitted before a shutdown still run.
+
+    Returns
+    -------
+    futures : list of `concurrent.futures.Future` or None
+        One future per argument, or ``None`` if no thread pool
+        implementation is available.
+    """
+    global _EXECUTOR
+    if ThreadPoolExecutor is None:
+        return None
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=get_num_threads())
+        return [_EXECUTOR.submit(_run_in_worker, func, arg) for arg in args]
+
+
+def chunk_slices(size, chunk_size):
+    """Return slices that split ``range(size)`` into chunks.
+
+    Parameters
+    ----------
+    size : nonnegative int
+        Total number of entries.
+    chunk_size : positive int
+        Maximum number of entries per chunk. All chunks except the last
+        one have exactly this size.
+
+    Returns
+    -------
+    slices : list of slice
+        Consecutive slices covering ``range(size)``.
+
+    Examples
+    --------
+    >>> chunk_slices(10, 4)
+    [slice(0, 4, None), slice(4, 8, None), slice(8, 10, None)]
+    >>> chunk_slices(0, 4)
+    []
+    """
+    size, chunk_size = int(size), int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError('`chunk_size` must be positive, got {}'
+                         ''.format(chunk_size))
+    return [slice(start, min(start + chunk_size, size))
+            for start in range(0, size, chunk_size)]
+
+
+def _run_in_worker(func, arg):
+    """Call ``func(arg)`` and mark the current thread as pool worker."""
+    _WORKER_STATE.active = True
+    try:
+        return func(arg)
+    finally:
+        _WORKER_STATE.active = False
+
+
+def parallel_map(func, iterable, num_threads=None):
+    """Apply ``func`` to all items of ``iterable`` in a thread pool.
+
+    The results are returned in the order of ``iterable``, hence
+    reductions over them are deterministic regardless of the order in
+    which the workers finish. Calls from inside a worker thread are
+    executed serially to avoid dead-locking the shared pool, as is
+    everything if `concurrent.futures` is not available.
+
+    Parameters
+    ----------
+    func : callable
+        Function taking one argument. It should release the GIL for
+        most of its runtime (as NumPy and BLAS routines do) to benefit
+        from multithreading.
+    iterable : iterable
+        Arguments for ``func``.
+    num_threads : positive int, optional
+        Maximum number of threads to use. For ``None``, the value of
+        `get_num_threads` is used.
+
+    Returns
+    -------
+    results : list
+        ``[func(item) for item in iterable]``.
+
+    Examples
+    --------
+    >>> parallel_map(lambda x: x ** 2, range(5))
+    [0, 1, 4, 9, 16]
+    """
+    items = list(iterable)
+    if num_threads is None:
+        num_threads = get_num_threads()
+
+    if (len(items) <= 1 or num_threads <= 1 or
+            getattr(_WORKER_STATE, 'active', False)):
+        return [func(item) for item in items]
+
+    if num_threads >= get_num_threads():
+        futures = _submit(func, items)
+        if futures is None:
+            return [func(item) for item in items]
+    else:
+        # Limit concurrency by grouping items into `num_threads` batches
+        def run_batch(batch):
+            return [func(item) for item in batch]
+
+        batches = [items[i::num_threads] for i in range(num_threads)]
+        futures = _submit(run_batch, batches)
+        if futures is None:
+            return [func(item) for item in items]
+        batch_results = [future.result() for future in futures]
+        results = [None] * len(items)
+        for i, batch_res in enumerate(batch_results):
+            results[i::num_threads] = batch_res
+        return results
+
+    return [future.result() for future in futures]
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
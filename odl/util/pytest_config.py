@@ -72,7 +72,7 @@ if not PYWT_AVAILABLE:
     collect_ignore.append(
         path.join(odl_root, 'odl', 'trafos', 'backends', 'pywt_bindings.py')
     )
-    # Currently `pywt` is the only implementation
+    # The doctests use the default implementation `pywt`
     collect_ignore.append(
         path.join(odl_root, 'odl', 'trafos', 'wavelet.py')
     )
@@ -0,0 +1,234 @@
+# Copyright 2014-2020 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Process-wide pool of reusable scratch elements.
+
+Composite operators and iterative solvers need temporary elements for
+intermediate results. Instead of allocating (and page-faulting) a new
+element in every call, they borrow one from this pool with
+`scratch_element` and return it when done. The pool is keyed by space
+identity, thread-safe, and bounded by the total number of bytes of the
+idle elements; the elements of the least recently used spaces are
+dropped first.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+__all__ = (
+    'scratch_element',
+    'scratch_elements',
+    'scratch_pool_stats',
+    'clear_scratch_pool',
+    'set_scratch_pool_size',
+)
+
+
+# Maps `id(space)` to a list of idle `(element, nbytes)` pairs. The
+# elements keep their space alive, hence ids cannot be reused while the
+# entry exists.
+_SCRATCH_POOL = OrderedDict()
+_SCRATCH_POOL_SIZE = 2 ** 28
+_SCRATCH_POOL_LOCK = threading.Lock()
+_SCRATCH_POOL_NBYTES = 0
+_SCRATCH_POOL_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _acquire(space):
+    """Return an idle element of ``space`` from the pool or a new one."""
+    global _SCRATCH_POOL_NBYTES
+    key = id(space)
+    with _SCRATCH_POOL_LOCK:
+        idle = _SCRATCH_POOL.get(key, None)
+        if idle:
+            elem, nbytes = idle.pop()
+            if not idle:
+                del _SCRATCH_POOL[key]
+            _SCRATCH_POOL_NBYTES -= nbytes
+            _SCRATCH_POOL_STATS['hits'] += 1
+            return elem
+        _SCRATCH_POOL_STATS['misses'] += 1
+
+    return space.element()
+
+
+def _release(space, elem):
+    """Put ``elem`` back into the pool, evicting old elements if needed."""
+    global _SCRATCH_POOL_NBYTES
+    # Elements of spaces without a known size are never kept
+    nbytes = getattr(space, 'nbytes', None)
+    key = id(space)
+    with _SCRATCH_POOL_LOCK:
+        if nbytes is None or nbytes > _SCRATCH_POOL_SIZE:
+            _SCRATCH_POOL_STATS['evictions'] += 1
+            return
+
+        # Re-insert to mark the key as most recently used
+        elems = _SCRATCH_POOL.pop(key, [])
+        elems.append((elem, nbytes))
+        _SCRATCH_POOL[key] = elems
+        _SCRATCH_POOL_NBYTES += nbytes
+        _evict(_SCRATCH_POOL_SIZE)
+
+
+def _evict(max_nbytes):
+    """Drop least recently used elements until ``max_nbytes`` are left.
+
+    Must be called with the pool lock held.
+    """
+    global _SCRATCH_POOL_NBYTES
+    while _SCRATCH_POOL_NBYTES > max_nbytes:
+        key, idle = next(iter(_SCRATCH_POOL.items()))
+        _, nbytes = idle.pop(0)
+        if not idle:
+            del _SCRATCH_POOL[key]
+        _SCRATCH_POOL_NBYTES -= nbytes
+        _SCRATCH_POOL_STATS['evictions'] += 1
+
+
+@contextmanager
+def scratch_element(space, tmp=None):
+    """Context manager providing a temporary element of ``space``.
+
+    The element is taken from the scratch pool if an idle element of
+    ``space`` is available, otherwise it is newly created. Its initial
+    content is undefined, as for ``space.element()``. On exit, it is
+    returned to the pool and must not be used anymore.
+
+    Parameters
+    ----------
+    space : `LinearSpace`
+        Space of the temporary element. Elements are only shared between
+        calls with the same space object, not between equal spaces.
+    tmp : ``space`` element, optional
+        If given, this element is used as-is and not added to the pool.
+        This allows operators to accept user-provided temporaries.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> x = space.element([1, 2, 3])
+    >>> with scratch_element(space) as tmp:
+    ...     result = tmp.lincomb(2, x).inner(x)
+    >>> result
+    28.0
+
+    The second request for an element of the same space is served from
+    the pool:
+
+    >>> clear_scratch_pool()
+    >>> with scratch_element(space) as tmp:
+    ...     pass
+    >>> with scratch_element(space) as tmp:
+    ...     pass
+    >>> stats = scratch_pool_stats()
+    >>> stats['hits'], stats['misses']
+    (1, 1)
+    """
+    if tmp is not None:
+        yield tmp
+        return
+
+    elem = _acquire(space)
+    try:
+        yield elem
+    finally:
+        _release(space, elem)
+
+
+@contextmanager
+def scratch_elements(*spaces):
+    """Context manager version of `scratch_element` for several spaces.
+
+    Parameters
+    ----------
+    space1, ..., spaceN : `LinearSpace`
+        Spaces of the temporary elements. The same space can be given
+        multiple times to get several distinct elements.
+
+    Yields
+    ------
+    elements : list
+        Temporary elements, one per space, in the order of the spaces.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> with scratch_elements(space, space) as (tmp1, tmp2):
+    ...     tmp1 is tmp2
+    False
+    """
+    if not spaces:
+        yield []
+        return
+
+    with scratch_element(spaces[0]) as elem:
+        with scratch_elements(*spaces[1:]) as elems:
+            yield [elem] + elems
+
+
+def scratch_pool_stats():
+    """Return usage statistics of the scratch pool.
+
+    Returns
+    -------
+    stats : dict
+        Dictionary with the following entries:
+
+        - ``'hits'``: number of requests served from the pool
+        - ``'misses'``: number of requests that created a new element
+        - ``'evictions'``: number of elements dropped from the pool
+        - ``'num_elements'``: number of idle elements in the pool
+        - ``'nbytes'``: total size of the idle elements in bytes
+        - ``'max_nbytes'``: maximum total size of the idle elements
+    """
+    with _SCRATCH_POOL_LOCK:
+        stats = dict(_SCRATCH_POOL_STATS)
+        stats['num_elements'] = sum(len(idle)
+                                    for idle in _SCRATCH_POOL.values())
+        stats['nbytes'] = _SCRATCH_POOL_NBYTES
+        stats['max_nbytes'] = _SCRATCH_POOL_SIZE
+    return stats
+
+
+def clear_scratch_pool():
+    """Remove all elements from the scratch pool and reset the statistics."""
+    global _SCRATCH_POOL_NBYTES
+    with _SCRATCH_POOL_LOCK:
+        _SCRATCH_POOL.clear()
+        _SCRATCH_POOL_NBYTES = 0
+        for key in _SCRATCH_POOL_STATS:
+            _SCRATCH_POOL_STATS[key] = 0
+
+
+def set_scratch_pool_size(nbytes):
+    """Set the maximum total size of idle elements in the scratch pool.
+
+    Parameters
+    ----------
+    nbytes : nonnegative int
+        New maximum number of bytes. Elements of the least recently used
+        spaces are dropped if the pool is larger. With ``nbytes=0``,
+        no elements are kept.
+    """
+    global _SCRATCH_POOL_SIZE
+    nbytes, nbytes_in = int(nbytes), nbytes
+    if nbytes != nbytes_in or nbytes < 0:
+        raise ValueError('`nbytes` must be a nonnegative integer, got {!r}'
+                         ''.format(nbytes_in))
+    with _SCRATCH_POOL_LOCK:
+        _SCRATCH_POOL_SIZE = nbytes
+        _evict(_SCRATCH_POOL_SIZE)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -626,6 +626,19 @@ def writable_array(obj, **kwargs):
             obj[:] = arr
 
 
+@contextmanager
+def _writable_arrays(objs, **kwargs):
+    """Context manager version of `writable_array` for several objects."""
+    objs = list(objs)
+    if not objs:
+        yield []
+        return
+
+    with writable_array(objs[0], **kwargs) as arr:
+        with _writable_arrays(objs[1:], **kwargs) as arrs:
+            yield [arr] + arrs
+
+
 def signature_string(posargs, optargs, sep=', ', mod='!r'):
     """Return a stringified signature from given arguments.
 